@@ -1386,6 +1386,8 @@ static void AUNotifySearchIncrementalSync(NSString *resourceIdentifier, NSDictio
       }
       return NO;
     }
+    self.database.metrics = application.metrics;
+    self.database.statementStats = application.statementStats;
   }
 
   NSMutableDictionary *childConfig = [NSMutableDictionary dictionary];
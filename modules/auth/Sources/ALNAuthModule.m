@@ -9,6 +9,7 @@
 #import "ALNJSONSerialization.h"
 #import "ALNPg.h"
 #import "ALNPasswordHash.h"
+#import "ALNPasswordHashExecutor.h"
 #import "ALNRecoveryCodes.h"
 #import "ALNSecurityPrimitives.h"
 #import "ALNServices.h"
@@ -568,6 +569,7 @@ static NSString *AMStubHS256JWT(NSDictionary *claims, NSString *sharedSecret) {
 @interface ALNAuthModuleRuntime ()
 
 @property(nonatomic, strong) ALNPg *database;
+@property(nonatomic, strong) ALNPasswordHashExecutor *passwordHashExecutor;
 @property(nonatomic, strong) id<ALNMailAdapter> mailAdapter;
 @property(nonatomic, copy) NSDictionary *moduleConfig;
 @property(nonatomic, copy) NSString *environmentName;
@@ -905,6 +907,7 @@ static id AMInstantiateHookClass(NSDictionary *hooksConfig,
   self = [super init];
   if (self != nil) {
     _moduleConfig = @{};
+    _passwordHashExecutor = [ALNPasswordHashExecutor sharedExecutor];
     _prefix = @"/auth";
     _apiPrefix = @"/auth/api";
     _loginPath = @"/auth/login";
@@ -1132,7 +1135,10 @@ static id AMInstantiateHookClass(NSDictionary *hooksConfig,
     }
     return NO;
   }
+  self.database.metrics = application.metrics;
+  self.database.statementStats = application.statementStats;
   self.mailAdapter = application.mailAdapter;
+  self.passwordHashExecutor = application.passwordHashExecutor ?: [ALNPasswordHashExecutor sharedExecutor];
   return YES;
 }
 
@@ -1511,9 +1517,9 @@ static id AMInstantiateHookClass(NSDictionary *hooksConfig,
   NSArray *finalRoles = AMJSONArrayFromJSONString(AMJSONString(userValues[@"roles"] ?: roles));
 
   NSError *hashError = nil;
-  NSString *encodedHash = [ALNPasswordHash hashPasswordString:(password ?: @"")
-                                                      options:[ALNPasswordHash defaultArgon2idOptions]
-                                                        error:&hashError];
+  NSString *encodedHash = [self.passwordHashExecutor hashPasswordString:(password ?: @"")
+                                                                options:[ALNPasswordHash defaultArgon2idOptions]
+                                                                  error:&hashError];
   if ([encodedHash length] == 0) {
     if (error != NULL) {
       *error = hashError ?: AMError(ALNAuthModuleErrorValidationFailed, @"Failed to hash password", nil);
@@ -1613,9 +1619,9 @@ static id AMInstantiateHookClass(NSDictionary *hooksConfig,
   NSArray *finalRoles = AMJSONArrayFromJSONString(AMJSONString(userValues[@"roles"] ?: roles));
 
   NSError *hashError = nil;
-  NSString *encodedHash = [ALNPasswordHash hashPasswordString:AMRandomToken(32)
-                                                      options:[ALNPasswordHash defaultArgon2idOptions]
-                                                        error:&hashError];
+  NSString *encodedHash = [self.passwordHashExecutor hashPasswordString:AMRandomToken(32)
+                                                                options:[ALNPasswordHash defaultArgon2idOptions]
+                                                                  error:&hashError];
   if ([encodedHash length] == 0) {
     if (error != NULL) {
       *error = hashError ?: AMError(ALNAuthModuleErrorValidationFailed, @"Failed to provision claim credential", nil);
@@ -1713,9 +1719,9 @@ static id AMInstantiateHookClass(NSDictionary *hooksConfig,
     return nil;
   }
   NSError *verifyError = nil;
-  BOOL verified = [ALNPasswordHash verifyPasswordString:(password ?: @"")
-                                     againstEncodedHash:encodedHash
-                                                  error:&verifyError];
+  BOOL verified = [self.passwordHashExecutor verifyPasswordString:(password ?: @"")
+                                               againstEncodedHash:encodedHash
+                                                            error:&verifyError];
   if (!verified) {
     if (error != NULL) {
       *error = verifyError ?: AMError(ALNAuthModuleErrorAuthenticationFailed, @"Invalid email or password", nil);
@@ -1917,9 +1923,9 @@ static id AMInstantiateHookClass(NSDictionary *hooksConfig,
     return NO;
   }
   NSError *hashError = nil;
-  NSString *encodedHash = [ALNPasswordHash hashPasswordString:(password ?: @"")
-                                                      options:[ALNPasswordHash defaultArgon2idOptions]
-                                                        error:&hashError];
+  NSString *encodedHash = [self.passwordHashExecutor hashPasswordString:(password ?: @"")
+                                                                options:[ALNPasswordHash defaultArgon2idOptions]
+                                                                  error:&hashError];
   if ([encodedHash length] == 0) {
     if (error != NULL) {
       *error = hashError;
@@ -3233,6 +3239,19 @@ static id AMInstantiateHookClass(NSDictionary *hooksConfig,
   return [self renderTemplate:templateName context:context layout:layoutName error:error];
 }
 
+// Password hashing sheds load instead of queueing without bound; report that
+// as 503 with Retry-After rather than as a credential or validation failure.
+- (NSInteger)statusForAuthError:(NSError *)error defaultStatus:(NSInteger)defaultStatus {
+  if (![error.domain isEqualToString:ALNPasswordHashErrorDomain] ||
+      error.code != ALNPasswordHashErrorExecutorSaturated) {
+    return defaultStatus;
+  }
+  NSUInteger retryAfter = [error.userInfo[ALNPasswordHashRetryAfterSecondsKey] unsignedIntegerValue];
+  [self.context.response setHeader:@"Retry-After"
+                             value:[NSString stringWithFormat:@"%lu", (unsigned long)MAX((NSUInteger)1, retryAfter)]];
+  return 503;
+}
+
 - (NSArray *)errorEntriesForError:(NSError *)error
                             field:(NSString *)field {
   if (error == nil) {
@@ -3318,7 +3337,7 @@ static id AMInstantiateHookClass(NSDictionary *hooksConfig,
   NSError *error = nil;
   NSDictionary *user = [self.runtime authenticateLocalEmail:email password:password error:&error];
   if (user == nil) {
-    [self setStatus:401];
+    [self setStatus:[self statusForAuthError:error defaultStatus:401]];
     NSArray *errors = [self errorEntriesForError:(error ?: AMError(ALNAuthModuleErrorAuthenticationFailed, @"Invalid email or password", nil))
                                            field:@"email"];
     if ([self shouldPreferJSONForHeadlessRequest:ctx]) {
@@ -3457,7 +3476,7 @@ static id AMInstantiateHookClass(NSDictionary *hooksConfig,
   NSDictionary *user =
       [self.runtime createLocalUserWithEmail:email displayName:displayName password:password source:@"local_registration" error:&error];
   if (user == nil) {
-    [self setStatus:422];
+    [self setStatus:[self statusForAuthError:error defaultStatus:422]];
     NSArray *errors = [self errorEntriesForError:(error ?: AMError(ALNAuthModuleErrorValidationFailed, @"Registration failed", nil))
                                            field:AMTrimmedString(error.userInfo[@"field"])];
     if ([self shouldPreferJSONForHeadlessRequest:ctx]) {
@@ -3677,7 +3696,7 @@ static id AMInstantiateHookClass(NSDictionary *hooksConfig,
                                                user:&user
                                               error:&error];
   if (!ok) {
-    [self setStatus:422];
+    [self setStatus:[self statusForAuthError:error defaultStatus:422]];
     NSArray *errors = [self errorEntriesForError:error field:@"password"];
     if ([self shouldPreferJSONForHeadlessRequest:ctx]) {
       return @{ @"status" : @"error", @"errors" : errors };
@@ -3728,7 +3747,7 @@ static id AMInstantiateHookClass(NSDictionary *hooksConfig,
   NSError *authError = nil;
   NSDictionary *authenticated = [self.runtime authenticateLocalEmail:user[@"email"] password:parameters[@"current_password"] error:&authError];
   if (authenticated == nil) {
-    [self setStatus:401];
+    [self setStatus:[self statusForAuthError:authError defaultStatus:401]];
     return @{ @"status" : @"error", @"message" : authError.localizedDescription ?: @"Current password is invalid" };
   }
   NSError *updateError = nil;
@@ -3737,11 +3756,12 @@ static id AMInstantiateHookClass(NSDictionary *hooksConfig,
     [self setStatus:422];
     return @{ @"status" : @"error", @"message" : passwordMessage ?: @"Password does not satisfy policy" };
   }
-  NSString *encodedHash = [ALNPasswordHash hashPasswordString:AMTrimmedString(parameters[@"new_password"])
-                                                      options:[ALNPasswordHash defaultArgon2idOptions]
-                                                        error:&updateError];
+  NSString *encodedHash =
+      [self.runtime.passwordHashExecutor hashPasswordString:AMTrimmedString(parameters[@"new_password"])
+                                                    options:[ALNPasswordHash defaultArgon2idOptions]
+                                                      error:&updateError];
   if ([encodedHash length] == 0) {
-    [self setStatus:500];
+    [self setStatus:[self statusForAuthError:updateError defaultStatus:500]];
     return @{ @"status" : @"error", @"message" : updateError.localizedDescription ?: @"Failed to hash password" };
   }
   NSInteger command = [self.runtime.database executeCommand:@"UPDATE auth_local_credentials "
@@ -34,6 +34,10 @@ typedef NS_ENUM(NSInteger, ALNOpsModuleErrorCode) {
 @property(nonatomic, copy, readonly) NSString *apiPrefix;
 @property(nonatomic, copy, readonly) NSArray<NSString *> *accessRoles;
 @property(nonatomic, assign, readonly) NSUInteger minimumAuthAssuranceLevel;
+@property(nonatomic, assign, readonly) BOOL profilerEnabled;
+@property(nonatomic, copy, readonly) NSArray<NSString *> *profilerRoles;
+@property(nonatomic, assign, readonly) NSUInteger profilerMaxSeconds;
+@property(nonatomic, assign, readonly) NSUInteger profilerFrequencyHz;
 @property(nonatomic, strong, readonly, nullable) ALNApplication *application;
 
 + (instancetype)sharedRuntime;
@@ -43,6 +47,8 @@ typedef NS_ENUM(NSInteger, ALNOpsModuleErrorCode) {
 - (NSDictionary *)resolvedConfigSummary;
 - (NSDictionary *)dashboardSummary;
 - (nullable NSDictionary *)moduleDrilldownForIdentifier:(NSString *)identifier;
+- (NSDictionary *)slowRequestsSummary;
+- (NSDictionary *)statementStatsSummary;
 
 @end
 
@@ -9,6 +9,9 @@
 #import "ALNMetrics.h"
 #import "ALNRequest.h"
 #import "ALNResponse.h"
+#import "ALNSQLStatementStats.h"
+#import "ALNSamplingProfiler.h"
+#import "ALNSlowRequestRecorder.h"
 #import "ALNStorageModule.h"
 
 NSString *const ALNOpsModuleErrorDomain = @"Arlen.Modules.Ops.Error";
@@ -319,6 +322,10 @@ static NSUInteger const ALNOpsSnapshotHistoryLimit = 48U;
 @property(nonatomic, copy, readwrite) NSString *apiPrefix;
 @property(nonatomic, copy, readwrite) NSArray<NSString *> *accessRoles;
 @property(nonatomic, assign, readwrite) NSUInteger minimumAuthAssuranceLevel;
+@property(nonatomic, assign, readwrite) BOOL profilerEnabled;
+@property(nonatomic, copy, readwrite) NSArray<NSString *> *profilerRoles;
+@property(nonatomic, assign, readwrite) NSUInteger profilerMaxSeconds;
+@property(nonatomic, assign, readwrite) NSUInteger profilerFrequencyHz;
 @property(nonatomic, strong, readwrite, nullable) ALNApplication *application;
 @property(nonatomic, copy) NSDictionary *moduleConfig;
 @property(nonatomic, strong) NSMutableArray<NSDictionary *> *historySnapshots;
@@ -362,6 +369,10 @@ static NSUInteger const ALNOpsSnapshotHistoryLimit = 48U;
     _apiPrefix = @"/ops/api";
     _accessRoles = @[ @"operator", @"admin" ];
     _minimumAuthAssuranceLevel = 2;
+    _profilerEnabled = YES;
+    _profilerRoles = @[ @"admin" ];
+    _profilerMaxSeconds = 30;
+    _profilerFrequencyHz = 99;
     _moduleConfig = @{};
     _historySnapshots = [NSMutableArray array];
     _cardProviders = @[];
@@ -396,6 +407,21 @@ static NSUInteger const ALNOpsSnapshotHistoryLimit = 48U;
   if ([roles count] == 0) {
     [roles addObjectsFromArray:@[ @"operator", @"admin" ]];
   }
+  NSDictionary *profiler =
+      [moduleConfig[@"profiler"] isKindOfClass:[NSDictionary class]] ? moduleConfig[@"profiler"] : @{};
+  NSArray *rawProfilerRoles =
+      [profiler[@"roles"] isKindOfClass:[NSArray class]] ? profiler[@"roles"] : @[ @"admin" ];
+  NSMutableArray *profilerRoles = [NSMutableArray array];
+  for (id value in rawProfilerRoles) {
+    NSString *role = OTLowerTrimmedString(value);
+    if ([role length] == 0 || [profilerRoles containsObject:role]) {
+      continue;
+    }
+    [profilerRoles addObject:role];
+  }
+  if ([profilerRoles count] == 0) {
+    [profilerRoles addObject:@"admin"];
+  }
 
   self.application = application;
   self.moduleConfig = moduleConfig;
@@ -409,6 +435,22 @@ static NSUInteger const ALNOpsSnapshotHistoryLimit = 48U;
   if (self.minimumAuthAssuranceLevel == 0) {
     self.minimumAuthAssuranceLevel = 2;
   }
+  self.profilerEnabled = [profiler[@"enabled"] respondsToSelector:@selector(boolValue)]
+                             ? [profiler[@"enabled"] boolValue]
+                             : YES;
+  self.profilerRoles = [NSArray arrayWithArray:profilerRoles];
+  self.profilerMaxSeconds = [profiler[@"maxSeconds"] respondsToSelector:@selector(unsignedIntegerValue)]
+                                ? [profiler[@"maxSeconds"] unsignedIntegerValue]
+                                : 30;
+  if (self.profilerMaxSeconds == 0) {
+    self.profilerMaxSeconds = 30;
+  }
+  self.profilerFrequencyHz = [profiler[@"frequencyHz"] respondsToSelector:@selector(unsignedIntegerValue)]
+                                 ? [profiler[@"frequencyHz"] unsignedIntegerValue]
+                                 : 99;
+  if (self.profilerFrequencyHz == 0 || self.profilerFrequencyHz > 1000) {
+    self.profilerFrequencyHz = 99;
+  }
   NSDictionary *persistence = [moduleConfig[@"persistence"] isKindOfClass:[NSDictionary class]] ? moduleConfig[@"persistence"] : @{};
   self.statePath = OTTrimmedString(persistence[@"path"]);
   self.persistenceEnabled = ([self.statePath length] > 0);
@@ -430,6 +472,10 @@ static NSUInteger const ALNOpsSnapshotHistoryLimit = 48U;
     @"apiPrefix" : self.apiPrefix ?: @"/ops/api",
     @"accessRoles" : self.accessRoles ?: @[ @"operator", @"admin" ],
     @"minimumAuthAssuranceLevel" : @(self.minimumAuthAssuranceLevel),
+    @"profilerEnabled" : @(self.profilerEnabled),
+    @"profilerRoles" : self.profilerRoles ?: @[ @"admin" ],
+    @"profilerMaxSeconds" : @(self.profilerMaxSeconds),
+    @"profilerFrequencyHz" : @(self.profilerFrequencyHz),
     @"persistenceEnabled" : @(self.persistenceEnabled),
     @"statePath" : self.statePath ?: @"",
     @"cardProviderCount" : @([self.cardProviders count]),
@@ -798,6 +844,41 @@ static NSUInteger const ALNOpsSnapshotHistoryLimit = 48U;
   };
 }
 
+- (NSDictionary *)slowRequestsSummary {
+  ALNSlowRequestRecorder *recorder = self.application.slowRequestRecorder;
+  if (recorder == nil) {
+    return @{
+      @"available" : @NO,
+      @"slowest" : @[],
+      @"recent" : @[],
+    };
+  }
+  NSMutableDictionary *summary = [NSMutableDictionary dictionaryWithDictionary:[recorder dictionaryRepresentation]];
+  summary[@"available"] = @YES;
+  summary[@"paths"] = @{
+    @"html" : OTPathJoin(self.prefix, @"requests"),
+    @"api" : OTPathJoin(self.apiPrefix, @"requests"),
+  };
+  return summary;
+}
+
+- (NSDictionary *)statementStatsSummary {
+  ALNSQLStatementStats *stats = self.application.statementStats;
+  if (stats == nil) {
+    return @{
+      @"available" : @NO,
+      @"statements" : @[],
+    };
+  }
+  NSMutableDictionary *summary = [NSMutableDictionary dictionaryWithDictionary:[stats dictionaryRepresentation]];
+  summary[@"available"] = @YES;
+  summary[@"paths"] = @{
+    @"html" : OTPathJoin(self.prefix, @"statements"),
+    @"api" : OTPathJoin(self.apiPrefix, @"statements"),
+  };
+  return summary;
+}
+
 - (NSDictionary *)dashboardSummary {
   NSDictionary *signals = @{
     @"health" : [self signalSummaryForPath:@"/healthz"],
@@ -1046,6 +1127,32 @@ static NSUInteger const ALNOpsSnapshotHistoryLimit = 48U;
   return nil;
 }
 
+- (id)slowRequests:(ALNContext *)ctx {
+  (void)ctx;
+  [self renderTemplate:@"modules/ops/requests/index"
+               context:[self pageContextWithTitle:@"Slow Requests"
+                                          heading:@"Slow requests"
+                                          message:@""
+                                           errors:nil
+                                            extra:@{ @"slowRequests" : [self.runtime slowRequestsSummary] ?: @{} }]
+                layout:@"modules/ops/layouts/main"
+                 error:NULL];
+  return nil;
+}
+
+- (id)statementStats:(ALNContext *)ctx {
+  (void)ctx;
+  [self renderTemplate:@"modules/ops/statements/index"
+               context:[self pageContextWithTitle:@"SQL Statements"
+                                          heading:@"SQL statements"
+                                          message:@""
+                                           errors:nil
+                                            extra:@{ @"statementStats" : [self.runtime statementStatsSummary] ?: @{} }]
+                layout:@"modules/ops/layouts/main"
+                 error:NULL];
+  return nil;
+}
+
 - (id)apiSummary:(ALNContext *)ctx {
   (void)ctx;
   [self renderJSONEnvelopeWithData:[self.runtime dashboardSummary] meta:nil error:NULL];
@@ -1082,6 +1189,80 @@ static NSUInteger const ALNOpsSnapshotHistoryLimit = 48U;
   return nil;
 }
 
+// Samples this worker process only; repeat the request to cover others.
+- (id)apiProfile:(ALNContext *)ctx {
+  if (!self.runtime.profilerEnabled) {
+    [self renderAPIErrorWithStatus:404 code:@"not_found" message:@"ops profiler is disabled" meta:nil];
+    return nil;
+  }
+  if (!OTRolesAllowAccess([ctx authRoles], self.runtime.profilerRoles)) {
+    [self renderAPIErrorWithStatus:403
+                              code:@"forbidden"
+                           message:@"Missing profiler role"
+                              meta:@{ @"required_roles_any" : self.runtime.profilerRoles ?: @[] }];
+    return nil;
+  }
+
+  NSUInteger maxSeconds = self.runtime.profilerMaxSeconds;
+  NSNumber *secondsValue = [self queryIntegerForName:@"seconds"];
+  NSNumber *frequencyValue = [self queryIntegerForName:@"hz"];
+  NSInteger seconds = (secondsValue != nil) ? [secondsValue integerValue] : 10;
+  NSInteger frequency = (frequencyValue != nil) ? [frequencyValue integerValue]
+                                                : (NSInteger)self.runtime.profilerFrequencyHz;
+  if (seconds < 1 || (NSUInteger)seconds > maxSeconds || frequency < 1 || frequency > 1000) {
+    [self renderAPIErrorWithStatus:422
+                              code:@"invalid_parameters"
+                           message:@"seconds or hz is out of range"
+                              meta:@{
+                                @"maxSeconds" : @(maxSeconds),
+                                @"maxFrequencyHz" : @1000,
+                              }];
+    return nil;
+  }
+
+  NSError *profileError = nil;
+  NSDictionary *profile = [[ALNSamplingProfiler sharedProfiler] profileForDuration:(NSTimeInterval)seconds
+                                                                        frequency:(NSUInteger)frequency
+                                                                            error:&profileError];
+  if (profile == nil) {
+    NSInteger status = 500;
+    NSString *code = @"profiler_failed";
+    if (profileError.code == ALNSamplingProfilerErrorBusy) {
+      status = 409;
+      code = @"profiler_busy";
+    } else if (profileError.code == ALNSamplingProfilerErrorUnsupported) {
+      status = 501;
+      code = @"profiler_unsupported";
+    }
+    [self renderAPIErrorWithStatus:status
+                              code:code
+                           message:profileError.localizedDescription ?: @"profiling failed"
+                              meta:nil];
+    return nil;
+  }
+  [self.context.response setHeader:@"X-Arlen-Profile-Samples"
+                             value:[profile[@"samples"] stringValue] ?: @"0"];
+  [self.context.response setHeader:@"X-Arlen-Profile-Dropped"
+                             value:[profile[@"dropped"] stringValue] ?: @"0"];
+  [self.context.response setHeader:@"X-Arlen-Profile-Pid"
+                             value:[NSString stringWithFormat:@"%d", [[NSProcessInfo processInfo] processIdentifier]]];
+  [self renderData:[profile[@"collapsed"] dataUsingEncoding:NSUTF8StringEncoding] ?: [NSData data]
+       contentType:@"text/plain; charset=utf-8"];
+  return nil;
+}
+
+- (id)apiSlowRequests:(ALNContext *)ctx {
+  (void)ctx;
+  [self renderJSONEnvelopeWithData:[self.runtime slowRequestsSummary] meta:nil error:NULL];
+  return nil;
+}
+
+- (id)apiStatementStats:(ALNContext *)ctx {
+  (void)ctx;
+  [self renderJSONEnvelopeWithData:[self.runtime statementStatsSummary] meta:nil error:NULL];
+  return nil;
+}
+
 - (id)apiOpenAPI:(ALNContext *)ctx {
   (void)ctx;
   [self renderJSONEnvelopeWithData:@{ @"openapi" : [self.runtime.application openAPISpecification] ?: @{} }
@@ -1115,6 +1296,16 @@ static NSUInteger const ALNOpsSnapshotHistoryLimit = 48U;
                               name:@"ops_module_drilldown"
                    controllerClass:[ALNOpsModuleController class]
                             action:@"moduleDrilldown"];
+  [application registerRouteMethod:@"GET"
+                              path:@"/requests"
+                              name:@"ops_slow_requests"
+                   controllerClass:[ALNOpsModuleController class]
+                            action:@"slowRequests"];
+  [application registerRouteMethod:@"GET"
+                              path:@"/statements"
+                              name:@"ops_statement_stats"
+                   controllerClass:[ALNOpsModuleController class]
+                            action:@"statementStats"];
   [application endRouteGroup];
 
   [application beginRouteGroupWithPrefix:runtime.apiPrefix guardAction:@"requireOpsAPI" formats:nil];
@@ -1138,14 +1329,29 @@ static NSUInteger const ALNOpsSnapshotHistoryLimit = 48U;
                               name:@"ops_api_metrics"
                    controllerClass:[ALNOpsModuleController class]
                             action:@"apiMetrics"];
+  [application registerRouteMethod:@"GET"
+                              path:@"/requests"
+                              name:@"ops_api_slow_requests"
+                   controllerClass:[ALNOpsModuleController class]
+                            action:@"apiSlowRequests"];
+  [application registerRouteMethod:@"GET"
+                              path:@"/statements"
+                              name:@"ops_api_statement_stats"
+                   controllerClass:[ALNOpsModuleController class]
+                            action:@"apiStatementStats"];
   [application registerRouteMethod:@"GET"
                               path:@"/openapi"
                               name:@"ops_api_openapi"
                    controllerClass:[ALNOpsModuleController class]
                             action:@"apiOpenAPI"];
+  [application registerRouteMethod:@"GET"
+                              path:@"/profile"
+                              name:@"ops_api_profile"
+                   controllerClass:[ALNOpsModuleController class]
+                            action:@"apiProfile"];
   [application endRouteGroup];
 
-  for (NSString *routeName in @[ @"ops_api_summary", @"ops_api_module_drilldown", @"ops_api_signals", @"ops_api_metrics", @"ops_api_openapi" ]) {
+  for (NSString *routeName in @[ @"ops_api_summary", @"ops_api_module_drilldown", @"ops_api_signals", @"ops_api_metrics", @"ops_api_slow_requests", @"ops_api_statement_stats", @"ops_api_openapi", @"ops_api_profile" ]) {
     [application configureRouteNamed:routeName
                        requestSchema:nil
                       responseSchema:nil
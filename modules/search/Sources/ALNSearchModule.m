@@ -18,18 +18,21 @@ static NSString *const ALNSearchReindexJobIdentifier = @"search.reindex";
 static NSUInteger const ALNSearchHistoryLimit = 30;
 static NSUInteger const ALNSearchGenerationHistoryLimit = 6;
 
-extern NSString *ALNEOCRender_modules_search_dashboard_index_html_eoc(id ctx, NSError **error);
-extern NSString *ALNEOCRender_modules_search_layouts_main_html_eoc(id ctx, NSError **error);
-extern NSString *ALNEOCRender_modules_search_result_index_html_eoc(id ctx, NSError **error);
+extern ALNEOCRenderBuffer *ALNEOCRender_modules_search_dashboard_index_html_eoc(
+    id ctx, ALNEOCRenderBuffer *out, NSError **error);
+extern ALNEOCRenderBuffer *ALNEOCRender_modules_search_layouts_main_html_eoc(
+    id ctx, ALNEOCRenderBuffer *out, NSError **error);
+extern ALNEOCRenderBuffer *ALNEOCRender_modules_search_result_index_html_eoc(
+    id ctx, ALNEOCRenderBuffer *out, NSError **error);
 
 static void STRegisterSearchModuleTemplates(void) {
   // Tests clear the global EOC registry; re-register module-owned templates when the module boots.
-  ALNEOCRegisterTemplate(@"modules/search/dashboard/index.html.eoc",
-                         &ALNEOCRender_modules_search_dashboard_index_html_eoc);
-  ALNEOCRegisterTemplate(@"modules/search/layouts/main.html.eoc",
-                         &ALNEOCRender_modules_search_layouts_main_html_eoc);
-  ALNEOCRegisterTemplate(@"modules/search/result/index.html.eoc",
-                         &ALNEOCRender_modules_search_result_index_html_eoc);
+  ALNEOCRegisterBufferTemplate(@"modules/search/dashboard/index.html.eoc",
+                               &ALNEOCRender_modules_search_dashboard_index_html_eoc);
+  ALNEOCRegisterBufferTemplate(@"modules/search/layouts/main.html.eoc",
+                               &ALNEOCRender_modules_search_layouts_main_html_eoc);
+  ALNEOCRegisterBufferTemplate(@"modules/search/result/index.html.eoc",
+                               &ALNEOCRender_modules_search_result_index_html_eoc);
 }
 
 static NSString *STTrimmedString(id value) {
@@ -1911,6 +1914,8 @@ static NSDictionary *STStatusCard(NSString *label, NSString *value, NSString *st
     }
     return NO;
   }
+  self.database.metrics = application.metrics;
+  self.database.statementStats = application.statementStats;
   self.tableName = [self validatedSQLIdentifier:postgres[@"tableName"] defaultValue:@"search_module_documents"];
   self.textSearchConfiguration = [self validatedTextSearchConfiguration:postgres[@"textSearchConfiguration"]];
   return [self ensureSchemaWithError:error];
@@ -10,6 +10,7 @@
 #import "Core/ALNValueTransformers.h"
 #import "Data/ALNAdapterConformance.h"
 #import "Data/ALNDatabaseAdapter.h"
+#import "Data/ALNDatabaseQueryCache.h"
 #import "Data/ALNDataverseClient.h"
 #import "Data/ALNDataverseCodegen.h"
 #import "Data/ALNDataverseMetadata.h"
@@ -35,6 +36,7 @@
 #import "Data/ALNSQLDialect.h"
 #endif
 #import "Data/ALNSQLBuilder.h"
+#import "Data/ALNSQLStatementStats.h"
 #import "HTTP/ALNHTTPServer.h"
 #import "HTTP/ALNRequest.h"
 #import "HTTP/ALNResponse.h"
@@ -52,11 +54,15 @@
 #import "MVC/Template/ALNEOCRuntime.h"
 #import "MVC/Template/ALNEOCTranspiler.h"
 #import "MVC/View/ALNView.h"
+#import "Support/ALNCIDRSet.h"
 #import "Support/ALNLogger.h"
 #import "Support/ALNLive.h"
 #import "Support/ALNMetrics.h"
 #import "Support/ALNPerf.h"
 #import "Support/ALNPlatform.h"
+#import "Support/ALNRateLimitStore.h"
+#import "Support/ALNSamplingProfiler.h"
+#import "Support/ALNSlowRequestRecorder.h"
 #import "Support/ALNAuth.h"
 #import "Support/ALNAuthProviderPresets.h"
 #import "Support/ALNAuthProviderSessionBridge.h"
@@ -64,6 +70,7 @@
 #import "Support/ALNEventStream.h"
 #import "Support/ALNOIDCClient.h"
 #import "Support/ALNPasswordHash.h"
+#import "Support/ALNPasswordHashExecutor.h"
 #import "Support/ALNRecoveryCodes.h"
 #import "Support/ALNTOTP.h"
 #import "Support/ALNWebAuthn.h"
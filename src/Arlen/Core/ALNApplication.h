@@ -12,6 +12,9 @@
 @class ALNLogger;
 @class ALNContext;
 @class ALNMetricsRegistry;
+@class ALNPasswordHashExecutor;
+@class ALNSlowRequestRecorder;
+@class ALNSQLStatementStats;
 @class ALNRoute;
 @class ALNApplication;
 @class ALNDataverseClient;
@@ -56,6 +59,11 @@ NS_ASSUME_NONNULL_BEGIN
 @property(nonatomic, copy, readonly) NSString *environment;
 @property(nonatomic, strong, readonly) ALNLogger *logger;
 @property(nonatomic, strong, readonly) ALNMetricsRegistry *metrics;
+@property(nonatomic, strong, readonly) ALNPasswordHashExecutor *passwordHashExecutor;
+@property(nonatomic, strong, readonly, nullable) ALNSlowRequestRecorder *slowRequestRecorder;
+// Present when `observability.statementStats.enabled`; assign it to the
+// `statementStats` of each ALNPg the application uses.
+@property(nonatomic, strong, readonly, nullable) ALNSQLStatementStats *statementStats;
 @property(nonatomic, copy, readonly) NSArray *middlewares;
 @property(nonatomic, copy, readonly) NSArray *plugins;
 @property(nonatomic, copy, readonly) NSArray *modules;
@@ -173,7 +181,16 @@ NS_ASSUME_NONNULL_BEGIN
 
 - (ALNResponse *)dispatchRequest:(ALNRequest *)request;
 - (NSArray *)routeTable;
+// Built once per route-table state and cached: adding a route or calling
+// one of the configureRoute... methods rebuilds it on next use.
 - (NSDictionary *)openAPISpecification;
+// Compact JSON bytes of `openAPISpecification`, served as-is by
+// `/openapi.json`, with a strong ETag for the same bytes.
+- (nullable NSData *)openAPIDocumentDataWithETag:(NSString *_Nullable *_Nullable)etag
+                                           error:(NSError *_Nullable *_Nullable)error;
+// For code that mutates ALNRoute metadata directly instead of through the
+// configureRoute... methods.
+- (void)invalidateOpenAPIDocument;
 - (BOOL)writeOpenAPISpecToPath:(NSString *)path
                         pretty:(BOOL)pretty
                          error:(NSError *_Nullable *_Nullable)error;
@@ -17,8 +17,13 @@
 #import "ALNSessionMiddleware.h"
 #import "ALNLogger.h"
 #import "ALNJSONSerialization.h"
+#import "ALNSecurityPrimitives.h"
 #import "ALNPerf.h"
 #import "ALNMetrics.h"
+#import "ALNPasswordHashExecutor.h"
+#import "ALNSlowRequestRecorder.h"
+#import "ALNSQLStatementStats.h"
+#import "ALNEOCRuntime.h"
 #import "ALNAuth.h"
 #import "ALNAuthSession.h"
 #import "ALNEventStream.h"
@@ -633,6 +638,14 @@ static BOOL ALNInvokeRouteAction(id controller,
 @property(nonatomic, copy, readwrite) NSString *environment;
 @property(nonatomic, strong, readwrite) ALNLogger *logger;
 @property(nonatomic, strong, readwrite) ALNMetricsRegistry *metrics;
+@property(nonatomic, strong) ALNMetricsCounter *requestsTotalCounter;
+@property(nonatomic, strong) ALNMetricsCounter *errorsTotalCounter;
+@property(nonatomic, strong) ALNMetricsGauge *requestsActiveGauge;
+@property(nonatomic, copy) NSArray<ALNMetricsTiming *> *stageDurationTimings;
+@property(nonatomic, strong, readwrite) ALNPasswordHashExecutor *passwordHashExecutor;
+@property(nonatomic, strong, readwrite, nullable) ALNSlowRequestRecorder *slowRequestRecorder;
+@property(nonatomic, strong, readwrite, nullable) ALNSQLStatementStats *statementStats;
+@property(nonatomic, assign) NSUInteger statementStatsMetricsLimit;
 @property(nonatomic, strong) NSMutableArray *mutableMiddlewares;
 @property(nonatomic, strong) NSMutableArray *mutablePlugins;
 @property(nonatomic, strong) NSMutableArray *mutableModules;
@@ -659,8 +672,10 @@ static BOOL ALNInvokeRouteAction(id controller,
 @property(nonatomic, assign) BOOL responseIdentityHeadersEnabled;
 @property(nonatomic, assign) BOOL apiOnly;
 @property(nonatomic, assign) BOOL performanceLoggingEnabled;
+@property(nonatomic, assign) BOOL serverTimingEnabled;
 @property(nonatomic, assign) BOOL eocStrictLocalsEnabled;
 @property(nonatomic, assign) BOOL eocStrictStringifyEnabled;
+@property(nonatomic, assign) BOOL eocRenderProfilingEnabled;
 @property(nonatomic, assign) BOOL pageStateEnabled;
 @property(nonatomic, copy) NSString *i18nDefaultLocale;
 @property(nonatomic, copy) NSString *i18nFallbackLocale;
@@ -673,6 +688,13 @@ static BOOL ALNInvokeRouteAction(id controller,
 @property(nonatomic, strong) NSMutableDictionary<NSString *, ALNDataverseClient *> *mutableDataverseClients;
 @property(nonatomic, strong) NSLock *dataverseClientLock;
 @property(nonatomic, assign) BOOL configuredRoutesLoaded;
+@property(nonatomic, strong) NSLock *openAPIDocumentLock;
+@property(nonatomic, copy, nullable) NSDictionary *openAPIDocumentSpecification;
+@property(nonatomic, strong, nullable) NSData *openAPIDocumentData;
+@property(nonatomic, copy, nullable) NSString *openAPIDocumentETag;
+@property(nonatomic, assign) NSUInteger openAPIDocumentRouterGeneration;
+@property(nonatomic, assign) NSUInteger routeMetadataGeneration;
+@property(nonatomic, assign) NSUInteger openAPIDocumentMetadataGeneration;
 
 - (BOOL)loadConfiguredRoutesWithError:(NSError *_Nullable *_Nullable)error;
 - (void)loadConfiguredPlugins;
@@ -1122,6 +1144,51 @@ static NSArray<NSString *> *ALNDataverseTargetNamesFromConfigAndEnvironment(NSDi
     _metricsEnabled = [metricsEnabledValue respondsToSelector:@selector(boolValue)]
                           ? [metricsEnabledValue boolValue]
                           : YES;
+    NSDictionary *metricsHistogram = ALNDictionaryConfigValue(observability, @"metricsHistogram");
+    NSArray *histogramBuckets = [metricsHistogram[@"bucketsMs"] isKindOfClass:[NSArray class]]
+                                    ? metricsHistogram[@"bucketsMs"]
+                                    : nil;
+    if ([histogramBuckets count] == 0) {
+      double minimumMs = [metricsHistogram[@"minimumMs"] respondsToSelector:@selector(doubleValue)]
+                             ? [metricsHistogram[@"minimumMs"] doubleValue]
+                             : 0.1;
+      double maximumMs = [metricsHistogram[@"maximumMs"] respondsToSelector:@selector(doubleValue)]
+                             ? [metricsHistogram[@"maximumMs"] doubleValue]
+                             : 60000.0;
+      histogramBuckets = [ALNMetricsHistogram
+          logLinearBoundariesFromMinimum:minimumMs
+                                 maximum:maximumMs
+                     subBucketsPerDecade:ALNUIntConfigValue(metricsHistogram[@"subBucketsPerDecade"], 9, 1)];
+    }
+    _metrics.defaultHistogramBoundaries = histogramBuckets;
+    _requestsTotalCounter = [_metrics counterNamed:@"http_requests_total"];
+    _errorsTotalCounter = [_metrics counterNamed:@"http_errors_total"];
+    _requestsActiveGauge = [_metrics gaugeNamed:@"http_requests_active"];
+    NSMutableArray *stageDurationTimings = [NSMutableArray arrayWithCapacity:ALNPerfStageCount];
+    for (NSUInteger stage = 0; stage < ALNPerfStageCount; stage++) {
+      NSString *name = (stage == ALNPerfStageTotal)
+                           ? @"http_request_duration_ms"
+                           : [NSString stringWithFormat:@"http_%@_duration_ms",
+                                                        ALNPerfStageName((ALNPerfStage)stage)];
+      [stageDurationTimings addObject:[_metrics timingNamed:name]];
+    }
+    _stageDurationTimings = [stageDurationTimings copy];
+    _serverTimingEnabled = ALNBoolConfigValue(observability[@"serverTimingEnabled"], NO);
+    NSDictionary *slowRequests = ALNDictionaryConfigValue(observability, @"slowRequests");
+    if (ALNBoolConfigValue(slowRequests[@"enabled"], YES)) {
+      double thresholdMs = [slowRequests[@"thresholdMs"] respondsToSelector:@selector(doubleValue)]
+                               ? [slowRequests[@"thresholdMs"] doubleValue]
+                               : 500.0;
+      _slowRequestRecorder = [[ALNSlowRequestRecorder alloc]
+          initWithThresholdMilliseconds:thresholdMs
+                               capacity:ALNUIntConfigValue(slowRequests[@"capacity"], 32, 1)];
+    }
+    NSDictionary *statementStats = ALNDictionaryConfigValue(observability, @"statementStats");
+    if (ALNBoolConfigValue(statementStats[@"enabled"], NO)) {
+      _statementStats = [[ALNSQLStatementStats alloc]
+          initWithMaxStatements:ALNUIntConfigValue(statementStats[@"maxStatements"], 500, 1)];
+      _statementStatsMetricsLimit = ALNUIntConfigValue(statementStats[@"metricsExportLimit"], 20, 0);
+    }
     id tracePropagationEnabledValue = observability[@"tracePropagationEnabled"];
     _tracePropagationEnabled = [tracePropagationEnabledValue respondsToSelector:@selector(boolValue)]
                                    ? [tracePropagationEnabledValue boolValue]
@@ -1150,6 +1217,10 @@ static NSArray<NSString *> *ALNDataverseTargetNamesFromConfigAndEnvironment(NSDi
     _eocStrictStringifyEnabled = [strictStringifyValue respondsToSelector:@selector(boolValue)]
                                      ? [strictStringifyValue boolValue]
                                      : NO;
+    id renderProfilingValue = eoc[@"renderProfiling"];
+    _eocRenderProfilingEnabled = [renderProfilingValue respondsToSelector:@selector(boolValue)]
+                                     ? [renderProfilingValue boolValue]
+                                     : NO;
     NSDictionary *compatibility =
         [_config[@"compatibility"] isKindOfClass:[NSDictionary class]]
             ? _config[@"compatibility"]
@@ -1167,9 +1238,32 @@ static NSArray<NSString *> *ALNDataverseTargetNamesFromConfigAndEnvironment(NSDi
     _routeCompilationLock = [[NSLock alloc] init];
     _mutableDataverseClients = [NSMutableDictionary dictionary];
     _dataverseClientLock = [[NSLock alloc] init];
+    _openAPIDocumentLock = [[NSLock alloc] init];
     ALNLogLevel defaultLogLevel =
         [_environment isEqualToString:@"development"] ? ALNLogLevelDebug : ALNLogLevelInfo;
     _logger.minimumLevel = ALNLogLevelFromConfigValue(_config[@"logLevel"], defaultLogLevel);
+    NSDictionary *passwordHashing = ALNDictionaryConfigValue(_config, @"passwordHashing");
+    double passwordHashQueueTimeout = [passwordHashing[@"queueTimeoutSeconds"] respondsToSelector:@selector(doubleValue)]
+                                          ? [passwordHashing[@"queueTimeoutSeconds"] doubleValue]
+                                          : 0.25;
+    // Hashing callers run or wait on HTTP worker threads, so running plus
+    // queued hashes are held to half the workers and the rest keep serving
+    // other routes while logins pile up.
+    NSDictionary *runtimeLimits = ALNDictionaryConfigValue(_config, @"runtimeLimits");
+    NSUInteger httpWorkers = ALNUIntConfigValue(runtimeLimits[@"maxConcurrentHTTPWorkers"], 8, 1);
+    NSUInteger passwordHashWorkerShare = MAX((NSUInteger)1, httpWorkers / 2);
+    NSUInteger passwordHashConcurrent =
+        MIN(ALNUIntConfigValue(passwordHashing[@"maxConcurrent"], MAX((NSUInteger)1, passwordHashWorkerShare / 2), 1),
+            passwordHashWorkerShare);
+    NSUInteger passwordHashQueueDepth =
+        MIN(ALNUIntConfigValue(passwordHashing[@"maxQueueDepth"], passwordHashWorkerShare - passwordHashConcurrent, 0),
+            passwordHashWorkerShare - passwordHashConcurrent);
+    _passwordHashExecutor = [[ALNPasswordHashExecutor alloc]
+        initWithMaxConcurrent:passwordHashConcurrent
+                maxQueueDepth:passwordHashQueueDepth
+          queueTimeoutSeconds:passwordHashQueueTimeout
+              memoryBudgetKiB:ALNUIntConfigValue(passwordHashing[@"memoryBudgetMiB"], 128, 1) * 1024];
+    _passwordHashExecutor.metrics = _metrics;
     [self registerBuiltInMiddlewares];
     [self loadConfiguredStaticMounts];
     [self loadConfiguredPlugins];
@@ -2550,33 +2644,292 @@ static NSString *ALNOpenAPISwaggerDocsHTML(void) {
          "</body></html>";
 }
 
+// Literal names for the status codes responses usually carry, so counting a
+// response does not format a metric name.
+static NSString *ALNHTTPStatusMetricName(NSInteger statusCode) {
+  switch (statusCode) {
+  case 200:
+    return @"http_status_200_total";
+  case 201:
+    return @"http_status_201_total";
+  case 202:
+    return @"http_status_202_total";
+  case 204:
+    return @"http_status_204_total";
+  case 206:
+    return @"http_status_206_total";
+  case 301:
+    return @"http_status_301_total";
+  case 302:
+    return @"http_status_302_total";
+  case 303:
+    return @"http_status_303_total";
+  case 304:
+    return @"http_status_304_total";
+  case 307:
+    return @"http_status_307_total";
+  case 308:
+    return @"http_status_308_total";
+  case 400:
+    return @"http_status_400_total";
+  case 401:
+    return @"http_status_401_total";
+  case 403:
+    return @"http_status_403_total";
+  case 404:
+    return @"http_status_404_total";
+  case 405:
+    return @"http_status_405_total";
+  case 406:
+    return @"http_status_406_total";
+  case 409:
+    return @"http_status_409_total";
+  case 410:
+    return @"http_status_410_total";
+  case 412:
+    return @"http_status_412_total";
+  case 413:
+    return @"http_status_413_total";
+  case 415:
+    return @"http_status_415_total";
+  case 416:
+    return @"http_status_416_total";
+  case 422:
+    return @"http_status_422_total";
+  case 429:
+    return @"http_status_429_total";
+  case 500:
+    return @"http_status_500_total";
+  case 501:
+    return @"http_status_501_total";
+  case 502:
+    return @"http_status_502_total";
+  case 503:
+    return @"http_status_503_total";
+  case 504:
+    return @"http_status_504_total";
+  default:
+    return [NSString stringWithFormat:@"http_status_%ld_total", (long)statusCode];
+  }
+}
+
 static void ALNRecordRequestMetrics(ALNApplication *application,
                                     ALNResponse *response,
                                     ALNPerfTrace *trace) {
   if (!application.metricsEnabled) {
     return;
   }
-  [application.metrics incrementCounter:@"http_requests_total"];
-  [application.metrics incrementCounter:[NSString stringWithFormat:@"http_status_%ld_total", (long)response.statusCode]];
+  [application.requestsTotalCounter increment];
+  [application.metrics incrementCounter:ALNHTTPStatusMetricName(response.statusCode)];
   if (response.statusCode >= 500) {
-    [application.metrics incrementCounter:@"http_errors_total"];
+    [application.errorsTotalCounter increment];
+  }
+
+  NSArray *stageTimings = application.stageDurationTimings;
+  for (NSUInteger stage = 0; stage < ALNPerfStageCount && stage < [stageTimings count]; stage++) {
+    if ([trace hasDurationForStageID:(ALNPerfStage)stage]) {
+      [stageTimings[stage] recordMilliseconds:[trace durationMillisecondsForStageID:(ALNPerfStage)stage]];
+    }
+  }
+}
+
+typedef struct {
+  double renderMilliseconds;
+  unsigned long long bytes;
+} ALNStreamedBodyStats;
+
+static void ALNRecordSlowRequestWithStream(ALNApplication *application,
+                                           ALNRequest *request,
+                                           ALNResponse *response,
+                                           ALNPerfTrace *trace,
+                                           NSString *requestID,
+                                           NSString *routeName,
+                                           NSString *controllerName,
+                                           NSString *actionName,
+                                           const ALNStreamedBodyStats *streamed) {
+  ALNSlowRequestRecorder *recorder = application.slowRequestRecorder;
+  if (recorder == nil || ![trace isEnabled]) {
+    return;
+  }
+  double totalMs = [trace durationMillisecondsForStageID:ALNPerfStageTotal];
+  if (streamed != NULL) {
+    totalMs += streamed->renderMilliseconds;
+  }
+  if (![recorder shouldRecordDurationMilliseconds:totalMs]) {
+    return;
+  }
+
+  NSMutableDictionary *stages = [NSMutableDictionary dictionaryWithCapacity:ALNPerfStageCount];
+  for (NSUInteger stage = 0; stage < ALNPerfStageCount; stage++) {
+    if (stage != ALNPerfStageTotal && [trace hasDurationForStageID:(ALNPerfStage)stage]) {
+      stages[ALNPerfStageName((ALNPerfStage)stage)] =
+          @([trace durationMillisecondsForStageID:(ALNPerfStage)stage]);
+    }
+  }
+  unsigned long long responseBytes = [response bodyLength];
+  if (responseBytes == 0 && [response.fileBodyPath length] > 0) {
+    responseBytes = response.fileBodyLength;
+  }
+  if (streamed != NULL) {
+    stages[@"stream_render"] = @(streamed->renderMilliseconds);
+    responseBytes = streamed->bytes;
+  }
+  [recorder recordEntry:@{
+    @"timestamp" : @([[NSDate date] timeIntervalSince1970]),
+    @"request_id" : requestID ?: @"",
+    @"method" : request.method ?: @"",
+    @"path" : request.path ?: @"",
+    @"route" : routeName ?: @"",
+    @"controller" : controllerName ?: @"",
+    @"action" : actionName ?: @"",
+    @"status" : @(response.statusCode),
+    @"total_ms" : @(totalMs),
+    @"stages" : stages,
+    @"db_query_count" : @([trace databaseQueryCount]),
+    @"db_query_ms" : @([trace databaseQueryMilliseconds]),
+    @"response_bytes" : @(responseBytes),
+  }];
+}
+
+static void ALNRecordSlowRequest(ALNApplication *application,
+                                 ALNRequest *request,
+                                 ALNResponse *response,
+                                 ALNPerfTrace *trace,
+                                 NSString *requestID,
+                                 NSString *routeName,
+                                 NSString *controllerName,
+                                 NSString *actionName) {
+  ALNRecordSlowRequestWithStream(application,
+                                 request,
+                                 response,
+                                 trace,
+                                 requestID,
+                                 routeName,
+                                 controllerName,
+                                 actionName,
+                                 NULL);
+}
+
+// A streamed body renders after the trace has been finalized and the headers
+// (Server-Timing included) have gone out, so its render time cannot join the
+// `render` stage. It is timed here instead and reported when the stream ends:
+// as `http_stream_render_duration_ms`, and to the slow-request recorder, which
+// waits for the stream before judging the request.
+static void ALNTimeStreamedBody(ALNApplication *application,
+                                ALNRequest *request,
+                                ALNResponse *response,
+                                ALNPerfTrace *trace,
+                                NSString *requestID,
+                                NSString *routeName,
+                                NSString *controllerName,
+                                NSString *actionName) {
+  ALNResponseBodyStreamer streamer = response.bodyStreamer;
+  BOOL recordsSlowRequests = (application.slowRequestRecorder != nil && [trace isEnabled]);
+  if (streamer == nil || (!application.metricsEnabled && !recordsSlowRequests)) {
+    return;
+  }
+  response.bodyStreamer = ^BOOL(ALNResponseChunkWriter writeChunk) {
+    __block unsigned long long bytes = 0;
+    uint64_t startNanoseconds = ALNPerfMonotonicNanoseconds();
+    BOOL streamedOK = streamer(^BOOL(NSData *chunk) {
+      bytes += [chunk length];
+      return writeChunk(chunk);
+    });
+    uint64_t elapsed = ALNPerfMonotonicNanoseconds() - startNanoseconds;
+    ALNStreamedBodyStats streamed = {
+      .renderMilliseconds = (double)elapsed / 1000000.0,
+      .bytes = bytes,
+    };
+    if (application.metricsEnabled) {
+      [application.metrics recordTiming:@"http_stream_render_duration_ms"
+                           milliseconds:streamed.renderMilliseconds];
+    }
+    if (recordsSlowRequests) {
+      ALNRecordSlowRequestWithStream(application,
+                                     request,
+                                     response,
+                                     trace,
+                                     requestID,
+                                     routeName,
+                                     controllerName,
+                                     actionName,
+                                     &streamed);
+    }
+    return streamedOK;
+  };
+}
+
+static const NSUInteger ALNEOCRenderProfileHeaderLimit = 8;
+
+// Render profiles are opt-in (`eoc.renderProfiling`). The per-template
+// breakdown rides along with the other performance headers; the metrics
+// registry has no labels, so only request-wide totals are exported there.
+static void ALNApplyEOCRenderProfile(ALNApplication *application,
+                                     ALNResponse *response,
+                                     id profileValue,
+                                     BOOL performanceLogging) {
+  if (![profileValue isKindOfClass:[ALNEOCRenderProfile class]]) {
+    return;
+  }
+  ALNEOCRenderProfile *profile = profileValue;
+  NSUInteger renderCount = [profile renderCount];
+  if (renderCount == 0) {
+    return;
+  }
+  NSArray *entries = [profile entries];
+
+  if (performanceLogging) {
+    NSMutableArray *parts = [NSMutableArray array];
+    for (NSDictionary *entry in entries) {
+      if ([parts count] >= ALNEOCRenderProfileHeaderLimit) {
+        break;
+      }
+      [parts addObject:[NSString stringWithFormat:@"%@;n=%lu;ms=%.3f;self=%.3f;bytes=%lu",
+                                                  entry[@"path"],
+                                                  (unsigned long)[entry[@"count"] unsignedIntegerValue],
+                                                  [entry[@"inclusive_ms"] doubleValue],
+                                                  [entry[@"self_ms"] doubleValue],
+                                                  (unsigned long)[entry[@"bytes"] unsignedIntegerValue]]];
+    }
+    [response setHeader:@"X-Arlen-EOC-Render-Ms"
+                  value:[NSString stringWithFormat:@"%.3f", [profile totalSelfMilliseconds]]];
+    [response setHeader:@"X-Arlen-EOC-Profile" value:[parts componentsJoinedByString:@", "]];
   }
 
-  NSNumber *totalMs = [trace durationMillisecondsForStage:@"total"];
-  if (totalMs != nil) {
-    [application.metrics recordTiming:@"http_request_duration_ms"
-                         milliseconds:[totalMs doubleValue]];
+  if (!application.metricsEnabled) {
+    return;
   }
-  NSNumber *routeMs = [trace durationMillisecondsForStage:@"route"];
-  if (routeMs != nil) {
-    [application.metrics recordTiming:@"http_route_duration_ms"
-                         milliseconds:[routeMs doubleValue]];
+  ALNMetricsRegistry *metrics = application.metrics;
+  double totalBytes = 0.0;
+  for (NSDictionary *entry in entries) {
+    totalBytes += [entry[@"bytes"] doubleValue];
   }
-  NSNumber *controllerMs = [trace durationMillisecondsForStage:@"controller"];
-  if (controllerMs != nil) {
-    [application.metrics recordTiming:@"http_controller_duration_ms"
-                         milliseconds:[controllerMs doubleValue]];
+  [metrics incrementCounter:@"eoc_renders_total" by:(double)renderCount];
+  [metrics incrementCounter:@"eoc_render_bytes_total" by:totalBytes];
+  [metrics recordTiming:@"eoc_render_duration_ms" milliseconds:[profile totalSelfMilliseconds]];
+}
+
+// Streamed bodies render after the request's profile has been reported, so
+// the stream gets a profile of its own, recorded when the stream ends.
+static void ALNProfileStreamedBody(ALNApplication *application,
+                                   ALNResponse *response,
+                                   id profileValue) {
+  ALNResponseBodyStreamer streamer = response.bodyStreamer;
+  if (streamer == nil || ![profileValue isKindOfClass:[ALNEOCRenderProfile class]]) {
+    return;
   }
+  response.bodyStreamer = ^BOOL(ALNResponseChunkWriter writeChunk) {
+    ALNEOCRenderProfile *profile = [[ALNEOCRenderProfile alloc] init];
+    NSDictionary *profileToken = ALNEOCPushRenderProfile(profile);
+    BOOL streamed = NO;
+    @try {
+      streamed = streamer(writeChunk);
+    } @finally {
+      ALNEOCPopRenderProfile(profileToken);
+    }
+    ALNApplyEOCRenderProfile(application, nil, profile, NO);
+    return streamed;
+  };
 }
 
 static ALNPerfTrace *ALNDisabledPerfTrace(void) {
@@ -3269,6 +3622,27 @@ static BOOL ALNBuiltInEndpointPrefersJSON(ALNRequest *request) {
   return [format isEqualToString:@"json"];
 }
 
+// Weak comparison, as RFC 9110 requires for If-None-Match.
+static BOOL ALNIfNoneMatchIncludesETag(NSString *ifNoneMatch, NSString *etag) {
+  if ([ifNoneMatch length] == 0 || [etag length] == 0) {
+    return NO;
+  }
+  for (NSString *part in [ifNoneMatch componentsSeparatedByString:@","]) {
+    NSString *candidate =
+        [part stringByTrimmingCharactersInSet:[NSCharacterSet whitespaceAndNewlineCharacterSet]];
+    if ([candidate isEqualToString:@"*"]) {
+      return YES;
+    }
+    if ([candidate hasPrefix:@"W/"]) {
+      candidate = [candidate substringFromIndex:2];
+    }
+    if ([candidate isEqualToString:etag]) {
+      return YES;
+    }
+  }
+  return NO;
+}
+
 static BOOL ALNPathIsReservedOperabilityEndpoint(NSString *path) {
   NSString *candidate = path ?: @"";
   return [candidate isEqualToString:@"/healthz"] ||
@@ -3365,6 +3739,8 @@ static BOOL ALNApplyBuiltInResponse(ALNApplication *application,
 
   if ([routePath isEqualToString:@"/metrics"] || [requestPath isEqualToString:@"/metrics"]) {
     response.statusCode = 200;
+    [application.statementStats exportToMetricsRegistry:application.metrics
+                                                  limit:application.statementStatsMetricsLimit];
     if (ALNHeaderPrefersJSON(request)) {
       NSError *jsonError = nil;
       BOOL ok = [response setJSONBody:[application.metrics snapshot]
@@ -3401,17 +3777,22 @@ static BOOL ALNApplyBuiltInResponse(ALNApplication *application,
                      [requestPath isEqualToString:@"/.well-known/openapi.json"];
   if (openapiPath && ALNOpenAPIEnabled(application)) {
     NSError *jsonError = nil;
-    BOOL ok = [response setJSONBody:[application openAPISpecification]
-                            options:0
-                              error:&jsonError];
-    if (!ok) {
+    NSString *etag = nil;
+    NSData *document = [application openAPIDocumentDataWithETag:&etag error:&jsonError];
+    if (document == nil) {
       response.statusCode = 500;
       [response setHeader:@"Content-Type" value:@"text/plain; charset=utf-8"];
       [response setTextBody:@"openapi serialization failed\n"];
     } else {
-      response.statusCode = 200;
-      if (headRequest) {
-        [response setTextBody:@""];
+      [response setHeader:@"ETag" value:etag];
+      [response setHeader:@"Cache-Control" value:@"no-cache"];
+      if (ALNIfNoneMatchIncludesETag([request headerValueForName:@"if-none-match"], etag)) {
+        response.statusCode = 304;
+        [response clearBody];
+      } else {
+        response.statusCode = 200;
+        [response setDataBody:headRequest ? [NSData data] : document
+                  contentType:@"application/json; charset=utf-8"];
       }
     }
     response.committed = YES;
@@ -3621,10 +4002,17 @@ static BOOL ALNApplyRequestContractIfNeeded(ALNApplication *application,
   }
 
   NSArray *validationErrors = nil;
-  NSDictionary *coerced = ALNSchemaCoerceRequestValues(requestSchema,
-                                                       request,
-                                                       request.routeParams ?: @{},
-                                                       &validationErrors);
+  ALNCompiledSchema *compiledSchema = route.compiledRequestSchema;
+  NSDictionary *coerced =
+      (compiledSchema != nil)
+          ? ALNCompiledSchemaCoerceRequestValues(compiledSchema,
+                                                 request,
+                                                 request.routeParams ?: @{},
+                                                 &validationErrors)
+          : ALNSchemaCoerceRequestValues(requestSchema,
+                                         request,
+                                         request.routeParams ?: @{},
+                                         &validationErrors);
   if ([validationErrors count] > 0) {
     context.stash[ALNContextValidationErrorsStashKey] = validationErrors;
     ALNApplyValidationFailureResponse(application,
@@ -3960,7 +4348,12 @@ static BOOL ALNValidateResponseContractIfNeeded(ALNApplication *application,
   }
 
   NSArray *validationErrors = nil;
-  BOOL valid = ALNSchemaValidateResponseValue(payload, responseSchema, &validationErrors);
+  ALNCompiledSchema *compiledSchema = route.compiledResponseSchema;
+  BOOL valid = (compiledSchema != nil)
+                   ? ALNCompiledSchemaValidateResponseValue(payload,
+                                                            compiledSchema,
+                                                            &validationErrors)
+                   : ALNSchemaValidateResponseValue(payload, responseSchema, &validationErrors);
   if (!valid) {
     ALNApplyInternalErrorResponse(application,
                                   request,
@@ -3986,33 +4379,43 @@ static void ALNFinalizeResponse(ALNApplication *application,
                                 ALNRequestIdentity *requestIdentity,
                                 const ALNRequestTraceContext *traceContext,
                                 BOOL performanceLogging) {
-  if (performanceLogging && [trace isEnabled]) {
-    [trace setStage:@"parse" durationMilliseconds:request.parseDurationMilliseconds >= 0.0
-                                           ? request.parseDurationMilliseconds
-                                           : 0.0];
+  if ([trace isEnabled]) {
+    [trace setStageID:ALNPerfStageParse
+        durationMilliseconds:request.parseDurationMilliseconds >= 0.0
+                                 ? request.parseDurationMilliseconds
+                                 : 0.0];
 
-    NSNumber *writeStage = [trace durationMillisecondsForStage:@"response_write"];
-    if (writeStage == nil) {
+    if (![trace hasDurationForStageID:ALNPerfStageResponseWrite]) {
       double writeMs = request.responseWriteDurationMilliseconds;
       if (writeMs < 0.0) {
         writeMs = 0.0;
       }
-      [trace setStage:@"response_write" durationMilliseconds:writeMs];
+      [trace setStageID:ALNPerfStageResponseWrite durationMilliseconds:writeMs];
     }
 
-    [trace endStage:@"total"];
-    NSNumber *total = [trace durationMillisecondsForStage:@"total"] ?: @(0);
-    NSNumber *parse = [trace durationMillisecondsForStage:@"parse"] ?: @(0);
-    NSNumber *responseWrite = [trace durationMillisecondsForStage:@"response_write"] ?: @(0);
+    [trace endStageID:ALNPerfStageTotal];
+  }
+
+  if (performanceLogging && [trace isEnabled]) {
+    double total = [trace durationMillisecondsForStageID:ALNPerfStageTotal];
+    double parse = [trace durationMillisecondsForStageID:ALNPerfStageParse];
+    double responseWrite = [trace durationMillisecondsForStageID:ALNPerfStageResponseWrite];
 
     [response setHeader:@"X-Arlen-Total-Ms"
-                  value:[NSString stringWithFormat:@"%.3f", [total doubleValue]]];
+                  value:[NSString stringWithFormat:@"%.3f", total]];
     [response setHeader:@"X-Mojo-Total-Ms"
-                  value:[NSString stringWithFormat:@"%.3f", [total doubleValue]]];
+                  value:[NSString stringWithFormat:@"%.3f", total]];
     [response setHeader:@"X-Arlen-Parse-Ms"
-                  value:[NSString stringWithFormat:@"%.3f", [parse doubleValue]]];
+                  value:[NSString stringWithFormat:@"%.3f", parse]];
     [response setHeader:@"X-Arlen-Response-Write-Ms"
-                  value:[NSString stringWithFormat:@"%.3f", [responseWrite doubleValue]]];
+                  value:[NSString stringWithFormat:@"%.3f", responseWrite]];
+  }
+
+  if (application.serverTimingEnabled && [trace isEnabled]) {
+    NSString *serverTiming = [trace serverTimingHeaderValue];
+    if ([serverTiming length] > 0) {
+      [response setHeader:@"Server-Timing" value:serverTiming];
+    }
   }
 
   if (application.responseIdentityHeadersEnabled) {
@@ -4275,7 +4678,10 @@ static void ALNFinalizeResponse(ALNApplication *application,
   route.compiledFastActionIMP = NULL;
   route.compiledActionReturnKind = ALNRouteInvocationReturnKindUnknown;
   route.compiledGuardReturnKind = ALNRouteInvocationReturnKindUnknown;
+  route.compiledRequestSchema = nil;
+  route.compiledResponseSchema = nil;
   route.compiledInvocationMetadata = NO;
+  [self invalidateOpenAPIDocument];
   return YES;
 }
 
@@ -4300,6 +4706,7 @@ static void ALNFinalizeResponse(ALNApplication *application,
   route.minimumAuthAssuranceLevel = minimumAuthAssuranceLevel;
   route.maximumAuthenticationAgeSeconds = maximumAuthenticationAgeSeconds;
   route.stepUpPath = [stepUpPath isKindOfClass:[NSString class]] ? [stepUpPath copy] : @"";
+  [self invalidateOpenAPIDocument];
   return YES;
 }
 
@@ -4319,6 +4726,7 @@ static void ALNFinalizeResponse(ALNApplication *application,
     return NO;
   }
   route.policyNames = ALNNormalizedUniqueStrings(policies);
+  [self invalidateOpenAPIDocument];
   return YES;
 }
 
@@ -4472,6 +4880,8 @@ static void ALNFinalizeResponse(ALNApplication *application,
   route.compiledFastActionIMP = NULL;
   route.compiledActionReturnKind = ALNRouteInvocationReturnKindUnknown;
   route.compiledGuardReturnKind = ALNRouteInvocationReturnKindUnknown;
+  route.compiledRequestSchema = nil;
+  route.compiledResponseSchema = nil;
   route.compiledInvocationMetadata = NO;
 
   if (route.controllerClass == Nil) {
@@ -4637,6 +5047,13 @@ static void ALNFinalizeResponse(ALNApplication *application,
   route.compiledFastActionIMP = fastActionIMP;
   route.compiledActionReturnKind = actionReturnKind;
   route.compiledGuardReturnKind = guardReturnKind;
+  route.compiledRequestSchema = ([route.requestSchema count] > 0)
+                                    ? [[ALNCompiledSchema alloc] initWithSchema:route.requestSchema]
+                                    : nil;
+  route.compiledResponseSchema =
+      ([route.responseSchema count] > 0)
+          ? [[ALNCompiledSchema alloc] initWithSchema:route.responseSchema]
+          : nil;
   route.compiledInvocationMetadata = YES;
   return YES;
 }
@@ -4663,8 +5080,59 @@ static void ALNFinalizeResponse(ALNApplication *application,
   return YES;
 }
 
+- (void)invalidateOpenAPIDocument {
+  [self.openAPIDocumentLock lock];
+  self.routeMetadataGeneration += 1;
+  [self.openAPIDocumentLock unlock];
+}
+
+// Caller holds openAPIDocumentLock.
+- (BOOL)openAPIDocumentIsCurrentLocked {
+  return self.openAPIDocumentSpecification != nil &&
+         self.openAPIDocumentRouterGeneration == self.router.generation &&
+         self.openAPIDocumentMetadataGeneration == self.routeMetadataGeneration;
+}
+
 - (NSDictionary *)openAPISpecification {
-  return ALNBuildOpenAPISpecification([self.router allRoutes], self.config ?: @{});
+  [self.openAPIDocumentLock lock];
+  if (![self openAPIDocumentIsCurrentLocked]) {
+    self.openAPIDocumentSpecification =
+        ALNBuildOpenAPISpecification([self.router allRoutes], self.config ?: @{});
+    self.openAPIDocumentData = nil;
+    self.openAPIDocumentETag = nil;
+    self.openAPIDocumentRouterGeneration = self.router.generation;
+    self.openAPIDocumentMetadataGeneration = self.routeMetadataGeneration;
+  }
+  NSDictionary *specification = self.openAPIDocumentSpecification;
+  [self.openAPIDocumentLock unlock];
+  return specification;
+}
+
+- (NSData *)openAPIDocumentDataWithETag:(NSString **)etag error:(NSError **)error {
+  NSDictionary *specification = [self openAPISpecification];
+  [self.openAPIDocumentLock lock];
+  NSData *data = nil;
+  NSString *documentETag = nil;
+  if (self.openAPIDocumentSpecification == specification && self.openAPIDocumentData != nil) {
+    data = self.openAPIDocumentData;
+    documentETag = self.openAPIDocumentETag;
+  } else {
+    data = [ALNJSONSerialization dataWithJSONObject:specification options:0 error:error];
+    if (data != nil) {
+      NSString *digest = ALNLowercaseHexStringFromData(ALNSHA256(data) ?: [NSData data]) ?: @"";
+      documentETag = [NSString stringWithFormat:@"\"%@\"",
+                                                [digest substringToIndex:MIN((NSUInteger)32, [digest length])]];
+      if (self.openAPIDocumentSpecification == specification) {
+        self.openAPIDocumentData = data;
+        self.openAPIDocumentETag = documentETag;
+      }
+    }
+  }
+  [self.openAPIDocumentLock unlock];
+  if (data != nil && etag != NULL) {
+    *etag = documentETag;
+  }
+  return data;
 }
 
 - (BOOL)writeOpenAPISpecToPath:(NSString *)path
@@ -4681,10 +5149,10 @@ static void ALNFinalizeResponse(ALNApplication *application,
     return NO;
   }
 
-  NSJSONWritingOptions options = pretty ? NSJSONWritingPrettyPrinted : 0;
-  NSData *json = [ALNJSONSerialization dataWithJSONObject:[self openAPISpecification]
-                                                  options:options
-                                                    error:error];
+  NSData *json = pretty ? [ALNJSONSerialization dataWithJSONObject:[self openAPISpecification]
+                                                           options:NSJSONWritingPrettyPrinted
+                                                             error:error]
+                       : [self openAPIDocumentDataWithETag:NULL error:error];
   if (json == nil) {
     return NO;
   }
@@ -4737,6 +5205,11 @@ static void ALNFinalizeResponse(ALNApplication *application,
       return NO;
     }
   }
+  if (ALNOpenAPIEnabled(self)) {
+    // Build and serialize the document now so the first /openapi.json
+    // request does not pay for it.
+    (void)[self openAPIDocumentDataWithETag:NULL error:NULL];
+  }
 
   for (NSDictionary *entry in self.mutableMounts) {
     ALNApplication *mounted =
@@ -4822,6 +5295,59 @@ static void ALNFinalizeResponse(ALNApplication *application,
   }
 }
 
+- (id<ALNRateLimitStore>)rateLimitStoreForConfig:(NSDictionary *)rateLimit {
+  NSString *backend = [ALNStringConfigValue(rateLimit[@"backend"], @"auto") lowercaseString];
+  NSString *sharedPath = ALNTrimmedStringConfigValue(rateLimit[@"sharedMemoryPath"]);
+  NSUInteger slots = ALNUIntConfigValue(rateLimit[@"sharedMemorySlots"], 65536, 1);
+  if ([backend isEqualToString:@"auto"]) {
+    backend = ([sharedPath length] > 0) ? @"shared" : @"memory";
+  }
+
+  NSError *storeError = nil;
+  if ([backend isEqualToString:@"redis"]) {
+    NSString *redisURL = ALNTrimmedStringConfigValue(rateLimit[@"redisURL"]);
+    ALNRedisCacheAdapter *adapter =
+        ([redisURL length] > 0)
+            ? [[ALNRedisCacheAdapter alloc] initWithURLString:redisURL
+                                                    namespace:nil
+                                                  adapterName:@"rate_limit_redis"
+                                                        error:&storeError]
+            : nil;
+    if (adapter != nil) {
+      NSString *namespacePrefix =
+          ALNStringConfigValue(rateLimit[@"redisNamespace"], @"arlen:ratelimit");
+      return [[ALNRedisRateLimitStore alloc] initWithRedisAdapter:adapter
+                                                         namespace:namespacePrefix];
+    }
+  } else if ([backend isEqualToString:@"shared"]) {
+    ALNSharedMemoryRateLimitStore *store =
+        ([sharedPath length] > 0)
+            ? [[ALNSharedMemoryRateLimitStore alloc] initWithPath:sharedPath
+                                                        slotCount:slots
+                                                            error:&storeError]
+            : nil;
+    if (store != nil) {
+      return store;
+    }
+  } else if (![backend isEqualToString:@"memory"]) {
+    storeError = [NSError errorWithDomain:ALNRateLimitStoreErrorDomain
+                                     code:20
+                                 userInfo:@{
+                                   NSLocalizedDescriptionKey : @"unknown rateLimit.backend"
+                                 }];
+  }
+
+  if ([backend isEqualToString:@"memory"] && storeError == nil) {
+    return [[ALNSharedMemoryRateLimitStore alloc] initWithPath:nil slotCount:slots error:NULL];
+  }
+  [self.logger warn:@"rate limit backend unavailable; using per-process limits"
+             fields:@{
+               @"backend" : backend ?: @"",
+               @"error" : storeError.localizedDescription ?: @"missing backend settings",
+             }];
+  return [[ALNSharedMemoryRateLimitStore alloc] initWithPath:nil slotCount:slots error:NULL];
+}
+
 - (void)registerBuiltInMiddlewares {
   NSDictionary *securityHeaders = ALNDictionaryConfigValue(self.config, @"securityHeaders");
   BOOL securityHeadersEnabled = ALNBoolConfigValue(securityHeaders[@"enabled"], YES);
@@ -4836,8 +5362,10 @@ static void ALNFinalizeResponse(ALNApplication *application,
   if (rateLimitEnabled) {
     NSUInteger requests = ALNUIntConfigValue(rateLimit[@"requests"], 120, 1);
     NSUInteger windowSeconds = ALNUIntConfigValue(rateLimit[@"windowSeconds"], 60, 1);
+    id<ALNRateLimitStore> store = [self rateLimitStoreForConfig:rateLimit];
     [self addMiddleware:[[ALNRateLimitMiddleware alloc] initWithMaxRequests:requests
-                                                               windowSeconds:windowSeconds]];
+                                                               windowSeconds:windowSeconds
+                                                                       store:store]];
   }
 
   NSDictionary *session = ALNDictionaryConfigValue(self.config, @"session");
@@ -4861,16 +5389,18 @@ static void ALNFinalizeResponse(ALNApplication *application,
       BOOL secureDefault = [self.environment isEqualToString:@"production"];
       BOOL secure = ALNBoolConfigValue(session[@"secure"], secureDefault);
       NSString *sameSite = ALNStringConfigValue(session[@"sameSite"], @"Lax");
+      NSUInteger tokenCacheSize = ALNUIntConfigValue(session[@"tokenCacheSize"], 1024, 0);
       [self addMiddleware:[[ALNSessionMiddleware alloc] initWithSecret:secret
                                                              cookieName:cookieName
                                                           maxAgeSeconds:maxAge
                                                                  secure:secure
-                                                               sameSite:sameSite]];
+                                                               sameSite:sameSite
+                                                     tokenCacheCapacity:tokenCacheSize]];
       sessionMiddlewareActive = YES;
     }
   }
 
-  [self addMiddleware:[[ALNRoutePolicyMiddleware alloc] init]];
+  [self addMiddleware:[[ALNRoutePolicyMiddleware alloc] initWithConfig:self.config]];
 
   NSDictionary *csrf = ALNDictionaryConfigValue(self.config, @"csrf");
   BOOL csrfEnabled = ALNBoolConfigValue(csrf[@"enabled"], sessionEnabled);
@@ -4954,13 +5484,18 @@ static void ALNFinalizeResponse(ALNApplication *application,
   ALNRequestTraceContext traceContext =
       ALNBuildRequestTraceContext(request, self.tracePropagationEnabled);
   BOOL apiOnly = self.apiOnly;
+  // Stage timing is cheap enough to run whenever anything consumes it:
+  // performance headers/logs, Server-Timing, the stage histograms, the
+  // slow-request recorder, or per-route SQL statement stats.
+  BOOL traceEnabled = performanceLogging || metricsEnabled || self.serverTimingEnabled ||
+                      self.slowRequestRecorder != nil || self.statementStats != nil;
   ALNPerfTrace *trace =
-      performanceLogging ? [[ALNPerfTrace alloc] initWithEnabled:YES] : ALNDisabledPerfTrace();
-  if (performanceLogging) {
-    [trace startStage:@"total"];
-  }
+      traceEnabled ? [[ALNPerfTrace alloc] initWithEnabled:YES] : ALNDisabledPerfTrace();
+  [trace startStageID:ALNPerfStageTotal];
+  ALNPerfTrace *previousTrace = [ALNPerfTrace currentTrace];
+  [ALNPerfTrace setCurrentTrace:traceEnabled ? trace : nil];
   if (metricsEnabled) {
-    [self.metrics addGauge:@"http_requests_active" delta:1.0];
+    [self.requestsActiveGauge addDelta:1.0];
   }
 
   NSString *routePath = request.path ?: @"/";
@@ -5005,8 +5540,17 @@ static void ALNFinalizeResponse(ALNApplication *application,
                         &traceContext,
                         performanceLogging);
     ALNRecordRequestMetrics(self, response, trace);
+    ALNRecordSlowRequest(self,
+                         request,
+                         response,
+                         trace,
+                         ALNResolvedRequestID(requestIdentity),
+                         reservedBuiltInPath,
+                         @"",
+                         @"");
+    [ALNPerfTrace setCurrentTrace:previousTrace];
     if (metricsEnabled) {
-      [self.metrics addGauge:@"http_requests_active" delta:-1.0];
+      [self.requestsActiveGauge addDelta:-1.0];
     }
 
     if (self.traceExporter != nil) {
@@ -5053,9 +5597,7 @@ static void ALNFinalizeResponse(ALNApplication *application,
     return response;
   }
 
-  if (performanceLogging) {
-    [trace startStage:@"route"];
-  }
+  [trace startStageID:ALNPerfStageRoute];
   double benchmarkRouteStageStartMs = ALNWallClockMilliseconds();
   NSString *retryStrippedPath = nil;
   NSString *retryPathFormat = nil;
@@ -5078,9 +5620,7 @@ static void ALNFinalizeResponse(ALNApplication *application,
       }
     }
   }
-  if (performanceLogging) {
-    [trace endStage:@"route"];
-  }
+  [trace endStageID:ALNPerfStageRoute];
   double benchmarkRouteStageDurationMs = ALNWallClockMilliseconds() - benchmarkRouteStageStartMs;
 
   if (matchedRoute == nil) {
@@ -5118,8 +5658,17 @@ static void ALNFinalizeResponse(ALNApplication *application,
                         &traceContext,
                         performanceLogging);
     ALNRecordRequestMetrics(self, response, trace);
+    ALNRecordSlowRequest(self,
+                         request,
+                         response,
+                         trace,
+                         ALNResolvedRequestID(requestIdentity),
+                         @"",
+                         @"",
+                         @"");
+    [ALNPerfTrace setCurrentTrace:previousTrace];
     if (metricsEnabled) {
-      [self.metrics addGauge:@"http_requests_active" delta:-1.0];
+      [self.requestsActiveGauge addDelta:-1.0];
     }
 
     if (self.traceExporter != nil) {
@@ -5184,6 +5733,9 @@ static void ALNFinalizeResponse(ALNApplication *application,
   BOOL prefersJSON = [requestFormat isEqualToString:@"json"];
   request.routeParams = matchedParams ?: @{};
   NSString *resolvedRouteName = matchedRoute.name ?: @"";
+  if (traceEnabled) {
+    trace.routeName = resolvedRouteName;
+  }
   NSString *resolvedControllerName = NSStringFromClass(matchedRoute.controllerClass) ?: @"";
   NSString *resolvedActionName = matchedRoute.actionName ?: @"";
 
@@ -5218,7 +5770,7 @@ static void ALNFinalizeResponse(ALNApplication *application,
     double benchmarkControllerStageStartMs = ALNWallClockMilliseconds();
     double benchmarkControllerStageDurationMs = 0.0;
     BOOL benchmarkDispatchHeadersEnabled = ALNBenchmarkDispatchHeadersEnabledForRoute(matchedRoute);
-    [trace startStage:@"controller"];
+    [trace startStageID:ALNPerfStageController];
     @try {
       fastHandled = ALNInvokeCompiledFastRouteAction(matchedRoute, request, response, request.routeParams);
       benchmarkControllerStageDurationMs =
@@ -5269,7 +5821,7 @@ static void ALNFinalizeResponse(ALNApplication *application,
       [self.logger error:@"controller exception" fields:logFields];
       fastHandled = YES;
     }
-    [trace endStage:@"controller"];
+    [trace endStageID:ALNPerfStageController];
 
     if (fastHandled) {
       ALNFinalizeResponse(self,
@@ -5280,8 +5832,17 @@ static void ALNFinalizeResponse(ALNApplication *application,
                           &traceContext,
                           performanceLogging);
       ALNRecordRequestMetrics(self, response, trace);
+      ALNRecordSlowRequest(self,
+                           request,
+                           response,
+                           trace,
+                           ALNResolvedRequestID(requestIdentity),
+                           resolvedRouteName,
+                           resolvedControllerName,
+                           resolvedActionName);
+      [ALNPerfTrace setCurrentTrace:previousTrace];
       if (metricsEnabled) {
-        [self.metrics addGauge:@"http_requests_active" delta:-1.0];
+        [self.requestsActiveGauge addDelta:-1.0];
       }
 
       if (self.traceExporter != nil) {
@@ -5373,6 +5934,9 @@ static void ALNFinalizeResponse(ALNApplication *application,
       self.i18nFallbackLocale ?: self.i18nDefaultLocale ?: @"en";
   baseStash[ALNContextEOCStrictLocalsStashKey] = @(self.eocStrictLocalsEnabled);
   baseStash[ALNContextEOCStrictStringifyStashKey] = @(self.eocStrictStringifyEnabled);
+  if (self.eocRenderProfilingEnabled) {
+    baseStash[ALNContextEOCRenderProfileStashKey] = [[ALNEOCRenderProfile alloc] init];
+  }
   baseStash[ALNContextPageStateEnabledStashKey] = @(self.pageStateEnabled);
   baseStash[ALNContextRoutePolicyNamesStashKey] = matchedRoute.policyNames ?: @[];
   NSMutableDictionary *stash =
@@ -5398,7 +5962,7 @@ static void ALNFinalizeResponse(ALNApplication *application,
   NSMutableArray *executedMiddlewares = nil;
   if (shouldDispatchController && [self.mutableMiddlewares count] > 0) {
     executedMiddlewares = [NSMutableArray arrayWithCapacity:[self.mutableMiddlewares count]];
-    [trace startStage:@"middleware"];
+    [trace startStageID:ALNPerfStageMiddleware];
     for (id<ALNMiddleware> middleware in self.mutableMiddlewares) {
       NSError *middlewareError = nil;
       BOOL shouldContinue = [middleware processContext:context error:&middlewareError];
@@ -5436,7 +6000,7 @@ static void ALNFinalizeResponse(ALNApplication *application,
         break;
       }
     }
-    [trace endStage:@"middleware"];
+    [trace endStageID:ALNPerfStageMiddleware];
   }
 
   if (shouldDispatchController && !response.committed) {
@@ -5450,7 +6014,7 @@ static void ALNFinalizeResponse(ALNApplication *application,
   }
 
   if (shouldDispatchController) {
-    [trace startStage:@"controller"];
+    [trace startStageID:ALNPerfStageController];
     @try {
       id controller = [[matchedRoute.controllerClass alloc] init];
       if ([controller isKindOfClass:[ALNController class]]) {
@@ -5549,7 +6113,7 @@ static void ALNFinalizeResponse(ALNApplication *application,
       }
       [self.logger error:@"controller exception" fields:logFields];
     }
-    [trace endStage:@"controller"];
+    [trace endStageID:ALNPerfStageController];
   }
 
   if (!response.committed) {
@@ -5562,7 +6126,9 @@ static void ALNFinalizeResponse(ALNApplication *application,
       }
 
       NSError *jsonError = nil;
+      [trace startStageID:ALNPerfStageSerialize];
       BOOL ok = [response setJSONBody:returnValue options:options error:&jsonError];
+      [trace endStageID:ALNPerfStageSerialize];
       if (!ok) {
         NSDictionary *details = ALNErrorDetailsFromNSError(jsonError);
         ALNApplyInternalErrorResponse(self,
@@ -5654,9 +6220,34 @@ static void ALNFinalizeResponse(ALNApplication *application,
                       requestIdentity,
                       &traceContext,
                       performanceLogging);
+  ALNApplyEOCRenderProfile(self,
+                           response,
+                           context.stash[ALNContextEOCRenderProfileStashKey],
+                           performanceLogging);
+  ALNProfileStreamedBody(self, response, context.stash[ALNContextEOCRenderProfileStashKey]);
   ALNRecordRequestMetrics(self, response, trace);
+  if (response.bodyStreamer != nil) {
+    ALNTimeStreamedBody(self,
+                        request,
+                        response,
+                        trace,
+                        ALNResolvedRequestID(requestIdentity),
+                        resolvedRouteName,
+                        resolvedControllerName,
+                        resolvedActionName);
+  } else {
+    ALNRecordSlowRequest(self,
+                         request,
+                         response,
+                         trace,
+                         ALNResolvedRequestID(requestIdentity),
+                         resolvedRouteName,
+                         resolvedControllerName,
+                         resolvedActionName);
+  }
+  [ALNPerfTrace setCurrentTrace:previousTrace];
   if (metricsEnabled) {
-    [self.metrics addGauge:@"http_requests_active" delta:-1.0];
+    [self.requestsActiveGauge addDelta:-1.0];
   }
 
   if (self.traceExporter != nil) {
@@ -428,6 +428,12 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
                         "MOJOOBJC_READINESS_REQUIRES_CLUSTER_QUORUM");
   NSString *metricsEnabled =
       ALNEnvValueCompat("ARLEN_METRICS_ENABLED", "MOJOOBJC_METRICS_ENABLED");
+  NSString *serverTimingEnabled =
+      ALNEnvValueCompat("ARLEN_SERVER_TIMING_ENABLED", "MOJOOBJC_SERVER_TIMING_ENABLED");
+  NSString *slowRequestThresholdMs =
+      ALNEnvValueCompat("ARLEN_SLOW_REQUEST_THRESHOLD_MS", "MOJOOBJC_SLOW_REQUEST_THRESHOLD_MS");
+  NSString *statementStatsEnabled =
+      ALNEnvValueCompat("ARLEN_STATEMENT_STATS_ENABLED", "MOJOOBJC_STATEMENT_STATS_ENABLED");
   NSString *serveStatic = ALNEnvValueCompat("ARLEN_SERVE_STATIC", "MOJOOBJC_SERVE_STATIC");
   NSString *staticAllowExtensions =
       ALNEnvValueCompat("ARLEN_STATIC_ALLOW_EXTENSIONS", "MOJOOBJC_STATIC_ALLOW_EXTENSIONS");
@@ -517,6 +523,16 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
       ALNEnvValueCompat("ARLEN_RATE_LIMIT_REQUESTS", "MOJOOBJC_RATE_LIMIT_REQUESTS");
   NSString *rateLimitWindowSeconds =
       ALNEnvValueCompat("ARLEN_RATE_LIMIT_WINDOW_SECONDS", "MOJOOBJC_RATE_LIMIT_WINDOW_SECONDS");
+  NSString *passwordHashMaxConcurrent = ALNEnvValueCompat("ARLEN_PASSWORD_HASH_MAX_CONCURRENT",
+                                                         "MOJOOBJC_PASSWORD_HASH_MAX_CONCURRENT");
+  NSString *passwordHashMaxQueueDepth = ALNEnvValueCompat("ARLEN_PASSWORD_HASH_MAX_QUEUE_DEPTH",
+                                                         "MOJOOBJC_PASSWORD_HASH_MAX_QUEUE_DEPTH");
+  NSString *rateLimitBackend =
+      ALNEnvValueCompat("ARLEN_RATE_LIMIT_BACKEND", "MOJOOBJC_RATE_LIMIT_BACKEND");
+  NSString *rateLimitSharedPath =
+      ALNEnvValueCompat("ARLEN_RATE_LIMIT_SHARED_PATH", "MOJOOBJC_RATE_LIMIT_SHARED_PATH");
+  NSString *rateLimitRedisURL =
+      ALNEnvValueCompat("ARLEN_RATE_LIMIT_REDIS_URL", "MOJOOBJC_RATE_LIMIT_REDIS_URL");
 
   NSString *securityHeadersEnabled =
       ALNEnvValueCompat("ARLEN_SECURITY_HEADERS_ENABLED", "MOJOOBJC_SECURITY_HEADERS_ENABLED");
@@ -564,6 +580,8 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
       ALNEnvValueCompat("ARLEN_EOC_STRICT_LOCALS", "MOJOOBJC_EOC_STRICT_LOCALS");
   NSString *eocStrictStringify =
       ALNEnvValueCompat("ARLEN_EOC_STRICT_STRINGIFY", "MOJOOBJC_EOC_STRICT_STRINGIFY");
+  NSString *eocRenderProfiling =
+      ALNEnvValueCompat("ARLEN_EOC_RENDER_PROFILING", "MOJOOBJC_EOC_RENDER_PROFILING");
   NSString *routingCompileOnStart =
       ALNEnvValueCompat("ARLEN_ROUTING_COMPILE_ON_START",
                         "MOJOOBJC_ROUTING_COMPILE_ON_START");
@@ -745,8 +763,23 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
   }
   ALNApplyIntegerOverride(rateLimit, rateLimitRequests, @"requests", 1);
   ALNApplyIntegerOverride(rateLimit, rateLimitWindowSeconds, @"windowSeconds", 1);
+  if ([rateLimitBackend length] > 0) {
+    rateLimit[@"backend"] = rateLimitBackend;
+  }
+  if ([rateLimitSharedPath length] > 0) {
+    rateLimit[@"sharedMemoryPath"] = rateLimitSharedPath;
+  }
+  if ([rateLimitRedisURL length] > 0) {
+    rateLimit[@"redisURL"] = rateLimitRedisURL;
+  }
   config[@"rateLimit"] = rateLimit;
 
+  NSMutableDictionary *passwordHashing =
+      [NSMutableDictionary dictionaryWithDictionary:config[@"passwordHashing"] ?: @{}];
+  ALNApplyIntegerOverride(passwordHashing, passwordHashMaxConcurrent, @"maxConcurrent", 1);
+  ALNApplyIntegerOverride(passwordHashing, passwordHashMaxQueueDepth, @"maxQueueDepth", 0);
+  config[@"passwordHashing"] = passwordHashing;
+
   NSMutableDictionary *securityHeaders =
       [NSMutableDictionary dictionaryWithDictionary:config[@"securityHeaders"] ?: @{}];
   NSNumber *securityHeadersEnabledValue = ALNParseBooleanString(securityHeadersEnabled);
@@ -862,6 +895,27 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
   if (metricsEnabledValue != nil) {
     observability[@"metricsEnabled"] = metricsEnabledValue;
   }
+  NSNumber *serverTimingEnabledValue = ALNParseBooleanString(serverTimingEnabled);
+  if (serverTimingEnabledValue != nil) {
+    observability[@"serverTimingEnabled"] = serverTimingEnabledValue;
+  }
+  if ([slowRequestThresholdMs length] > 0) {
+    NSMutableDictionary *slowRequests = [NSMutableDictionary
+        dictionaryWithDictionary:[observability[@"slowRequests"] isKindOfClass:[NSDictionary class]]
+                                     ? observability[@"slowRequests"]
+                                     : @{}];
+    ALNApplyIntegerOverride(slowRequests, slowRequestThresholdMs, @"thresholdMs", 0);
+    observability[@"slowRequests"] = slowRequests;
+  }
+  NSNumber *statementStatsEnabledValue = ALNParseBooleanString(statementStatsEnabled);
+  if (statementStatsEnabledValue != nil) {
+    NSMutableDictionary *statementStats = [NSMutableDictionary
+        dictionaryWithDictionary:[observability[@"statementStats"] isKindOfClass:[NSDictionary class]]
+                                     ? observability[@"statementStats"]
+                                     : @{}];
+    statementStats[@"enabled"] = statementStatsEnabledValue;
+    observability[@"statementStats"] = statementStats;
+  }
   config[@"observability"] = observability;
 
   NSMutableDictionary *cluster =
@@ -894,6 +948,10 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
   if (eocStrictStringifyValue != nil) {
     eoc[@"strictStringify"] = eocStrictStringifyValue;
   }
+  NSNumber *eocRenderProfilingValue = ALNParseBooleanString(eocRenderProfiling);
+  if (eocRenderProfilingValue != nil) {
+    eoc[@"renderProfiling"] = eocRenderProfilingValue;
+  }
   config[@"eoc"] = eoc;
 
   NSMutableDictionary *routing =
@@ -1098,6 +1156,9 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
   if (finalSession[@"sameSite"] == nil) {
     finalSession[@"sameSite"] = @"Lax";
   }
+  if (finalSession[@"tokenCacheSize"] == nil) {
+    finalSession[@"tokenCacheSize"] = @(1024);
+  }
   config[@"session"] = finalSession;
 
   NSMutableDictionary *finalCSRF =
@@ -1127,8 +1188,30 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
   if (finalRateLimit[@"windowSeconds"] == nil) {
     finalRateLimit[@"windowSeconds"] = @(60);
   }
+  if (![finalRateLimit[@"backend"] isKindOfClass:[NSString class]] ||
+      [finalRateLimit[@"backend"] length] == 0) {
+    finalRateLimit[@"backend"] = @"auto";
+  }
+  if (finalRateLimit[@"sharedMemorySlots"] == nil) {
+    finalRateLimit[@"sharedMemorySlots"] = @(65536);
+  }
+  if (finalRateLimit[@"redisNamespace"] == nil) {
+    finalRateLimit[@"redisNamespace"] = @"arlen:ratelimit";
+  }
   config[@"rateLimit"] = finalRateLimit;
 
+  NSMutableDictionary *finalPasswordHashing =
+      [NSMutableDictionary dictionaryWithDictionary:config[@"passwordHashing"] ?: @{}];
+  // maxConcurrent and maxQueueDepth default from runtimeLimits when the
+  // application builds its executor.
+  if (finalPasswordHashing[@"queueTimeoutSeconds"] == nil) {
+    finalPasswordHashing[@"queueTimeoutSeconds"] = @(0.25);
+  }
+  if (finalPasswordHashing[@"memoryBudgetMiB"] == nil) {
+    finalPasswordHashing[@"memoryBudgetMiB"] = @(128);
+  }
+  config[@"passwordHashing"] = finalPasswordHashing;
+
   NSMutableDictionary *finalSecurityHeaders =
       [NSMutableDictionary dictionaryWithDictionary:config[@"securityHeaders"] ?: @{}];
   if (finalSecurityHeaders[@"enabled"] == nil) {
@@ -1215,6 +1298,9 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
   if (finalEOC[@"strictStringify"] == nil) {
     finalEOC[@"strictStringify"] = @(NO);
   }
+  if (finalEOC[@"renderProfiling"] == nil) {
+    finalEOC[@"renderProfiling"] = @(NO);
+  }
   config[@"eoc"] = finalEOC;
 
   NSMutableDictionary *finalRouting =
@@ -1261,6 +1347,53 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
   if (finalObservability[@"metricsEnabled"] == nil) {
     finalObservability[@"metricsEnabled"] = @(YES);
   }
+  if (finalObservability[@"serverTimingEnabled"] == nil) {
+    finalObservability[@"serverTimingEnabled"] = @(NO);
+  }
+  NSMutableDictionary *finalMetricsHistogram = [NSMutableDictionary
+      dictionaryWithDictionary:[finalObservability[@"metricsHistogram"] isKindOfClass:[NSDictionary class]]
+                                   ? finalObservability[@"metricsHistogram"]
+                                   : @{}];
+  if (finalMetricsHistogram[@"minimumMs"] == nil) {
+    finalMetricsHistogram[@"minimumMs"] = @(0.1);
+  }
+  if (finalMetricsHistogram[@"maximumMs"] == nil) {
+    finalMetricsHistogram[@"maximumMs"] = @(60000);
+  }
+  if (finalMetricsHistogram[@"subBucketsPerDecade"] == nil) {
+    finalMetricsHistogram[@"subBucketsPerDecade"] = @(9);
+  }
+  finalObservability[@"metricsHistogram"] = finalMetricsHistogram;
+  NSMutableDictionary *finalSlowRequests = [NSMutableDictionary
+      dictionaryWithDictionary:[finalObservability[@"slowRequests"] isKindOfClass:[NSDictionary class]]
+                                   ? finalObservability[@"slowRequests"]
+                                   : @{}];
+  if (finalSlowRequests[@"enabled"] == nil) {
+    finalSlowRequests[@"enabled"] = @(YES);
+  }
+  if (finalSlowRequests[@"thresholdMs"] == nil) {
+    finalSlowRequests[@"thresholdMs"] = @(500);
+  }
+  if (finalSlowRequests[@"capacity"] == nil) {
+    finalSlowRequests[@"capacity"] = @(32);
+  }
+  finalSlowRequests[@"enabled"] = @([finalSlowRequests[@"enabled"] boolValue]);
+  finalObservability[@"slowRequests"] = finalSlowRequests;
+  NSMutableDictionary *finalStatementStats = [NSMutableDictionary
+      dictionaryWithDictionary:[finalObservability[@"statementStats"] isKindOfClass:[NSDictionary class]]
+                                   ? finalObservability[@"statementStats"]
+                                   : @{}];
+  if (finalStatementStats[@"enabled"] == nil) {
+    finalStatementStats[@"enabled"] = @(NO);
+  }
+  if (finalStatementStats[@"maxStatements"] == nil) {
+    finalStatementStats[@"maxStatements"] = @(500);
+  }
+  if (finalStatementStats[@"metricsExportLimit"] == nil) {
+    finalStatementStats[@"metricsExportLimit"] = @(20);
+  }
+  finalStatementStats[@"enabled"] = @([finalStatementStats[@"enabled"] boolValue]);
+  finalObservability[@"statementStats"] = finalStatementStats;
   config[@"observability"] = finalObservability;
 
   NSMutableDictionary *finalCluster =
@@ -1391,6 +1524,7 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
   finalSession[@"enabled"] = @([finalSession[@"enabled"] boolValue]);
   finalSession[@"maxAgeSeconds"] = @([finalSession[@"maxAgeSeconds"] integerValue]);
   finalSession[@"secure"] = @([finalSession[@"secure"] boolValue]);
+  finalSession[@"tokenCacheSize"] = @(MAX((NSInteger)0, [finalSession[@"tokenCacheSize"] integerValue]));
   config[@"session"] = finalSession;
 
   finalCSRF[@"enabled"] = @([finalCSRF[@"enabled"] boolValue]);
@@ -1404,8 +1538,16 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
   finalRateLimit[@"enabled"] = @([finalRateLimit[@"enabled"] boolValue]);
   finalRateLimit[@"requests"] = @([finalRateLimit[@"requests"] integerValue]);
   finalRateLimit[@"windowSeconds"] = @([finalRateLimit[@"windowSeconds"] integerValue]);
+  finalRateLimit[@"backend"] = [finalRateLimit[@"backend"] lowercaseString];
+  finalRateLimit[@"sharedMemorySlots"] = @([finalRateLimit[@"sharedMemorySlots"] integerValue]);
   config[@"rateLimit"] = finalRateLimit;
 
+  finalPasswordHashing[@"maxConcurrent"] = @(MAX((NSInteger)1, [finalPasswordHashing[@"maxConcurrent"] integerValue]));
+  finalPasswordHashing[@"maxQueueDepth"] = @(MAX((NSInteger)0, [finalPasswordHashing[@"maxQueueDepth"] integerValue]));
+  finalPasswordHashing[@"queueTimeoutSeconds"] = @([finalPasswordHashing[@"queueTimeoutSeconds"] doubleValue]);
+  finalPasswordHashing[@"memoryBudgetMiB"] = @(MAX((NSInteger)1, [finalPasswordHashing[@"memoryBudgetMiB"] integerValue]));
+  config[@"passwordHashing"] = finalPasswordHashing;
+
   finalSecurityHeaders[@"enabled"] = @([finalSecurityHeaders[@"enabled"] boolValue]);
   config[@"securityHeaders"] = finalSecurityHeaders;
 
@@ -1476,6 +1618,7 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
 
   finalEOC[@"strictLocals"] = @([finalEOC[@"strictLocals"] boolValue]);
   finalEOC[@"strictStringify"] = @([finalEOC[@"strictStringify"] boolValue]);
+  finalEOC[@"renderProfiling"] = @([finalEOC[@"renderProfiling"] boolValue]);
   config[@"eoc"] = finalEOC;
 
   finalRouting[@"compileOnStart"] = @([finalRouting[@"compileOnStart"] boolValue]);
@@ -1503,6 +1646,8 @@ static NSDictionary *ALNSecurityProfileDefaults(NSString *profileName) {
       @([finalObservability[@"readinessRequiresClusterQuorum"] boolValue]);
   finalObservability[@"metricsEnabled"] =
       @([finalObservability[@"metricsEnabled"] boolValue]);
+  finalObservability[@"serverTimingEnabled"] =
+      @([finalObservability[@"serverTimingEnabled"] boolValue]);
   config[@"observability"] = finalObservability;
 
   finalCluster[@"enabled"] = @([finalCluster[@"enabled"] boolValue]);
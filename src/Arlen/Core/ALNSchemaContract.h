@@ -18,6 +18,33 @@ BOOL ALNSchemaValidateResponseValue(id _Nullable value,
                                     NSDictionary *schema,
                                     NSArray *_Nullable *_Nullable errors);
 
+// A request/response schema compiled once into a validator program: typed
+// field slots in evaluation order, per-slot required flags and sources,
+// enum sets, bounds, and transformer chains resolved ahead of time. Field
+// paths are only formatted when an error is reported. Immutable and safe to
+// share across threads; ALNApplication compiles one per route schema in
+// `compileRoute:`.
+//
+// Results and errors are identical to the dictionary-based functions above,
+// which compile on every call. Transformers are bound when the schema is
+// compiled, so register custom transformers before routes are compiled.
+@interface ALNCompiledSchema : NSObject
+
+@property(nonatomic, copy, readonly) NSDictionary *schema;
+
+- (instancetype)initWithSchema:(NSDictionary *)schema;
+
+@end
+
+NSDictionary *_Nullable ALNCompiledSchemaCoerceRequestValues(ALNCompiledSchema *schema,
+                                                             ALNRequest *request,
+                                                             NSDictionary *routeParams,
+                                                             NSArray *_Nullable *_Nullable errors);
+
+BOOL ALNCompiledSchemaValidateResponseValue(id _Nullable value,
+                                            ALNCompiledSchema *schema,
+                                            NSArray *_Nullable *_Nullable errors);
+
 NS_ASSUME_NONNULL_END
 
 #endif
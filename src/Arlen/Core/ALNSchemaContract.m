@@ -315,50 +315,6 @@ static void ALNCollectSchemaReadinessDiagnosticsForDescriptor(id rawDescriptor,
   }
 }
 
-static BOOL ALNSchemaApplyDescriptorTransformers(id rawValue,
-                                                 NSDictionary *descriptor,
-                                                 NSString *fieldPath,
-                                                 NSMutableArray *errors,
-                                                 id *transformedOut) {
-  NSArray *transformers = ALNSchemaTransformerNames(descriptor);
-  if ([transformers count] == 0) {
-    if (transformedOut != NULL) {
-      *transformedOut = rawValue;
-    }
-    return YES;
-  }
-
-  id current = rawValue;
-  for (NSString *name in transformers) {
-    NSError *transformError = nil;
-    id transformed = ALNApplyValueTransformerNamed(name, current, &transformError);
-    if (transformError != nil) {
-      NSString *code =
-          (transformError.code == ALNValueTransformerErrorUnknownTransformer)
-              ? @"invalid_transformer"
-              : @"invalid_transform";
-      NSMutableDictionary *meta = [NSMutableDictionary dictionary];
-      meta[@"transformer"] = name ?: @"";
-      if ([transformError.domain length] > 0) {
-        meta[@"domain"] = transformError.domain;
-      }
-      meta[@"domain_code"] = @((NSInteger)transformError.code);
-      ALNAppendSchemaErrorWithMetadata(errors,
-                                       fieldPath,
-                                       code,
-                                       transformError.localizedDescription ?: @"invalid transform",
-                                       meta);
-      return NO;
-    }
-    current = transformed;
-  }
-
-  if (transformedOut != NULL) {
-    *transformedOut = current;
-  }
-  return YES;
-}
-
 static BOOL ALNParseInteger(NSString *value, NSInteger *outValue) {
   if (![value isKindOfClass:[NSString class]] || [value length] == 0) {
     return NO;
@@ -415,281 +371,470 @@ static NSNumber *ALNParseBoolean(id value) {
   return nil;
 }
 
-static BOOL ALNSchemaEnumContainsValue(NSArray *allowedValues, id value) {
-  if (![allowedValues isKindOfClass:[NSArray class]] || [allowedValues count] == 0) {
-    return YES;
+typedef NS_ENUM(NSUInteger, ALNSchemaNodeType) {
+  ALNSchemaNodeTypeString = 0,
+  ALNSchemaNodeTypeInteger = 1,
+  ALNSchemaNodeTypeNumber = 2,
+  ALNSchemaNodeTypeBoolean = 3,
+  ALNSchemaNodeTypeObject = 4,
+  ALNSchemaNodeTypeArray = 5,
+  ALNSchemaNodeTypeUnsupported = 6,
+};
+
+// `path`, `route`, `param`, and unrecognized sources all read route params
+// first and fall back to the query string.
+typedef NS_ENUM(NSUInteger, ALNSchemaFieldSource) {
+  ALNSchemaFieldSourceParam = 0,
+  ALNSchemaFieldSourceQuery = 1,
+  ALNSchemaFieldSourceHeader = 2,
+  ALNSchemaFieldSourceBody = 3,
+};
+
+static ALNSchemaNodeType ALNSchemaNodeTypeForDescriptor(NSDictionary *descriptor) {
+  NSString *type = ALNSchemaType(descriptor);
+  if ([type isEqualToString:@"string"]) {
+    return ALNSchemaNodeTypeString;
   }
-  for (id candidate in allowedValues) {
-    if ((candidate == nil && value == nil) || [candidate isEqual:value]) {
-      return YES;
-    }
+  if ([type isEqualToString:@"integer"]) {
+    return ALNSchemaNodeTypeInteger;
+  }
+  if ([type isEqualToString:@"number"]) {
+    return ALNSchemaNodeTypeNumber;
   }
-  return NO;
+  if ([type isEqualToString:@"boolean"]) {
+    return ALNSchemaNodeTypeBoolean;
+  }
+  if ([type isEqualToString:@"object"]) {
+    return ALNSchemaNodeTypeObject;
+  }
+  if ([type isEqualToString:@"array"]) {
+    return ALNSchemaNodeTypeArray;
+  }
+  return ALNSchemaNodeTypeUnsupported;
 }
 
-static id ALNSchemaCoerceScalarValue(id rawValue,
-                                     NSDictionary *descriptor,
-                                     NSString *fieldPath,
-                                     BOOL coerce,
-                                     NSMutableArray *errors) {
-  NSString *type = ALNSchemaType(descriptor);
-  if ([type isEqualToString:@"string"]) {
+static ALNSchemaFieldSource ALNSchemaFieldSourceForDescriptor(NSDictionary *descriptor) {
+  NSString *source = [descriptor[@"source"] isKindOfClass:[NSString class]]
+                         ? [descriptor[@"source"] lowercaseString]
+                         : @"";
+  if ([source isEqualToString:@"query"]) {
+    return ALNSchemaFieldSourceQuery;
+  }
+  if ([source isEqualToString:@"header"]) {
+    return ALNSchemaFieldSourceHeader;
+  }
+  if ([source isEqualToString:@"body"]) {
+    return ALNSchemaFieldSourceBody;
+  }
+  return ALNSchemaFieldSourceParam;
+}
+
+@class ALNSchemaProgramField;
+
+@interface ALNSchemaProgramNode : NSObject {
+@public
+  ALNSchemaNodeType _type;
+  BOOL _hasCoerce;
+  BOOL _coerce;
+  NSArray<NSString *> *_transformerNames;
+  // Resolved transformers, parallel to _transformerNames. NSNull marks a name
+  // that did not resolve; it is looked up again at validation time so the
+  // error matches ALNApplyValueTransformerNamed.
+  NSArray *_transformers;
+  BOOL _hasMinLength;
+  NSInteger _minLength;
+  BOOL _hasMaxLength;
+  NSInteger _maxLength;
+  BOOL _hasMinimum;
+  double _minimum;
+  BOOL _hasMaximum;
+  double _maximum;
+  NSSet *_enumValues;
+  NSArray<ALNSchemaProgramField *> *_fields;
+  ALNSchemaProgramNode *_items;
+}
+@end
+
+@implementation ALNSchemaProgramNode
+@end
+
+@interface ALNSchemaProgramField : NSObject {
+@public
+  NSString *_name;
+  NSString *_headerName;
+  ALNSchemaFieldSource _source;
+  BOOL _required;
+  id _defaultValue;
+  ALNSchemaProgramNode *_node;
+}
+@end
+
+@implementation ALNSchemaProgramField
+@end
+
+static NSArray<ALNSchemaProgramField *> *ALNSchemaCompileFields(NSDictionary *descriptor);
+
+static ALNSchemaProgramNode *ALNSchemaCompileNode(NSDictionary *descriptor) {
+  ALNSchemaProgramNode *node = [[ALNSchemaProgramNode alloc] init];
+  node->_type = ALNSchemaNodeTypeForDescriptor(descriptor);
+
+  id coerce = descriptor[@"coerce"];
+  if ([coerce respondsToSelector:@selector(boolValue)]) {
+    node->_hasCoerce = YES;
+    node->_coerce = [coerce boolValue];
+  }
+
+  NSArray *names = ALNSchemaTransformerNames(descriptor);
+  NSMutableArray *transformers = [NSMutableArray arrayWithCapacity:[names count]];
+  for (NSString *name in names) {
+    NSValueTransformer *transformer = ALNValueTransformerNamed(name);
+    [transformers addObject:transformer ?: [NSNull null]];
+  }
+  node->_transformerNames = names;
+  node->_transformers = [NSArray arrayWithArray:transformers];
+
+  id minLength = descriptor[@"minLength"];
+  if ([minLength respondsToSelector:@selector(integerValue)]) {
+    node->_hasMinLength = YES;
+    node->_minLength = [minLength integerValue];
+  }
+  id maxLength = descriptor[@"maxLength"];
+  if ([maxLength respondsToSelector:@selector(integerValue)]) {
+    node->_hasMaxLength = YES;
+    node->_maxLength = [maxLength integerValue];
+  }
+  id minimum = descriptor[@"minimum"];
+  if ([minimum respondsToSelector:@selector(doubleValue)]) {
+    node->_hasMinimum = YES;
+    node->_minimum = [minimum doubleValue];
+  }
+  id maximum = descriptor[@"maximum"];
+  if ([maximum respondsToSelector:@selector(doubleValue)]) {
+    node->_hasMaximum = YES;
+    node->_maximum = [maximum doubleValue];
+  }
+
+  id allowedValues = descriptor[@"enum"];
+  if ([allowedValues isKindOfClass:[NSArray class]] && [allowedValues count] > 0) {
+    node->_enumValues = [NSSet setWithArray:allowedValues];
+  }
+
+  if (node->_type == ALNSchemaNodeTypeObject) {
+    node->_fields = ALNSchemaCompileFields(descriptor);
+  } else if (node->_type == ALNSchemaNodeTypeArray) {
+    node->_items = ALNSchemaCompileNode(ALNSchemaDescriptorFromValue(descriptor[@"items"]));
+  }
+  return node;
+}
+
+static NSArray<ALNSchemaProgramField *> *ALNSchemaCompileFields(NSDictionary *descriptor) {
+  NSDictionary *properties = ALNSchemaProperties(descriptor);
+  NSSet *required = ALNSchemaRequiredSet(descriptor, properties);
+  NSArray *names = [[properties allKeys] sortedArrayUsingSelector:@selector(compare:)];
+  NSMutableArray *fields = [NSMutableArray arrayWithCapacity:[names count]];
+  for (NSString *name in names) {
+    NSDictionary *fieldDescriptor = ALNSchemaDescriptorFromValue(properties[name]);
+    ALNSchemaProgramField *field = [[ALNSchemaProgramField alloc] init];
+    field->_name = [name copy];
+    field->_headerName = [name lowercaseString];
+    field->_source = ALNSchemaFieldSourceForDescriptor(fieldDescriptor);
+    field->_required = [required containsObject:name];
+    field->_defaultValue = fieldDescriptor[@"default"];
+    field->_node = ALNSchemaCompileNode(fieldDescriptor);
+    [fields addObject:field];
+  }
+  return [NSArray arrayWithArray:fields];
+}
+
+// Field paths are kept as a stack-allocated chain while validating and only
+// formatted ("a.b[2].c") when an error is reported.
+typedef struct ALNSchemaPath {
+  const struct ALNSchemaPath *parent;
+  __unsafe_unretained NSString *name;
+  NSUInteger index;
+} ALNSchemaPath;
+
+static NSString *ALNSchemaPathString(const ALNSchemaPath *path) {
+  if (path->parent == NULL) {
+    return path->name ?: @"value";
+  }
+  NSString *base = ALNSchemaPathString(path->parent);
+  if (path->name != nil) {
+    return [NSString stringWithFormat:@"%@.%@", base, path->name];
+  }
+  return [NSString stringWithFormat:@"%@[%lu]", base, (unsigned long)path->index];
+}
+
+static id ALNSchemaRunScalar(ALNSchemaProgramNode *node,
+                             id rawValue,
+                             const ALNSchemaPath *path,
+                             BOOL coerce,
+                             NSMutableArray *errors) {
+  switch (node->_type) {
+  case ALNSchemaNodeTypeString: {
     NSString *stringValue = nil;
-    if ([rawValue isKindOfClass:[NSString class]]) {
+    BOOL isString = [rawValue isKindOfClass:[NSString class]];
+    if (isString) {
       stringValue = rawValue;
     } else if (coerce && [rawValue respondsToSelector:@selector(description)]) {
       stringValue = [rawValue description];
     }
-    if ([stringValue length] == 0 && ![rawValue isKindOfClass:[NSString class]]) {
-      ALNAppendSchemaError(errors, fieldPath, @"invalid_type", @"must be a string");
+    if ([stringValue length] == 0 && !isString) {
+      ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"invalid_type", @"must be a string");
       return nil;
     }
-
-    id minLength = descriptor[@"minLength"];
-    if ([minLength respondsToSelector:@selector(integerValue)] &&
-        [stringValue length] < [minLength integerValue]) {
-      ALNAppendSchemaError(errors, fieldPath, @"too_short", @"is shorter than minLength");
+    if (node->_hasMinLength && [stringValue length] < (NSUInteger)node->_minLength) {
+      ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"too_short",
+                           @"is shorter than minLength");
       return nil;
     }
-    id maxLength = descriptor[@"maxLength"];
-    if ([maxLength respondsToSelector:@selector(integerValue)] &&
-        [stringValue length] > [maxLength integerValue]) {
-      ALNAppendSchemaError(errors, fieldPath, @"too_long", @"is longer than maxLength");
+    if (node->_hasMaxLength && [stringValue length] > (NSUInteger)node->_maxLength) {
+      ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"too_long",
+                           @"is longer than maxLength");
       return nil;
     }
     return stringValue ?: @"";
   }
 
-  if ([type isEqualToString:@"integer"]) {
+  case ALNSchemaNodeTypeInteger: {
     NSInteger parsed = 0;
     if ([rawValue isKindOfClass:[NSNumber class]]) {
       parsed = [rawValue integerValue];
-    } else if (coerce && [rawValue isKindOfClass:[NSString class]] &&
-               ALNParseInteger(rawValue, &parsed)) {
-      // parsed from string
-    } else {
-      ALNAppendSchemaError(errors, fieldPath, @"invalid_type", @"must be an integer");
+    } else if (!(coerce && ALNParseInteger(rawValue, &parsed))) {
+      ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"invalid_type",
+                           @"must be an integer");
       return nil;
     }
-    id minimum = descriptor[@"minimum"];
-    if ([minimum respondsToSelector:@selector(doubleValue)] &&
-        (double)parsed < [minimum doubleValue]) {
-      ALNAppendSchemaError(errors, fieldPath, @"too_small", @"is lower than minimum");
+    if (node->_hasMinimum && (double)parsed < node->_minimum) {
+      ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"too_small",
+                           @"is lower than minimum");
       return nil;
     }
-    id maximum = descriptor[@"maximum"];
-    if ([maximum respondsToSelector:@selector(doubleValue)] &&
-        (double)parsed > [maximum doubleValue]) {
-      ALNAppendSchemaError(errors, fieldPath, @"too_large", @"is greater than maximum");
+    if (node->_hasMaximum && (double)parsed > node->_maximum) {
+      ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"too_large",
+                           @"is greater than maximum");
       return nil;
     }
     return @(parsed);
   }
 
-  if ([type isEqualToString:@"number"]) {
+  case ALNSchemaNodeTypeNumber: {
     double parsed = 0.0;
     if ([rawValue isKindOfClass:[NSNumber class]]) {
       parsed = [rawValue doubleValue];
-    } else if (coerce && [rawValue isKindOfClass:[NSString class]] &&
-               ALNParseDouble(rawValue, &parsed)) {
-      // parsed
-    } else {
-      ALNAppendSchemaError(errors, fieldPath, @"invalid_type", @"must be a number");
+    } else if (!(coerce && ALNParseDouble(rawValue, &parsed))) {
+      ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"invalid_type",
+                           @"must be a number");
       return nil;
     }
-    id minimum = descriptor[@"minimum"];
-    if ([minimum respondsToSelector:@selector(doubleValue)] &&
-        parsed < [minimum doubleValue]) {
-      ALNAppendSchemaError(errors, fieldPath, @"too_small", @"is lower than minimum");
+    if (node->_hasMinimum && parsed < node->_minimum) {
+      ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"too_small",
+                           @"is lower than minimum");
       return nil;
     }
-    id maximum = descriptor[@"maximum"];
-    if ([maximum respondsToSelector:@selector(doubleValue)] &&
-        parsed > [maximum doubleValue]) {
-      ALNAppendSchemaError(errors, fieldPath, @"too_large", @"is greater than maximum");
+    if (node->_hasMaximum && parsed > node->_maximum) {
+      ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"too_large",
+                           @"is greater than maximum");
       return nil;
     }
     return @(parsed);
   }
 
-  if ([type isEqualToString:@"boolean"]) {
-    NSNumber *parsed = coerce ? ALNParseBoolean(rawValue) : ([rawValue isKindOfClass:[NSNumber class]] ? @([rawValue boolValue]) : nil);
+  case ALNSchemaNodeTypeBoolean: {
+    NSNumber *parsed = coerce ? ALNParseBoolean(rawValue)
+                              : ([rawValue isKindOfClass:[NSNumber class]]
+                                     ? @([rawValue boolValue])
+                                     : nil);
     if (parsed == nil) {
-      ALNAppendSchemaError(errors, fieldPath, @"invalid_type", @"must be a boolean");
+      ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"invalid_type",
+                           @"must be a boolean");
       return nil;
     }
     return parsed;
   }
 
-  if ([type isEqualToString:@"object"]) {
+  case ALNSchemaNodeTypeObject:
     if (![rawValue isKindOfClass:[NSDictionary class]]) {
-      ALNAppendSchemaError(errors, fieldPath, @"invalid_type", @"must be an object");
+      ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"invalid_type",
+                           @"must be an object");
       return nil;
     }
     return rawValue;
-  }
 
-  if ([type isEqualToString:@"array"]) {
+  case ALNSchemaNodeTypeArray:
     if (![rawValue isKindOfClass:[NSArray class]]) {
-      ALNAppendSchemaError(errors, fieldPath, @"invalid_type", @"must be an array");
+      ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"invalid_type",
+                           @"must be an array");
       return nil;
     }
     return rawValue;
+
+  case ALNSchemaNodeTypeUnsupported:
+    break;
   }
 
-  ALNAppendSchemaError(errors, fieldPath, @"unsupported_type", @"unsupported schema type");
+  ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"unsupported_type",
+                       @"unsupported schema type");
   return nil;
 }
 
-static BOOL ALNSchemaValidateValueRecursive(id value,
-                                            NSDictionary *descriptor,
-                                            NSString *fieldPath,
-                                            BOOL coerce,
-                                            NSMutableArray *errors,
-                                            id *coercedOut) {
-  if (descriptor == nil) {
-    if (coercedOut != NULL) {
-      *coercedOut = value;
+static BOOL ALNSchemaRunNode(ALNSchemaProgramNode *node,
+                             id value,
+                             const ALNSchemaPath *path,
+                             BOOL coerce,
+                             NSMutableArray *errors,
+                             id *coercedOut) {
+  // A descriptor-level `coerce` applies to this value only; nested values
+  // inherit the caller's setting.
+  BOOL coerceValue = node->_hasCoerce ? node->_coerce : coerce;
+
+  id current = value;
+  NSUInteger transformerCount = [node->_transformerNames count];
+  for (NSUInteger idx = 0; idx < transformerCount; idx++) {
+    NSString *name = node->_transformerNames[idx];
+    id transformer = node->_transformers[idx];
+    NSError *transformError = nil;
+    id transformed = (transformer != [NSNull null])
+                         ? ALNApplyValueTransformer(transformer, current, &transformError)
+                         : ALNApplyValueTransformerNamed(name, current, &transformError);
+    if (transformError != nil) {
+      NSString *code =
+          (transformError.code == ALNValueTransformerErrorUnknownTransformer)
+              ? @"invalid_transformer"
+              : @"invalid_transform";
+      NSMutableDictionary *meta = [NSMutableDictionary dictionary];
+      meta[@"transformer"] = name ?: @"";
+      if ([transformError.domain length] > 0) {
+        meta[@"domain"] = transformError.domain;
+      }
+      meta[@"domain_code"] = @((NSInteger)transformError.code);
+      ALNAppendSchemaErrorWithMetadata(errors,
+                                       ALNSchemaPathString(path),
+                                       code,
+                                       transformError.localizedDescription ?: @"invalid transform",
+                                       meta);
+      return NO;
     }
-    return YES;
-  }
-
-  BOOL coerceValue = coerce;
-  if ([descriptor[@"coerce"] respondsToSelector:@selector(boolValue)]) {
-    coerceValue = [descriptor[@"coerce"] boolValue];
-  }
-
-  id transformedValue = value;
-  if (!ALNSchemaApplyDescriptorTransformers(value,
-                                            descriptor,
-                                            fieldPath,
-                                            errors,
-                                            &transformedValue)) {
-    return NO;
+    current = transformed;
   }
 
-  id coercedScalar =
-      ALNSchemaCoerceScalarValue(transformedValue, descriptor, fieldPath, coerceValue, errors);
-  if (coercedScalar == nil) {
+  id coerced = ALNSchemaRunScalar(node, current, path, coerceValue, errors);
+  if (coerced == nil) {
     return NO;
   }
 
-  NSString *type = ALNSchemaType(descriptor);
-  if ([type isEqualToString:@"object"]) {
-    NSDictionary *properties = ALNSchemaProperties(descriptor);
-    NSSet *required = ALNSchemaRequiredSet(descriptor, properties);
-    NSMutableDictionary *coercedObject = [NSMutableDictionary dictionary];
-    NSDictionary *dictValue = [coercedScalar isKindOfClass:[NSDictionary class]] ? coercedScalar : @{};
-
-    NSArray *propertyNames = [[properties allKeys] sortedArrayUsingSelector:@selector(compare:)];
-    for (NSString *propertyName in propertyNames) {
-      NSDictionary *propertyDescriptor = ALNSchemaDescriptorFromValue(properties[propertyName]);
-      id rawProperty = dictValue[propertyName];
-      NSString *propertyPath = [NSString stringWithFormat:@"%@.%@", fieldPath ?: @"value", propertyName];
+  if (node->_type == ALNSchemaNodeTypeObject) {
+    NSDictionary *dictValue = coerced;
+    NSMutableDictionary *coercedObject =
+        [NSMutableDictionary dictionaryWithCapacity:[node->_fields count]];
+    for (ALNSchemaProgramField *field in node->_fields) {
+      id rawProperty = dictValue[field->_name];
+      ALNSchemaPath propertyPath = { path, field->_name, 0 };
       if (rawProperty == nil || rawProperty == [NSNull null]) {
-        if ([required containsObject:propertyName]) {
-          ALNAppendSchemaError(errors, propertyPath, @"missing", @"is required");
+        if (field->_required) {
+          ALNAppendSchemaError(errors, ALNSchemaPathString(&propertyPath), @"missing",
+                               @"is required");
         }
         continue;
       }
-
       id coercedProperty = nil;
-      BOOL valid = ALNSchemaValidateValueRecursive(rawProperty,
-                                                   propertyDescriptor,
-                                                   propertyPath,
-                                                   coerce,
-                                                   errors,
-                                                   &coercedProperty);
-      if (!valid) {
+      if (!ALNSchemaRunNode(field->_node, rawProperty, &propertyPath, coerce, errors,
+                            &coercedProperty)) {
         continue;
       }
       if (coercedProperty != nil) {
-        coercedObject[propertyName] = coercedProperty;
+        coercedObject[field->_name] = coercedProperty;
       }
     }
-    if (coercedOut != NULL) {
-      *coercedOut = coercedObject;
-    }
-  } else if ([type isEqualToString:@"array"]) {
-    NSArray *arrayValue = [coercedScalar isKindOfClass:[NSArray class]] ? coercedScalar : @[];
-    NSDictionary *itemDescriptor = ALNSchemaDescriptorFromValue(descriptor[@"items"]);
-    NSMutableArray *coercedArray = [NSMutableArray array];
-    for (NSUInteger idx = 0; idx < [arrayValue count]; idx++) {
-      id itemValue = arrayValue[idx];
+    coerced = coercedObject;
+  } else if (node->_type == ALNSchemaNodeTypeArray) {
+    NSArray *arrayValue = coerced;
+    NSUInteger count = [arrayValue count];
+    NSMutableArray *coercedArray = [NSMutableArray arrayWithCapacity:count];
+    for (NSUInteger idx = 0; idx < count; idx++) {
+      ALNSchemaPath itemPath = { path, nil, idx };
       id coercedItem = nil;
-      NSString *itemPath = [NSString stringWithFormat:@"%@[%lu]", fieldPath ?: @"value", (unsigned long)idx];
-      BOOL valid = ALNSchemaValidateValueRecursive(itemValue,
-                                                   itemDescriptor,
-                                                   itemPath,
-                                                   coerce,
-                                                   errors,
-                                                   &coercedItem);
-      if (!valid) {
+      if (!ALNSchemaRunNode(node->_items, arrayValue[idx], &itemPath, coerce, errors,
+                            &coercedItem)) {
         continue;
       }
       [coercedArray addObject:coercedItem ?: [NSNull null]];
     }
-    if (coercedOut != NULL) {
-      *coercedOut = coercedArray;
-    }
-  } else if (coercedOut != NULL) {
-    *coercedOut = coercedScalar;
+    coerced = coercedArray;
   }
 
-  if (!ALNSchemaEnumContainsValue(descriptor[@"enum"], (coercedOut != NULL) ? *coercedOut : coercedScalar)) {
-    ALNAppendSchemaError(errors, fieldPath, @"invalid_enum", @"must be one of the allowed values");
+  if (coercedOut != NULL) {
+    *coercedOut = coerced;
+  }
+  if (node->_enumValues != nil && ![node->_enumValues containsObject:coerced]) {
+    ALNAppendSchemaError(errors, ALNSchemaPathString(path), @"invalid_enum",
+                         @"must be one of the allowed values");
     return NO;
   }
   return YES;
 }
 
-static NSString *ALNSchemaSource(NSDictionary *descriptor) {
-  NSString *source = [descriptor[@"source"] isKindOfClass:[NSString class]]
-                         ? [descriptor[@"source"] lowercaseString]
-                         : @"";
-  if ([source length] == 0) {
-    return @"param";
-  }
-  return source;
+@interface ALNCompiledSchema () {
+@public
+  BOOL _empty;
+  BOOL _needsBodyObject;
+  NSArray<ALNSchemaProgramField *> *_requestFields;
+  ALNSchemaProgramNode *_responseRoot;
 }
+@end
 
-NSArray *ALNSchemaReadinessDiagnostics(NSDictionary *schema) {
-  if (![schema isKindOfClass:[NSDictionary class]] || [schema count] == 0) {
-    return @[];
-  }
+@implementation ALNCompiledSchema
 
-  NSMutableArray *diagnostics = [NSMutableArray array];
-  ALNCollectSchemaReadinessDiagnosticsForDescriptor(schema, @"", diagnostics);
-  return [NSArray arrayWithArray:diagnostics];
+- (instancetype)init {
+  return [self initWithSchema:@{}];
 }
 
-NSDictionary *ALNSchemaCoerceRequestValues(NSDictionary *schema,
-                                          ALNRequest *request,
-                                          NSDictionary *routeParams,
-                                          NSArray **errors) {
-  if (![schema isKindOfClass:[NSDictionary class]] || [schema count] == 0) {
+- (instancetype)initWithSchema:(NSDictionary *)schema {
+  self = [super init];
+  if (self) {
+    _schema = [schema isKindOfClass:[NSDictionary class]] ? [schema copy] : @{};
+    _empty = ([_schema count] == 0);
+    if (!_empty) {
+      _requestFields = ALNSchemaCompileFields(_schema);
+      for (ALNSchemaProgramField *field in _requestFields) {
+        if (field->_source == ALNSchemaFieldSourceBody) {
+          _needsBodyObject = YES;
+          break;
+        }
+      }
+
+      NSDictionary *responseDescriptor = _schema;
+      if (_schema[@"properties"] == nil && _schema[@"type"] == nil) {
+        responseDescriptor = @{
+          @"type" : @"object",
+          @"properties" : _schema,
+        };
+      }
+      _responseRoot = ALNSchemaCompileNode(responseDescriptor);
+    }
+  }
+  return self;
+}
+
+@end
+
+NSDictionary *ALNCompiledSchemaCoerceRequestValues(ALNCompiledSchema *schema,
+                                                  ALNRequest *request,
+                                                  NSDictionary *routeParams,
+                                                  NSArray **errors) {
+  if (schema == nil || schema->_empty) {
     if (errors != NULL) {
       *errors = @[];
     }
     return @{};
   }
 
-  NSDictionary *properties = ALNSchemaProperties(schema);
-  NSSet *required = ALNSchemaRequiredSet(schema, properties);
-  NSMutableDictionary *coercedValues = [NSMutableDictionary dictionary];
+  NSMutableDictionary *coercedValues =
+      [NSMutableDictionary dictionaryWithCapacity:[schema->_requestFields count]];
   NSMutableArray *validationErrors = [NSMutableArray array];
 
-  BOOL needsBodyObject = NO;
-  for (NSString *field in properties) {
-    NSDictionary *descriptor = ALNSchemaDescriptorFromValue(properties[field]);
-    if ([[ALNSchemaSource(descriptor) lowercaseString] isEqualToString:@"body"]) {
-      needsBodyObject = YES;
-      break;
-    }
-  }
-
   NSDictionary *bodyObject = nil;
-  if (needsBodyObject && [request.body length] > 0) {
+  if (schema->_needsBodyObject && [request.body length] > 0) {
     NSError *bodyError = nil;
     id parsedBody = [ALNJSONSerialization JSONObjectWithData:request.body
                                                      options:0
@@ -701,53 +846,44 @@ NSDictionary *ALNSchemaCoerceRequestValues(NSDictionary *schema,
     }
   }
 
-  NSArray *fields = [[properties allKeys] sortedArrayUsingSelector:@selector(compare:)];
-  for (NSString *field in fields) {
-    NSDictionary *descriptor = ALNSchemaDescriptorFromValue(properties[field]);
-    NSString *source = ALNSchemaSource(descriptor);
+  NSDictionary *queryParams = request.queryParams;
+  for (ALNSchemaProgramField *field in schema->_requestFields) {
+    NSString *name = field->_name;
     id rawValue = nil;
-    if ([source isEqualToString:@"path"] || [source isEqualToString:@"route"] ||
-        [source isEqualToString:@"param"]) {
-      rawValue = routeParams[field];
-      if (rawValue == nil && [source isEqualToString:@"param"]) {
-        rawValue = request.queryParams[field];
-      }
-      if (rawValue == nil && ![source isEqualToString:@"param"]) {
-        rawValue = request.queryParams[field];
-      }
-    } else if ([source isEqualToString:@"query"]) {
-      rawValue = request.queryParams[field];
-    } else if ([source isEqualToString:@"header"]) {
-      rawValue = request.headers[[field lowercaseString]];
-    } else if ([source isEqualToString:@"body"]) {
-      rawValue = bodyObject[field];
-    } else {
-      rawValue = routeParams[field] ?: request.queryParams[field];
+    switch (field->_source) {
+    case ALNSchemaFieldSourceParam:
+      rawValue = routeParams[name] ?: queryParams[name];
+      break;
+    case ALNSchemaFieldSourceQuery:
+      rawValue = queryParams[name];
+      break;
+    case ALNSchemaFieldSourceHeader:
+      rawValue = request.headers[field->_headerName];
+      break;
+    case ALNSchemaFieldSourceBody:
+      rawValue = bodyObject[name];
+      break;
     }
 
-    if ((rawValue == nil || rawValue == [NSNull null]) && descriptor[@"default"] != nil) {
-      rawValue = descriptor[@"default"];
+    if ((rawValue == nil || rawValue == [NSNull null]) && field->_defaultValue != nil) {
+      rawValue = field->_defaultValue;
     }
 
     if (rawValue == nil || rawValue == [NSNull null]) {
-      if ([required containsObject:field]) {
-        ALNAppendSchemaError(validationErrors, field, @"missing", @"is required");
+      if (field->_required) {
+        ALNAppendSchemaError(validationErrors, name, @"missing", @"is required");
       }
       continue;
     }
 
+    ALNSchemaPath path = { NULL, name, 0 };
     id coercedValue = nil;
-    BOOL valid = ALNSchemaValidateValueRecursive(rawValue,
-                                                 descriptor,
-                                                 field,
-                                                 YES,
-                                                 validationErrors,
-                                                 &coercedValue);
-    if (!valid) {
+    if (!ALNSchemaRunNode(field->_node, rawValue, &path, YES, validationErrors,
+                          &coercedValue)) {
       continue;
     }
     if (coercedValue != nil) {
-      coercedValues[field] = coercedValue;
+      coercedValues[name] = coercedValue;
     }
   }
 
@@ -760,8 +896,10 @@ NSDictionary *ALNSchemaCoerceRequestValues(NSDictionary *schema,
   return [NSDictionary dictionaryWithDictionary:coercedValues];
 }
 
-BOOL ALNSchemaValidateResponseValue(id value, NSDictionary *schema, NSArray **errors) {
-  if (![schema isKindOfClass:[NSDictionary class]] || [schema count] == 0) {
+BOOL ALNCompiledSchemaValidateResponseValue(id value,
+                                            ALNCompiledSchema *schema,
+                                            NSArray **errors) {
+  if (schema == nil || schema->_empty) {
     if (errors != NULL) {
       *errors = @[];
     }
@@ -769,23 +907,47 @@ BOOL ALNSchemaValidateResponseValue(id value, NSDictionary *schema, NSArray **er
   }
 
   NSMutableArray *validationErrors = [NSMutableArray array];
-  NSDictionary *descriptor = schema;
-  if (schema[@"properties"] == nil && schema[@"type"] == nil) {
-    descriptor = @{
-      @"type" : @"object",
-      @"properties" : schema,
-    };
-  }
-
+  ALNSchemaPath path = { NULL, @"response", 0 };
   id coercedValue = nil;
-  BOOL valid = ALNSchemaValidateValueRecursive(value,
-                                               descriptor,
-                                               @"response",
-                                               NO,
-                                               validationErrors,
-                                               &coercedValue);
+  BOOL valid = ALNSchemaRunNode(schema->_responseRoot, value, &path, NO, validationErrors,
+                                &coercedValue);
   if (errors != NULL) {
     *errors = [NSArray arrayWithArray:validationErrors];
   }
   return valid && [validationErrors count] == 0;
 }
+
+NSArray *ALNSchemaReadinessDiagnostics(NSDictionary *schema) {
+  if (![schema isKindOfClass:[NSDictionary class]] || [schema count] == 0) {
+    return @[];
+  }
+
+  NSMutableArray *diagnostics = [NSMutableArray array];
+  ALNCollectSchemaReadinessDiagnosticsForDescriptor(schema, @"", diagnostics);
+  return [NSArray arrayWithArray:diagnostics];
+}
+
+NSDictionary *ALNSchemaCoerceRequestValues(NSDictionary *schema,
+                                          ALNRequest *request,
+                                          NSDictionary *routeParams,
+                                          NSArray **errors) {
+  if (![schema isKindOfClass:[NSDictionary class]] || [schema count] == 0) {
+    if (errors != NULL) {
+      *errors = @[];
+    }
+    return @{};
+  }
+  ALNCompiledSchema *compiled = [[ALNCompiledSchema alloc] initWithSchema:schema];
+  return ALNCompiledSchemaCoerceRequestValues(compiled, request, routeParams, errors);
+}
+
+BOOL ALNSchemaValidateResponseValue(id value, NSDictionary *schema, NSArray **errors) {
+  if (![schema isKindOfClass:[NSDictionary class]] || [schema count] == 0) {
+    if (errors != NULL) {
+      *errors = @[];
+    }
+    return YES;
+  }
+  ALNCompiledSchema *compiled = [[ALNCompiledSchema alloc] initWithSchema:schema];
+  return ALNCompiledSchemaValidateResponseValue(value, compiled, errors);
+}
@@ -21,6 +21,11 @@ NSArray<NSString *> *ALNRegisteredValueTransformerNames(void);
 id _Nullable ALNApplyValueTransformerNamed(NSString *name,
                                            id _Nullable value,
                                            NSError **_Nullable error);
+// Applies an already-resolved transformer, reporting failures the same way
+// as ALNApplyValueTransformerNamed.
+id _Nullable ALNApplyValueTransformer(NSValueTransformer *transformer,
+                                      id _Nullable value,
+                                      NSError **_Nullable error);
 
 NS_ASSUME_NONNULL_END
 
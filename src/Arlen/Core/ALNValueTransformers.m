@@ -337,6 +337,10 @@ id ALNApplyValueTransformerNamed(NSString *name, id value, NSError **error) {
     return nil;
   }
 
+  return ALNApplyValueTransformer(transformer, value, error);
+}
+
+id ALNApplyValueTransformer(NSValueTransformer *transformer, id value, NSError **error) {
   if ([transformer respondsToSelector:@selector(aln_transformedValue:error:)]) {
     return [(id<ALNErrorReportingValueTransformer>)transformer
         aln_transformedValue:value
@@ -18,6 +18,7 @@ typedef NS_ENUM(NSInteger, ALNDatabaseAdapterErrorCode) {
 
 @class ALNDatabaseRow;
 @class ALNDatabaseResult;
+@class ALNDatabaseResultRow;
 
 @interface ALNDatabaseJSONValue : NSObject
 
@@ -59,6 +60,24 @@ typedef NS_ENUM(NSInteger, ALNDatabaseAdapterErrorCode) {
 
 @end
 
+// A row of a columnar ALNDatabaseResult: an immutable NSDictionary view
+// over the result's shared column index and flat value storage, so a row
+// costs one small object instead of its own hash table. SQL NULL is NSNull,
+// as in plain row dictionaries; with duplicate column names the last one
+// wins for keyed access. -copy returns a standalone NSDictionary, so a
+// kept row does not keep the whole result alive.
+@interface ALNDatabaseResultRow : NSDictionary<NSString *, id>
+
+// Every result column in order, shared by all rows of the result.
+@property(nonatomic, copy, readonly) NSArray<NSString *> *columns;
+
+// NSNotFound when the result has no such column.
+- (NSUInteger)indexOfColumn:(NSString *)columnName;
+// nil when `index` is out of range.
+- (nullable id)valueAtColumnIndex:(NSUInteger)index;
+
+@end
+
 @interface ALNDatabaseResult : NSObject
 
 @property(nonatomic, copy, readonly) NSArray<NSDictionary<NSString *, id> *> *rows;
@@ -74,6 +93,12 @@ typedef NS_ENUM(NSInteger, ALNDatabaseAdapterErrorCode) {
 - (instancetype)initWithRows:(nullable NSArray<NSDictionary<NSString *, id> *> *)rows
               orderedColumns:(nullable NSArray<NSString *> *)orderedColumns
                orderedValues:(nullable NSArray<NSArray *> *)orderedValues NS_DESIGNATED_INITIALIZER;
+// Columnar storage: `rowValues` holds every value row-major, `[columns
+// count]` per row. `rows` are ALNDatabaseResultRow views over it.
++ (instancetype)resultWithColumns:(nullable NSArray<NSString *> *)columns
+                        rowValues:(nullable NSArray *)rowValues;
+- (instancetype)initWithColumns:(nullable NSArray<NSString *> *)columns
+                      rowValues:(nullable NSArray *)rowValues NS_DESIGNATED_INITIALIZER;
 - (nullable ALNDatabaseRow *)first;
 - (nullable ALNDatabaseRow *)rowAtIndex:(NSUInteger)index;
 - (nullable ALNDatabaseRow *)one:(NSError *_Nullable *_Nullable)error;
@@ -108,6 +133,10 @@ typedef NS_ENUM(NSInteger, ALNDatabaseAdapterErrorCode) {
 - (BOOL)withSavepointNamed:(NSString *)name
                 usingBlock:(BOOL (^)(NSError *_Nullable *_Nullable error))block
                      error:(NSError *_Nullable *_Nullable)error;
+// Implemented by connections that wrap another one (the query cache's
+// write-recording connection), so callers can check what the connection
+// really is while still sending statements through the wrapper.
+- (id<ALNDatabaseConnection>)underlyingConnection;
 
 @end
 
@@ -139,6 +168,8 @@ typedef NS_ENUM(NSInteger, ALNDatabaseAdapterErrorCode) {
                            error:(NSError *_Nullable *_Nullable)error;
 - (nullable id<ALNSQLDialect>)sqlDialect;
 - (NSDictionary<NSString *, id> *)capabilityMetadata;
+// Implemented by adapters that wrap another one (ALNDatabaseQueryCache).
+- (id<ALNDatabaseAdapter>)underlyingAdapter;
 
 @end
 
@@ -146,6 +177,9 @@ FOUNDATION_EXPORT NSError *ALNDatabaseAdapterMakeError(ALNDatabaseAdapterErrorCo
                                                        NSString *message,
                                                        NSDictionary *_Nullable userInfo);
 FOUNDATION_EXPORT BOOL ALNDatabaseErrorIsConnectivityFailure(NSError *_Nullable error);
+// A connection pool with no free connection: a subset of connectivity
+// failures that says the target is busy, not that it is unreachable.
+FOUNDATION_EXPORT BOOL ALNDatabaseErrorIsPoolExhaustion(NSError *_Nullable error);
 FOUNDATION_EXPORT ALNDatabaseJSONValue *ALNDatabaseJSONParameter(id _Nullable object);
 FOUNDATION_EXPORT ALNDatabaseArrayValue *ALNDatabaseArrayParameter(NSArray *_Nullable items);
 FOUNDATION_EXPORT ALNDatabaseResult *_Nonnull ALNDatabaseResultFromRows(
@@ -178,6 +212,12 @@ FOUNDATION_EXPORT NSInteger ALNDatabaseExecuteCommandBatch(id<ALNDatabaseConnect
                                                            NSString *sql,
                                                            NSArray<NSArray *> *_Nullable parameterSets,
                                                            NSError *_Nullable *_Nullable error);
+// The innermost connection or adapter behind any wrappers; the argument
+// itself when it wraps nothing.
+FOUNDATION_EXPORT id<ALNDatabaseConnection> _Nullable ALNDatabaseUnderlyingConnection(
+    id<ALNDatabaseConnection> _Nullable connection);
+FOUNDATION_EXPORT id<ALNDatabaseAdapter> _Nullable ALNDatabaseUnderlyingAdapter(
+    id<ALNDatabaseAdapter> _Nullable adapter);
 FOUNDATION_EXPORT BOOL ALNDatabaseConnectionSupportsSavepoints(
     id<ALNDatabaseConnection> connection);
 FOUNDATION_EXPORT BOOL ALNDatabaseCreateSavepoint(id<ALNDatabaseConnection> connection,
@@ -41,6 +41,27 @@ static NSDictionary<NSString *, id> *ALNDatabaseResultOrderedColumnSeedDictionar
 
 @end
 
+// Column layout and values shared by every row of a columnar result.
+@interface ALNDatabaseColumnarStorage : NSObject
+
+@property(nonatomic, copy, readonly) NSArray<NSString *> *columns;
+@property(nonatomic, copy, readonly) NSArray<NSString *> *distinctColumns;
+@property(nonatomic, copy, readonly) NSDictionary<NSString *, NSNumber *> *columnIndexes;
+@property(nonatomic, copy, readonly) NSArray *values;
+@property(nonatomic, assign, readonly) NSUInteger columnCount;
+@property(nonatomic, assign, readonly) NSUInteger rowCount;
+
+- (instancetype)initWithColumns:(NSArray<NSString *> *)columns values:(NSArray *)values;
+
+@end
+
+@interface ALNDatabaseResultRow ()
+
+- (instancetype)initWithStorage:(ALNDatabaseColumnarStorage *)storage rowIndex:(NSUInteger)rowIndex;
+- (NSArray *)orderedValues;
+
+@end
+
 @implementation ALNDatabaseJSONValue
 
 + (instancetype)valueWithObject:(id)object {
@@ -181,6 +202,97 @@ static NSDictionary<NSString *, id> *ALNDatabaseResultOrderedColumnSeedDictionar
 
 @end
 
+@implementation ALNDatabaseColumnarStorage
+
+- (instancetype)initWithColumns:(NSArray<NSString *> *)columns values:(NSArray *)values {
+  self = [super init];
+  if (self != nil) {
+    NSMutableArray<NSString *> *resolvedColumns = [NSMutableArray array];
+    NSMutableArray<NSString *> *distinctColumns = [NSMutableArray array];
+    NSMutableDictionary<NSString *, NSNumber *> *columnIndexes = [NSMutableDictionary dictionary];
+    for (id rawColumn in [columns isKindOfClass:[NSArray class]] ? columns : @[]) {
+      NSString *column = ([rawColumn isKindOfClass:[NSString class]] && [rawColumn length] > 0)
+                             ? rawColumn
+                             : [NSString stringWithFormat:@"col_%lu", (unsigned long)[resolvedColumns count]];
+      if (columnIndexes[column] == nil) {
+        [distinctColumns addObject:column];
+      }
+      // Later duplicates win, matching a dictionary filled column by column.
+      columnIndexes[column] = @([resolvedColumns count]);
+      [resolvedColumns addObject:column];
+    }
+    _columns = [NSArray arrayWithArray:resolvedColumns];
+    _distinctColumns = [NSArray arrayWithArray:distinctColumns];
+    _columnIndexes = [NSDictionary dictionaryWithDictionary:columnIndexes];
+    _values = [values isKindOfClass:[NSArray class]] ? [values copy] : @[];
+    _columnCount = [_columns count];
+    _rowCount = (_columnCount > 0) ? ([_values count] / _columnCount) : 0;
+  }
+  return self;
+}
+
+@end
+
+@implementation ALNDatabaseResultRow {
+  ALNDatabaseColumnarStorage *_storage;
+  NSUInteger _offset;
+}
+
+- (instancetype)initWithStorage:(ALNDatabaseColumnarStorage *)storage rowIndex:(NSUInteger)rowIndex {
+  self = [super init];
+  if (self != nil) {
+    _storage = storage;
+    _offset = rowIndex * storage.columnCount;
+  }
+  return self;
+}
+
+- (NSArray<NSString *> *)columns {
+  return _storage.columns;
+}
+
+- (NSUInteger)indexOfColumn:(NSString *)columnName {
+  NSNumber *index = [columnName isKindOfClass:[NSString class]] ? _storage.columnIndexes[columnName] : nil;
+  return (index != nil) ? [index unsignedIntegerValue] : NSNotFound;
+}
+
+- (id)valueAtColumnIndex:(NSUInteger)index {
+  if (index >= _storage.columnCount) {
+    return nil;
+  }
+  return _storage.values[_offset + index];
+}
+
+- (NSArray *)orderedValues {
+  return [_storage.values subarrayWithRange:NSMakeRange(_offset, _storage.columnCount)];
+}
+
+- (NSUInteger)count {
+  return [_storage.distinctColumns count];
+}
+
+- (id)objectForKey:(id)aKey {
+  NSUInteger index = [self indexOfColumn:aKey];
+  return (index != NSNotFound) ? _storage.values[_offset + index] : nil;
+}
+
+- (NSEnumerator *)keyEnumerator {
+  return [_storage.distinctColumns objectEnumerator];
+}
+
+- (NSUInteger)countByEnumeratingWithState:(NSFastEnumerationState *)state
+                                  objects:(id __unsafe_unretained [])buffer
+                                    count:(NSUInteger)len {
+  return [_storage.distinctColumns countByEnumeratingWithState:state objects:buffer count:len];
+}
+
+- (id)copyWithZone:(NSZone *)zone {
+  (void)zone;
+  return [[NSDictionary alloc] initWithDictionary:self];
+}
+
+@end
+
 @implementation ALNDatabaseResult
 
 + (NSArray<NSString *> *)normalizedOrderedColumns:(NSArray<NSString *> *)orderedColumns
@@ -234,6 +346,25 @@ static NSDictionary<NSString *, id> *ALNDatabaseResultOrderedColumnSeedDictionar
   return self;
 }
 
++ (instancetype)resultWithColumns:(NSArray<NSString *> *)columns rowValues:(NSArray *)rowValues {
+  return [[self alloc] initWithColumns:columns rowValues:rowValues];
+}
+
+- (instancetype)initWithColumns:(NSArray<NSString *> *)columns rowValues:(NSArray *)rowValues {
+  self = [super init];
+  if (self != nil) {
+    ALNDatabaseColumnarStorage *storage = [[ALNDatabaseColumnarStorage alloc] initWithColumns:columns
+                                                                                       values:rowValues];
+    NSMutableArray<NSDictionary<NSString *, id> *> *rows = [NSMutableArray arrayWithCapacity:storage.rowCount];
+    for (NSUInteger idx = 0; idx < storage.rowCount; idx++) {
+      [rows addObject:[[ALNDatabaseResultRow alloc] initWithStorage:storage rowIndex:idx]];
+    }
+    _rows = [NSArray arrayWithArray:rows];
+    _columns = storage.columns;
+  }
+  return self;
+}
+
 - (NSUInteger)count {
   return [self.rows count];
 }
@@ -250,10 +381,12 @@ static NSDictionary<NSString *, id> *ALNDatabaseResultOrderedColumnSeedDictionar
   if (![row isKindOfClass:[NSDictionary class]]) {
     return nil;
   }
-  NSArray *orderedValues = (index < [self.orderedValues count] &&
-                            [self.orderedValues[index] isKindOfClass:[NSArray class]])
-                               ? self.orderedValues[index]
-                               : nil;
+  NSArray *orderedValues = nil;
+  if ([row isKindOfClass:[ALNDatabaseResultRow class]]) {
+    orderedValues = [(ALNDatabaseResultRow *)row orderedValues];
+  } else if (index < [self.orderedValues count] && [self.orderedValues[index] isKindOfClass:[NSArray class]]) {
+    orderedValues = self.orderedValues[index];
+  }
   return [ALNDatabaseRow rowWithDictionary:row
                              orderedColumns:self.columns
                               orderedValues:orderedValues];
@@ -351,6 +484,27 @@ BOOL ALNDatabaseErrorIsConnectivityFailure(NSError *error) {
   return NO;
 }
 
+BOOL ALNDatabaseErrorIsPoolExhaustion(NSError *error) {
+  if (![error isKindOfClass:[NSError class]]) {
+    return NO;
+  }
+
+  NSError *underlying = [error.userInfo[NSUnderlyingErrorKey] isKindOfClass:[NSError class]]
+                            ? error.userInfo[NSUnderlyingErrorKey]
+                            : nil;
+  if (underlying != nil && ALNDatabaseErrorIsPoolExhaustion(underlying)) {
+    return YES;
+  }
+
+  if ([error.domain isEqualToString:ALNPgErrorDomain]) {
+    return (error.code == ALNPgErrorPoolExhausted);
+  }
+  if ([error.domain isEqualToString:ALNMSSQLErrorDomain]) {
+    return (error.code == ALNMSSQLErrorPoolExhausted);
+  }
+  return [[error.localizedDescription lowercaseString] containsString:@"pool exhausted"];
+}
+
 ALNDatabaseJSONValue *ALNDatabaseJSONParameter(id object) {
   return [ALNDatabaseJSONValue valueWithObject:object];
 }
@@ -574,6 +728,28 @@ NSInteger ALNDatabaseExecuteCommandBatch(id<ALNDatabaseConnection> connection,
   return totalAffected;
 }
 
+id<ALNDatabaseConnection> ALNDatabaseUnderlyingConnection(id<ALNDatabaseConnection> connection) {
+  while ([connection respondsToSelector:@selector(underlyingConnection)]) {
+    id<ALNDatabaseConnection> inner = [connection underlyingConnection];
+    if (inner == nil || inner == connection) {
+      break;
+    }
+    connection = inner;
+  }
+  return connection;
+}
+
+id<ALNDatabaseAdapter> ALNDatabaseUnderlyingAdapter(id<ALNDatabaseAdapter> adapter) {
+  while ([adapter respondsToSelector:@selector(underlyingAdapter)]) {
+    id<ALNDatabaseAdapter> inner = [adapter underlyingAdapter];
+    if (inner == nil || inner == adapter) {
+      break;
+    }
+    adapter = inner;
+  }
+  return adapter;
+}
+
 BOOL ALNDatabaseConnectionSupportsSavepoints(id<ALNDatabaseConnection> connection) {
   return [connection respondsToSelector:@selector(createSavepointNamed:error:)] &&
          [connection respondsToSelector:@selector(rollbackToSavepointNamed:error:)] &&
@@ -0,0 +1,99 @@
+#ifndef ALN_DATABASE_QUERY_CACHE_H
+#define ALN_DATABASE_QUERY_CACHE_H
+
+#import <Foundation/Foundation.h>
+
+#import "ALNDatabaseAdapter.h"
+#import "ALNServices.h"
+
+NS_ASSUME_NONNULL_BEGIN
+
+@class ALNMetricsRegistry;
+@class ALNSQLBuilder;
+
+// Read-through result cache in front of another adapter. Cached reads are
+// keyed by compiled SQL plus parameters and tagged with the tables they
+// read; a write to a table invalidates every entry tagged with it.
+//
+// Tags are versioned in the cache adapter itself: each entry key embeds the
+// current version of its tags, and invalidation replaces the version, so
+// stale entries simply stop being found and age out by TTL. With a shared
+// cache (Redis) invalidation is therefore visible to every process; with
+// per-process caches, set `invalidationChannel` and run an invalidation
+// listener in each process.
+//
+// Writes invalidate when they go through this adapter: executeCommand,
+// executeBuilderCommand, write statements sent through executeQuery
+// (INSERT ... RETURNING), and everything done on connections from
+// withTransactionUsingBlock: or acquireAdapterConnection:, including COPY
+// and pipelines sent with ALNPgConnection's bulkCopyIntoTable and
+// executePipeline, which invalidate once the transaction commits or the
+// connection is released. Those connections, and this adapter, report what
+// they wrap through ALNDatabaseUnderlyingConnection and
+// ALNDatabaseUnderlyingAdapter. Written tables
+// are recognized in INSERT, UPDATE, DELETE, MERGE, TRUNCATE, COPY ... FROM,
+// ALTER TABLE, and DROP TABLE statements. Tags are bare lowercase table
+// names, so `public.users` and `"Users"` both tag `users`.
+@interface ALNDatabaseQueryCache : NSObject <ALNDatabaseAdapter>
+
+@property(nonatomic, strong, readonly) id<ALNDatabaseAdapter> adapter;
+@property(nonatomic, strong, readonly) id<ALNCacheAdapter> cache;
+// Used when a cached read passes ttlSeconds <= 0. Default 60 seconds.
+@property(nonatomic, assign) NSTimeInterval defaultTTLSeconds;
+// Prefix for every key this instance writes. Default `aln:qc:`.
+@property(nonatomic, copy) NSString *keyPrefix;
+// Receives db_query_cache_{hits,misses,invalidations}_total counters.
+@property(nonatomic, strong, nullable) ALNMetricsRegistry *metrics;
+// When set, invalidations are also published with pg_notify() on this
+// channel through the wrapped adapter, for listeners in other processes.
+@property(nonatomic, copy, nullable) NSString *invalidationChannel;
+
+// Bare lowercase table names written by `sql`, in statement order.
++ (NSArray<NSString *> *)tablesWrittenBySQL:(NSString *)sql;
+
+- (instancetype)initWithAdapter:(id<ALNDatabaseAdapter>)adapter
+                          cache:(id<ALNCacheAdapter>)cache;
+- (instancetype)init NS_UNAVAILABLE;
+
+// Passes through uncached, like executeQuery; caching is opt-in.
+- (nullable NSArray<NSDictionary *> *)executeBuilderQuery:(ALNSQLBuilder *)builder
+                                                     error:(NSError *_Nullable *_Nullable)error;
+// Cached and tagged with the builder's referencedTableNames, which miss
+// tables named only in raw SQL fragments; cache such statements with
+// executeCachedQuery and explicit tables instead.
+- (nullable ALNDatabaseResult *)executeCachedBuilderQuery:(ALNSQLBuilder *)builder
+                                               ttlSeconds:(NSTimeInterval)ttlSeconds
+                                                    error:(NSError *_Nullable *_Nullable)error;
+// Raw SQL carries no table information, so the tags are given explicitly.
+- (nullable ALNDatabaseResult *)executeCachedQuery:(NSString *)sql
+                                        parameters:(nullable NSArray *)parameters
+                                            tables:(NSArray<NSString *> *)tables
+                                        ttlSeconds:(NSTimeInterval)ttlSeconds
+                                             error:(NSError *_Nullable *_Nullable)error;
+
+- (NSInteger)executeBuilderCommand:(ALNSQLBuilder *)builder
+                              error:(NSError *_Nullable *_Nullable)error;
+
+// Invalidates every entry tagged with any of `tables`, and publishes the
+// invalidation when `invalidationChannel` is set.
+- (BOOL)invalidateTables:(NSArray<NSString *> *)tables
+                   error:(NSError *_Nullable *_Nullable)error;
+
+// Opens a dedicated connection that LISTENs on `invalidationChannel` and
+// applies invalidations published by other processes, on a background
+// thread, until stopInvalidationListener. PostgreSQL only.
+- (BOOL)startInvalidationListenerWithConnectionString:(NSString *)connectionString
+                                                error:(NSError *_Nullable *_Nullable)error;
+- (void)stopInvalidationListener;
+
+// { hits, misses, invalidations, statements }, where statements lists
+// { id, statement, hits, misses } per normalized statement, most hits
+// first.
+- (NSDictionary<NSString *, id> *)statistics;
+- (void)resetStatistics;
+
+@end
+
+NS_ASSUME_NONNULL_END
+
+#endif
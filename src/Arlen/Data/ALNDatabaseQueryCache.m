@@ -0,0 +1,993 @@
+#import "ALNDatabaseQueryCache.h"
+
+#import "ALNMetrics.h"
+#import "ALNPg.h"
+#import "ALNSQLBuilder.h"
+#import "ALNSQLStatementStats.h"
+#import "ALNSecurityPrimitives.h"
+
+// Distinct statements with their own hit/miss counters; the rest only count
+// toward the totals.
+static const NSUInteger ALNDatabaseQueryCacheMaxStatements = 500;
+static const NSUInteger ALNDatabaseQueryCacheNormalizationCacheLimit = 4096;
+
+// Tags are bare lowercase table names: no quotes, no schema.
+static NSString *ALNDatabaseQueryCacheTag(NSString *table) {
+  if (![table isKindOfClass:[NSString class]]) {
+    return nil;
+  }
+  NSString *name = [[table componentsSeparatedByString:@"."] lastObject];
+  name = [[name stringByReplacingOccurrencesOfString:@"\"" withString:@""]
+      stringByTrimmingCharactersInSet:[NSCharacterSet whitespaceAndNewlineCharacterSet]];
+  return ([name length] > 0) ? [name lowercaseString] : nil;
+}
+
+static NSArray<NSString *> *ALNDatabaseQueryCacheTags(NSArray *tables) {
+  NSMutableSet<NSString *> *tags = [NSMutableSet set];
+  for (id table in [tables isKindOfClass:[NSArray class]] ? tables : @[]) {
+    NSString *tag = ALNDatabaseQueryCacheTag(table);
+    if (tag != nil) {
+      [tags addObject:tag];
+    }
+  }
+  return [[tags allObjects] sortedArrayUsingSelector:@selector(compare:)];
+}
+
+static BOOL ALNDatabaseQueryCacheIsWordCharacter(unichar c) {
+  return (c >= 'a' && c <= 'z') || (c >= 'A' && c <= 'Z') || (c >= '0' && c <= '9') || c == '_' ||
+         c == '$' || c == '.' || c > 127;
+}
+
+// Words (dotted and quoted names stay whole) and the punctuation the write
+// patterns need; literals and comments are skipped.
+static NSArray<NSString *> *ALNDatabaseQueryCacheSQLTokens(NSString *sql) {
+  NSMutableArray<NSString *> *tokens = [NSMutableArray array];
+  NSUInteger length = [sql length];
+  NSUInteger idx = 0;
+  while (idx < length) {
+    unichar c = [sql characterAtIndex:idx];
+    unichar next = (idx + 1 < length) ? [sql characterAtIndex:idx + 1] : 0;
+    if (c == '-' && next == '-') {
+      while (idx < length && [sql characterAtIndex:idx] != '\n') {
+        idx++;
+      }
+    } else if (c == '/' && next == '*') {
+      NSRange end = [sql rangeOfString:@"*/" options:0 range:NSMakeRange(idx + 2, length - idx - 2)];
+      idx = (end.location == NSNotFound) ? length : NSMaxRange(end);
+    } else if (c == '\'') {
+      idx++;
+      while (idx < length && [sql characterAtIndex:idx] != '\'') {
+        idx++;
+      }
+      idx++;
+    } else if (c == '"' || ALNDatabaseQueryCacheIsWordCharacter(c)) {
+      NSUInteger start = idx;
+      while (idx < length) {
+        unichar current = [sql characterAtIndex:idx];
+        if (current == '"') {
+          NSRange close = [sql rangeOfString:@"\"" options:0 range:NSMakeRange(idx + 1, length - idx - 1)];
+          idx = (close.location == NSNotFound) ? length : close.location + 1;
+        } else if (ALNDatabaseQueryCacheIsWordCharacter(current)) {
+          idx++;
+        } else {
+          break;
+        }
+      }
+      [tokens addObject:[sql substringWithRange:NSMakeRange(start, idx - start)]];
+    } else {
+      if (c == ',' || c == ';' || c == '(' || c == ')') {
+        [tokens addObject:[NSString stringWithCharacters:&c length:1]];
+      }
+      idx++;
+    }
+  }
+  return tokens;
+}
+
+static BOOL ALNDatabaseQueryCacheHasKeywordAt(NSString *sql, NSUInteger idx, NSString *keyword) {
+  NSUInteger end = idx + [keyword length];
+  if (end > [sql length] ||
+      [sql compare:keyword options:NSCaseInsensitiveSearch range:NSMakeRange(idx, [keyword length])] !=
+          NSOrderedSame) {
+    return NO;
+  }
+  return end == [sql length] || !ALNDatabaseQueryCacheIsWordCharacter([sql characterAtIndex:end]);
+}
+
+// Most statements passed through are plain reads. A leading SELECT, or a
+// WITH whose text never mentions a data-modifying keyword, writes nothing,
+// which is cheaper to see than tokenizing the statement. Anything else,
+// including a leading comment, gets the full scan.
+static BOOL ALNDatabaseQueryCacheIsPlainRead(NSString *sql) {
+  NSUInteger length = [sql length];
+  NSUInteger idx = 0;
+  while (idx < length) {
+    unichar c = [sql characterAtIndex:idx];
+    if (c != ' ' && c != '\t' && c != '\n' && c != '\r' && c != '(') {
+      break;
+    }
+    idx++;
+  }
+  if (ALNDatabaseQueryCacheHasKeywordAt(sql, idx, @"SELECT")) {
+    return YES;
+  }
+  if (!ALNDatabaseQueryCacheHasKeywordAt(sql, idx, @"WITH")) {
+    return NO;
+  }
+  for (NSString *keyword in @[ @"INSERT", @"UPDATE", @"DELETE", @"MERGE" ]) {
+    if ([sql rangeOfString:keyword options:NSCaseInsensitiveSearch].location != NSNotFound) {
+      return NO;
+    }
+  }
+  return YES;
+}
+
+static NSString *ALNDatabaseQueryCacheKeyword(NSArray<NSString *> *tokens, NSUInteger idx) {
+  return (idx < [tokens count]) ? [tokens[idx] uppercaseString] : @"";
+}
+
+// Adds the table named at `idx` unless it is a keyword the patterns can land
+// on (`DO UPDATE SET`, `FOR UPDATE OF`, ...). Returns the index after it.
+static NSUInteger ALNDatabaseQueryCacheAddTable(NSArray<NSString *> *tokens,
+                                                NSUInteger idx,
+                                                NSMutableOrderedSet<NSString *> *tables) {
+  static NSSet<NSString *> *notTables = nil;
+  static dispatch_once_t onceToken;
+  dispatch_once(&onceToken, ^{
+    notTables = [NSSet setWithArray:@[
+      @"SET", @"ON", @"OF", @"ONLY", @"TABLE", @"FROM", @"WHERE", @"NOWAIT", @"SKIP", @"IF",
+      @",", @";", @"(", @")"
+    ]];
+  });
+  if ([ALNDatabaseQueryCacheKeyword(tokens, idx) isEqualToString:@"ONLY"]) {
+    idx++;
+  }
+  if (idx >= [tokens count] || [notTables containsObject:[tokens[idx] uppercaseString]]) {
+    return idx;
+  }
+  NSString *tag = ALNDatabaseQueryCacheTag(tokens[idx]);
+  if (tag != nil) {
+    [tables addObject:tag];
+  }
+  return idx + 1;
+}
+
+static NSUInteger ALNDatabaseQueryCacheAddTableList(NSArray<NSString *> *tokens,
+                                                    NSUInteger idx,
+                                                    NSMutableOrderedSet<NSString *> *tables) {
+  idx = ALNDatabaseQueryCacheAddTable(tokens, idx, tables);
+  while ([ALNDatabaseQueryCacheKeyword(tokens, idx) isEqualToString:@","]) {
+    idx = ALNDatabaseQueryCacheAddTable(tokens, idx + 1, tables);
+  }
+  return idx;
+}
+
+// Content-addressed form of one parameter; type-tagged and length-prefixed
+// so distinct values never collide.
+static NSString *ALNDatabaseQueryCacheParameterFingerprint(id value) {
+  NSString *kind = nil;
+  NSString *text = nil;
+  if (value == nil || value == [NSNull null]) {
+    return @"z;";
+  } else if ([value isKindOfClass:[NSString class]]) {
+    kind = @"s";
+    text = value;
+  } else if ([value isKindOfClass:[NSNumber class]]) {
+    kind = [NSString stringWithFormat:@"n%s", [value objCType]];
+    text = [value stringValue];
+  } else if ([value isKindOfClass:[NSDate class]]) {
+    kind = @"d";
+    text = [NSString stringWithFormat:@"%.6f", [value timeIntervalSince1970]];
+  } else if ([value isKindOfClass:[NSData class]]) {
+    kind = @"b";
+    text = [value base64EncodedStringWithOptions:0];
+  } else if ([value isKindOfClass:[NSArray class]]) {
+    NSMutableString *items = [NSMutableString string];
+    for (id item in value) {
+      [items appendString:ALNDatabaseQueryCacheParameterFingerprint(item)];
+    }
+    kind = @"a";
+    text = items;
+  } else {
+    kind = NSStringFromClass([value class]);
+    text = [value description];
+  }
+  return [NSString stringWithFormat:@"%@%lu:%@;", kind, (unsigned long)[text length], text];
+}
+
+static NSString *ALNDatabaseQueryCacheHex(NSData *data) {
+  const unsigned char *bytes = [data bytes];
+  NSMutableString *hex = [NSMutableString stringWithCapacity:[data length] * 2];
+  for (NSUInteger idx = 0; idx < [data length]; idx++) {
+    [hex appendFormat:@"%02x", bytes[idx]];
+  }
+  return hex;
+}
+
+static NSString *ALNDatabaseQueryCacheQuotedIdentifier(NSString *identifier) {
+  return [NSString stringWithFormat:@"\"%@\"",
+                                    [identifier stringByReplacingOccurrencesOfString:@"\""
+                                                                          withString:@"\"\""]];
+}
+
+// Passes a transaction or acquired connection through while recording the
+// tables written on it.
+@interface ALNDatabaseQueryCacheConnection : NSObject <ALNDatabaseConnection>
+
+@property(nonatomic, strong, readonly) id<ALNDatabaseConnection> connection;
+@property(nonatomic, strong, readonly) NSMutableOrderedSet<NSString *> *writtenTables;
+
+- (instancetype)initWithConnection:(id<ALNDatabaseConnection>)connection;
+
+@end
+
+@implementation ALNDatabaseQueryCacheConnection
+
+- (instancetype)initWithConnection:(id<ALNDatabaseConnection>)connection {
+  self = [super init];
+  if (self) {
+    _connection = connection;
+    _writtenTables = [NSMutableOrderedSet orderedSet];
+  }
+  return self;
+}
+
+- (BOOL)respondsToSelector:(SEL)selector {
+  if (selector == @selector(executeQueryResult:parameters:error:) ||
+      selector == @selector(executeCommandBatch:parameterSets:error:) ||
+      selector == @selector(bulkCopyIntoTable:columns:format:rowProducer:error:) ||
+      selector == @selector(executePipeline:error:) ||
+      selector == @selector(streamQuery:parameters:batchSize:usingBlock:error:)) {
+    return [self.connection respondsToSelector:selector];
+  }
+  return [super respondsToSelector:selector] || [self.connection respondsToSelector:selector];
+}
+
+- (id)forwardingTargetForSelector:(SEL)selector {
+  (void)selector;
+  return self.connection;
+}
+
+- (id<ALNDatabaseConnection>)underlyingConnection {
+  return self.connection;
+}
+
+- (void)recordWritesForSQL:(NSString *)sql {
+  [self.writtenTables addObjectsFromArray:[ALNDatabaseQueryCache tablesWrittenBySQL:sql]];
+}
+
+- (NSArray<NSDictionary *> *)executeQuery:(NSString *)sql
+                               parameters:(NSArray *)parameters
+                                    error:(NSError **)error {
+  NSArray<NSDictionary *> *rows = [self.connection executeQuery:sql parameters:parameters error:error];
+  if (rows != nil) {
+    [self recordWritesForSQL:sql];
+  }
+  return rows;
+}
+
+- (NSDictionary *)executeQueryOne:(NSString *)sql
+                       parameters:(NSArray *)parameters
+                            error:(NSError **)error {
+  NSError *queryError = nil;
+  NSDictionary *row = [self.connection executeQueryOne:sql parameters:parameters error:&queryError];
+  if (queryError == nil) {
+    [self recordWritesForSQL:sql];
+  } else if (error != NULL) {
+    *error = queryError;
+  }
+  return row;
+}
+
+- (ALNDatabaseResult *)executeQueryResult:(NSString *)sql
+                               parameters:(NSArray *)parameters
+                                    error:(NSError **)error {
+  ALNDatabaseResult *result = [self.connection executeQueryResult:sql parameters:parameters error:error];
+  if (result != nil) {
+    [self recordWritesForSQL:sql];
+  }
+  return result;
+}
+
+- (NSInteger)executeCommand:(NSString *)sql
+                 parameters:(NSArray *)parameters
+                      error:(NSError **)error {
+  NSInteger affected = [self.connection executeCommand:sql parameters:parameters error:error];
+  if (affected >= 0) {
+    [self recordWritesForSQL:sql];
+  }
+  return affected;
+}
+
+- (NSInteger)executeCommandBatch:(NSString *)sql
+                   parameterSets:(NSArray<NSArray *> *)parameterSets
+                           error:(NSError **)error {
+  NSInteger affected = [self.connection executeCommandBatch:sql parameterSets:parameterSets error:error];
+  if (affected >= 0) {
+    [self recordWritesForSQL:sql];
+  }
+  return affected;
+}
+
+// PostgreSQL-only entry points, implemented here rather than forwarded so
+// their writes are recorded too.
+- (NSInteger)bulkCopyIntoTable:(NSString *)table
+                       columns:(NSArray<NSString *> *)columns
+                        format:(ALNPgCopyFormat)format
+                   rowProducer:(ALNPgCopyRowProducer)rowProducer
+                         error:(NSError **)error {
+  NSInteger copied = [(ALNPgConnection *)self.connection bulkCopyIntoTable:table
+                                                                   columns:columns
+                                                                    format:format
+                                                               rowProducer:rowProducer
+                                                                     error:error];
+  NSString *tag = ALNDatabaseQueryCacheTag(table);
+  if (copied >= 0 && tag != nil) {
+    [self.writtenTables addObject:tag];
+  }
+  return copied;
+}
+
+- (NSArray *)executePipeline:(ALNPgPipeline *)pipeline error:(NSError **)error {
+  NSArray<NSString *> *statements = [pipeline statements];
+  NSArray *outcomes = [(ALNPgConnection *)self.connection executePipeline:pipeline error:error];
+  for (NSUInteger idx = 0; idx < [outcomes count] && idx < [statements count]; idx++) {
+    if (![outcomes[idx] isKindOfClass:[NSError class]]) {
+      [self recordWritesForSQL:statements[idx]];
+    }
+  }
+  return outcomes;
+}
+
+- (BOOL)streamQuery:(NSString *)sql
+         parameters:(NSArray *)parameters
+          batchSize:(NSUInteger)batchSize
+         usingBlock:(ALNPgRowBatchBlock)block
+              error:(NSError **)error {
+  BOOL streamed = [(ALNPgConnection *)self.connection streamQuery:sql
+                                                       parameters:parameters
+                                                        batchSize:batchSize
+                                                       usingBlock:block
+                                                            error:error];
+  if (streamed) {
+    [self recordWritesForSQL:sql];
+  }
+  return streamed;
+}
+
+@end
+
+// The LISTEN connection and stop flag shared with the listener thread.
+@interface ALNDatabaseQueryCacheListener : NSObject
+
+@property(nonatomic, copy) NSString *connectionString;
+@property(nonatomic, copy) NSString *channel;
+@property(atomic, assign) BOOL stopped;
+
+@end
+
+@implementation ALNDatabaseQueryCacheListener
+@end
+
+@interface ALNDatabaseQueryCache () {
+  NSLock *_lock;
+  NSMutableDictionary<NSString *, NSMutableDictionary *> *_statements;
+  NSMutableDictionary<NSString *, NSString *> *_normalizedByRawSQL;
+  unsigned long long _hits;
+  unsigned long long _misses;
+  unsigned long long _invalidations;
+  // Prefixes published invalidations so the listener skips our own.
+  NSString *_instanceToken;
+  ALNDatabaseQueryCacheListener *_listener;
+}
+
+@property(nonatomic, strong, readwrite) id<ALNDatabaseAdapter> adapter;
+@property(nonatomic, strong, readwrite) id<ALNCacheAdapter> cache;
+
+@end
+
+@implementation ALNDatabaseQueryCache
+
++ (NSArray<NSString *> *)tablesWrittenBySQL:(NSString *)sql {
+  if (![sql isKindOfClass:[NSString class]] || [sql length] == 0 || ALNDatabaseQueryCacheIsPlainRead(sql)) {
+    return @[];
+  }
+  NSArray<NSString *> *tokens = ALNDatabaseQueryCacheSQLTokens(sql);
+  NSMutableOrderedSet<NSString *> *tables = [NSMutableOrderedSet orderedSet];
+  NSUInteger count = [tokens count];
+  for (NSUInteger idx = 0; idx < count; idx++) {
+    NSString *keyword = [tokens[idx] uppercaseString];
+    NSString *nextKeyword = ALNDatabaseQueryCacheKeyword(tokens, idx + 1);
+    if (([keyword isEqualToString:@"INSERT"] || [keyword isEqualToString:@"MERGE"]) &&
+        [nextKeyword isEqualToString:@"INTO"]) {
+      ALNDatabaseQueryCacheAddTable(tokens, idx + 2, tables);
+    } else if ([keyword isEqualToString:@"DELETE"] && [nextKeyword isEqualToString:@"FROM"]) {
+      ALNDatabaseQueryCacheAddTable(tokens, idx + 2, tables);
+    } else if ([keyword isEqualToString:@"UPDATE"]) {
+      // Not the UPDATE of `FOR [NO KEY] UPDATE` or `ON CONFLICT DO UPDATE`.
+      NSString *previous = (idx > 0) ? [tokens[idx - 1] uppercaseString] : @"";
+      if (![previous isEqualToString:@"FOR"] && ![previous isEqualToString:@"KEY"] &&
+          ![previous isEqualToString:@"DO"]) {
+        ALNDatabaseQueryCacheAddTable(tokens, idx + 1, tables);
+      }
+    } else if ([keyword isEqualToString:@"TRUNCATE"]) {
+      NSUInteger start = [nextKeyword isEqualToString:@"TABLE"] ? idx + 2 : idx + 1;
+      ALNDatabaseQueryCacheAddTableList(tokens, start, tables);
+    } else if (([keyword isEqualToString:@"ALTER"] || [keyword isEqualToString:@"DROP"]) &&
+               [nextKeyword isEqualToString:@"TABLE"]) {
+      NSUInteger start = idx + 2;
+      if ([ALNDatabaseQueryCacheKeyword(tokens, start) isEqualToString:@"IF"]) {
+        start += [ALNDatabaseQueryCacheKeyword(tokens, start + 1) isEqualToString:@"NOT"] ? 3 : 2;
+      }
+      ALNDatabaseQueryCacheAddTableList(tokens, start, tables);
+    } else if ([keyword isEqualToString:@"COPY"]) {
+      for (NSUInteger scan = idx + 2; scan < count; scan++) {
+        NSString *word = [tokens[scan] uppercaseString];
+        if ([word isEqualToString:@"FROM"]) {
+          ALNDatabaseQueryCacheAddTable(tokens, idx + 1, tables);
+          break;
+        }
+        if ([word isEqualToString:@"TO"] || [word isEqualToString:@";"]) {
+          break;
+        }
+      }
+    }
+  }
+  return [tables array];
+}
+
+- (instancetype)initWithAdapter:(id<ALNDatabaseAdapter>)adapter cache:(id<ALNCacheAdapter>)cache {
+  self = [super init];
+  if (self) {
+    _adapter = adapter;
+    _cache = cache;
+    _defaultTTLSeconds = 60.0;
+    _keyPrefix = @"aln:qc:";
+    _lock = [[NSLock alloc] init];
+    _statements = [NSMutableDictionary dictionary];
+    _normalizedByRawSQL = [NSMutableDictionary dictionary];
+    _instanceToken = [[NSUUID UUID] UUIDString];
+  }
+  return self;
+}
+
+- (void)dealloc {
+  _listener.stopped = YES;
+}
+
+#pragma mark - ALNDatabaseAdapter
+
+- (NSString *)adapterName {
+  return [self.adapter adapterName];
+}
+
+- (id<ALNDatabaseAdapter>)underlyingAdapter {
+  return self.adapter;
+}
+
+- (id<ALNSQLDialect>)sqlDialect {
+  return [self.adapter respondsToSelector:@selector(sqlDialect)] ? [self.adapter sqlDialect] : nil;
+}
+
+- (NSDictionary<NSString *, id> *)capabilityMetadata {
+  NSMutableDictionary<NSString *, id> *metadata = [NSMutableDictionary dictionary];
+  if ([self.adapter respondsToSelector:@selector(capabilityMetadata)]) {
+    [metadata addEntriesFromDictionary:[self.adapter capabilityMetadata] ?: @{}];
+  }
+  metadata[@"query_cache_enabled"] = @YES;
+  metadata[@"query_cache_adapter"] = [self.cache adapterName] ?: @"";
+  metadata[@"query_cache_invalidation_channel"] = self.invalidationChannel ?: @"";
+  return metadata;
+}
+
+- (id<ALNDatabaseConnection>)acquireAdapterConnection:(NSError **)error {
+  id<ALNDatabaseConnection> connection = [self.adapter acquireAdapterConnection:error];
+  return (connection != nil) ? [[ALNDatabaseQueryCacheConnection alloc] initWithConnection:connection] : nil;
+}
+
+- (void)releaseAdapterConnection:(id<ALNDatabaseConnection>)connection {
+  if (![(id)connection isKindOfClass:[ALNDatabaseQueryCacheConnection class]]) {
+    [self.adapter releaseAdapterConnection:connection];
+    return;
+  }
+  ALNDatabaseQueryCacheConnection *tracking = (ALNDatabaseQueryCacheConnection *)connection;
+  [self.adapter releaseAdapterConnection:tracking.connection];
+  if ([tracking.writtenTables count] > 0) {
+    (void)[self invalidateTables:[tracking.writtenTables array] error:NULL];
+  }
+}
+
+- (NSArray<NSDictionary *> *)executeQuery:(NSString *)sql
+                               parameters:(NSArray *)parameters
+                                    error:(NSError **)error {
+  NSArray<NSDictionary *> *rows = [self.adapter executeQuery:sql parameters:parameters ?: @[] error:error];
+  if (rows != nil) {
+    [self invalidateTablesWrittenBySQL:sql];
+  }
+  return rows;
+}
+
+- (ALNDatabaseResult *)executeQueryResult:(NSString *)sql
+                               parameters:(NSArray *)parameters
+                                    error:(NSError **)error {
+  ALNDatabaseResult *result = [self uncachedResultForSQL:sql parameters:parameters ?: @[] error:error];
+  if (result != nil) {
+    [self invalidateTablesWrittenBySQL:sql];
+  }
+  return result;
+}
+
+- (NSInteger)executeCommand:(NSString *)sql
+                 parameters:(NSArray *)parameters
+                      error:(NSError **)error {
+  NSInteger affected = [self.adapter executeCommand:sql parameters:parameters ?: @[] error:error];
+  if (affected >= 0) {
+    [self invalidateTablesWrittenBySQL:sql];
+  }
+  return affected;
+}
+
+- (NSInteger)executeCommandBatch:(NSString *)sql
+                   parameterSets:(NSArray<NSArray *> *)parameterSets
+                           error:(NSError **)error {
+  NSInteger affected = 0;
+  if ([self.adapter respondsToSelector:@selector(executeCommandBatch:parameterSets:error:)]) {
+    affected = [self.adapter executeCommandBatch:sql parameterSets:parameterSets ?: @[] error:error];
+  } else {
+    for (NSArray *parameters in parameterSets ?: @[]) {
+      NSInteger rowAffected = [self.adapter executeCommand:sql parameters:parameters error:error];
+      if (rowAffected < 0) {
+        affected = rowAffected;
+        break;
+      }
+      affected += rowAffected;
+    }
+  }
+  if (affected >= 0) {
+    [self invalidateTablesWrittenBySQL:sql];
+  }
+  return affected;
+}
+
+- (BOOL)withTransactionUsingBlock:(BOOL (^)(id<ALNDatabaseConnection> connection,
+                                            NSError **error))block
+                            error:(NSError **)error {
+  if (block == nil) {
+    return [self.adapter withTransactionUsingBlock:block error:error];
+  }
+  __block NSArray<NSString *> *writtenTables = nil;
+  BOOL committed =
+      [self.adapter withTransactionUsingBlock:^BOOL(id<ALNDatabaseConnection> connection, NSError **blockError) {
+        ALNDatabaseQueryCacheConnection *tracking =
+            [[ALNDatabaseQueryCacheConnection alloc] initWithConnection:connection];
+        BOOL result = block(tracking, blockError);
+        writtenTables = [tracking.writtenTables array];
+        return result;
+      }
+                                        error:error];
+  // Only after commit: a reader between our writes and the commit caches
+  // old rows under the old tag versions, which this makes unreachable.
+  if (committed && [writtenTables count] > 0) {
+    (void)[self invalidateTables:writtenTables error:NULL];
+  }
+  return committed;
+}
+
+#pragma mark - Cached reads
+
+// Not cached: a builder can read tables through raw SQL fragments that
+// referencedTableNames cannot see, so caching is left to callers who know
+// the statement (executeCachedBuilderQuery:ttlSeconds:error:).
+- (NSArray<NSDictionary *> *)executeBuilderQuery:(ALNSQLBuilder *)builder error:(NSError **)error {
+  NSDictionary *built = [self compiledBuilder:builder error:error];
+  if (built == nil) {
+    return nil;
+  }
+  return [self executeQuery:built[@"sql"] parameters:built[@"parameters"] error:error];
+}
+
+- (ALNDatabaseResult *)executeCachedBuilderQuery:(ALNSQLBuilder *)builder
+                                      ttlSeconds:(NSTimeInterval)ttlSeconds
+                                           error:(NSError **)error {
+  NSDictionary *built = [self compiledBuilder:builder error:error];
+  if (built == nil) {
+    return nil;
+  }
+  return [self executeCachedQuery:built[@"sql"]
+                       parameters:built[@"parameters"]
+                           tables:[builder referencedTableNames]
+                       ttlSeconds:ttlSeconds
+                            error:error];
+}
+
+- (ALNDatabaseResult *)executeCachedQuery:(NSString *)sql
+                               parameters:(NSArray *)parameters
+                                   tables:(NSArray<NSString *> *)tables
+                               ttlSeconds:(NSTimeInterval)ttlSeconds
+                                    error:(NSError **)error {
+  if (error != NULL) {
+    *error = nil;
+  }
+  NSArray *resolvedParameters = [parameters isKindOfClass:[NSArray class]] ? parameters : @[];
+  // Cache failures degrade to an uncached read rather than failing it.
+  NSString *key = [self entryKeyForSQL:sql parameters:resolvedParameters tags:ALNDatabaseQueryCacheTags(tables)];
+  ALNDatabaseResult *result = nil;
+  if (key != nil) {
+    result = [self resultFromStoredObject:[self.cache objectForKey:key atTime:[NSDate date] error:NULL]];
+  }
+  [self recordLookupForSQL:sql hit:(result != nil)];
+  if (result != nil) {
+    return result;
+  }
+
+  result = [self uncachedResultForSQL:sql parameters:resolvedParameters error:error];
+  if (result != nil && key != nil) {
+    id stored = [self storedObjectForResult:result];
+    if (stored != nil) {
+      (void)[self.cache setObject:stored
+                           forKey:key
+                       ttlSeconds:(ttlSeconds > 0) ? ttlSeconds : self.defaultTTLSeconds
+                            error:NULL];
+    }
+  }
+  return result;
+}
+
+- (NSInteger)executeBuilderCommand:(ALNSQLBuilder *)builder error:(NSError **)error {
+  NSDictionary *built = [self compiledBuilder:builder error:error];
+  if (built == nil) {
+    return -1;
+  }
+  NSInteger affected = [self.adapter executeCommand:built[@"sql"] parameters:built[@"parameters"] error:error];
+  if (affected >= 0) {
+    NSMutableOrderedSet<NSString *> *tables =
+        [NSMutableOrderedSet orderedSetWithArray:[[self class] tablesWrittenBySQL:built[@"sql"]]];
+    if ([builder.tableName length] > 0) {
+      [tables addObject:builder.tableName];
+    }
+    (void)[self invalidateTables:[tables array] error:NULL];
+  }
+  return affected;
+}
+
+- (NSDictionary *)compiledBuilder:(ALNSQLBuilder *)builder error:(NSError **)error {
+  if (![builder isKindOfClass:[ALNSQLBuilder class]]) {
+    if (error != NULL) {
+      *error = ALNDatabaseAdapterMakeError(ALNDatabaseAdapterErrorInvalidArgument,
+                                           @"builder must be an ALNSQLBuilder",
+                                           nil);
+    }
+    return nil;
+  }
+  NSDictionary *built = [builder buildWithDialect:[self sqlDialect] error:error];
+  if (![built[@"sql"] isKindOfClass:[NSString class]]) {
+    return nil;
+  }
+  return @{
+    @"sql" : built[@"sql"],
+    @"parameters" : [built[@"parameters"] isKindOfClass:[NSArray class]] ? built[@"parameters"] : @[],
+  };
+}
+
+- (ALNDatabaseResult *)uncachedResultForSQL:(NSString *)sql
+                                 parameters:(NSArray *)parameters
+                                      error:(NSError **)error {
+  if ([self.adapter respondsToSelector:@selector(executeQueryResult:parameters:error:)]) {
+    return [self.adapter executeQueryResult:sql parameters:parameters error:error];
+  }
+  NSArray<NSDictionary *> *rows = [self.adapter executeQuery:sql parameters:parameters error:error];
+  return (rows != nil) ? ALNDatabaseResultFromRows(rows) : nil;
+}
+
+#pragma mark - Keys and storage
+
+- (NSString *)tagKeyForTag:(NSString *)tag {
+  return [NSString stringWithFormat:@"%@t:%@", self.keyPrefix ?: @"", tag];
+}
+
+// The tag's current version, created on first use. nil when the cache
+// cannot be read or written.
+- (NSString *)versionForTag:(NSString *)tag {
+  NSString *key = [self tagKeyForTag:tag];
+  NSError *cacheError = nil;
+  id version = [self.cache objectForKey:key atTime:[NSDate date] error:&cacheError];
+  if ([version isKindOfClass:[NSString class]]) {
+    return version;
+  }
+  if (cacheError != nil) {
+    return nil;
+  }
+  NSString *fresh = [[NSUUID UUID] UUIDString];
+  return [self.cache setObject:fresh forKey:key ttlSeconds:0 error:NULL] ? fresh : nil;
+}
+
+- (NSString *)entryKeyForSQL:(NSString *)sql parameters:(NSArray *)parameters tags:(NSArray<NSString *> *)tags {
+  if (![sql isKindOfClass:[NSString class]] || [sql length] == 0 || self.cache == nil) {
+    return nil;
+  }
+  NSMutableString *material = [NSMutableString stringWithFormat:@"%lu:%@\n", (unsigned long)[sql length], sql];
+  for (id parameter in parameters) {
+    [material appendString:ALNDatabaseQueryCacheParameterFingerprint(parameter)];
+  }
+  [material appendString:@"\n"];
+  for (NSString *tag in tags) {
+    NSString *version = [self versionForTag:tag];
+    if (version == nil) {
+      return nil;
+    }
+    [material appendFormat:@"%@=%@;", tag, version];
+  }
+  NSData *digest = ALNSHA256([material dataUsingEncoding:NSUTF8StringEncoding]);
+  if (digest == nil) {
+    return nil;
+  }
+  return [NSString stringWithFormat:@"%@r:%@", self.keyPrefix ?: @"", ALNDatabaseQueryCacheHex(digest)];
+}
+
+// The in-memory cache keeps the immutable result itself; other caches get
+// an archive, since rows carry NSNull and other non-property-list values.
+- (id)storedObjectForResult:(ALNDatabaseResult *)result {
+  if ([(id)self.cache isKindOfClass:[ALNInMemoryCacheAdapter class]]) {
+    return result;
+  }
+  NSArray<NSString *> *columns = result.columns ?: @[];
+  NSMutableArray *values = [NSMutableArray arrayWithCapacity:result.count * [columns count]];
+  for (NSDictionary *row in result.rows) {
+    BOOL columnar = [row isKindOfClass:[ALNDatabaseResultRow class]];
+    for (NSUInteger column = 0; column < [columns count]; column++) {
+      id value = columnar ? [(ALNDatabaseResultRow *)row valueAtColumnIndex:column] : row[columns[column]];
+      [values addObject:value ?: [NSNull null]];
+    }
+  }
+  @try {
+    return [NSKeyedArchiver archivedDataWithRootObject:@{ @"columns" : columns, @"values" : values }];
+  } @catch (NSException *exception) {
+    (void)exception;
+    return nil;
+  }
+}
+
+- (ALNDatabaseResult *)resultFromStoredObject:(id)stored {
+  if ([stored isKindOfClass:[ALNDatabaseResult class]]) {
+    return stored;
+  }
+  if (![stored isKindOfClass:[NSData class]]) {
+    return nil;
+  }
+  NSDictionary *archived = nil;
+  @try {
+    archived = [NSKeyedUnarchiver unarchiveObjectWithData:stored];
+  } @catch (NSException *exception) {
+    (void)exception;
+    return nil;
+  }
+  if (![archived isKindOfClass:[NSDictionary class]] || ![archived[@"columns"] isKindOfClass:[NSArray class]] ||
+      ![archived[@"values"] isKindOfClass:[NSArray class]]) {
+    return nil;
+  }
+  return [ALNDatabaseResult resultWithColumns:archived[@"columns"] rowValues:archived[@"values"]];
+}
+
+#pragma mark - Invalidation
+
+- (void)invalidateTablesWrittenBySQL:(NSString *)sql {
+  NSArray<NSString *> *tables = [[self class] tablesWrittenBySQL:sql];
+  if ([tables count] > 0) {
+    (void)[self invalidateTables:tables error:NULL];
+  }
+}
+
+- (BOOL)invalidateTags:(NSArray<NSString *> *)tags error:(NSError **)error {
+  BOOL ok = YES;
+  for (NSString *tag in tags) {
+    NSError *cacheError = nil;
+    if (![self.cache setObject:[[NSUUID UUID] UUIDString]
+                        forKey:[self tagKeyForTag:tag]
+                    ttlSeconds:0
+                         error:&cacheError]) {
+      if (ok && error != NULL) {
+        *error = cacheError;
+      }
+      ok = NO;
+    }
+  }
+  [_lock lock];
+  _invalidations += [tags count];
+  [_lock unlock];
+  [self.metrics incrementCounter:@"db_query_cache_invalidations_total" by:(double)[tags count]];
+  return ok;
+}
+
+- (BOOL)invalidateTables:(NSArray<NSString *> *)tables error:(NSError **)error {
+  if (error != NULL) {
+    *error = nil;
+  }
+  NSArray<NSString *> *tags = ALNDatabaseQueryCacheTags(tables);
+  if ([tags count] == 0) {
+    return YES;
+  }
+  BOOL ok = [self invalidateTags:tags error:error];
+
+  NSString *channel = self.invalidationChannel;
+  if ([channel length] > 0) {
+    NSString *payload =
+        [NSString stringWithFormat:@"%@ %@", _instanceToken, [tags componentsJoinedByString:@","]];
+    NSError *notifyError = nil;
+    if ([self.adapter executeQuery:@"SELECT pg_notify($1, $2)"
+                        parameters:@[ channel, payload ]
+                             error:&notifyError] == nil) {
+      if (ok && error != NULL) {
+        *error = notifyError;
+      }
+      ok = NO;
+    }
+  }
+  return ok;
+}
+
+- (void)applyInvalidationPayload:(NSString *)payload {
+  NSRange separator = [payload rangeOfString:@" "];
+  if (separator.location == NSNotFound ||
+      [[payload substringToIndex:separator.location] isEqualToString:_instanceToken]) {
+    return;
+  }
+  NSArray<NSString *> *tables =
+      [[payload substringFromIndex:NSMaxRange(separator)] componentsSeparatedByString:@","];
+  NSArray<NSString *> *tags = ALNDatabaseQueryCacheTags(tables);
+  if ([tags count] > 0) {
+    (void)[self invalidateTags:tags error:NULL];
+  }
+}
+
+- (ALNPgConnection *)openListenerConnection:(ALNDatabaseQueryCacheListener *)listener error:(NSError **)error {
+  ALNPgConnection *connection = [[ALNPgConnection alloc] initWithConnectionString:listener.connectionString
+                                                                            error:error];
+  if (connection == nil) {
+    return nil;
+  }
+  NSString *sql = [NSString stringWithFormat:@"LISTEN %@", ALNDatabaseQueryCacheQuotedIdentifier(listener.channel)];
+  if ([connection executeCommand:sql parameters:@[] error:error] < 0) {
+    [connection close];
+    return nil;
+  }
+  return connection;
+}
+
+- (BOOL)startInvalidationListenerWithConnectionString:(NSString *)connectionString error:(NSError **)error {
+  if (error != NULL) {
+    *error = nil;
+  }
+  if ([self.invalidationChannel length] == 0 || [connectionString length] == 0) {
+    if (error != NULL) {
+      *error = ALNDatabaseAdapterMakeError(ALNDatabaseAdapterErrorInvalidArgument,
+                                           @"invalidation listener requires invalidationChannel and a connection string",
+                                           nil);
+    }
+    return NO;
+  }
+  [self stopInvalidationListener];
+
+  ALNDatabaseQueryCacheListener *listener = [[ALNDatabaseQueryCacheListener alloc] init];
+  listener.connectionString = connectionString;
+  listener.channel = self.invalidationChannel;
+  ALNPgConnection *initial = [self openListenerConnection:listener error:error];
+  if (initial == nil) {
+    return NO;
+  }
+  [_lock lock];
+  _listener = listener;
+  [_lock unlock];
+
+  __weak ALNDatabaseQueryCache *weakSelf = self;
+  NSThread *thread = [[NSThread alloc] initWithBlock:^{
+    ALNPgConnection *connection = initial;
+    while (!listener.stopped) {
+      @autoreleasepool {
+        if (connection == nil) {
+          // Reconnect after a failure; invalidations published meanwhile are
+          // lost, so entries may stay stale until their TTL.
+          [NSThread sleepForTimeInterval:1.0];
+          connection = [weakSelf openListenerConnection:listener error:NULL];
+          continue;
+        }
+        NSArray<NSDictionary *> *notifications = [connection waitForNotificationsWithTimeout:1.0 error:NULL];
+        if (notifications == nil) {
+          [connection close];
+          connection = nil;
+          continue;
+        }
+        ALNDatabaseQueryCache *cache = weakSelf;
+        if (cache == nil) {
+          break;
+        }
+        for (NSDictionary *notification in notifications) {
+          [cache applyInvalidationPayload:notification[@"payload"]];
+        }
+      }
+    }
+    [connection close];
+  }];
+  [thread setName:@"arlen-db-query-cache-listener"];
+  [thread start];
+  return YES;
+}
+
+- (void)stopInvalidationListener {
+  [_lock lock];
+  ALNDatabaseQueryCacheListener *listener = _listener;
+  _listener = nil;
+  [_lock unlock];
+  listener.stopped = YES;
+}
+
+#pragma mark - Statistics
+
+- (void)recordLookupForSQL:(NSString *)sql hit:(BOOL)hit {
+  [self.metrics incrementCounter:hit ? @"db_query_cache_hits_total" : @"db_query_cache_misses_total"];
+  if (![sql isKindOfClass:[NSString class]]) {
+    return;
+  }
+
+  [_lock lock];
+  NSString *normalized = _normalizedByRawSQL[sql];
+  [_lock unlock];
+  if (normalized == nil) {
+    normalized = [ALNSQLStatementStats normalizedSQL:sql];
+  }
+
+  [_lock lock];
+  if ([_normalizedByRawSQL count] >= ALNDatabaseQueryCacheNormalizationCacheLimit) {
+    [_normalizedByRawSQL removeAllObjects];
+  }
+  _normalizedByRawSQL[[sql copy]] = normalized;
+  if (hit) {
+    _hits += 1;
+  } else {
+    _misses += 1;
+  }
+  NSMutableDictionary *entry = _statements[normalized];
+  if (entry == nil && [_statements count] < ALNDatabaseQueryCacheMaxStatements) {
+    entry = [NSMutableDictionary dictionaryWithDictionary:@{
+      @"id" : [ALNSQLStatementStats statementIDForNormalizedSQL:normalized],
+      @"statement" : normalized,
+      @"hits" : @0,
+      @"misses" : @0,
+    }];
+    _statements[normalized] = entry;
+  }
+  NSString *counter = hit ? @"hits" : @"misses";
+  entry[counter] = @([entry[counter] unsignedLongLongValue] + 1);
+  [_lock unlock];
+}
+
+- (NSDictionary<NSString *, id> *)statistics {
+  [_lock lock];
+  NSMutableArray<NSDictionary *> *statements = [NSMutableArray arrayWithCapacity:[_statements count]];
+  for (NSMutableDictionary *entry in [_statements allValues]) {
+    [statements addObject:[entry copy]];
+  }
+  NSDictionary *totals = @{
+    @"hits" : @(_hits),
+    @"misses" : @(_misses),
+    @"invalidations" : @(_invalidations),
+  };
+  [_lock unlock];
+
+  [statements sortUsingComparator:^NSComparisonResult(NSDictionary *left, NSDictionary *right) {
+    return [right[@"hits"] compare:left[@"hits"]];
+  }];
+  NSMutableDictionary<NSString *, id> *statistics = [NSMutableDictionary dictionaryWithDictionary:totals];
+  statistics[@"statements"] = statements;
+  return statistics;
+}
+
+- (void)resetStatistics {
+  [_lock lock];
+  [_statements removeAllObjects];
+  _hits = 0;
+  _misses = 0;
+  _invalidations = 0;
+  [_lock unlock];
+}
+
+@end
@@ -7,6 +7,8 @@
 
 NS_ASSUME_NONNULL_BEGIN
 
+@class ALNMetricsRegistry;
+
 extern NSString *const ALNDatabaseRouterErrorDomain;
 
 typedef NS_ENUM(NSInteger, ALNDatabaseRouterErrorCode) {
@@ -47,6 +49,8 @@ extern NSString *const ALNDatabaseRouterEventResolverOverrideKey;
 extern NSString *const ALNDatabaseRouterEventErrorDomainKey;
 extern NSString *const ALNDatabaseRouterEventErrorCodeKey;
 extern NSString *const ALNDatabaseRouterEventFallbackPolicyKey;
+extern NSString *const ALNDatabaseRouterEventUsedReadPoolKey;
+extern NSString *const ALNDatabaseRouterEventReasonKey;
 
 typedef NSString *_Nullable (^ALNDatabaseRouteTargetResolver)(
     ALNDatabaseRouteOperationClass operationClass,
@@ -69,6 +73,40 @@ typedef void (^ALNDatabaseRoutingDiagnosticsListener)(NSDictionary<NSString *, i
 @property(nonatomic, copy, nullable) ALNDatabaseRouteTargetResolver routeTargetResolver;
 @property(nonatomic, copy, nullable) ALNDatabaseRoutingDiagnosticsListener routingDiagnosticsListener;
 
+// Read pool. When configured, reads that would go to defaultReadTarget go to
+// the eligible pool target with the lowest
+// (latency EWMA + 1ms) * (outstanding reads + 1) / weight instead.
+// Read-after-write stickiness still sends reads to defaultWriteTarget, and
+// routeTargetResolver sees the pool's choice as its default. When no pool
+// target is eligible, reads go to defaultWriteTarget.
+//
+// A target is ejected after ejectAfterConsecutiveFailures connectivity
+// errors in a row, or when a health probe fails, and becomes eligible again
+// after ejectionSeconds (with probes running, only once a probe succeeds).
+// An exhausted connection pool is not a connectivity error here: the read
+// may fall back, but the target stays in the pool. Probes of ALNPg and
+// ALNMSSQL targets (also behind ALNDatabaseQueryCache) run on a dedicated
+// connection per target instead of the target's pool.
+// A target whose probed replication lag exceeds maxReplicationLagSeconds is
+// skipped until a probe finds it within the limit.
+@property(nonatomic, copy, readonly) NSArray<NSString *> *readPoolTargets;
+// Default 3.
+@property(nonatomic, assign) NSUInteger ejectAfterConsecutiveFailures;
+// Default 30 seconds.
+@property(nonatomic, assign) NSTimeInterval ejectionSeconds;
+// Period of the background probe thread, started on the first pooled read;
+// 0 disables background probes. Default 5 seconds.
+@property(nonatomic, assign) NSTimeInterval healthProbeIntervalSeconds;
+// 0 disables lag checks. Default 0.
+@property(nonatomic, assign) NSTimeInterval maxReplicationLagSeconds;
+// Probe for targets whose adapterName is `postgresql`; the `lag_seconds`
+// column of its first row is the replication lag. Defaults to replay lag
+// (0 on a primary or a fully caught-up standby). Other targets are probed
+// with `SELECT 1`.
+@property(nonatomic, copy) NSString *replicationLagQuery;
+// Receives db_router_target_<name>_* metrics for read pool targets.
+@property(nonatomic, strong, nullable) ALNMetricsRegistry *metrics;
+
 - (nullable instancetype)initWithTargets:(NSDictionary<NSString *, id<ALNDatabaseAdapter>> *)targets
                        defaultReadTarget:(NSString *)defaultReadTarget
                       defaultWriteTarget:(NSString *)defaultWriteTarget
@@ -94,6 +132,21 @@ typedef void (^ALNDatabaseRoutingDiagnosticsListener)(NSDictionary<NSString *, i
                   routingContext:(nullable NSDictionary<NSString *, id> *)routingContext
                             error:(NSError *_Nullable *_Nullable)error;
 
+// Pool targets must be keys of `targets`. Weights default to 1.0, and a
+// weight of 0 drains a target without removing it. An empty array disables
+// the read pool. Health state of targets kept across calls is preserved.
+- (BOOL)configureReadPoolWithTargets:(NSArray<NSString *> *)targets
+                             weights:(nullable NSDictionary<NSString *, NSNumber *> *)weights
+                               error:(NSError *_Nullable *_Nullable)error;
+
+// One synchronous probe of every read pool target.
+- (void)probeReadPoolTargets;
+
+// Per target: weight, eligible, ejected, lagging, latency_ewma_ms,
+// outstanding, reads, errors, consecutive_failures, replication_lag_seconds
+// (when probed), and last_error (when set).
+- (NSDictionary<NSString *, NSDictionary<NSString *, id> *> *)readPoolStatus;
+
 @end
 
 NS_ASSUME_NONNULL_END
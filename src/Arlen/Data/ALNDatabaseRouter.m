@@ -1,5 +1,11 @@
 #import "ALNDatabaseRouter.h"
 
+#import <math.h>
+
+#import "ALNMSSQL.h"
+#import "ALNMetrics.h"
+#import "ALNPg.h"
+
 NSString *const ALNDatabaseRouterErrorDomain = @"Arlen.Data.Router.Error";
 
 NSString *const ALNDatabaseRoutingContextTenantKey = @"tenant";
@@ -19,6 +25,15 @@ NSString *const ALNDatabaseRouterEventResolverOverrideKey = @"resolver_override"
 NSString *const ALNDatabaseRouterEventErrorDomainKey = @"error_domain";
 NSString *const ALNDatabaseRouterEventErrorCodeKey = @"error_code";
 NSString *const ALNDatabaseRouterEventFallbackPolicyKey = @"fallback_policy";
+NSString *const ALNDatabaseRouterEventUsedReadPoolKey = @"used_read_pool";
+NSString *const ALNDatabaseRouterEventReasonKey = @"reason";
+
+static NSString *const ALNDatabaseRouterDefaultReplicationLagQuery =
+    @"SELECT COALESCE(CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+     "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END, 0) AS lag_seconds";
+
+// Weight of the newest sample in a target's latency average.
+static const double ALNDatabaseRouterLatencyEWMAAlpha = 0.3;
 
 static NSError *ALNDatabaseRouterMakeError(ALNDatabaseRouterErrorCode code,
                                            NSString *message,
@@ -42,6 +57,38 @@ NSString *ALNDatabaseRouteOperationClassName(ALNDatabaseRouteOperationClass oper
   return @"unknown";
 }
 
+static NSTimeInterval ALNDatabaseRouterNow(void) {
+  return [[NSProcessInfo processInfo] systemUptime];
+}
+
+// A connection of its own to probe `adapter` on, or nil for adapters the
+// router cannot open one for; those are probed through the adapter.
+static id<ALNDatabaseConnection> ALNDatabaseRouterOpenProbeConnection(id<ALNDatabaseAdapter> adapter,
+                                                                      NSError **error) {
+  id<ALNDatabaseAdapter> underlying = ALNDatabaseUnderlyingAdapter(adapter);
+  if ([(id)underlying isKindOfClass:[ALNPg class]]) {
+    return [[ALNPgConnection alloc] initWithConnectionString:((ALNPg *)underlying).connectionString
+                                                       error:error];
+  }
+  if ([(id)underlying isKindOfClass:[ALNMSSQL class]]) {
+    return [[ALNMSSQLConnection alloc] initWithConnectionString:((ALNMSSQL *)underlying).connectionString
+                                                          error:error];
+  }
+  return nil;
+}
+
+static NSString *ALNDatabaseRouterMetricName(NSString *target, NSString *suffix) {
+  NSMutableString *name = [NSMutableString stringWithString:@"db_router_target_"];
+  NSString *lowered = [target lowercaseString];
+  for (NSUInteger idx = 0; idx < [lowered length]; idx++) {
+    unichar c = [lowered characterAtIndex:idx];
+    BOOL plain = (c >= 'a' && c <= 'z') || (c >= '0' && c <= '9');
+    [name appendString:plain ? [NSString stringWithCharacters:&c length:1] : @"_"];
+  }
+  [name appendFormat:@"_%@", suffix];
+  return name;
+}
+
 NSString *ALNDatabaseReadFallbackPolicyName(ALNDatabaseReadFallbackPolicy policy) {
   switch (policy) {
   case ALNDatabaseReadFallbackPolicyDisabled:
@@ -54,12 +101,55 @@ NSString *ALNDatabaseReadFallbackPolicyName(ALNDatabaseReadFallbackPolicy policy
   return @"unknown";
 }
 
+// Read pool bookkeeping for one target; guarded by the router.
+@interface ALNDatabaseRouterTargetHealth : NSObject
+
+@property(nonatomic, assign) double weight;
+@property(nonatomic, assign) double latencyEWMAMilliseconds;
+@property(nonatomic, assign) BOOL latencySampled;
+@property(nonatomic, assign) NSUInteger outstanding;
+@property(nonatomic, assign) unsigned long long reads;
+@property(nonatomic, assign) unsigned long long errors;
+@property(nonatomic, assign) NSUInteger consecutiveFailures;
+@property(nonatomic, assign) BOOL ejected;
+@property(nonatomic, assign) NSTimeInterval ejectedUntil;
+@property(nonatomic, assign) BOOL lagging;
+@property(nonatomic, strong) NSNumber *replicationLagSeconds;
+@property(nonatomic, copy) NSString *lastError;
+// Health probes run here rather than on the target's pool, so a saturated
+// pool does not fail them.
+@property(nonatomic, strong) id<ALNDatabaseConnection> probeConnection;
+
+- (void)recordLatencyMilliseconds:(double)milliseconds;
+
+@end
+
+@implementation ALNDatabaseRouterTargetHealth
+
+- (void)recordLatencyMilliseconds:(double)milliseconds {
+  if (!self.latencySampled) {
+    self.latencyEWMAMilliseconds = milliseconds;
+    self.latencySampled = YES;
+    return;
+  }
+  self.latencyEWMAMilliseconds = (ALNDatabaseRouterLatencyEWMAAlpha * milliseconds) +
+                                 ((1.0 - ALNDatabaseRouterLatencyEWMAAlpha) * self.latencyEWMAMilliseconds);
+}
+
+@end
+
 @interface ALNDatabaseRouter ()
 
 @property(nonatomic, copy, readwrite) NSDictionary<NSString *, id<ALNDatabaseAdapter>> *targets;
 @property(nonatomic, copy, readwrite) NSString *defaultReadTarget;
 @property(nonatomic, copy, readwrite) NSString *defaultWriteTarget;
 @property(nonatomic, strong) NSMutableDictionary<NSString *, NSDate *> *lastWriteByScope;
+@property(nonatomic, copy, readwrite) NSArray<NSString *> *readPoolTargets;
+@property(nonatomic, strong) NSMutableDictionary<NSString *, ALNDatabaseRouterTargetHealth *> *readPoolHealth;
+@property(nonatomic, assign) NSUInteger readPoolCursor;
+@property(nonatomic, assign) BOOL healthProbesStarted;
+// Only used to sleep the probe thread between passes.
+@property(nonatomic, strong) NSCondition *healthProbeCondition;
 
 @end
 
@@ -133,6 +223,16 @@ NSString *ALNDatabaseReadFallbackPolicyName(ALNDatabaseReadFallbackPolicy policy
   _lastWriteByScope = [NSMutableDictionary dictionary];
   _routeTargetResolver = nil;
   _routingDiagnosticsListener = nil;
+  _readPoolTargets = @[];
+  _readPoolHealth = [NSMutableDictionary dictionary];
+  _readPoolCursor = 0;
+  _ejectAfterConsecutiveFailures = 3;
+  _ejectionSeconds = 30.0;
+  _healthProbeIntervalSeconds = 5.0;
+  _maxReplicationLagSeconds = 0;
+  _replicationLagQuery = [ALNDatabaseRouterDefaultReplicationLagQuery copy];
+  _healthProbesStarted = NO;
+  _healthProbeCondition = [[NSCondition alloc] init];
   return self;
 }
 
@@ -234,8 +334,16 @@ NSString *ALNDatabaseReadFallbackPolicyName(ALNDatabaseReadFallbackPolicy policy
                    fallbackTarget:nil
                             error:nil];
 
+  BOOL pooled = [self beginReadOnPoolTarget:target];
+  NSTimeInterval startedAt = ALNDatabaseRouterNow();
   NSError *queryError = nil;
   NSArray<NSDictionary *> *rows = [adapter executeQuery:sql parameters:parameters ?: @[] error:&queryError];
+  if (pooled) {
+    [self finishReadOnPoolTarget:target
+            durationMilliseconds:(ALNDatabaseRouterNow() - startedAt) * 1000.0
+                       succeeded:(rows != nil)
+                           error:queryError];
+  }
   if (rows != nil) {
     return rows;
   }
@@ -386,6 +494,8 @@ NSString *ALNDatabaseReadFallbackPolicyName(ALNDatabaseReadFallbackPolicy policy
         @(self.readFallbackPolicy != ALNDatabaseReadFallbackPolicyDisabled),
     @"read_fallback_policy" : ALNDatabaseReadFallbackPolicyName(self.readFallbackPolicy),
     @"supports_routing_diagnostics" : @YES,
+    @"supports_read_pool_balancing" : @YES,
+    @"read_pool_size" : @([self.readPoolTargets count]),
   };
 }
 
@@ -397,10 +507,15 @@ NSString *ALNDatabaseReadFallbackPolicyName(ALNDatabaseReadFallbackPolicy policy
   NSString *defaultTarget =
       (operationClass == ALNDatabaseRouteOperationClassRead) ? self.defaultReadTarget : self.defaultWriteTarget;
   BOOL usedStickiness = NO;
+  BOOL usedReadPool = NO;
   if (operationClass == ALNDatabaseRouteOperationClassRead &&
       [self shouldUseStickinessForScope:scope atDate:[NSDate date]]) {
     defaultTarget = self.defaultWriteTarget;
     usedStickiness = YES;
+  } else if (operationClass == ALNDatabaseRouteOperationClassRead && [self.readPoolTargets count] > 0) {
+    NSString *pooledTarget = [self selectReadPoolTarget];
+    defaultTarget = pooledTarget ?: self.defaultWriteTarget;
+    usedReadPool = (pooledTarget != nil);
   }
 
   NSString *selectedTarget = defaultTarget;
@@ -438,6 +553,9 @@ NSString *ALNDatabaseReadFallbackPolicyName(ALNDatabaseReadFallbackPolicy policy
   descriptor[ALNDatabaseRouterEventSelectedTargetKey] = selectedTarget;
   descriptor[ALNDatabaseRouterEventDefaultTargetKey] = defaultTarget ?: @"";
   descriptor[ALNDatabaseRouterEventUsedStickinessKey] = @(usedStickiness);
+  if ([self.readPoolTargets count] > 0 && operationClass == ALNDatabaseRouteOperationClassRead) {
+    descriptor[ALNDatabaseRouterEventUsedReadPoolKey] = @(usedReadPool);
+  }
   descriptor[ALNDatabaseRouterEventStickinessScopeKey] = scope;
   descriptor[ALNDatabaseRouterEventResolverOverrideKey] = @(resolverOverride);
   descriptor[ALNDatabaseRouterEventFallbackPolicyKey] =
@@ -517,4 +635,410 @@ NSString *ALNDatabaseReadFallbackPolicyName(ALNDatabaseReadFallbackPolicy policy
   self.routingDiagnosticsListener([NSDictionary dictionaryWithDictionary:event]);
 }
 
+#pragma mark - Read pool
+
+- (BOOL)configureReadPoolWithTargets:(NSArray<NSString *> *)targets
+                             weights:(NSDictionary<NSString *, NSNumber *> *)weights
+                               error:(NSError **)error {
+  NSArray *candidates = [targets isKindOfClass:[NSArray class]] ? targets : nil;
+  if (candidates == nil) {
+    if (error != NULL) {
+      *error = ALNDatabaseRouterMakeError(ALNDatabaseRouterErrorInvalidArgument,
+                                          @"read pool targets must be an array",
+                                          nil);
+    }
+    return NO;
+  }
+  NSDictionary *resolvedWeights = [weights isKindOfClass:[NSDictionary class]] ? weights : @{};
+
+  NSMutableOrderedSet<NSString *> *names = [NSMutableOrderedSet orderedSet];
+  NSMutableDictionary<NSString *, NSNumber *> *weightByTarget = [NSMutableDictionary dictionary];
+  for (id candidate in candidates) {
+    if (![candidate isKindOfClass:[NSString class]] || self.targets[candidate] == nil) {
+      if (error != NULL) {
+        *error = ALNDatabaseRouterMakeError(ALNDatabaseRouterErrorUnknownTarget,
+                                            @"read pool target does not exist",
+                                            @{ @"target" : [candidate description] ?: @"" });
+      }
+      return NO;
+    }
+    id weight = resolvedWeights[candidate] ?: @1.0;
+    if (![weight isKindOfClass:[NSNumber class]] || !isfinite([weight doubleValue]) ||
+        [weight doubleValue] < 0) {
+      if (error != NULL) {
+        *error = ALNDatabaseRouterMakeError(ALNDatabaseRouterErrorInvalidArgument,
+                                            @"read pool weights must be non-negative numbers",
+                                            @{ @"target" : candidate });
+      }
+      return NO;
+    }
+    [names addObject:candidate];
+    weightByTarget[candidate] = weight;
+  }
+
+  @synchronized(self) {
+    NSMutableDictionary<NSString *, ALNDatabaseRouterTargetHealth *> *health = [NSMutableDictionary dictionary];
+    for (NSString *name in names) {
+      ALNDatabaseRouterTargetHealth *entry = self.readPoolHealth[name] ?: [[ALNDatabaseRouterTargetHealth alloc] init];
+      entry.weight = [weightByTarget[name] doubleValue];
+      health[name] = entry;
+    }
+    self.readPoolHealth = health;
+    self.readPoolTargets = [names array];
+    self.readPoolCursor = 0;
+  }
+  return YES;
+}
+
+- (BOOL)healthProbesRunning {
+  return self.healthProbesStarted && self.healthProbeIntervalSeconds > 0;
+}
+
+// Caller holds the lock. Without background probes an ejected target is let
+// back in once its ejection expires, one failure away from re-ejection.
+- (BOOL)isEligiblePoolTarget:(ALNDatabaseRouterTargetHealth *)health
+                       atTime:(NSTimeInterval)now
+                    recovered:(BOOL *)recovered {
+  if (health.weight <= 0 || health.lagging) {
+    return NO;
+  }
+  if (!health.ejected) {
+    return YES;
+  }
+  if (now < health.ejectedUntil || [self healthProbesRunning]) {
+    return NO;
+  }
+  health.ejected = NO;
+  health.consecutiveFailures = (self.ejectAfterConsecutiveFailures > 0) ? self.ejectAfterConsecutiveFailures - 1 : 0;
+  *recovered = YES;
+  return YES;
+}
+
+- (nullable NSString *)selectReadPoolTarget {
+  [self startHealthProbesIfNeeded];
+
+  NSString *selected = nil;
+  NSMutableArray<NSString *> *recoveredTargets = [NSMutableArray array];
+  NSTimeInterval now = ALNDatabaseRouterNow();
+  @synchronized(self) {
+    NSArray<NSString *> *pool = self.readPoolTargets;
+    NSUInteger count = [pool count];
+    double bestScore = INFINITY;
+    // Starting at a rotating offset spreads ties, including cold start.
+    NSUInteger offset = (count > 0) ? (self.readPoolCursor % count) : 0;
+    self.readPoolCursor += 1;
+    for (NSUInteger step = 0; step < count; step++) {
+      NSString *name = pool[(offset + step) % count];
+      ALNDatabaseRouterTargetHealth *health = self.readPoolHealth[name];
+      BOOL recovered = NO;
+      if (health == nil || ![self isEligiblePoolTarget:health atTime:now recovered:&recovered]) {
+        continue;
+      }
+      if (recovered) {
+        [recoveredTargets addObject:name];
+      }
+      double score = (health.latencyEWMAMilliseconds + 1.0) * (double)(health.outstanding + 1) / health.weight;
+      if (score < bestScore) {
+        bestScore = score;
+        selected = name;
+      }
+    }
+  }
+
+  for (NSString *name in recoveredTargets) {
+    [self emitReadPoolEventWithStage:@"recover" target:name reason:@"ejection_expired"];
+  }
+  return selected;
+}
+
+- (BOOL)beginReadOnPoolTarget:(NSString *)target {
+  NSUInteger outstanding = 0;
+  @synchronized(self) {
+    ALNDatabaseRouterTargetHealth *health = self.readPoolHealth[target ?: @""];
+    if (health == nil) {
+      return NO;
+    }
+    health.outstanding += 1;
+    outstanding = health.outstanding;
+  }
+  [self.metrics setGauge:ALNDatabaseRouterMetricName(target, @"outstanding") value:(double)outstanding];
+  return YES;
+}
+
+- (void)finishReadOnPoolTarget:(NSString *)target
+          durationMilliseconds:(double)durationMilliseconds
+                     succeeded:(BOOL)succeeded
+                         error:(NSError *)error {
+  BOOL ejected = NO;
+  double latency = 0;
+  NSUInteger outstanding = 0;
+  @synchronized(self) {
+    ALNDatabaseRouterTargetHealth *health = self.readPoolHealth[target ?: @""];
+    if (health == nil) {
+      return;
+    }
+    if (health.outstanding > 0) {
+      health.outstanding -= 1;
+    }
+    health.reads += 1;
+    if (succeeded) {
+      [health recordLatencyMilliseconds:durationMilliseconds];
+      health.consecutiveFailures = 0;
+    } else {
+      health.errors += 1;
+      health.lastError = error.localizedDescription ?: @"read returned nil without an error";
+      // Query errors say nothing about the target's health, and neither
+      // does an exhausted pool: the target is busy, not down.
+      if (ALNDatabaseErrorIsConnectivityFailure(error) && !ALNDatabaseErrorIsPoolExhaustion(error)) {
+        health.consecutiveFailures += 1;
+        if (!health.ejected && self.ejectAfterConsecutiveFailures > 0 &&
+            health.consecutiveFailures >= self.ejectAfterConsecutiveFailures) {
+          health.ejected = YES;
+          health.ejectedUntil = ALNDatabaseRouterNow() + MAX(self.ejectionSeconds, 0);
+          ejected = YES;
+        }
+      }
+    }
+    latency = health.latencyEWMAMilliseconds;
+    outstanding = health.outstanding;
+  }
+
+  ALNMetricsRegistry *metrics = self.metrics;
+  [metrics incrementCounter:ALNDatabaseRouterMetricName(target, @"reads_total")];
+  [metrics recordTiming:ALNDatabaseRouterMetricName(target, @"read_ms") milliseconds:durationMilliseconds];
+  [metrics setGauge:ALNDatabaseRouterMetricName(target, @"outstanding") value:(double)outstanding];
+  [metrics setGauge:ALNDatabaseRouterMetricName(target, @"latency_ewma_ms") value:latency];
+  if (!succeeded) {
+    [metrics incrementCounter:ALNDatabaseRouterMetricName(target, @"errors_total")];
+  }
+  if (ejected) {
+    [self recordEjectionOfTarget:target reason:@"connectivity_errors"];
+  }
+}
+
+- (void)recordEjectionOfTarget:(NSString *)target reason:(NSString *)reason {
+  [self.metrics incrementCounter:ALNDatabaseRouterMetricName(target, @"ejections_total")];
+  [self.metrics setGauge:ALNDatabaseRouterMetricName(target, @"eligible") value:0];
+  [self emitReadPoolEventWithStage:@"eject" target:target reason:reason];
+}
+
+- (void)probeReadPoolTargets {
+  NSArray<NSString *> *pool = nil;
+  @synchronized(self) {
+    pool = self.readPoolTargets;
+  }
+
+  for (NSString *target in pool) {
+    id<ALNDatabaseAdapter> adapter = self.targets[target];
+    BOOL postgres = [[adapter adapterName] isEqualToString:@"postgresql"];
+    NSString *sql = (postgres && [self.replicationLagQuery length] > 0) ? self.replicationLagQuery : @"SELECT 1";
+    NSTimeInterval startedAt = ALNDatabaseRouterNow();
+    NSError *probeError = nil;
+    NSArray<NSDictionary *> *rows = [self probeTarget:target adapter:adapter sql:sql error:&probeError];
+    NSTimeInterval finishedAt = ALNDatabaseRouterNow();
+    id lagValue = [[rows firstObject] isKindOfClass:[NSDictionary class]] ? [rows firstObject][@"lag_seconds"] : nil;
+    NSNumber *lag = nil;
+    if ([lagValue respondsToSelector:@selector(doubleValue)]) {
+      lag = @([lagValue doubleValue]);
+    }
+    [self applyProbeOfTarget:target
+                        rows:rows
+                         lag:lag
+        durationMilliseconds:(finishedAt - startedAt) * 1000.0
+                      atTime:finishedAt
+                       error:probeError];
+  }
+}
+
+// Runs the probe on the target's dedicated probe connection, opening it on
+// first use and after a failure. The connection is checked out of the
+// health record while in use, so overlapping probe passes never share it.
+- (NSArray<NSDictionary *> *)probeTarget:(NSString *)target
+                                 adapter:(id<ALNDatabaseAdapter>)adapter
+                                     sql:(NSString *)sql
+                                   error:(NSError **)error {
+  id<ALNDatabaseConnection> connection = nil;
+  @synchronized(self) {
+    ALNDatabaseRouterTargetHealth *health = self.readPoolHealth[target];
+    connection = health.probeConnection;
+    health.probeConnection = nil;
+  }
+  if (connection == nil) {
+    NSError *openError = nil;
+    connection = ALNDatabaseRouterOpenProbeConnection(adapter, &openError);
+    if (connection == nil && openError != nil) {
+      if (error != NULL) {
+        *error = openError;
+      }
+      return nil;
+    }
+  }
+  if (connection == nil) {
+    return [adapter executeQuery:sql parameters:@[] error:error];
+  }
+
+  NSArray<NSDictionary *> *rows = [connection executeQuery:sql parameters:@[] error:error];
+  if (rows != nil) {
+    @synchronized(self) {
+      ALNDatabaseRouterTargetHealth *health = self.readPoolHealth[target];
+      if (health.probeConnection == nil) {
+        health.probeConnection = connection;
+      }
+    }
+  }
+  return rows;
+}
+
+- (void)applyProbeOfTarget:(NSString *)target
+                      rows:(NSArray *)rows
+                       lag:(NSNumber *)lag
+      durationMilliseconds:(double)durationMilliseconds
+                    atTime:(NSTimeInterval)now
+                     error:(NSError *)error {
+  NSMutableArray<NSArray<NSString *> *> *events = [NSMutableArray array];
+  BOOL ejected = NO;
+  BOOL eligible = NO;
+  double latency = 0;
+  @synchronized(self) {
+    ALNDatabaseRouterTargetHealth *health = self.readPoolHealth[target];
+    if (health == nil) {
+      return;
+    }
+    if (rows == nil && ALNDatabaseErrorIsPoolExhaustion(error)) {
+      // Only adapters probed through their own pool get here; a busy pool
+      // proves nothing either way.
+      health.lastError = error.localizedDescription ?: @"health probe found the pool exhausted";
+    } else if (rows == nil) {
+      health.lastError = error.localizedDescription ?: @"health probe failed";
+      if (!health.ejected) {
+        health.ejected = YES;
+        health.ejectedUntil = now + MAX(self.ejectionSeconds, 0);
+        ejected = YES;
+      }
+    } else {
+      [health recordLatencyMilliseconds:durationMilliseconds];
+      if (health.ejected && now >= health.ejectedUntil) {
+        health.ejected = NO;
+        health.consecutiveFailures = 0;
+        [events addObject:@[ @"recover", @"probe_succeeded" ]];
+      }
+      health.replicationLagSeconds = lag;
+      BOOL lagging = (self.maxReplicationLagSeconds > 0 && lag != nil &&
+                      [lag doubleValue] > self.maxReplicationLagSeconds);
+      if (lagging != health.lagging) {
+        health.lagging = lagging;
+        [events addObject:lagging ? @[ @"eject", @"replication_lag" ] : @[ @"recover", @"replication_caught_up" ]];
+      }
+    }
+    eligible = !health.ejected && !health.lagging && health.weight > 0;
+    latency = health.latencyEWMAMilliseconds;
+  }
+
+  ALNMetricsRegistry *metrics = self.metrics;
+  if (ejected) {
+    [self recordEjectionOfTarget:target reason:@"probe_failed"];
+  }
+  for (NSArray<NSString *> *event in events) {
+    [self emitReadPoolEventWithStage:event[0] target:target reason:event[1]];
+  }
+  [metrics setGauge:ALNDatabaseRouterMetricName(target, @"eligible") value:eligible ? 1 : 0];
+  [metrics setGauge:ALNDatabaseRouterMetricName(target, @"latency_ewma_ms") value:latency];
+  if (lag != nil) {
+    [metrics setGauge:ALNDatabaseRouterMetricName(target, @"replication_lag_seconds") value:[lag doubleValue]];
+  }
+}
+
+- (void)startHealthProbesIfNeeded {
+  if (self.healthProbesStarted || self.healthProbeIntervalSeconds <= 0) {
+    return;
+  }
+  @synchronized(self) {
+    if (self.healthProbesStarted) {
+      return;
+    }
+    self.healthProbesStarted = YES;
+  }
+
+  __weak ALNDatabaseRouter *weakSelf = self;
+  NSCondition *sleeper = self.healthProbeCondition;
+  NSThread *thread = [[NSThread alloc] initWithBlock:^{
+    while (YES) {
+      NSTimeInterval interval = 0;
+      @autoreleasepool {
+        ALNDatabaseRouter *router = weakSelf;
+        interval = router.healthProbeIntervalSeconds;
+      }
+      if (interval <= 0) {
+        break;
+      }
+      [sleeper lock];
+      [sleeper waitUntilDate:[NSDate dateWithTimeIntervalSinceNow:interval]];
+      [sleeper unlock];
+
+      BOOL stop = NO;
+      @autoreleasepool {
+        ALNDatabaseRouter *router = weakSelf;
+        if (router == nil || router.healthProbeIntervalSeconds <= 0) {
+          stop = YES;
+        } else {
+          [router probeReadPoolTargets];
+        }
+      }
+      if (stop) {
+        break;
+      }
+    }
+    @autoreleasepool {
+      ALNDatabaseRouter *router = weakSelf;
+      @synchronized(router) {
+        router.healthProbesStarted = NO;
+      }
+    }
+  }];
+  [thread setName:@"arlen-db-router-health-probe"];
+  [thread start];
+}
+
+- (NSDictionary<NSString *, NSDictionary<NSString *, id> *> *)readPoolStatus {
+  NSMutableDictionary<NSString *, NSDictionary<NSString *, id> *> *status = [NSMutableDictionary dictionary];
+  NSTimeInterval now = ALNDatabaseRouterNow();
+  @synchronized(self) {
+    for (NSString *name in self.readPoolTargets) {
+      ALNDatabaseRouterTargetHealth *health = self.readPoolHealth[name];
+      BOOL ejected = health.ejected && (now < health.ejectedUntil || [self healthProbesRunning]);
+      NSMutableDictionary<NSString *, id> *entry = [NSMutableDictionary dictionaryWithDictionary:@{
+        @"weight" : @(health.weight),
+        @"eligible" : @(!ejected && !health.lagging && health.weight > 0),
+        @"ejected" : @(ejected),
+        @"lagging" : @(health.lagging),
+        @"latency_ewma_ms" : @(health.latencyEWMAMilliseconds),
+        @"outstanding" : @(health.outstanding),
+        @"reads" : @(health.reads),
+        @"errors" : @(health.errors),
+        @"consecutive_failures" : @(health.consecutiveFailures),
+      }];
+      if (health.replicationLagSeconds != nil) {
+        entry[@"replication_lag_seconds"] = health.replicationLagSeconds;
+      }
+      if ([health.lastError length] > 0) {
+        entry[@"last_error"] = health.lastError;
+      }
+      status[name] = entry;
+    }
+  }
+  return status;
+}
+
+- (void)emitReadPoolEventWithStage:(NSString *)stage target:(NSString *)target reason:(NSString *)reason {
+  [self emitRoutingEventWithStage:stage
+                       descriptor:@{
+                         ALNDatabaseRouterEventOperationClassKey :
+                             ALNDatabaseRouteOperationClassName(ALNDatabaseRouteOperationClassRead),
+                         ALNDatabaseRouterEventSelectedTargetKey : target ?: @"",
+                         ALNDatabaseRouterEventReasonKey : reason ?: @"",
+                       }
+                   fallbackTarget:nil
+                            error:nil];
+}
+
 @end
@@ -7,6 +7,8 @@
 NS_ASSUME_NONNULL_BEGIN
 
 @class ALNSQLBuilder;
+@class ALNMetricsRegistry;
+@class ALNSQLStatementStats;
 
 extern NSString *const ALNPgErrorDomain;
 extern NSString *const ALNPgErrorDiagnosticsKey;
@@ -58,16 +60,93 @@ typedef NS_ENUM(NSInteger, ALNPgPreparedStatementReusePolicy) {
 
 typedef void (^ALNPgQueryDiagnosticsListener)(NSDictionary<NSString *, id> *event);
 
+typedef NS_ENUM(NSInteger, ALNPgCopyFormat) {
+  ALNPgCopyFormatText = 0,
+  ALNPgCopyFormatBinary = 1,
+};
+
+// Supplies COPY rows one at a time: the next row's values in column order,
+// or nil when there are no more rows. Setting `error` and returning nil
+// aborts the COPY.
+typedef NSArray *_Nullable (^ALNPgCopyRowProducer)(NSError *_Nullable *_Nullable error);
+
+// Receives streamed rows a batch at a time. Setting `*stop` to YES cancels
+// the rest of the query.
+typedef void (^ALNPgRowBatchBlock)(NSArray<NSDictionary *> *rows, BOOL *stop);
+
+// Independent statements queued for one pipelined round trip. Build one per
+// unit of work; it is not thread-safe.
+@interface ALNPgPipeline : NSObject
+
+@property(nonatomic, assign, readonly) NSUInteger count;
+// SQL of each queued operation, in order.
+@property(nonatomic, copy, readonly) NSArray<NSString *> *statements;
+
+// Each returns the index of the operation's entry in the results array.
+- (NSUInteger)addQuery:(NSString *)sql parameters:(nullable NSArray *)parameters;
+- (NSUInteger)addCommand:(NSString *)sql parameters:(nullable NSArray *)parameters;
+- (void)removeAllOperations;
+
+@end
+
+typedef void (^ALNPgQueryCompletion)(ALNDatabaseResult *_Nullable result, NSError *_Nullable error);
+
+// One query running on its own pooled connection, started by
+// -[ALNPg sendQuery:parameters:]. It is sent as soon as the pool has a free
+// connection; results are read, and the connection returned to the pool,
+// while a thread waits in -wait: or +whenAll:error:. Completion blocks run
+// on that thread. Wait on the thread that sent the query; a future that is
+// never waited on cancels its query when deallocated.
+@interface ALNPgQueryFuture : NSObject
+
+@property(nonatomic, copy, readonly) NSString *sql;
+@property(nonatomic, assign, readonly, getter=isFinished) BOOL finished;
+// Rows for queries; an empty result for commands.
+@property(nonatomic, strong, readonly, nullable) ALNDatabaseResult *result;
+// Rows returned or affected.
+@property(nonatomic, assign, readonly) NSInteger affectedRows;
+@property(nonatomic, strong, readonly, nullable) NSError *error;
+
+- (instancetype)init NS_UNAVAILABLE;
+
+- (nullable ALNDatabaseResult *)wait:(NSError *_Nullable *_Nullable)error;
+// Waits for every future at once, so the queries overlap. Returns their
+// results in order, or nil with the first future's error; every future runs
+// to completion either way.
++ (nullable NSArray<ALNDatabaseResult *> *)whenAll:(NSArray<ALNPgQueryFuture *> *)futures
+                                             error:(NSError *_Nullable *_Nullable)error;
+
+@end
+
 @interface ALNPgConnection : NSObject <ALNDatabaseConnection>
 
 @property(nonatomic, copy, readonly) NSString *connectionString;
 @property(nonatomic, assign, readonly, getter=isOpen) BOOL open;
+// YES when the loaded libpq provides pipeline mode (PostgreSQL 14+ client).
+@property(nonatomic, assign, readonly) BOOL supportsPipelineMode;
 @property(nonatomic, assign) ALNPgPreparedStatementReusePolicy preparedStatementReusePolicy;
 @property(nonatomic, assign) NSUInteger preparedStatementCacheLimit;
 @property(nonatomic, assign) NSUInteger builderCompilationCacheLimit;
 @property(nonatomic, assign) BOOL includeSQLInDiagnosticsEvents;
 @property(nonatomic, assign) BOOL emitDiagnosticsEventsToStderr;
 @property(nonatomic, copy, nullable) ALNPgQueryDiagnosticsListener queryDiagnosticsListener;
+// When set, every server round trip is recorded as a `db_query_duration_ms`
+// timing sample.
+@property(nonatomic, strong, nullable) ALNMetricsRegistry *metrics;
+// When set, every server round trip is aggregated per normalized statement
+// and attributed to the route of the current ALNPerfTrace.
+@property(nonatomic, strong, nullable) ALNSQLStatementStats *statementStats;
+// Requests query results in binary format, decoded directly for bool,
+// int2/4/8, float4/8, numeric, date, time, timestamp(tz), uuid, bytea,
+// json(b), text types, and 1-D arrays of those, into the same values text
+// results produce. Each statement's column types are described once per
+// connection (decisions for the 512 most recently used statements are kept;
+// a cursor's FETCHes reuse the one made at its DECLARE); a statement
+// selecting any other type (interval, inet, enums, ...) is read as text
+// instead. A result that no longer decodes after a schema change drops the
+// decision, and a read-only statement is rerun as text. Off by default;
+// ignored when libpq lacks PQfformat/PQgetlength/PQdescribePrepared.
+@property(nonatomic, assign) BOOL binaryResultsEnabled;
 
 - (nullable instancetype)initWithConnectionString:(NSString *)connectionString
                                             error:(NSError *_Nullable *_Nullable)error;
@@ -93,10 +172,66 @@ typedef void (^ALNPgQueryDiagnosticsListener)(NSDictionary<NSString *, id> *even
 - (NSInteger)executeCommand:(NSString *)sql
                  parameters:(NSArray *)parameters
                       error:(NSError *_Nullable *_Nullable)error;
+// With pipeline mode, parameter sets are sent without waiting for results,
+// up to 512 per sync point. Without pipeline mode, sets run one round trip
+// at a time. Outside an explicit transaction the batch runs in its own
+// transaction, so a failing set rolls back every set in the batch; inside
+// one, the failure aborts the caller's transaction.
 - (NSInteger)executeCommandBatch:(NSString *)sql
                    parameterSets:(NSArray<NSArray *> *)parameterSets
                            error:(NSError *_Nullable *_Nullable)error;
 
+// Sends every queued operation before reading any result. Operations are
+// independent (each is followed by its own sync point), so one failure
+// does not abort the others unless a transaction is open. The returned array
+// holds, per operation in order, an ALNDatabaseResult (query), an NSNumber
+// of affected rows (command), or the operation's NSError. nil with `error`
+// only when the connection itself fails.
+- (nullable NSArray *)executePipeline:(ALNPgPipeline *)pipeline
+                                error:(NSError *_Nullable *_Nullable)error;
+
+// Streams rows into `table` with COPY ... FROM STDIN, encoding and sending
+// them as the producer yields them, so memory stays flat however many rows
+// are loaded. Text format accepts the same values as query parameters.
+// Binary format sends NSString as UTF-8, NSData verbatim, NSUUID as uuid,
+// boolean NSNumber as bool, integral NSNumber as int8, floating NSNumber as
+// float8, and NSDate as timestamptz; target columns must have exactly those
+// types. Returns the number of rows copied, or -1; a producer error or a row
+// the server rejects aborts the whole COPY. An exception raised by the
+// producer also aborts it and is rethrown once the connection has left COPY.
+- (NSInteger)bulkCopyIntoTable:(NSString *)table
+                       columns:(NSArray<NSString *> *)columns
+                        format:(ALNPgCopyFormat)format
+                   rowProducer:(ALNPgCopyRowProducer)rowProducer
+                         error:(NSError *_Nullable *_Nullable)error;
+
+// Runs a query and hands its rows to `block` in batches of `batchSize`
+// (0 means 500) as they arrive, instead of materializing the whole result.
+// Uses libpq chunked-rows mode when available (libpq 17+) and single-row
+// mode otherwise; builds without either fall back to executeQuery and slice
+// the result. Setting `*stop` cancels the statement server-side, except
+// inside a transaction, where cancelling would abort it and the remaining
+// rows are read and discarded instead. Rows decode exactly as executeQuery
+// rows do. The connection is busy until the call returns, so `block` must
+// not issue queries on it.
+- (BOOL)streamQuery:(NSString *)sql
+         parameters:(NSArray *)parameters
+          batchSize:(NSUInteger)batchSize
+         usingBlock:(ALNPgRowBatchBlock)block
+              error:(NSError *_Nullable *_Nullable)error;
+- (BOOL)streamBuilderQuery:(ALNSQLBuilder *)builder
+                 batchSize:(NSUInteger)batchSize
+                usingBlock:(ALNPgRowBatchBlock)block
+                     error:(NSError *_Nullable *_Nullable)error;
+
+// Waits up to `timeout` seconds for NOTIFY messages on channels this
+// connection has LISTENed to, returning { channel, payload, pid } entries
+// (empty on timeout), or nil when the connection fails. Keep the
+// connection out of the pool while listening.
+- (nullable NSArray<NSDictionary<NSString *, id> *> *)
+    waitForNotificationsWithTimeout:(NSTimeInterval)timeout
+                              error:(NSError *_Nullable *_Nullable)error;
+
 - (nullable NSArray<NSDictionary *> *)executePreparedQueryNamed:(NSString *)name
                                                      parameters:(NSArray *)parameters
                                                           error:(NSError *_Nullable *_Nullable)error;
@@ -130,10 +265,32 @@ typedef void (^ALNPgQueryDiagnosticsListener)(NSDictionary<NSString *, id> *even
 @property(nonatomic, assign) ALNPgPreparedStatementReusePolicy preparedStatementReusePolicy;
 @property(nonatomic, assign) NSUInteger preparedStatementCacheLimit;
 @property(nonatomic, assign) NSUInteger builderCompilationCacheLimit;
+// With background maintenance running, idle connections are pinged by the
+// maintenance thread; with maintenanceIntervalSeconds == 0 they are pinged on
+// checkout instead.
 @property(nonatomic, assign) BOOL connectionLivenessChecksEnabled;
+// Acquirers wait in FIFO order for up to this long before failing with
+// ALNPgErrorPoolExhausted; 0 fails immediately. Default 5 seconds.
+@property(nonatomic, assign) NSTimeInterval acquireTimeoutSeconds;
+// Idle connections kept open by warmUpConnections: and maintenance.
+// Default 0.
+@property(nonatomic, assign) NSUInteger minIdleConnections;
+// Connections older than this are closed instead of reused; 0 disables.
+// Default 1800 seconds.
+@property(nonatomic, assign) NSTimeInterval maxConnectionLifetimeSeconds;
+// Idle connections beyond minIdleConnections are closed after this long;
+// 0 disables. Default 600 seconds.
+@property(nonatomic, assign) NSTimeInterval idleTimeoutSeconds;
+// Period of the background maintenance thread, started on first use; 0
+// disables it. Default 30 seconds.
+@property(nonatomic, assign) NSTimeInterval maintenanceIntervalSeconds;
 @property(nonatomic, assign) BOOL includeSQLInDiagnosticsEvents;
 @property(nonatomic, assign) BOOL emitDiagnosticsEventsToStderr;
 @property(nonatomic, copy, nullable) ALNPgQueryDiagnosticsListener queryDiagnosticsListener;
+@property(nonatomic, strong, nullable) ALNMetricsRegistry *metrics;
+@property(nonatomic, strong, nullable) ALNSQLStatementStats *statementStats;
+// Applied to every pooled connection; see ALNPgConnection.
+@property(nonatomic, assign) BOOL binaryResultsEnabled;
 
 + (NSDictionary<NSString *, id> *)capabilityMetadata;
 
@@ -144,6 +301,17 @@ typedef void (^ALNPgQueryDiagnosticsListener)(NSDictionary<NSString *, id> *even
 - (nullable ALNPgConnection *)acquireConnection:(NSError *_Nullable *_Nullable)error;
 - (void)releaseConnection:(ALNPgConnection *)connection;
 
+// Opens connections until minIdleConnections are idle (bounded by
+// maxConnections) and starts background maintenance. Call at boot.
+- (BOOL)warmUpConnections:(NSError *_Nullable *_Nullable)error;
+// One maintenance pass: closes expired and surplus idle connections, pings
+// idle connections when liveness checks are enabled, and refills minIdle.
+- (void)performPoolMaintenance;
+// { max_connections, in_use, idle, pending, waiting, acquires, waits,
+//   timeouts, wait_ms_total, created, closed_expired, closed_idle,
+//   closed_liveness }
+- (NSDictionary<NSString *, id> *)poolStatistics;
+
 - (nullable id<ALNDatabaseConnection>)acquireAdapterConnection:(NSError *_Nullable *_Nullable)error;
 - (void)releaseAdapterConnection:(id<ALNDatabaseConnection>)connection;
 
@@ -164,6 +332,32 @@ typedef void (^ALNPgQueryDiagnosticsListener)(NSDictionary<NSString *, id> *even
                            error:(NSError *_Nullable *_Nullable)error;
 - (NSInteger)executeBuilderCommand:(ALNSQLBuilder *)builder
                               error:(NSError *_Nullable *_Nullable)error;
+- (nullable NSArray *)executePipeline:(ALNPgPipeline *)pipeline
+                                error:(NSError *_Nullable *_Nullable)error;
+- (NSInteger)bulkCopyIntoTable:(NSString *)table
+                       columns:(NSArray<NSString *> *)columns
+                        format:(ALNPgCopyFormat)format
+                   rowProducer:(ALNPgCopyRowProducer)rowProducer
+                         error:(NSError *_Nullable *_Nullable)error;
+- (BOOL)streamQuery:(NSString *)sql
+         parameters:(NSArray *)parameters
+          batchSize:(NSUInteger)batchSize
+         usingBlock:(ALNPgRowBatchBlock)block
+              error:(NSError *_Nullable *_Nullable)error;
+- (BOOL)streamBuilderQuery:(ALNSQLBuilder *)builder
+                 batchSize:(NSUInteger)batchSize
+                usingBlock:(ALNPgRowBatchBlock)block
+                     error:(NSError *_Nullable *_Nullable)error;
+
+// Starts a query or command on its own pooled connection and returns without
+// waiting for it; see ALNPgQueryFuture. Queries started back to back run
+// concurrently, up to maxConnections at a time; the rest are sent as earlier
+// ones finish. They never join a transaction held by the caller. Runs
+// synchronously when libpq lacks PQconsumeInput/PQisBusy/PQsocket.
+- (ALNPgQueryFuture *)sendQuery:(NSString *)sql parameters:(nullable NSArray *)parameters;
+- (ALNPgQueryFuture *)sendQuery:(NSString *)sql
+                     parameters:(nullable NSArray *)parameters
+                     completion:(nullable ALNPgQueryCompletion)completion;
 
 - (BOOL)withTransaction:(BOOL (^)(ALNPgConnection *connection,
                                   NSError *_Nullable *_Nullable error))block
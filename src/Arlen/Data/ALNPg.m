@@ -1,11 +1,17 @@
 #import "ALNPg.h"
 #import "ALNJSONSerialization.h"
+#import "ALNMetrics.h"
+#import "ALNPerf.h"
 #import "ALNPlatform.h"
 #import "ALNPostgresDialect.h"
 #import "ALNSQLBuilder.h"
+#import "ALNSQLStatementStats.h"
 
 #import <dispatch/dispatch.h>
 #import <ctype.h>
+#import <limits.h>
+#import <math.h>
+#import <errno.h>
 #import <stdlib.h>
 #import <stdint.h>
 #import <string.h>
@@ -13,6 +19,7 @@
 #include <windows.h>
 #else
 #include <dlfcn.h>
+#include <poll.h>
 #endif
 
 NSString *const ALNPgErrorDomain = @"Arlen.Data.Pg.Error";
@@ -61,8 +68,20 @@ typedef enum {
   ALNPGRES_EMPTY_QUERY = 0,
   ALNPGRES_COMMAND_OK = 1,
   ALNPGRES_TUPLES_OK = 2,
+  ALNPGRES_COPY_IN = 4,
+  ALNPGRES_SINGLE_TUPLE = 9,
+  ALNPGRES_PIPELINE_SYNC = 10,
+  ALNPGRES_PIPELINE_ABORTED = 11,
+  ALNPGRES_TUPLES_CHUNK = 12,
 } ALNExecStatusType;
 
+// Leading fields of libpq's PGnotify.
+typedef struct {
+  char *relname;
+  int be_pid;
+  char *extra;
+} ALNPGnotify;
+
 typedef struct {
   const char **paramValues;
   char **ownedParamValues;
@@ -134,6 +153,38 @@ static ALNOid (*ALNPQftype)(const PGresult *res, int columnNumber) = NULL;
 static int (*ALNPQgetisnull)(const PGresult *res, int rowNumber, int columnNumber) = NULL;
 static char *(*ALNPQgetvalue)(const PGresult *res, int rowNumber, int columnNumber) = NULL;
 static char *(*ALNPQcmdTuples)(PGresult *res) = NULL;
+// Binary result decoding; optional.
+static int (*ALNPQfformat)(const PGresult *res, int columnNumber) = NULL;
+static int (*ALNPQgetlength)(const PGresult *res, int rowNumber, int columnNumber) = NULL;
+static PGresult *(*ALNPQdescribePrepared)(PGconn *conn, const char *stmtName) = NULL;
+// Pipeline mode (libpq 14+); optional.
+static int (*ALNPQenterPipelineMode)(PGconn *conn) = NULL;
+static int (*ALNPQexitPipelineMode)(PGconn *conn) = NULL;
+static int (*ALNPQpipelineSync)(PGconn *conn) = NULL;
+static int (*ALNPQsendQueryParams)(PGconn *conn,
+                                   const char *command,
+                                   int nParams,
+                                   const void *paramTypes,
+                                   const char *const *paramValues,
+                                   const int *paramLengths,
+                                   const int *paramFormats,
+                                   int resultFormat) = NULL;
+static PGresult *(*ALNPQgetResult)(PGconn *conn) = NULL;
+static int (*ALNPQputCopyData)(PGconn *conn, const char *buffer, int nbytes) = NULL;
+static int (*ALNPQputCopyEnd)(PGconn *conn, const char *errormsg) = NULL;
+// Row streaming; chunked mode is libpq 17+.
+static int (*ALNPQsetSingleRowMode)(PGconn *conn) = NULL;
+static int (*ALNPQsetChunkedRowsMode)(PGconn *conn, int chunkSize) = NULL;
+static void *(*ALNPQgetCancel)(PGconn *conn) = NULL;
+static int (*ALNPQcancel)(void *cancel, char *errbuf, int errbufsize) = NULL;
+static void (*ALNPQfreeCancel)(void *cancel) = NULL;
+// Non-blocking result reads for concurrent queries; optional.
+static int (*ALNPQconsumeInput)(PGconn *conn) = NULL;
+static int (*ALNPQisBusy)(PGconn *conn) = NULL;
+static int (*ALNPQsocket)(const PGconn *conn) = NULL;
+// LISTEN/NOTIFY delivery; optional.
+static ALNPGnotify *(*ALNPQnotifies)(PGconn *conn) = NULL;
+static void (*ALNPQfreemem)(void *ptr) = NULL;
 
 #if defined(_WIN32)
 static NSString *ALNLibpqDynamicLoaderLastError(void) {
@@ -286,6 +337,26 @@ static BOOL ALNLoadLibpq(NSError **error) {
     ok = ok && ALNBindLibpqSymbol((void **)&ALNPQgetvalue, handle, "PQgetvalue");
     ok = ok && ALNBindLibpqSymbol((void **)&ALNPQcmdTuples, handle, "PQcmdTuples");
     ALNBindOptionalLibpqSymbol((void **)&ALNPQresultErrorField, handle, "PQresultErrorField");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQfformat, handle, "PQfformat");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQgetlength, handle, "PQgetlength");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQdescribePrepared, handle, "PQdescribePrepared");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQenterPipelineMode, handle, "PQenterPipelineMode");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQexitPipelineMode, handle, "PQexitPipelineMode");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQpipelineSync, handle, "PQpipelineSync");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQsendQueryParams, handle, "PQsendQueryParams");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQgetResult, handle, "PQgetResult");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQputCopyData, handle, "PQputCopyData");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQputCopyEnd, handle, "PQputCopyEnd");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQsetSingleRowMode, handle, "PQsetSingleRowMode");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQsetChunkedRowsMode, handle, "PQsetChunkedRowsMode");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQgetCancel, handle, "PQgetCancel");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQcancel, handle, "PQcancel");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQfreeCancel, handle, "PQfreeCancel");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQconsumeInput, handle, "PQconsumeInput");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQisBusy, handle, "PQisBusy");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQsocket, handle, "PQsocket");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQnotifies, handle, "PQnotifies");
+    ALNBindOptionalLibpqSymbol((void **)&ALNPQfreemem, handle, "PQfreemem");
 
     if (!ok) {
       gLibpqLoadError =
@@ -1403,6 +1474,24 @@ static NSArray *ALNPgArrayTokensFromString(NSString *value, NSError **error) {
   return [NSArray arrayWithArray:tokens];
 }
 
+static id ALNPgJSONValueFromData(NSData *jsonData, NSString *columnName, NSError **error) {
+  if (jsonData == nil) {
+    return nil;
+  }
+  id decoded = [ALNJSONSerialization JSONObjectWithData:jsonData options:0 error:error];
+  if (decoded == nil && error != NULL && *error != nil) {
+    NSError *jsonError = *error;
+    NSString *detail = [NSString stringWithFormat:@"column %@ JSON decode failed: %@",
+                                                  columnName ?: @"",
+                                                  [jsonError localizedDescription] ?: @"invalid JSON"];
+    *error = ALNPgMakeError(ALNPgErrorQueryFailed,
+                            @"failed decoding PostgreSQL result value",
+                            detail,
+                            nil);
+  }
+  return decoded;
+}
+
 static NSArray *ALNPgDecodedArrayValueForFieldType(ALNOid fieldType,
                                                    NSString *columnName,
                                                    NSString *stringValue,
@@ -1494,23 +1583,11 @@ static id ALNPgDecodedValueForFieldType(ALNOid fieldType,
     decoded = ALNPgDataFromByteaString(stringValue);
     break;
   case ALNPGOIDOID_JSON:
-  case ALNPGOIDOID_JSONB: {
-    NSData *jsonData = [stringValue dataUsingEncoding:NSUTF8StringEncoding allowLossyConversion:NO];
-    if (jsonData != nil) {
-      decoded = [ALNJSONSerialization JSONObjectWithData:jsonData options:0 error:error];
-      if (decoded == nil && error != NULL && *error != nil) {
-        NSError *jsonError = *error;
-        NSString *detail = [NSString stringWithFormat:@"column %@ JSON decode failed: %@",
-                                                      columnName ?: @"",
-                                                      [jsonError localizedDescription] ?: @"invalid JSON"];
-        *error = ALNPgMakeError(ALNPgErrorQueryFailed,
-                                @"failed decoding PostgreSQL result value",
-                                detail,
-                                nil);
-      }
-    }
+  case ALNPGOIDOID_JSONB:
+    decoded = ALNPgJSONValueFromData([stringValue dataUsingEncoding:NSUTF8StringEncoding allowLossyConversion:NO],
+                                     columnName,
+                                     error);
     break;
-  }
   case ALNPGOIDOID_BOOL_ARRAY:
   case ALNPGOIDOID_BYTEA_ARRAY:
   case ALNPGOIDOID_INT2_ARRAY:
@@ -1556,6 +1633,451 @@ static id ALNPgDecodedValueForFieldType(ALNOid fieldType,
   return nil;
 }
 
+// Seconds between the Unix epoch and the PostgreSQL epoch (2000-01-01 UTC).
+static const double ALNPgPostgresEpochOffset = 946684800.0;
+
+// Binary-format (resultFormat 1) decoders. Each yields the same Foundation
+// value the text decoder produces for that type, without parsing text.
+static uint16_t ALNPgReadBigEndian16(const unsigned char *bytes) {
+  return (uint16_t)(((uint16_t)bytes[0] << 8) | bytes[1]);
+}
+
+static uint32_t ALNPgReadBigEndian32(const unsigned char *bytes) {
+  return ((uint32_t)bytes[0] << 24) | ((uint32_t)bytes[1] << 16) | ((uint32_t)bytes[2] << 8) | bytes[3];
+}
+
+static uint64_t ALNPgReadBigEndian64(const unsigned char *bytes) {
+  return ((uint64_t)ALNPgReadBigEndian32(bytes) << 32) | ALNPgReadBigEndian32(bytes + 4);
+}
+
+static NSNumber *ALNPgFloat4NumberFromBits(uint32_t bits) {
+  float value = 0;
+  memcpy(&value, &bits, sizeof(value));
+  if (!isfinite(value)) {
+    return @((double)value);
+  }
+  // Match the server's shortest round-trip text output, so 0.1::float4
+  // decodes to 0.1 rather than 0.100000001490116.
+  char buffer[32];
+  for (int precision = 6; precision <= 9; precision++) {
+    snprintf(buffer, sizeof(buffer), "%.*g", precision, (double)value);
+    if ((float)strtod(buffer, NULL) == value) {
+      break;
+    }
+  }
+  return @(strtod(buffer, NULL));
+}
+
+static NSDecimalNumber *ALNPgDecimalNumberFromBinaryNumeric(const unsigned char *bytes, int length) {
+  if (length < 8) {
+    return nil;
+  }
+  int16_t digitCount = (int16_t)ALNPgReadBigEndian16(bytes);
+  int16_t weight = (int16_t)ALNPgReadBigEndian16(bytes + 2);
+  uint16_t sign = ALNPgReadBigEndian16(bytes + 4);
+  int16_t displayScale = (int16_t)ALNPgReadBigEndian16(bytes + 6);
+  if (digitCount < 0 || displayScale < 0 || length < 8 + (2 * digitCount) ||
+      (sign != 0x0000 && sign != 0x4000)) {
+    // NaN and infinities have no NSDecimalNumber form, as in text decoding.
+    return nil;
+  }
+
+  const unsigned char *digits = bytes + 8;
+  NSMutableString *value = [NSMutableString stringWithString:(sign == 0x4000) ? @"-" : @""];
+  if (weight < 0) {
+    [value appendString:@"0"];
+  } else {
+    for (int group = 0; group <= weight; group++) {
+      int digit = (group < digitCount) ? (int16_t)ALNPgReadBigEndian16(digits + (2 * group)) : 0;
+      [value appendFormat:(group == 0) ? @"%d" : @"%04d", digit];
+    }
+  }
+  if (displayScale > 0) {
+    NSMutableString *fraction = [NSMutableString string];
+    for (int group = weight + 1; (NSInteger)[fraction length] < displayScale; group++) {
+      int digit = (group >= 0 && group < digitCount) ? (int16_t)ALNPgReadBigEndian16(digits + (2 * group)) : 0;
+      [fraction appendFormat:@"%04d", digit];
+    }
+    [value appendString:@"."];
+    [value appendString:[fraction substringToIndex:(NSUInteger)displayScale]];
+  }
+  return ALNPgDecimalNumberFromString(value);
+}
+
+static NSDate *ALNPgDateFromBinaryTimestamp(const unsigned char *bytes, int length) {
+  if (length != 8) {
+    return nil;
+  }
+  int64_t microseconds = (int64_t)ALNPgReadBigEndian64(bytes);
+  if (microseconds == INT64_MAX || microseconds == INT64_MIN) {
+    // infinity / -infinity, which text decoding rejects too.
+    return nil;
+  }
+  double seconds = (double)(microseconds / 1000000) + ((double)(microseconds % 1000000) / 1000000.0);
+  return [NSDate dateWithTimeIntervalSince1970:ALNPgPostgresEpochOffset + seconds];
+}
+
+static NSDate *ALNPgDateFromBinaryDate(const unsigned char *bytes, int length) {
+  if (length != 4) {
+    return nil;
+  }
+  int32_t days = (int32_t)ALNPgReadBigEndian32(bytes);
+  if (days == INT32_MAX || days == INT32_MIN) {
+    return nil;
+  }
+  return [NSDate dateWithTimeIntervalSince1970:ALNPgPostgresEpochOffset + ((double)days * 86400.0)];
+}
+
+static NSString *ALNPgTimeStringFromBinaryTime(const unsigned char *bytes, int length) {
+  if (length != 8) {
+    return nil;
+  }
+  int64_t microseconds = (int64_t)ALNPgReadBigEndian64(bytes);
+  if (microseconds < 0) {
+    return nil;
+  }
+  int64_t seconds = microseconds / 1000000;
+  int64_t fraction = microseconds % 1000000;
+  NSMutableString *value = [NSMutableString stringWithFormat:@"%02lld:%02lld:%02lld",
+                                                             (long long)(seconds / 3600),
+                                                             (long long)((seconds / 60) % 60),
+                                                             (long long)(seconds % 60)];
+  if (fraction > 0) {
+    NSString *digits = [NSString stringWithFormat:@"%06lld", (long long)fraction];
+    NSUInteger end = [digits length];
+    while (end > 0 && [digits characterAtIndex:end - 1] == '0') {
+      end -= 1;
+    }
+    [value appendFormat:@".%@", [digits substringToIndex:end]];
+  }
+  return value;
+}
+
+static NSString *ALNPgUUIDStringFromBinaryUUID(const unsigned char *bytes, int length) {
+  if (length != 16) {
+    return nil;
+  }
+  return [NSString stringWithFormat:@"%02x%02x%02x%02x-%02x%02x-%02x%02x-%02x%02x-%02x%02x%02x%02x%02x%02x",
+                                    bytes[0], bytes[1], bytes[2], bytes[3], bytes[4], bytes[5],
+                                    bytes[6], bytes[7], bytes[8], bytes[9], bytes[10], bytes[11],
+                                    bytes[12], bytes[13], bytes[14], bytes[15]];
+}
+
+static NSString *ALNPgStringFromBinaryText(const unsigned char *bytes, int length) {
+  return [[NSString alloc] initWithBytes:bytes length:(NSUInteger)length encoding:NSUTF8StringEncoding];
+}
+
+static id ALNPgDecodedBinaryValueForFieldType(ALNOid fieldType,
+                                              NSString *columnName,
+                                              const unsigned char *bytes,
+                                              int length,
+                                              NSError **error);
+
+static NSArray *ALNPgDecodedBinaryArray(NSString *columnName,
+                                        const unsigned char *bytes,
+                                        int length,
+                                        NSError **error) {
+  if (length < 12) {
+    return nil;
+  }
+  int32_t dimensions = (int32_t)ALNPgReadBigEndian32(bytes);
+  ALNOid elementType = (ALNOid)ALNPgReadBigEndian32(bytes + 8);
+  if (dimensions == 0) {
+    return @[];
+  }
+  if (dimensions != 1) {
+    if (error != NULL) {
+      *error = ALNPgMakeError(ALNPgErrorQueryFailed,
+                              @"failed decoding PostgreSQL array result",
+                              @"nested PostgreSQL array values are not supported",
+                              nil);
+    }
+    return nil;
+  }
+  if (length < 20) {
+    return nil;
+  }
+  int32_t elementCount = (int32_t)ALNPgReadBigEndian32(bytes + 12);
+  if (elementCount < 0) {
+    return nil;
+  }
+
+  NSMutableArray *decoded = [NSMutableArray arrayWithCapacity:(NSUInteger)elementCount];
+  int offset = 20;
+  for (int32_t idx = 0; idx < elementCount; idx++) {
+    if (offset + 4 > length) {
+      return nil;
+    }
+    int32_t elementLength = (int32_t)ALNPgReadBigEndian32(bytes + offset);
+    offset += 4;
+    if (elementLength == -1) {
+      [decoded addObject:[NSNull null]];
+      continue;
+    }
+    if (elementLength < 0 || elementLength > length - offset) {
+      return nil;
+    }
+    id element = ALNPgDecodedBinaryValueForFieldType(elementType, columnName, bytes + offset, elementLength, error);
+    if (element == nil) {
+      return nil;
+    }
+    [decoded addObject:element];
+    offset += elementLength;
+  }
+  return [NSArray arrayWithArray:decoded];
+}
+
+static id ALNPgDecodedBinaryValueForFieldType(ALNOid fieldType,
+                                              NSString *columnName,
+                                              const unsigned char *bytes,
+                                              int length,
+                                              NSError **error) {
+  id decoded = nil;
+  switch (fieldType) {
+  case ALNPGOIDOID_BOOL:
+    decoded = (length == 1) ? @(bytes[0] != 0) : nil;
+    break;
+  case ALNPGOIDOID_INT2:
+    decoded = (length == 2) ? @((long long)(int16_t)ALNPgReadBigEndian16(bytes)) : nil;
+    break;
+  case ALNPGOIDOID_INT4:
+    decoded = (length == 4) ? @((long long)(int32_t)ALNPgReadBigEndian32(bytes)) : nil;
+    break;
+  case ALNPGOIDOID_INT8:
+    decoded = (length == 8) ? @((long long)(int64_t)ALNPgReadBigEndian64(bytes)) : nil;
+    break;
+  case ALNPGOIDOID_FLOAT4:
+    decoded = (length == 4) ? ALNPgFloat4NumberFromBits(ALNPgReadBigEndian32(bytes)) : nil;
+    break;
+  case ALNPGOIDOID_FLOAT8:
+    if (length == 8) {
+      uint64_t bits = ALNPgReadBigEndian64(bytes);
+      double value = 0;
+      memcpy(&value, &bits, sizeof(value));
+      decoded = @(value);
+    }
+    break;
+  case ALNPGOIDOID_NUMERIC:
+    decoded = ALNPgDecimalNumberFromBinaryNumeric(bytes, length);
+    break;
+  case ALNPGOIDOID_DATE:
+    decoded = ALNPgDateFromBinaryDate(bytes, length);
+    break;
+  case ALNPGOIDOID_TIMESTAMP:
+  case ALNPGOIDOID_TIMESTAMPTZ:
+    decoded = ALNPgDateFromBinaryTimestamp(bytes, length);
+    break;
+  case ALNPGOIDOID_TIME:
+    decoded = ALNPgTimeStringFromBinaryTime(bytes, length);
+    break;
+  case ALNPGOIDOID_UUID:
+    decoded = ALNPgUUIDStringFromBinaryUUID(bytes, length);
+    break;
+  case ALNPGOIDOID_BYTEA:
+    return [NSData dataWithBytes:bytes length:(NSUInteger)length];
+  case ALNPGOIDOID_JSON:
+    decoded = ALNPgJSONValueFromData([NSData dataWithBytes:bytes length:(NSUInteger)length], columnName, error);
+    break;
+  case ALNPGOIDOID_JSONB:
+    // jsonb's binary form is a version byte (1) followed by the JSON text.
+    if (length >= 1 && bytes[0] == 1) {
+      decoded = ALNPgJSONValueFromData([NSData dataWithBytes:bytes + 1 length:(NSUInteger)(length - 1)],
+                                       columnName,
+                                       error);
+    }
+    break;
+  case ALNPGOIDOID_BOOL_ARRAY:
+  case ALNPGOIDOID_BYTEA_ARRAY:
+  case ALNPGOIDOID_INT2_ARRAY:
+  case ALNPGOIDOID_INT4_ARRAY:
+  case ALNPGOIDOID_TEXT_ARRAY:
+  case ALNPGOIDOID_JSON_ARRAY:
+  case ALNPGOIDOID_FLOAT4_ARRAY:
+  case ALNPGOIDOID_FLOAT8_ARRAY:
+  case ALNPGOIDOID_BPCHAR_ARRAY:
+  case ALNPGOIDOID_VARCHAR_ARRAY:
+  case ALNPGOIDOID_DATE_ARRAY:
+  case ALNPGOIDOID_TIME_ARRAY:
+  case ALNPGOIDOID_TIMESTAMP_ARRAY:
+  case ALNPGOIDOID_TIMESTAMPTZ_ARRAY:
+  case ALNPGOIDOID_NUMERIC_ARRAY:
+  case ALNPGOIDOID_UUID_ARRAY:
+  case ALNPGOIDOID_JSONB_ARRAY:
+    decoded = ALNPgDecodedBinaryArray(columnName, bytes, length, error);
+    break;
+  case ALNPGOIDOID_NAME:
+  case ALNPGOIDOID_TEXT:
+  case ALNPGOIDOID_BPCHAR:
+  case ALNPGOIDOID_VARCHAR:
+    decoded = ALNPgStringFromBinaryText(bytes, length);
+    break;
+  default:
+    // Binary results are only requested when every column has a decoder
+    // (see -resultFormatForSQL:...), so this is a mismatch, not a fallback.
+    if (error != NULL) {
+      NSString *detail = [NSString stringWithFormat:@"column %@ has no binary decoder for PostgreSQL OID %u",
+                                                    columnName ?: @"",
+                                                    fieldType];
+      *error = ALNPgMakeError(ALNPgErrorQueryFailed,
+                              @"failed decoding PostgreSQL result value",
+                              detail,
+                              nil);
+    }
+    return nil;
+  }
+
+  if (decoded != nil) {
+    return decoded;
+  }
+  if (error != NULL && *error == nil) {
+    NSString *detail = [NSString stringWithFormat:@"column %@ could not be decoded for binary PostgreSQL OID %u",
+                                                  columnName ?: @"",
+                                                  fieldType];
+    *error = ALNPgMakeError(ALNPgErrorQueryFailed,
+                            @"failed decoding PostgreSQL result value",
+                            detail,
+                            nil);
+  }
+  return nil;
+}
+
+// Mirrors the cases ALNPgDecodedBinaryValueForFieldType decodes.
+static BOOL ALNPgHasBinaryDecoderForFieldType(ALNOid fieldType) {
+  switch (fieldType) {
+  case ALNPGOIDOID_BOOL:
+  case ALNPGOIDOID_INT2:
+  case ALNPGOIDOID_INT4:
+  case ALNPGOIDOID_INT8:
+  case ALNPGOIDOID_FLOAT4:
+  case ALNPGOIDOID_FLOAT8:
+  case ALNPGOIDOID_NUMERIC:
+  case ALNPGOIDOID_DATE:
+  case ALNPGOIDOID_TIMESTAMP:
+  case ALNPGOIDOID_TIMESTAMPTZ:
+  case ALNPGOIDOID_TIME:
+  case ALNPGOIDOID_UUID:
+  case ALNPGOIDOID_BYTEA:
+  case ALNPGOIDOID_JSON:
+  case ALNPGOIDOID_JSONB:
+  case ALNPGOIDOID_BOOL_ARRAY:
+  case ALNPGOIDOID_BYTEA_ARRAY:
+  case ALNPGOIDOID_INT2_ARRAY:
+  case ALNPGOIDOID_INT4_ARRAY:
+  case ALNPGOIDOID_TEXT_ARRAY:
+  case ALNPGOIDOID_JSON_ARRAY:
+  case ALNPGOIDOID_FLOAT4_ARRAY:
+  case ALNPGOIDOID_FLOAT8_ARRAY:
+  case ALNPGOIDOID_BPCHAR_ARRAY:
+  case ALNPGOIDOID_VARCHAR_ARRAY:
+  case ALNPGOIDOID_DATE_ARRAY:
+  case ALNPGOIDOID_TIME_ARRAY:
+  case ALNPGOIDOID_TIMESTAMP_ARRAY:
+  case ALNPGOIDOID_TIMESTAMPTZ_ARRAY:
+  case ALNPGOIDOID_NUMERIC_ARRAY:
+  case ALNPGOIDOID_UUID_ARRAY:
+  case ALNPGOIDOID_JSONB_ARRAY:
+  case ALNPGOIDOID_NAME:
+  case ALNPGOIDOID_TEXT:
+  case ALNPGOIDOID_BPCHAR:
+  case ALNPGOIDOID_VARCHAR:
+    return YES;
+  default:
+    return NO;
+  }
+}
+
+// A result that came back binary with a column no decoder handles: the
+// cached format decision predates a schema change.
+static BOOL ALNPgResultHasUndecodableBinaryColumn(PGresult *result) {
+  if (result == NULL || ALNPQfformat == NULL) {
+    return NO;
+  }
+  int fieldCount = ALNPQnfields(result);
+  for (int field = 0; field < fieldCount; field++) {
+    if (ALNPQfformat(result, field) == 1 && !ALNPgHasBinaryDecoderForFieldType(ALNPQftype(result, field))) {
+      return YES;
+    }
+  }
+  return NO;
+}
+
+typedef NS_ENUM(NSInteger, ALNPgCursorStatementKind) {
+  ALNPgCursorStatementNone = 0,
+  ALNPgCursorStatementDeclare,
+  ALNPgCursorStatementFetch,
+  ALNPgCursorStatementClose,
+};
+
+static NSString *ALNPgNormalizedCursorName(NSString *token) {
+  NSString *name = [token stringByTrimmingCharactersInSet:[NSCharacterSet characterSetWithCharactersInString:@"; \t\r\n"]];
+  if ([name length] >= 2 && [name hasPrefix:@"\""] && [name hasSuffix:@"\""]) {
+    return [name substringWithRange:NSMakeRange(1, [name length] - 2)];
+  }
+  return [name lowercaseString];
+}
+
+// Recognizes DECLARE ... CURSOR ... FOR <query>, FETCH ... <cursor> and
+// CLOSE <cursor | ALL>, returning the cursor name and, for DECLARE, the
+// cursor's query.
+static ALNPgCursorStatementKind ALNPgClassifyCursorStatement(NSString *sql,
+                                                            NSString **cursorName,
+                                                            NSString **cursorQuery) {
+  NSString *trimmed = [sql stringByTrimmingCharactersInSet:[NSCharacterSet whitespaceAndNewlineCharacterSet]];
+  if ([trimmed length] < 5) {
+    return ALNPgCursorStatementNone;
+  }
+  unichar first = [trimmed characterAtIndex:0] | 0x20;
+  if (first != 'd' && first != 'f' && first != 'c') {
+    return ALNPgCursorStatementNone;
+  }
+  NSString *prefix = [[trimmed substringToIndex:MIN((NSUInteger)7, [trimmed length])] uppercaseString];
+  if (![prefix hasPrefix:@"DECLARE"] && ![prefix hasPrefix:@"FETCH"] && ![prefix hasPrefix:@"CLOSE"]) {
+    return ALNPgCursorStatementNone;
+  }
+  NSArray<NSString *> *tokens = [trimmed componentsSeparatedByCharactersInSet:[NSCharacterSet whitespaceAndNewlineCharacterSet]];
+  tokens = [tokens filteredArrayUsingPredicate:[NSPredicate predicateWithFormat:@"length > 0"]];
+  NSString *keyword = [tokens[0] uppercaseString];
+  if ([keyword isEqualToString:@"FETCH"] && [tokens count] >= 2) {
+    *cursorName = ALNPgNormalizedCursorName([tokens lastObject]);
+    return ALNPgCursorStatementFetch;
+  }
+  if ([keyword isEqualToString:@"CLOSE"] && [tokens count] >= 2) {
+    *cursorName = ALNPgNormalizedCursorName(tokens[1]);
+    return ALNPgCursorStatementClose;
+  }
+  if (![keyword isEqualToString:@"DECLARE"] || [tokens count] < 4) {
+    return ALNPgCursorStatementNone;
+  }
+  static NSRegularExpression *declarePattern = nil;
+  static dispatch_once_t onceToken;
+  dispatch_once(&onceToken, ^{
+    declarePattern = [NSRegularExpression
+        regularExpressionWithPattern:@"\\bCURSOR\\b(?:\\s+WITH(?:OUT)?\\s+HOLD)?\\s+FOR\\s+"
+                             options:NSRegularExpressionCaseInsensitive
+                               error:NULL];
+  });
+  NSTextCheckingResult *match = [declarePattern firstMatchInString:trimmed
+                                                           options:0
+                                                             range:NSMakeRange(0, [trimmed length])];
+  if (match == nil) {
+    return ALNPgCursorStatementNone;
+  }
+  *cursorName = ALNPgNormalizedCursorName(tokens[1]);
+  *cursorQuery = [trimmed substringFromIndex:NSMaxRange(match.range)];
+  return ALNPgCursorStatementDeclare;
+}
+
+// Read-only statements are safe to run again in text format when a stale
+// binary decision made their result undecodable.
+static BOOL ALNPgStatementIsReadOnly(NSString *sql) {
+  NSString *trimmed = [sql stringByTrimmingCharactersInSet:[NSCharacterSet whitespaceAndNewlineCharacterSet]];
+  NSRange space = [trimmed rangeOfCharacterFromSet:[NSCharacterSet whitespaceAndNewlineCharacterSet]];
+  NSString *keyword = [(space.location == NSNotFound) ? trimmed : [trimmed substringToIndex:space.location]
+      uppercaseString];
+  return [keyword isEqualToString:@"SELECT"] || [keyword isEqualToString:@"VALUES"] ||
+         [keyword isEqualToString:@"TABLE"] || [keyword isEqualToString:@"SHOW"];
+}
+
 static void ALNPgFreeExecParamsBuffer(ALNPgExecParamsBuffer *buffer) {
   if (buffer == NULL) {
     return;
@@ -1703,6 +2225,10 @@ static NSArray<NSString *> *ALNPgOrderedColumnNames(PGresult *result) {
   return [NSArray arrayWithArray:columns];
 }
 
+static BOOL ALNPgBinaryResultsAvailable(void) {
+  return ALNPQfformat != NULL && ALNPQgetlength != NULL;
+}
+
 static id ALNPgDecodedFieldValue(PGresult *result,
                                  int rowIndex,
                                  int field,
@@ -1717,10 +2243,19 @@ static id ALNPgDecodedFieldValue(PGresult *result,
     return [NSNull null];
   }
 
-  NSString *stringValue = [NSString stringWithUTF8String:value];
   ALNOid fieldType = (ALNPQftype != NULL) ? ALNPQftype(result, field) : 0;
   NSError *decodeError = nil;
-  id decoded = ALNPgDecodedValueForFieldType(fieldType, key, stringValue ?: @"", &decodeError);
+  id decoded = nil;
+  if (ALNPgBinaryResultsAvailable() && ALNPQfformat(result, field) == 1) {
+    decoded = ALNPgDecodedBinaryValueForFieldType(fieldType,
+                                                  key,
+                                                  (const unsigned char *)value,
+                                                  ALNPQgetlength(result, rowIndex, field),
+                                                  &decodeError);
+  } else {
+    NSString *stringValue = [NSString stringWithUTF8String:value];
+    decoded = ALNPgDecodedValueForFieldType(fieldType, key, stringValue ?: @"", &decodeError);
+  }
   if (decoded == nil && decodeError != nil) {
     if (error != NULL) {
       *error = decodeError;
@@ -1730,32 +2265,288 @@ static id ALNPgDecodedFieldValue(PGresult *result,
   return decoded ?: @"";
 }
 
-static NSDictionary *ALNPgRowDictionary(PGresult *result,
+// Appends every row's decoded values, row-major, to `values`.
+static BOOL ALNPgAppendDecodedRowValues(PGresult *result,
                                         NSArray<NSString *> *columnNames,
-                                        int rowIndex,
-                                        NSArray **orderedValuesOut,
+                                        NSMutableArray *values,
                                         NSError **error) {
+  int rowCount = ALNPQntuples(result);
   int fieldCount = ALNPQnfields(result);
-  NSMutableDictionary *row = [NSMutableDictionary dictionaryWithCapacity:(NSUInteger)fieldCount];
-  NSMutableArray *orderedValues = [NSMutableArray arrayWithCapacity:(NSUInteger)fieldCount];
-  for (int field = 0; field < fieldCount; field++) {
-    NSString *key = (field < (int)[columnNames count]) ? columnNames[(NSUInteger)field] : [NSString stringWithFormat:@"col_%d", field];
-    id decoded = ALNPgDecodedFieldValue(result, rowIndex, field, key, error);
-    if (decoded == nil && error != NULL && *error != nil) {
-      return nil;
+  for (int rowIndex = 0; rowIndex < rowCount; rowIndex++) {
+    for (int field = 0; field < fieldCount; field++) {
+      NSString *key = (field < (int)[columnNames count]) ? columnNames[(NSUInteger)field] : [NSString stringWithFormat:@"col_%d", field];
+      id decoded = ALNPgDecodedFieldValue(result, rowIndex, field, key, error);
+      if (decoded == nil && error != NULL && *error != nil) {
+        return NO;
+      }
+      [values addObject:decoded ?: (id)[NSNull null]];
     }
-    row[key] = decoded ?: (id)[NSNull null];
-    [orderedValues addObject:decoded ?: (id)[NSNull null]];
   }
-  if (orderedValuesOut != NULL) {
-    *orderedValuesOut = [NSArray arrayWithArray:orderedValues];
+  return YES;
+}
+
+// One flat value array behind a shared column index; rows come back as
+// ALNDatabaseResultRow views instead of a dictionary each.
+static ALNDatabaseResult *ALNPgColumnarResult(PGresult *result,
+                                              NSArray<NSString *> *columnNames,
+                                              NSError **error) {
+  NSMutableArray *values =
+      [NSMutableArray arrayWithCapacity:(NSUInteger)ALNPQntuples(result) * (NSUInteger)ALNPQnfields(result)];
+  if (!ALNPgAppendDecodedRowValues(result, columnNames, values, error)) {
+    return nil;
+  }
+  return [ALNDatabaseResult resultWithColumns:columnNames rowValues:values];
+}
+
+static BOOL ALNPgPipelineModeAvailable(void) {
+  return ALNPQenterPipelineMode != NULL && ALNPQexitPipelineMode != NULL &&
+         ALNPQpipelineSync != NULL && ALNPQsendQueryParams != NULL && ALNPQgetResult != NULL;
+}
+
+// Concurrent queries wait on the connection sockets with poll(), so they run
+// synchronously on Windows.
+static BOOL ALNPgAsyncQueriesAvailable(void) {
+#if defined(_WIN32)
+  return NO;
+#else
+  return ALNPQsendQueryParams != NULL && ALNPQgetResult != NULL && ALNPQconsumeInput != NULL &&
+         ALNPQisBusy != NULL && ALNPQsocket != NULL;
+#endif
+}
+
+static BOOL ALNPgNotificationsAvailable(void) {
+  return ALNPgAsyncQueriesAvailable() && ALNPQnotifies != NULL && ALNPQfreemem != NULL;
+}
+
+static NSInteger ALNPgAffectedRows(PGresult *result, ALNExecStatusType status) {
+  const char *tuples = ALNPQcmdTuples(result);
+  if (tuples != NULL && tuples[0] != '\0') {
+    return (NSInteger)strtol(tuples, NULL, 10);
+  }
+  if (status == ALNPGRES_TUPLES_OK) {
+    return (NSInteger)ALNPQntuples(result);
+  }
+  return 0;
+}
+
+// Operations in flight before a pipeline is synced and drained. Bounds the
+// unread results so a blocking-mode send can never wait on a server that is
+// itself blocked writing results.
+static const NSUInteger ALNPgPipelineMaxInFlight = 512;
+
+static NSString *const ALNPgPipelineSQLKey = @"sql";
+// Statements whose binary/text result format decision is kept per connection.
+static const NSUInteger ALNPgResultFormatCacheLimit = 512;
+static NSString *const ALNPgPipelineParametersKey = @"parameters";
+static NSString *const ALNPgPipelineCommandKey = @"command";
+
+// Rows per block call when streaming without an explicit batch size.
+static const NSUInteger ALNPgStreamDefaultBatchSize = 500;
+
+// COPY data is handed to libpq in writes of about this size.
+static const NSUInteger ALNPgCopyFlushBytes = 64 * 1024;
+
+static NSString *ALNPgQuotedQualifiedIdentifier(NSString *value) {
+  if (![value isKindOfClass:[NSString class]] || [value length] == 0) {
+    return nil;
+  }
+  NSArray<NSString *> *parts = [value componentsSeparatedByString:@"."];
+  NSMutableArray<NSString *> *quoted = [NSMutableArray arrayWithCapacity:[parts count]];
+  for (NSString *part in parts) {
+    if (!ALNSQLDialectIdentifierIsSafe(part)) {
+      return nil;
+    }
+    [quoted addObject:ALNSQLDialectDoubleQuoteIdentifier(part)];
+  }
+  return [quoted componentsJoinedByString:@"."];
+}
+
+static void ALNPgAppendBigEndian(NSMutableData *data, uint64_t value, NSUInteger width) {
+  unsigned char bytes[8];
+  for (NSUInteger idx = 0; idx < width; idx++) {
+    bytes[idx] = (unsigned char)(value >> (8 * (width - 1 - idx)));
+  }
+  [data appendBytes:bytes length:width];
+}
+
+static BOOL ALNPgAppendCopyTextRow(NSMutableData *data, NSArray *row, NSError **error) {
+  NSUInteger count = [row count];
+  for (NSUInteger idx = 0; idx < count; idx++) {
+    if (idx > 0) {
+      [data appendBytes:"\t" length:1];
+    }
+    NSError *valueError = nil;
+    NSString *value = ALNPgStringFromParam(row[idx], &valueError);
+    if (valueError != nil) {
+      if (error != NULL) {
+        *error = valueError;
+      }
+      return NO;
+    }
+    if (value == nil) {
+      [data appendBytes:"\\N" length:2];
+      continue;
+    }
+    const char *cursor = [value UTF8String];
+    if (cursor == NULL) {
+      if (error != NULL) {
+        *error = ALNPgMakeError(ALNPgErrorInvalidArgument, @"COPY value is not valid UTF-8", nil, nil);
+      }
+      return NO;
+    }
+    // Backslash, tab, newline, and carriage return are the only bytes the
+    // text format requires escaping.
+    const char *run = cursor;
+    for (; *cursor != '\0'; cursor++) {
+      const char *escape = NULL;
+      switch (*cursor) {
+        case '\\':
+          escape = "\\\\";
+          break;
+        case '\t':
+          escape = "\\t";
+          break;
+        case '\n':
+          escape = "\\n";
+          break;
+        case '\r':
+          escape = "\\r";
+          break;
+        default:
+          continue;
+      }
+      [data appendBytes:run length:(NSUInteger)(cursor - run)];
+      [data appendBytes:escape length:2];
+      run = cursor + 1;
+    }
+    [data appendBytes:run length:(NSUInteger)(cursor - run)];
+  }
+  [data appendBytes:"\n" length:1];
+  return YES;
+}
+
+static BOOL ALNPgAppendCopyBinaryField(NSMutableData *data, id value, NSError **error) {
+  if (value == nil || value == [NSNull null]) {
+    ALNPgAppendBigEndian(data, (uint32_t)-1, 4);
+    return YES;
+  }
+  if ([value isKindOfClass:[NSString class]]) {
+    NSData *utf8 = [(NSString *)value dataUsingEncoding:NSUTF8StringEncoding allowLossyConversion:NO];
+    if (utf8 != nil) {
+      ALNPgAppendBigEndian(data, [utf8 length], 4);
+      [data appendData:utf8];
+      return YES;
+    }
+  } else if ([value isKindOfClass:[NSData class]]) {
+    ALNPgAppendBigEndian(data, [(NSData *)value length], 4);
+    [data appendData:value];
+    return YES;
+  } else if ([value isKindOfClass:[NSUUID class]]) {
+    unsigned char bytes[16];
+    [(NSUUID *)value getUUIDBytes:bytes];
+    ALNPgAppendBigEndian(data, sizeof(bytes), 4);
+    [data appendBytes:bytes length:sizeof(bytes)];
+    return YES;
+  } else if ([value isKindOfClass:[NSNumber class]] && ![value isKindOfClass:[NSDecimalNumber class]]) {
+    NSNumber *number = value;
+    const char *type = [number objCType];
+    if (ALNPgNSNumberLooksBoolean(number)) {
+      ALNPgAppendBigEndian(data, 1, 4);
+      ALNPgAppendBigEndian(data, [number boolValue] ? 1 : 0, 1);
+    } else if (type != NULL && (strcmp(type, @encode(double)) == 0 || strcmp(type, @encode(float)) == 0)) {
+      double doubleValue = [number doubleValue];
+      uint64_t bits = 0;
+      memcpy(&bits, &doubleValue, sizeof(bits));
+      ALNPgAppendBigEndian(data, 8, 4);
+      ALNPgAppendBigEndian(data, bits, 8);
+    } else {
+      ALNPgAppendBigEndian(data, 8, 4);
+      ALNPgAppendBigEndian(data, (uint64_t)[number longLongValue], 8);
+    }
+    return YES;
+  } else if ([value isKindOfClass:[NSDate class]]) {
+    double seconds = [(NSDate *)value timeIntervalSince1970] - ALNPgPostgresEpochOffset;
+    ALNPgAppendBigEndian(data, 8, 4);
+    ALNPgAppendBigEndian(data, (uint64_t)llround(seconds * 1000000.0), 8);
+    return YES;
+  }
+  if (error != NULL) {
+    *error = ALNPgMakeError(ALNPgErrorInvalidArgument,
+                            @"value cannot be sent in binary COPY format",
+                            [NSString stringWithFormat:@"%@ values require ALNPgCopyFormatText",
+                                                       NSStringFromClass([value class])],
+                            nil);
+  }
+  return NO;
+}
+
+static BOOL ALNPgAppendCopyBinaryRow(NSMutableData *data, NSArray *row, NSError **error) {
+  ALNPgAppendBigEndian(data, [row count], 2);
+  for (id value in row) {
+    if (!ALNPgAppendCopyBinaryField(data, value, error)) {
+      return NO;
+    }
+  }
+  return YES;
+}
+
+@interface ALNPgPipeline ()
+
+@property(nonatomic, strong) NSMutableArray<NSDictionary *> *operations;
+
+@end
+
+@implementation ALNPgPipeline
+
+- (instancetype)init {
+  self = [super init];
+  if (self) {
+    _operations = [NSMutableArray array];
+  }
+  return self;
+}
+
+- (NSUInteger)count {
+  return [self.operations count];
+}
+
+- (NSArray<NSString *> *)statements {
+  NSMutableArray<NSString *> *statements = [NSMutableArray arrayWithCapacity:[self.operations count]];
+  for (NSDictionary *operation in self.operations) {
+    [statements addObject:operation[ALNPgPipelineSQLKey] ?: @""];
   }
-  return row;
+  return statements;
 }
 
+- (NSUInteger)addOperation:(NSString *)sql parameters:(NSArray *)parameters command:(BOOL)command {
+  [self.operations addObject:@{
+    ALNPgPipelineSQLKey : [sql copy] ?: @"",
+    ALNPgPipelineParametersKey : [parameters isKindOfClass:[NSArray class]] ? [parameters copy] : @[],
+    ALNPgPipelineCommandKey : @(command),
+  }];
+  return [self.operations count] - 1;
+}
+
+- (NSUInteger)addQuery:(NSString *)sql parameters:(NSArray *)parameters {
+  return [self addOperation:sql parameters:parameters command:NO];
+}
+
+- (NSUInteger)addCommand:(NSString *)sql parameters:(NSArray *)parameters {
+  return [self addOperation:sql parameters:parameters command:YES];
+}
+
+- (void)removeAllOperations {
+  [self.operations removeAllObjects];
+}
+
+@end
+
 @interface ALNPgConnection () {
   PGconn *_conn;
   BOOL _inTransaction;
+  // The query started by sendAsyncQuery:, until its outcome is read.
+  NSString *_asyncSQL;
+  NSTimeInterval _asyncStarted;
 }
 
 @property(nonatomic, copy, readwrite) NSString *connectionString;
@@ -1763,12 +2554,35 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
 @property(nonatomic, strong) NSMutableDictionary<NSString *, NSDictionary *> *builderCompilationCache;
 @property(nonatomic, strong) NSMutableArray<NSString *> *builderCompilationCacheOrder;
 @property(nonatomic, strong) NSMutableDictionary<NSString *, NSString *> *preparedStatementNamesByKey;
+@property(nonatomic, strong) NSMutableDictionary<NSString *, NSString *> *preparedStatementSQLByName;
 @property(nonatomic, strong) NSMutableArray<NSString *> *preparedStatementCacheOrder;
 @property(nonatomic, assign) NSUInteger preparedStatementSequence;
+// Result format (0 text, 1 binary) chosen per statement from its described
+// column types, least recently used first in resultFormatOrder.
+@property(nonatomic, strong) NSMutableDictionary<NSString *, NSNumber *> *resultFormatsBySQL;
+@property(nonatomic, strong) NSMutableOrderedSet<NSString *> *resultFormatOrder;
+// Result format of each open cursor's query, chosen at DECLARE.
+@property(nonatomic, strong) NSMutableDictionary<NSString *, NSNumber *> *cursorResultFormats;
+// Pool bookkeeping on the monotonic clock, in seconds.
+@property(nonatomic, assign) NSTimeInterval poolCreatedAt;
+@property(nonatomic, assign) NSTimeInterval poolReleasedAt;
+@property(nonatomic, assign) NSTimeInterval poolCheckedAt;
+// Outcome of the last sendAsyncQuery:, valid once asyncFinished is YES.
+@property(nonatomic, assign) BOOL asyncFinished;
+@property(nonatomic, strong, nullable) ALNDatabaseResult *asyncResult;
+@property(nonatomic, assign) NSInteger asyncAffectedRows;
+@property(nonatomic, strong, nullable) NSError *asyncError;
 
 - (BOOL)hasActiveTransaction;
 - (BOOL)checkConnectionLiveness:(NSError **)error;
+- (int)resultFormatForSQL:(NSString *)sql
+           parameterCount:(NSUInteger)parameterCount
+             preparedName:(nullable NSString *)preparedName;
 - (BOOL)deallocatePreparedStatementNamed:(NSString *)name error:(NSError **)error;
+- (BOOL)sendAsyncQuery:(NSString *)sql parameters:(NSArray *)parameters error:(NSError **)error;
+- (int)asyncSocket;
+- (BOOL)readAsyncInput;
+- (void)abandonAsyncQuery;
 
 @end
 
@@ -1826,10 +2640,17 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
   _includeSQLInDiagnosticsEvents = NO;
   _emitDiagnosticsEventsToStderr = NO;
   _queryDiagnosticsListener = nil;
+  _metrics = nil;
+  _statementStats = nil;
+  _binaryResultsEnabled = NO;
   _builderCompilationCache = [NSMutableDictionary dictionary];
   _builderCompilationCacheOrder = [NSMutableArray array];
   _preparedStatementNamesByKey = [NSMutableDictionary dictionary];
+  _preparedStatementSQLByName = [NSMutableDictionary dictionary];
   _preparedStatementCacheOrder = [NSMutableArray array];
+  _resultFormatsBySQL = [NSMutableDictionary dictionary];
+  _resultFormatOrder = [NSMutableOrderedSet orderedSet];
+  _cursorResultFormats = [NSMutableDictionary dictionary];
   _preparedStatementSequence = 0;
   return self;
 }
@@ -1913,7 +2734,11 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
   [self.builderCompilationCache removeAllObjects];
   [self.builderCompilationCacheOrder removeAllObjects];
   [self.preparedStatementNamesByKey removeAllObjects];
+  [self.preparedStatementSQLByName removeAllObjects];
   [self.preparedStatementCacheOrder removeAllObjects];
+  [self.resultFormatsBySQL removeAllObjects];
+  [self.resultFormatOrder removeAllObjects];
+  [self.cursorResultFormats removeAllObjects];
   self.preparedStatementSequence = 0;
 }
 
@@ -1953,6 +2778,60 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
   return event;
 }
 
+- (void)recordRoundTripSince:(NSTimeInterval)started
+                         sql:(NSString *)sql
+                      result:(PGresult *)result
+                    prepared:(BOOL)prepared {
+  [self recordRoundTripMilliseconds:([NSDate timeIntervalSinceReferenceDate] - started) * 1000.0
+                                sql:sql
+                             result:result
+                           prepared:prepared];
+}
+
+- (void)recordRoundTripMilliseconds:(double)elapsedMs
+                                sql:(NSString *)sql
+                             result:(PGresult *)result
+                           prepared:(BOOL)prepared {
+  if (self.metrics == nil && self.statementStats == nil && [ALNPerfTrace currentTrace] == nil) {
+    return;
+  }
+  ALNExecStatusType status = (result != NULL) ? ALNPQresultStatus(result) : ALNPGRES_EMPTY_QUERY;
+  BOOL failed = (result == NULL ||
+                 (status != ALNPGRES_TUPLES_OK && status != ALNPGRES_COMMAND_OK));
+  NSUInteger rows = 0;
+  if (status == ALNPGRES_TUPLES_OK) {
+    rows = (NSUInteger)MAX(ALNPQntuples(result), 0);
+  } else if (status == ALNPGRES_COMMAND_OK) {
+    const char *affected = ALNPQcmdTuples(result);
+    rows = (affected != NULL) ? (NSUInteger)strtoul(affected, NULL, 10) : 0;
+  }
+  [self recordRoundTripMilliseconds:elapsedMs sql:sql rows:rows failed:failed prepared:prepared];
+}
+
+- (void)recordRoundTripMilliseconds:(double)elapsedMs
+                                sql:(NSString *)sql
+                               rows:(NSUInteger)rows
+                             failed:(BOOL)failed
+                           prepared:(BOOL)prepared {
+  ALNMetricsRegistry *metrics = self.metrics;
+  ALNSQLStatementStats *statementStats = self.statementStats;
+  ALNPerfTrace *trace = [ALNPerfTrace currentTrace];
+  if (metrics == nil && trace == nil && statementStats == nil) {
+    return;
+  }
+  [metrics recordTiming:@"db_query_duration_ms" milliseconds:elapsedMs];
+  [trace recordDatabaseQueryMilliseconds:elapsedMs];
+  if (statementStats == nil || [sql length] == 0) {
+    return;
+  }
+  [statementStats recordSQL:sql
+                      route:trace.routeName
+       durationMilliseconds:elapsedMs
+                       rows:rows
+                   prepared:prepared
+                     failed:failed];
+}
+
 - (void)emitQueryEvent:(NSDictionary *)event {
   NSDictionary *immutable = [NSDictionary dictionaryWithDictionary:event ?: @{}];
   ALNPgQueryDiagnosticsListener listener = self.queryDiagnosticsListener;
@@ -2154,6 +3033,7 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
   }
 
   ALNPQclear(result);
+  [self.preparedStatementSQLByName removeObjectForKey:name];
   return YES;
 }
 
@@ -2209,9 +3089,127 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
     return NO;
   }
   ALNPQclear(result);
+  self.preparedStatementSQLByName[name] = [sql copy];
+  [self.statementStats recordPrepareForSQL:sql];
   return YES;
 }
 
+// Binary results are requested only when every result column has a binary
+// decoder, so interval, inet, money, enums and other undecoded types are
+// read as text, as with binary off. A statement is described once (through
+// its prepared name, or the unnamed statement) and the choice kept in a
+// bounded LRU. A cursor's query is described at DECLARE and its FETCHes
+// reuse that choice without a round trip.
+- (int)resultFormatForSQL:(NSString *)sql
+           parameterCount:(NSUInteger)parameterCount
+             preparedName:(NSString *)preparedName {
+  if (!self.binaryResultsEnabled || !ALNPgBinaryResultsAvailable() || ALNPQdescribePrepared == NULL ||
+      [sql length] == 0) {
+    return 0;
+  }
+  NSString *cursorName = nil;
+  NSString *cursorQuery = nil;
+  switch (ALNPgClassifyCursorStatement(sql, &cursorName, &cursorQuery)) {
+  case ALNPgCursorStatementDeclare:
+    self.cursorResultFormats[cursorName] = @([self describedResultFormatForSQL:cursorQuery
+                                                                parameterCount:parameterCount
+                                                                  preparedName:nil]);
+    return 0;
+  case ALNPgCursorStatementFetch:
+    // A cursor declared some other way (a script, a function) reads as text.
+    return [self.cursorResultFormats[cursorName] intValue];
+  case ALNPgCursorStatementClose:
+    if ([cursorName isEqualToString:@"all"]) {
+      [self.cursorResultFormats removeAllObjects];
+    } else {
+      [self.cursorResultFormats removeObjectForKey:cursorName];
+    }
+    return 0;
+  case ALNPgCursorStatementNone:
+    break;
+  }
+  return [self describedResultFormatForSQL:sql parameterCount:parameterCount preparedName:preparedName];
+}
+
+- (int)describedResultFormatForSQL:(NSString *)sql
+                    parameterCount:(NSUInteger)parameterCount
+                      preparedName:(NSString *)preparedName {
+  NSNumber *cached = self.resultFormatsBySQL[sql];
+  if (cached != nil) {
+    [self.resultFormatOrder removeObject:sql];
+    [self.resultFormatOrder addObject:sql];
+    return [cached intValue];
+  }
+
+  NSString *describedName = preparedName;
+  if (describedName == nil) {
+    PGresult *prepared = ALNPQprepare(_conn, "", [sql UTF8String], (int)parameterCount, NULL);
+    BOOL preparedOK = (prepared != NULL && ALNPQresultStatus(prepared) == ALNPGRES_COMMAND_OK);
+    if (prepared != NULL) {
+      ALNPQclear(prepared);
+    }
+    if (!preparedOK) {
+      // The statement itself reports the error when it runs.
+      return 0;
+    }
+    describedName = @"";
+  }
+  PGresult *description = ALNPQdescribePrepared(_conn, [describedName UTF8String]);
+  if (description == NULL) {
+    return 0;
+  }
+  int format = 0;
+  if (ALNPQresultStatus(description) == ALNPGRES_COMMAND_OK) {
+    format = 1;
+    int fieldCount = ALNPQnfields(description);
+    for (int field = 0; field < fieldCount; field++) {
+      if (!ALNPgHasBinaryDecoderForFieldType(ALNPQftype(description, field))) {
+        format = 0;
+        break;
+      }
+    }
+  }
+  ALNPQclear(description);
+  if ([self.resultFormatOrder count] >= ALNPgResultFormatCacheLimit) {
+    [self.resultFormatsBySQL removeObjectForKey:[self.resultFormatOrder firstObject]];
+    [self.resultFormatOrder removeObjectAtIndex:0];
+  }
+  self.resultFormatsBySQL[sql] = @(format);
+  [self.resultFormatOrder addObject:sql];
+  return format;
+}
+
+// Drops a format decision the schema has outgrown, so the statement is
+// described again on its next run.
+- (void)forgetResultFormatForSQL:(NSString *)sql {
+  if (sql == nil) {
+    return;
+  }
+  [self.resultFormatsBySQL removeObjectForKey:sql];
+  [self.resultFormatOrder removeObject:sql];
+}
+
+// When a result came back binary with a column that has no decoder, the
+// statement's cached decision is dropped and a read-only statement is run
+// again, in text format; anything else returns the decode error once.
+- (PGresult *)textResultReplacingStaleBinaryResult:(PGresult *)result
+                                               sql:(NSString *)sql
+                                             rerun:(PGresult * (^)(void))rerun {
+  if (!ALNPgResultHasUndecodableBinaryColumn(result)) {
+    return result;
+  }
+  [self forgetResultFormatForSQL:sql];
+  if (!ALNPgStatementIsReadOnly(sql)) {
+    return result;
+  }
+  ALNPQclear(result);
+  BOOL binaryResultsEnabled = self.binaryResultsEnabled;
+  self.binaryResultsEnabled = NO;
+  PGresult *textResult = rerun();
+  self.binaryResultsEnabled = binaryResultsEnabled;
+  return textResult;
+}
+
 - (PGresult *)runExecParamsSQL:(NSString *)sql
                     parameters:(NSArray *)parameters
                          error:(NSError **)error {
@@ -2239,6 +3237,8 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
     return NULL;
   }
 
+  int resultFormat = [self resultFormatForSQL:sql parameterCount:count preparedName:nil];
+  NSTimeInterval started = [NSDate timeIntervalSinceReferenceDate];
   PGresult *result = ALNPQexecParams(_conn,
                                   [sql UTF8String],
                                   (int)count,
@@ -2246,7 +3246,8 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
                                   paramBuffer.paramValues,
                                   paramBuffer.paramLengths,
                                   paramBuffer.paramFormats,
-                                  0);
+                                  resultFormat);
+  [self recordRoundTripSince:started sql:sql result:result prepared:NO];
   ALNPgFreeExecParamsBuffer(&paramBuffer);
 
   if (result == NULL) {
@@ -2282,7 +3283,9 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
     return NULL;
   }
 
+  NSTimeInterval started = [NSDate timeIntervalSinceReferenceDate];
   PGresult *result = ALNPQexec(_conn, [sql UTF8String]);
+  [self recordRoundTripSince:started sql:sql result:result prepared:NO];
   if (result == NULL) {
     if (error != NULL) {
       NSString *detail = [NSString stringWithUTF8String:ALNPQerrorMessage(_conn) ?: ""];
@@ -2324,13 +3327,21 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
     return NULL;
   }
 
+  int resultFormat = [self resultFormatForSQL:self.preparedStatementSQLByName[name] ?: name
+                               parameterCount:count
+                                 preparedName:name];
+  NSTimeInterval started = [NSDate timeIntervalSinceReferenceDate];
   PGresult *result = ALNPQexecPrepared(_conn,
                                     [name UTF8String],
                                     (int)count,
                                     paramBuffer.paramValues,
                                     paramBuffer.paramLengths,
                                     paramBuffer.paramFormats,
-                                    0);
+                                    resultFormat);
+  [self recordRoundTripSince:started
+                         sql:self.preparedStatementSQLByName[name] ?: name
+                      result:result
+                    prepared:YES];
   ALNPgFreeExecParamsBuffer(&paramBuffer);
 
   if (result == NULL && error != NULL) {
@@ -2344,34 +3355,11 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
 }
 
 - (NSArray<NSDictionary *> *)rowsFromResult:(PGresult *)result error:(NSError **)error {
-  int rowCount = ALNPQntuples(result);
-  NSArray<NSString *> *columnNames = ALNPgOrderedColumnNames(result);
-  NSMutableArray *rows = [NSMutableArray arrayWithCapacity:(NSUInteger)rowCount];
-  for (int idx = 0; idx < rowCount; idx++) {
-    NSDictionary *row = ALNPgRowDictionary(result, columnNames, idx, NULL, error);
-    if (row == nil) {
-      return nil;
-    }
-    [rows addObject:row];
-  }
-  return rows;
+  return [self databaseResultFromResult:result error:error].rows;
 }
 
 - (ALNDatabaseResult *)databaseResultFromResult:(PGresult *)result error:(NSError **)error {
-  int rowCount = ALNPQntuples(result);
-  NSArray<NSString *> *columnNames = ALNPgOrderedColumnNames(result);
-  NSMutableArray<NSDictionary *> *rows = [NSMutableArray arrayWithCapacity:(NSUInteger)rowCount];
-  NSMutableArray<NSArray *> *orderedValues = [NSMutableArray arrayWithCapacity:(NSUInteger)rowCount];
-  for (int idx = 0; idx < rowCount; idx++) {
-    NSArray *rowValues = nil;
-    NSDictionary *row = ALNPgRowDictionary(result, columnNames, idx, &rowValues, error);
-    if (row == nil) {
-      return nil;
-    }
-    [rows addObject:row];
-    [orderedValues addObject:rowValues ?: @[]];
-  }
-  return ALNDatabaseResultFromRowsWithOrderedColumns(rows, columnNames, orderedValues);
+  return ALNPgColumnarResult(result, ALNPgOrderedColumnNames(result), error);
 }
 
 - (NSArray<NSDictionary *> *)executeQuery:(NSString *)sql
@@ -2379,6 +3367,15 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
                                     error:(NSError **)error {
   ALNPgClearError(error);
   PGresult *result = [self runExecParamsSQL:sql parameters:parameters ?: @[] error:error];
+  if (result != NULL) {
+    result = [self textResultReplacingStaleBinaryResult:result
+                                                    sql:sql
+                                                  rerun:^PGresult * {
+                                                    return [self runExecParamsSQL:sql
+                                                                       parameters:parameters ?: @[]
+                                                                            error:error];
+                                                  }];
+  }
   if (result == NULL) {
     return nil;
   }
@@ -2419,6 +3416,15 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
                                     error:(NSError **)error {
   ALNPgClearError(error);
   PGresult *result = [self runExecParamsSQL:sql parameters:parameters ?: @[] error:error];
+  if (result != NULL) {
+    result = [self textResultReplacingStaleBinaryResult:result
+                                                    sql:sql
+                                                  rerun:^PGresult * {
+                                                    return [self runExecParamsSQL:sql
+                                                                       parameters:parameters ?: @[]
+                                                                            error:error];
+                                                  }];
+  }
   if (result == NULL) {
     return nil;
   }
@@ -2467,13 +3473,7 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
     return -1;
   }
 
-  const char *tuples = ALNPQcmdTuples(result);
-  NSInteger affected = 0;
-  if (tuples != NULL && tuples[0] != '\0') {
-    affected = (NSInteger)strtol(tuples, NULL, 10);
-  } else if (status == ALNPGRES_TUPLES_OK) {
-    affected = (NSInteger)ALNPQntuples(result);
-  }
+  NSInteger affected = ALNPgAffectedRows(result, status);
   ALNPQclear(result);
   return affected;
 }
@@ -2483,6 +3483,15 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
                                                  error:(NSError **)error {
   ALNPgClearError(error);
   PGresult *result = [self runExecPreparedNamed:name parameters:parameters ?: @[] error:error];
+  if (result != NULL) {
+    result = [self textResultReplacingStaleBinaryResult:result
+                                                    sql:self.preparedStatementSQLByName[name]
+                                                  rerun:^PGresult * {
+                                                    return [self runExecPreparedNamed:name
+                                                                           parameters:parameters ?: @[]
+                                                                                error:error];
+                                                  }];
+  }
   if (result == NULL) {
     return nil;
   }
@@ -2531,17 +3540,234 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
     return -1;
   }
 
-  const char *tuples = ALNPQcmdTuples(result);
-  NSInteger affected = 0;
-  if (tuples != NULL && tuples[0] != '\0') {
-    affected = (NSInteger)strtol(tuples, NULL, 10);
-  } else if (status == ALNPGRES_TUPLES_OK) {
-    affected = (NSInteger)ALNPQntuples(result);
-  }
+  NSInteger affected = ALNPgAffectedRows(result, status);
   ALNPQclear(result);
   return affected;
 }
 
+- (BOOL)supportsPipelineMode {
+  return ALNPgPipelineModeAvailable();
+}
+
+- (NSError *)failTransportWithMessage:(NSString *)message {
+  NSString *detail = (_conn != NULL)
+                         ? [NSString stringWithUTF8String:ALNPQerrorMessage(_conn) ?: ""]
+                         : nil;
+  // The protocol state is unknown after a transport failure mid-pipeline or
+  // mid-COPY; closing makes the pool discard the connection.
+  [self close];
+  return ALNPgMakeError(ALNPgErrorConnectionFailed, message, detail, nil);
+}
+
+- (id)pipelineOutcomeForResult:(PGresult *)result sql:(NSString *)sql command:(BOOL)command {
+  ALNExecStatusType status = ALNPQresultStatus(result);
+  if (status == ALNPGRES_PIPELINE_ABORTED) {
+    return ALNPgMakeError(ALNPgErrorQueryFailed,
+                          @"pipelined statement skipped after an earlier failure",
+                          nil,
+                          sql);
+  }
+  if (command && (status == ALNPGRES_COMMAND_OK || status == ALNPGRES_TUPLES_OK)) {
+    return @(ALNPgAffectedRows(result, status));
+  }
+  if (!command && status == ALNPGRES_TUPLES_OK) {
+    NSError *decodeError = nil;
+    ALNDatabaseResult *rows = [self databaseResultFromResult:result error:&decodeError];
+    return rows ?: (id)decodeError;
+  }
+  NSString *detail = [NSString stringWithUTF8String:ALNPQresultErrorMessage(result) ?: ""];
+  return ALNPgMakeErrorWithDiagnostics(ALNPgErrorQueryFailed,
+                                       command ? @"command execution failed"
+                                               : @"query did not return rows",
+                                       detail,
+                                       sql,
+                                       ALNPgDiagnosticsFromResult(result));
+}
+
+// Runs `operations` in pipeline mode, at most ALNPgPipelineMaxInFlight per
+// sync-and-drain cycle. With `syncEach`, every operation gets its own sync
+// point so failures stay isolated; otherwise each cycle shares one sync point
+// and processing stops after the first cycle with a failure. Returns one
+// outcome per processed operation, or nil when the connection fails.
+- (NSArray *)runPipelineOperations:(NSArray<NSDictionary *> *)operations
+                          syncEach:(BOOL)syncEach
+                             error:(NSError **)error {
+  ALNPgClearError(error);
+  NSError *openError = [self checkOpenError];
+  if (openError != nil) {
+    if (error != NULL) {
+      *error = openError;
+    }
+    return nil;
+  }
+
+  NSUInteger total = [operations count];
+  NSMutableArray *outcomes = [NSMutableArray arrayWithCapacity:total];
+  for (NSUInteger chunkStart = 0; chunkStart < total; chunkStart += ALNPgPipelineMaxInFlight) {
+    NSUInteger chunkCount = MIN(ALNPgPipelineMaxInFlight, total - chunkStart);
+    ALNPgExecParamsBuffer *buffers = calloc(chunkCount, sizeof(ALNPgExecParamsBuffer));
+    BOOL *built = calloc(chunkCount, sizeof(BOOL));
+    int *resultFormats = calloc(chunkCount, sizeof(int));
+    if (buffers == NULL || built == NULL || resultFormats == NULL) {
+      free(buffers);
+      free(built);
+      free(resultFormats);
+      if (error != NULL) {
+        *error = ALNPgMakeError(ALNPgErrorQueryFailed, @"failed to allocate pipeline", nil, nil);
+      }
+      return nil;
+    }
+
+    // Encode every parameter set before anything is sent, so an invalid
+    // batch fails without executing part of it.
+    NSMutableArray *chunkOutcomes = [NSMutableArray arrayWithCapacity:chunkCount];
+    BOOL invalidBatch = NO;
+    for (NSUInteger offset = 0; offset < chunkCount; offset++) {
+      NSDictionary *operation = operations[chunkStart + offset];
+      NSString *sql = operation[ALNPgPipelineSQLKey];
+      NSError *buildError = nil;
+      if ([sql length] == 0) {
+        buildError = ALNPgMakeError(ALNPgErrorInvalidArgument, @"sql must not be empty", nil, sql);
+      } else {
+        built[offset] = ALNPgBuildExecParamsBuffer(operation[ALNPgPipelineParametersKey],
+                                                   sql,
+                                                   &buffers[offset],
+                                                   &buildError);
+        // Described before pipeline mode is entered; describing is a round trip.
+        if (built[offset]) {
+          resultFormats[offset] = [self resultFormatForSQL:sql
+                                            parameterCount:[operation[ALNPgPipelineParametersKey] count]
+                                              preparedName:nil];
+        }
+      }
+      [chunkOutcomes addObject:built[offset] ? (id)[NSNull null] : (id)buildError];
+      if (!built[offset] && !syncEach) {
+        invalidBatch = YES;
+        [outcomes addObject:buildError];
+        break;
+      }
+    }
+
+    NSString *failure = nil;
+    if (!invalidBatch) {
+      if (ALNPQenterPipelineMode(_conn) != 1) {
+        failure = @"failed to enter pipeline mode";
+      }
+      for (NSUInteger offset = 0; failure == nil && offset < chunkCount; offset++) {
+        if (!built[offset]) {
+          continue;
+        }
+        NSDictionary *operation = operations[chunkStart + offset];
+        NSString *sql = operation[ALNPgPipelineSQLKey];
+        NSArray *parameters = operation[ALNPgPipelineParametersKey];
+        if (ALNPQsendQueryParams(_conn,
+                                 [sql UTF8String],
+                                 (int)[parameters count],
+                                 NULL,
+                                 buffers[offset].paramValues,
+                                 buffers[offset].paramLengths,
+                                 buffers[offset].paramFormats,
+                                 resultFormats[offset]) != 1) {
+          failure = @"failed to send pipelined statement";
+        } else if (syncEach && ALNPQpipelineSync(_conn) != 1) {
+          failure = @"failed to send pipeline sync";
+        }
+      }
+      if (failure == nil && !syncEach && ALNPQpipelineSync(_conn) != 1) {
+        failure = @"failed to send pipeline sync";
+      }
+    }
+    for (NSUInteger offset = 0; offset < chunkCount; offset++) {
+      if (built[offset]) {
+        ALNPgFreeExecParamsBuffer(&buffers[offset]);
+      }
+    }
+    free(buffers);
+    free(built);
+    free(resultFormats);
+    if (invalidBatch) {
+      return outcomes;
+    }
+    if (failure != nil) {
+      NSError *pipelineError = [self failTransportWithMessage:failure];
+      if (error != NULL) {
+        *error = pipelineError;
+      }
+      return nil;
+    }
+
+    NSTimeInterval lastArrival = [NSDate timeIntervalSinceReferenceDate];
+    BOOL chunkFailed = NO;
+    for (NSUInteger offset = 0; offset < chunkCount; offset++) {
+      if (chunkOutcomes[offset] != [NSNull null]) {
+        [outcomes addObject:chunkOutcomes[offset]];
+        continue;
+      }
+      NSDictionary *operation = operations[chunkStart + offset];
+      NSString *sql = operation[ALNPgPipelineSQLKey];
+      PGresult *result = ALNPQgetResult(_conn);
+      if (result == NULL) {
+        failure = @"pipeline ended before all results were read";
+        break;
+      }
+      NSTimeInterval arrival = [NSDate timeIntervalSinceReferenceDate];
+      if (ALNPQresultStatus(result) != ALNPGRES_PIPELINE_ABORTED) {
+        [self recordRoundTripMilliseconds:(arrival - lastArrival) * 1000.0
+                                      sql:sql
+                                   result:result
+                                 prepared:NO];
+      }
+      lastArrival = arrival;
+      id outcome = [self pipelineOutcomeForResult:result
+                                              sql:sql
+                                          command:[operation[ALNPgPipelineCommandKey] boolValue]];
+      ALNPQclear(result);
+      chunkFailed = chunkFailed || [outcome isKindOfClass:[NSError class]];
+      [outcomes addObject:outcome];
+
+      // Each statement's results end with NULL.
+      while ((result = ALNPQgetResult(_conn)) != NULL) {
+        ALNPQclear(result);
+      }
+      if (syncEach) {
+        result = ALNPQgetResult(_conn);
+        BOOL synced = (result != NULL && ALNPQresultStatus(result) == ALNPGRES_PIPELINE_SYNC);
+        if (result != NULL) {
+          ALNPQclear(result);
+        }
+        if (!synced) {
+          failure = @"pipeline sync result missing";
+          break;
+        }
+      }
+    }
+    if (failure == nil && !syncEach) {
+      PGresult *result = ALNPQgetResult(_conn);
+      BOOL synced = (result != NULL && ALNPQresultStatus(result) == ALNPGRES_PIPELINE_SYNC);
+      if (result != NULL) {
+        ALNPQclear(result);
+      }
+      if (!synced) {
+        failure = @"pipeline sync result missing";
+      }
+    }
+    if (failure == nil && ALNPQexitPipelineMode(_conn) != 1) {
+      failure = @"failed to exit pipeline mode";
+    }
+    if (failure != nil) {
+      NSError *pipelineError = [self failTransportWithMessage:failure];
+      if (error != NULL) {
+        *error = pipelineError;
+      }
+      return nil;
+    }
+    if (chunkFailed && !syncEach) {
+      break;
+    }
+  }
+  return outcomes;
+}
+
 - (NSInteger)executeCommandBatch:(NSString *)sql
                    parameterSets:(NSArray<NSArray *> *)parameterSets
                            error:(NSError **)error {
@@ -2556,7 +3782,6 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
     return -1;
   }
 
-  NSInteger totalAffected = 0;
   for (id item in parameterSets ?: @[]) {
     if (![item isKindOfClass:[NSArray class]]) {
       if (error != NULL) {
@@ -2567,18 +3792,672 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
       }
       return -1;
     }
-    NSInteger affected = [self executeCommand:sql parameters:item error:error];
-    if (affected < 0) {
-      return -1;
-    }
-    totalAffected += affected;
   }
-  return totalAffected;
-}
+  if ([parameterSets count] < 2 || _inTransaction) {
+    return [self runCommandBatch:sql parameterSets:parameterSets error:error];
+  }
 
-- (BOOL)executeScript:(NSString *)sql error:(NSError **)error {
-  ALNPgClearError(error);
-  PGresult *result = [self runExecScriptSQL:sql error:error];
+  // Without a caller transaction the batch opens its own, so it applies or
+  // rolls back as a whole rather than one sync segment at a time.
+  if (![self beginTransaction:error]) {
+    return -1;
+  }
+  NSInteger totalAffected = [self runCommandBatch:sql parameterSets:parameterSets error:error];
+  if (totalAffected < 0) {
+    (void)[self rollbackTransaction:NULL];
+    return -1;
+  }
+  if (![self commitTransaction:error]) {
+    return -1;
+  }
+  return totalAffected;
+}
+
+- (NSInteger)runCommandBatch:(NSString *)sql
+               parameterSets:(NSArray<NSArray *> *)parameterSets
+                       error:(NSError **)error {
+  NSInteger totalAffected = 0;
+  if ([parameterSets count] < 2 || !self.supportsPipelineMode) {
+    for (NSArray *item in parameterSets ?: @[]) {
+      NSInteger affected = [self executeCommand:sql parameters:item error:error];
+      if (affected < 0) {
+        return -1;
+      }
+      totalAffected += affected;
+    }
+    return totalAffected;
+  }
+
+  NSMutableArray *operations = [NSMutableArray arrayWithCapacity:[parameterSets count]];
+  for (NSArray *item in parameterSets) {
+    [operations addObject:@{
+      ALNPgPipelineSQLKey : sql ?: @"",
+      ALNPgPipelineParametersKey : item,
+      ALNPgPipelineCommandKey : @YES,
+    }];
+  }
+  NSArray *outcomes = [self runPipelineOperations:operations syncEach:NO error:error];
+  if (outcomes == nil) {
+    return -1;
+  }
+  for (id outcome in outcomes) {
+    if ([outcome isKindOfClass:[NSError class]]) {
+      if (error != NULL) {
+        *error = outcome;
+      }
+      return -1;
+    }
+    totalAffected += [outcome integerValue];
+  }
+  return totalAffected;
+}
+
+- (NSArray *)executePipeline:(ALNPgPipeline *)pipeline error:(NSError **)error {
+  ALNPgClearError(error);
+  if (![pipeline isKindOfClass:[ALNPgPipeline class]]) {
+    if (error != NULL) {
+      *error = ALNPgMakeError(ALNPgErrorInvalidArgument, @"pipeline is required", nil, nil);
+    }
+    return nil;
+  }
+  NSArray<NSDictionary *> *operations = [pipeline.operations copy];
+  if ([operations count] == 0) {
+    return @[];
+  }
+  if (self.supportsPipelineMode) {
+    return [self runPipelineOperations:operations syncEach:YES error:error];
+  }
+
+  NSError *openError = [self checkOpenError];
+  if (openError != nil) {
+    if (error != NULL) {
+      *error = openError;
+    }
+    return nil;
+  }
+  NSMutableArray *outcomes = [NSMutableArray arrayWithCapacity:[operations count]];
+  for (NSDictionary *operation in operations) {
+    NSString *sql = operation[ALNPgPipelineSQLKey];
+    NSArray *parameters = operation[ALNPgPipelineParametersKey];
+    NSError *operationError = nil;
+    id outcome = nil;
+    if ([operation[ALNPgPipelineCommandKey] boolValue]) {
+      NSInteger affected = [self executeCommand:sql parameters:parameters error:&operationError];
+      outcome = (affected >= 0) ? @(affected) : nil;
+    } else {
+      outcome = [self executeQueryResult:sql parameters:parameters error:&operationError];
+    }
+    [outcomes addObject:outcome ?: operationError ?: ALNPgMakeError(ALNPgErrorQueryFailed,
+                                                                      @"query execution failed",
+                                                                      nil,
+                                                                      sql)];
+  }
+  return outcomes;
+}
+
+- (NSInteger)bulkCopyIntoTable:(NSString *)table
+                       columns:(NSArray<NSString *> *)columns
+                        format:(ALNPgCopyFormat)format
+                   rowProducer:(ALNPgCopyRowProducer)rowProducer
+                         error:(NSError **)error {
+  ALNPgClearError(error);
+  NSError *openError = [self checkOpenError];
+  if (openError != nil) {
+    if (error != NULL) {
+      *error = openError;
+    }
+    return -1;
+  }
+  if (rowProducer == nil || ![columns isKindOfClass:[NSArray class]] || [columns count] == 0) {
+    if (error != NULL) {
+      *error = ALNPgMakeError(ALNPgErrorInvalidArgument,
+                              @"COPY requires columns and a row producer",
+                              nil,
+                              nil);
+    }
+    return -1;
+  }
+  NSString *quotedTable = ALNPgQuotedQualifiedIdentifier(table);
+  NSMutableArray<NSString *> *quotedColumns = [NSMutableArray arrayWithCapacity:[columns count]];
+  for (NSString *column in columns) {
+    NSString *quoted = ALNSQLDialectIdentifierIsSafe(column) ? ALNSQLDialectDoubleQuoteIdentifier(column) : nil;
+    if (quoted == nil || quotedTable == nil) {
+      if (error != NULL) {
+        *error = ALNPgMakeError(ALNPgErrorInvalidArgument,
+                                @"invalid COPY identifier",
+                                (quotedTable == nil) ? table : column,
+                                nil);
+      }
+      return -1;
+    }
+    [quotedColumns addObject:quoted];
+  }
+  if (ALNPQputCopyData == NULL || ALNPQputCopyEnd == NULL || ALNPQgetResult == NULL) {
+    if (error != NULL) {
+      *error = ALNPgMakeError(ALNPgErrorQueryFailed, @"libpq does not provide COPY support", nil, nil);
+    }
+    return -1;
+  }
+
+  BOOL binary = (format == ALNPgCopyFormatBinary);
+  NSString *sql = [NSString stringWithFormat:@"COPY %@ (%@) FROM STDIN%@",
+                                             quotedTable,
+                                             [quotedColumns componentsJoinedByString:@", "],
+                                             binary ? @" (FORMAT binary)" : @""];
+  NSTimeInterval started = [NSDate timeIntervalSinceReferenceDate];
+  PGresult *result = ALNPQexec(_conn, [sql UTF8String]);
+  if (result == NULL || ALNPQresultStatus(result) != ALNPGRES_COPY_IN) {
+    [self recordRoundTripSince:started sql:sql result:result prepared:NO];
+    if (error != NULL) {
+      NSString *detail = (result != NULL)
+                             ? [NSString stringWithUTF8String:ALNPQresultErrorMessage(result) ?: ""]
+                             : [NSString stringWithUTF8String:ALNPQerrorMessage(_conn) ?: ""];
+      *error = ALNPgMakeErrorWithDiagnostics(ALNPgErrorQueryFailed,
+                                             @"COPY failed to start",
+                                             detail,
+                                             sql,
+                                             (result != NULL) ? ALNPgDiagnosticsFromResult(result) : nil);
+    }
+    if (result != NULL) {
+      ALNPQclear(result);
+    }
+    return -1;
+  }
+  ALNPQclear(result);
+
+  NSMutableData *buffer = [NSMutableData dataWithCapacity:ALNPgCopyFlushBytes + 4096];
+  if (binary) {
+    [buffer appendBytes:"PGCOPY\n\377\r\n\0" length:11];
+    ALNPgAppendBigEndian(buffer, 0, 4);
+    ALNPgAppendBigEndian(buffer, 0, 4);
+  }
+  NSError *rowError = nil;
+  NSException *producerException = nil;
+  BOOL sendFailed = NO;
+  NSUInteger rowCount = 0;
+  while (rowError == nil && !sendFailed) {
+    @autoreleasepool {
+      NSError *producerError = nil;
+      NSArray *row = nil;
+      // A raising producer must not leave the connection stuck in COPY IN:
+      // the COPY is aborted and drained below before the exception is
+      // rethrown.
+      @try {
+        row = rowProducer(&producerError);
+      } @catch (NSException *exception) {
+        producerException = exception;
+        producerError = ALNPgMakeError(ALNPgErrorQueryFailed,
+                                       @"COPY row producer raised an exception",
+                                       exception.reason,
+                                       sql);
+      }
+      if (row == nil) {
+        rowError = producerError;
+        break;
+      }
+      NSError *encodeError = nil;
+      if (![row isKindOfClass:[NSArray class]] || [row count] != [columns count]) {
+        encodeError = ALNPgMakeError(ALNPgErrorInvalidArgument,
+                                     @"COPY row does not match the column list",
+                                     nil,
+                                     nil);
+      } else if (!(binary ? ALNPgAppendCopyBinaryRow(buffer, row, &encodeError)
+                          : ALNPgAppendCopyTextRow(buffer, row, &encodeError))) {
+        encodeError = encodeError ?: ALNPgMakeError(ALNPgErrorInvalidArgument,
+                                                    @"failed to encode COPY row",
+                                                    nil,
+                                                    nil);
+      }
+      if (encodeError != nil) {
+        NSString *detail = [NSString stringWithFormat:@"row %lu: %@",
+                                                      (unsigned long)(rowCount + 1),
+                                                      [encodeError localizedDescription] ?: @"invalid value"];
+        rowError = ALNPgMakeError(ALNPgErrorInvalidArgument, @"failed to encode COPY row", detail, sql);
+        break;
+      }
+      rowCount += 1;
+      if ([buffer length] >= ALNPgCopyFlushBytes) {
+        sendFailed = (ALNPQputCopyData(_conn, [buffer bytes], (int)[buffer length]) != 1);
+        [buffer setLength:0];
+      }
+    }
+  }
+  if (rowError == nil && !sendFailed) {
+    if (binary) {
+      ALNPgAppendBigEndian(buffer, (uint16_t)-1, 2);
+    }
+    if ([buffer length] > 0) {
+      sendFailed = (ALNPQputCopyData(_conn, [buffer bytes], (int)[buffer length]) != 1);
+    }
+  }
+  if (!sendFailed) {
+    // A non-NULL message makes the server abort and discard the COPY.
+    sendFailed = (ALNPQputCopyEnd(_conn, (rowError != nil) ? "aborted by client" : NULL) != 1);
+  }
+  if (sendFailed) {
+    NSError *copyError = [self failTransportWithMessage:@"failed to send COPY data"];
+    if (producerException != nil) {
+      @throw producerException;
+    }
+    if (error != NULL) {
+      *error = rowError ?: copyError;
+    }
+    return -1;
+  }
+
+  result = ALNPQgetResult(_conn);
+  ALNExecStatusType status = (result != NULL) ? ALNPQresultStatus(result) : ALNPGRES_EMPTY_QUERY;
+  [self recordRoundTripSince:started sql:sql result:result prepared:NO];
+  NSInteger copied = -1;
+  if (rowError != nil) {
+    if (error != NULL) {
+      *error = rowError;
+    }
+  } else if (status == ALNPGRES_COMMAND_OK) {
+    copied = ALNPgAffectedRows(result, status);
+  } else if (error != NULL) {
+    NSString *detail = (result != NULL)
+                           ? [NSString stringWithUTF8String:ALNPQresultErrorMessage(result) ?: ""]
+                           : [NSString stringWithUTF8String:ALNPQerrorMessage(_conn) ?: ""];
+    *error = ALNPgMakeErrorWithDiagnostics(ALNPgErrorQueryFailed,
+                                           @"COPY failed",
+                                           detail,
+                                           sql,
+                                           (result != NULL) ? ALNPgDiagnosticsFromResult(result) : nil);
+  }
+  if (result != NULL) {
+    ALNPQclear(result);
+  }
+  while ((result = ALNPQgetResult(_conn)) != NULL) {
+    ALNPQclear(result);
+  }
+  if (producerException != nil) {
+    @throw producerException;
+  }
+  return copied;
+}
+
+- (void)cancelRunningQuery {
+  if (ALNPQgetCancel == NULL || ALNPQcancel == NULL || ALNPQfreeCancel == NULL) {
+    return;
+  }
+  void *cancel = ALNPQgetCancel(_conn);
+  if (cancel == NULL) {
+    return;
+  }
+  char errbuf[256];
+  (void)ALNPQcancel(cancel, errbuf, (int)sizeof(errbuf));
+  ALNPQfreeCancel(cancel);
+}
+
+- (BOOL)streamQuery:(NSString *)sql
+         parameters:(NSArray *)parameters
+          batchSize:(NSUInteger)batchSize
+         usingBlock:(ALNPgRowBatchBlock)block
+              error:(NSError **)error {
+  ALNPgClearError(error);
+  NSError *openError = [self checkOpenError];
+  if (openError != nil) {
+    if (error != NULL) {
+      *error = openError;
+    }
+    return NO;
+  }
+  if ([sql length] == 0 || block == nil) {
+    if (error != NULL) {
+      *error = ALNPgMakeError(ALNPgErrorInvalidArgument,
+                              @"streaming requires sql and a row block",
+                              nil,
+                              sql);
+    }
+    return NO;
+  }
+  NSUInteger resolvedBatchSize = (batchSize > 0) ? batchSize : ALNPgStreamDefaultBatchSize;
+
+  if (ALNPQsendQueryParams == NULL || ALNPQgetResult == NULL || ALNPQsetSingleRowMode == NULL) {
+    NSArray *rows = [self executeQuery:sql parameters:parameters ?: @[] error:error];
+    if (rows == nil) {
+      return NO;
+    }
+    BOOL stop = NO;
+    for (NSUInteger offset = 0; offset < [rows count] && !stop; offset += resolvedBatchSize) {
+      NSUInteger length = MIN(resolvedBatchSize, [rows count] - offset);
+      block([rows subarrayWithRange:NSMakeRange(offset, length)], &stop);
+    }
+    return YES;
+  }
+
+  ALNPgExecParamsBuffer paramBuffer;
+  if (!ALNPgBuildExecParamsBuffer(parameters ?: @[], sql, &paramBuffer, error)) {
+    return NO;
+  }
+  int resultFormat = [self resultFormatForSQL:sql parameterCount:[parameters count] preparedName:nil];
+  NSTimeInterval started = [NSDate timeIntervalSinceReferenceDate];
+  int sent = ALNPQsendQueryParams(_conn,
+                                  [sql UTF8String],
+                                  (int)[parameters count],
+                                  NULL,
+                                  paramBuffer.paramValues,
+                                  paramBuffer.paramLengths,
+                                  paramBuffer.paramFormats,
+                                  resultFormat);
+  ALNPgFreeExecParamsBuffer(&paramBuffer);
+  if (sent != 1) {
+    if (error != NULL) {
+      NSString *detail = [NSString stringWithUTF8String:ALNPQerrorMessage(_conn) ?: ""];
+      *error = ALNPgMakeError(ALNPgErrorQueryFailed, @"query execution failed", detail, sql);
+    }
+    return NO;
+  }
+  // Chunked mode (libpq 17+) hands over up to one batch per PGresult;
+  // otherwise single-row mode hands over one row per PGresult. Either way
+  // libpq never buffers the whole result.
+  BOOL chunked = (ALNPQsetChunkedRowsMode != NULL &&
+                  ALNPQsetChunkedRowsMode(_conn, (int)MIN(resolvedBatchSize, (NSUInteger)INT_MAX)) == 1);
+  if (!chunked) {
+    (void)ALNPQsetSingleRowMode(_conn);
+  }
+
+  NSArray<NSString *> *columnNames = nil;
+  // Values of the rows not yet handed to the block, row-major; each batch
+  // becomes one columnar result.
+  NSMutableArray *batchValues = [NSMutableArray array];
+  NSUInteger batchRows = 0;
+  NSError *streamError = nil;
+  BOOL stop = NO;
+  NSUInteger rowCount = 0;
+  double blockSeconds = 0;
+  PGresult *result = NULL;
+  while ((result = ALNPQgetResult(_conn)) != NULL) {
+    ALNExecStatusType status = ALNPQresultStatus(result);
+    if (stop || streamError != nil) {
+      // Draining after cancel or failure; the canceled statement's error is
+      // expected and ignored.
+      ALNPQclear(result);
+      continue;
+    }
+    if (status != ALNPGRES_SINGLE_TUPLE && status != ALNPGRES_TUPLES_CHUNK && status != ALNPGRES_TUPLES_OK) {
+      NSString *detail = [NSString stringWithUTF8String:ALNPQresultErrorMessage(result) ?: ""];
+      streamError = ALNPgMakeErrorWithDiagnostics(ALNPgErrorQueryFailed,
+                                                  @"query did not return rows",
+                                                  detail,
+                                                  sql,
+                                                  ALNPgDiagnosticsFromResult(result));
+      ALNPQclear(result);
+      continue;
+    }
+    @autoreleasepool {
+      if (columnNames == nil) {
+        columnNames = ALNPgOrderedColumnNames(result);
+      }
+      NSError *decodeError = nil;
+      if (!ALNPgAppendDecodedRowValues(result, columnNames, batchValues, &decodeError)) {
+        streamError = decodeError;
+      } else {
+        NSUInteger tupleCount = (NSUInteger)ALNPQntuples(result);
+        rowCount += tupleCount;
+        batchRows += tupleCount;
+      }
+      while (streamError == nil && !stop && batchRows >= resolvedBatchSize) {
+        NSRange range = NSMakeRange(0, resolvedBatchSize * [columnNames count]);
+        NSArray *rows = [ALNDatabaseResult resultWithColumns:columnNames
+                                                   rowValues:[batchValues subarrayWithRange:range]].rows;
+        [batchValues removeObjectsInRange:range];
+        batchRows -= resolvedBatchSize;
+        NSTimeInterval blockStarted = [NSDate timeIntervalSinceReferenceDate];
+        block(rows, &stop);
+        blockSeconds += [NSDate timeIntervalSinceReferenceDate] - blockStarted;
+      }
+    }
+    ALNPQclear(result);
+    // Canceling inside a transaction would abort it, so there the remaining
+    // rows are read and discarded instead.
+    if ((stop || streamError != nil) && !_inTransaction) {
+      [self cancelRunningQuery];
+    }
+  }
+  if (!stop && streamError == nil && batchRows > 0) {
+    NSArray *rows = [ALNDatabaseResult resultWithColumns:columnNames rowValues:batchValues].rows;
+    NSTimeInterval blockStarted = [NSDate timeIntervalSinceReferenceDate];
+    block(rows, &stop);
+    blockSeconds += [NSDate timeIntervalSinceReferenceDate] - blockStarted;
+  }
+  double elapsedMs = ([NSDate timeIntervalSinceReferenceDate] - started - blockSeconds) * 1000.0;
+  [self recordRoundTripMilliseconds:elapsedMs sql:sql rows:rowCount failed:(streamError != nil) prepared:NO];
+  if (streamError != nil) {
+    if (error != NULL) {
+      *error = streamError;
+    }
+    return NO;
+  }
+  return YES;
+}
+
+- (BOOL)streamBuilderQuery:(ALNSQLBuilder *)builder
+                 batchSize:(NSUInteger)batchSize
+                usingBlock:(ALNPgRowBatchBlock)block
+                     error:(NSError **)error {
+  ALNPgClearError(error);
+  BOOL cacheHit = NO;
+  NSDictionary *compiled = [self compiledBuilder:builder cacheHit:&cacheHit error:error];
+  if (compiled == nil) {
+    return NO;
+  }
+  NSString *sql = [compiled[@"sql"] isKindOfClass:[NSString class]] ? compiled[@"sql"] : @"";
+  NSArray *parameters = [compiled[@"parameters"] isKindOfClass:[NSArray class]] ? compiled[@"parameters"] : @[];
+  return [self streamQuery:sql parameters:parameters batchSize:batchSize usingBlock:block error:error];
+}
+
+
+// Keeps the first result of the async query; later ones (a multi-statement
+// string) only need clearing.
+- (void)takeAsyncOutcomeFromResult:(PGresult *)result {
+  if (self.asyncResult != nil || self.asyncError != nil) {
+    return;
+  }
+  ALNExecStatusType status = ALNPQresultStatus(result);
+  if (status == ALNPGRES_TUPLES_OK) {
+    NSError *decodeError = nil;
+    self.asyncResult = [self databaseResultFromResult:result error:&decodeError];
+    self.asyncAffectedRows = (NSInteger)ALNPQntuples(result);
+    self.asyncError = (self.asyncResult == nil) ? decodeError : nil;
+  } else if (status == ALNPGRES_COMMAND_OK) {
+    self.asyncResult = [ALNDatabaseResult resultWithColumns:@[] rowValues:@[]];
+    self.asyncAffectedRows = ALNPgAffectedRows(result, status);
+  } else {
+    NSString *detail = [NSString stringWithUTF8String:ALNPQresultErrorMessage(result) ?: ""];
+    self.asyncError = ALNPgMakeErrorWithDiagnostics(ALNPgErrorQueryFailed,
+                                                    @"query execution failed",
+                                                    detail,
+                                                    _asyncSQL,
+                                                    ALNPgDiagnosticsFromResult(result));
+  }
+}
+
+- (void)finishAsyncQuery {
+  if (self.asyncResult == nil && self.asyncError == nil) {
+    self.asyncError = ALNPgMakeError(ALNPgErrorQueryFailed, @"query returned no result", nil, _asyncSQL);
+  }
+  BOOL failed = (self.asyncError != nil);
+  NSUInteger rows = failed ? 0 : (NSUInteger)MAX(self.asyncAffectedRows, 0);
+  [self recordRoundTripMilliseconds:([NSDate timeIntervalSinceReferenceDate] - _asyncStarted) * 1000.0
+                                sql:_asyncSQL
+                               rows:rows
+                             failed:failed
+                           prepared:NO];
+  _asyncSQL = nil;
+  self.asyncFinished = YES;
+}
+
+// Starts `sql` and returns without reading its result; readAsyncInput
+// collects it as the socket becomes readable. Without non-blocking support
+// in libpq the query runs to completion here instead. Returns NO, with the
+// outcome already set, when the query could not be sent.
+- (BOOL)sendAsyncQuery:(NSString *)sql parameters:(NSArray *)parameters error:(NSError **)error {
+  ALNPgClearError(error);
+  self.asyncFinished = NO;
+  self.asyncResult = nil;
+  self.asyncAffectedRows = 0;
+  self.asyncError = nil;
+  _asyncSQL = [sql copy] ?: @"";
+  _asyncStarted = [NSDate timeIntervalSinceReferenceDate];
+
+  NSError *sendError = [self checkOpenError];
+  if (sendError == nil && [sql length] == 0) {
+    sendError = ALNPgMakeError(ALNPgErrorInvalidArgument, @"sql must not be empty", nil, sql);
+  }
+  if (sendError == nil && !ALNPgAsyncQueriesAvailable()) {
+    PGresult *result = [self runExecParamsSQL:sql parameters:parameters ?: @[] error:&sendError];
+    if (result != NULL) {
+      [self takeAsyncOutcomeFromResult:result];
+      ALNPQclear(result);
+    }
+    // runExecParamsSQL: has already recorded the round trip.
+    _asyncSQL = nil;
+    self.asyncError = self.asyncError ?: sendError;
+    self.asyncFinished = YES;
+    if (self.asyncError != nil && error != NULL) {
+      *error = self.asyncError;
+    }
+    return (self.asyncError == nil);
+  }
+
+  ALNPgExecParamsBuffer paramBuffer;
+  if (sendError == nil && ALNPgBuildExecParamsBuffer(parameters ?: @[], sql, &paramBuffer, &sendError)) {
+    int resultFormat = [self resultFormatForSQL:sql parameterCount:[parameters count] preparedName:nil];
+    int sent = ALNPQsendQueryParams(_conn,
+                                    [sql UTF8String],
+                                    (int)[parameters count],
+                                    NULL,
+                                    paramBuffer.paramValues,
+                                    paramBuffer.paramLengths,
+                                    paramBuffer.paramFormats,
+                                    resultFormat);
+    ALNPgFreeExecParamsBuffer(&paramBuffer);
+    if (sent != 1) {
+      NSString *detail = [NSString stringWithUTF8String:ALNPQerrorMessage(_conn) ?: ""];
+      sendError = ALNPgMakeError(ALNPgErrorQueryFailed, @"query execution failed", detail, sql);
+    }
+  }
+  if (sendError != nil) {
+    self.asyncError = sendError;
+    [self finishAsyncQuery];
+    if (error != NULL) {
+      *error = sendError;
+    }
+    return NO;
+  }
+  return YES;
+}
+
+- (int)asyncSocket {
+  return (_conn != NULL && ALNPQsocket != NULL) ? ALNPQsocket(_conn) : -1;
+}
+
+// Reads whatever input has arrived without blocking. Returns YES once the
+// async query's last result has been consumed.
+- (BOOL)readAsyncInput {
+  if (self.asyncFinished) {
+    return YES;
+  }
+  if (_conn == NULL || ALNPQconsumeInput(_conn) != 1) {
+    self.asyncError = [self failTransportWithMessage:@"lost connection while reading query results"];
+    [self finishAsyncQuery];
+    return YES;
+  }
+  while (!ALNPQisBusy(_conn)) {
+    PGresult *result = ALNPQgetResult(_conn);
+    if (result == NULL) {
+      [self finishAsyncQuery];
+      return YES;
+    }
+    [self takeAsyncOutcomeFromResult:result];
+    ALNPQclear(result);
+  }
+  return NO;
+}
+
+// Cancels an async query nobody will wait for and discards its results, so
+// the connection can go back to the pool.
+- (void)abandonAsyncQuery {
+  if (self.asyncFinished || _conn == NULL) {
+    return;
+  }
+  [self cancelRunningQuery];
+  PGresult *result = NULL;
+  while ((result = ALNPQgetResult(_conn)) != NULL) {
+    ALNPQclear(result);
+  }
+  _asyncSQL = nil;
+  self.asyncFinished = YES;
+}
+
+- (void)appendPendingNotificationsTo:(NSMutableArray<NSDictionary *> *)notifications {
+  ALNPGnotify *notify = NULL;
+  while ((notify = ALNPQnotifies(_conn)) != NULL) {
+    [notifications addObject:@{
+      @"channel" : [NSString stringWithUTF8String:notify->relname ?: ""] ?: @"",
+      @"payload" : [NSString stringWithUTF8String:notify->extra ?: ""] ?: @"",
+      @"pid" : @(notify->be_pid),
+    }];
+    ALNPQfreemem(notify);
+  }
+}
+
+- (NSArray<NSDictionary<NSString *, id> *> *)waitForNotificationsWithTimeout:(NSTimeInterval)timeout
+                                                                       error:(NSError **)error {
+  ALNPgClearError(error);
+  NSError *openError = [self checkOpenError];
+  if (openError != nil) {
+    if (error != NULL) {
+      *error = openError;
+    }
+    return nil;
+  }
+  if (!ALNPgNotificationsAvailable()) {
+    if (error != NULL) {
+      *error = ALNPgMakeError(ALNPgErrorInvalidArgument,
+                              @"loaded libpq cannot deliver notifications",
+                              nil,
+                              nil);
+    }
+    return nil;
+  }
+
+  NSMutableArray<NSDictionary *> *notifications = [NSMutableArray array];
+  BOOL consumed = (ALNPQconsumeInput(_conn) == 1);
+  if (consumed) {
+    [self appendPendingNotificationsTo:notifications];
+  }
+#if !defined(_WIN32)
+  if (consumed && [notifications count] == 0 && timeout > 0) {
+    struct pollfd descriptor = {.fd = ALNPQsocket(_conn), .events = POLLIN, .revents = 0};
+    int timeoutMs = (int)MIN(timeout * 1000.0, (double)INT_MAX);
+    int ready = 0;
+    do {
+      ready = poll(&descriptor, 1, timeoutMs);
+    } while (ready < 0 && errno == EINTR);
+    if (ready > 0) {
+      consumed = (ALNPQconsumeInput(_conn) == 1);
+      if (consumed) {
+        [self appendPendingNotificationsTo:notifications];
+      }
+    }
+  }
+#endif
+  if (!consumed) {
+    NSError *transportError = [self failTransportWithMessage:@"lost connection while waiting for notifications"];
+    if (error != NULL) {
+      *error = transportError;
+    }
+    return nil;
+  }
+  return notifications;
+}
+
+- (BOOL)executeScript:(NSString *)sql error:(NSError **)error {
+  ALNPgClearError(error);
+  PGresult *result = [self runExecScriptSQL:sql error:error];
   if (result == NULL) {
     return NO;
   }
@@ -3037,84 +4916,333 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
     }
     return NO;
   }
-  return [self runTransactionSQL:[NSString stringWithFormat:@"ROLLBACK TO SAVEPOINT %@", validatedName]
-                           error:error];
+  return [self runTransactionSQL:[NSString stringWithFormat:@"ROLLBACK TO SAVEPOINT %@", validatedName]
+                           error:error];
+}
+
+- (BOOL)releaseSavepointNamed:(NSString *)name error:(NSError **)error {
+  ALNPgClearError(error);
+  NSString *validatedName = ALNPgValidatedSavepointName(name, error);
+  if (validatedName == nil) {
+    return NO;
+  }
+  if (!_inTransaction) {
+    if (error != NULL) {
+      *error = ALNPgMakeError(ALNPgErrorTransactionFailed,
+                              @"savepoints require an active transaction",
+                              nil,
+                              nil);
+    }
+    return NO;
+  }
+  return [self runTransactionSQL:[NSString stringWithFormat:@"RELEASE SAVEPOINT %@", validatedName]
+                           error:error];
+}
+
+- (BOOL)withSavepointNamed:(NSString *)name
+                usingBlock:(BOOL (^)(NSError **error))block
+                     error:(NSError **)error {
+  ALNPgClearError(error);
+  if (block == nil) {
+    if (error != NULL) {
+      *error = ALNPgMakeError(ALNPgErrorInvalidArgument,
+                              @"savepoint block is required",
+                              nil,
+                              nil);
+    }
+    return NO;
+  }
+  if (![self createSavepointNamed:name error:error]) {
+    return NO;
+  }
+
+  NSError *blockError = nil;
+  BOOL success = block(&blockError);
+  if (success) {
+    NSError *releaseError = nil;
+    if (![self releaseSavepointNamed:name error:&releaseError]) {
+      if (error != NULL) {
+        *error = releaseError;
+      }
+      return NO;
+    }
+    return YES;
+  }
+
+  NSError *rollbackError = nil;
+  (void)[self rollbackToSavepointNamed:name error:&rollbackError];
+  if (error != NULL) {
+    *error = blockError ?: rollbackError;
+  }
+  return NO;
+}
+
+@end
+
+static NSTimeInterval ALNPgPoolNow(void) {
+  return (NSTimeInterval)ALNPerfMonotonicNanoseconds() / 1000000000.0;
+}
+
+static BOOL ALNPgPoolConnectionExpired(ALNPgConnection *connection,
+                                       NSTimeInterval lifetime,
+                                       NSTimeInterval now) {
+  return lifetime > 0 && (now - connection.poolCreatedAt) >= lifetime;
+}
+
+@interface ALNPg () {
+  // Guards the pool state below and is broadcast whenever a connection or a
+  // connection slot becomes available.
+  NSCondition *_poolCondition;
+  // Only used to sleep the maintenance thread between passes.
+  NSCondition *_maintenanceCondition;
+  // FIFO of waiting acquirers; only the head may take a connection.
+  NSMutableArray *_waiters;
+  // Connections being opened or liveness-checked outside the lock. They
+  // count toward maxConnections.
+  NSUInteger _pendingConnections;
+  BOOL _maintenanceStarted;
+  unsigned long long _acquireCount;
+  unsigned long long _waitCount;
+  unsigned long long _timeoutCount;
+  double _waitMillisecondsTotal;
+  unsigned long long _createdCount;
+  unsigned long long _closedExpiredCount;
+  unsigned long long _closedIdleCount;
+  unsigned long long _closedLivenessCount;
+}
+
+@property(nonatomic, copy, readwrite) NSString *connectionString;
+@property(nonatomic, assign, readwrite) NSUInteger maxConnections;
+@property(nonatomic, strong) NSMutableArray *idleConnections;
+@property(nonatomic, assign) NSUInteger inUseConnections;
+
+- (ALNPgConnection *)acquireConnectionWaiting:(BOOL)wait error:(NSError **)error;
+
+@end
+
+// Blocks until at least one socket is readable and marks which; a socket
+// libpq no longer has (-1) counts as readable so its failure is read.
+static void ALNPgWaitForReadableSockets(const int *sockets, BOOL *readable, NSUInteger count) {
+  BOOL closed = NO;
+  for (NSUInteger idx = 0; idx < count; idx++) {
+    readable[idx] = (sockets[idx] < 0);
+    closed = closed || readable[idx];
+  }
+#if defined(_WIN32)
+  // Never reached: async queries complete at send time on Windows.
+  for (NSUInteger idx = 0; idx < count; idx++) {
+    readable[idx] = YES;
+  }
+#else
+  if (closed) {
+    return;
+  }
+  NSMutableData *descriptorData = [NSMutableData dataWithLength:count * sizeof(struct pollfd)];
+  struct pollfd *descriptors = [descriptorData mutableBytes];
+  for (NSUInteger idx = 0; idx < count; idx++) {
+    descriptors[idx].fd = sockets[idx];
+    descriptors[idx].events = POLLIN;
+  }
+  int ready = 0;
+  do {
+    ready = poll(descriptors, (nfds_t)count, -1);
+  } while (ready < 0 && errno == EINTR);
+  for (NSUInteger idx = 0; idx < count; idx++) {
+    readable[idx] = (ready < 0 || descriptors[idx].revents != 0);
+  }
+#endif
+}
+
+@interface ALNPgQueryFuture ()
+
+@property(nonatomic, copy, readwrite) NSString *sql;
+@property(nonatomic, assign, readwrite, getter=isFinished) BOOL finished;
+@property(nonatomic, strong, readwrite, nullable) ALNDatabaseResult *result;
+@property(nonatomic, assign, readwrite) NSInteger affectedRows;
+@property(nonatomic, strong, readwrite, nullable) NSError *error;
+@property(nonatomic, copy) NSArray *parameters;
+@property(nonatomic, copy, nullable) ALNPgQueryCompletion completion;
+// Held until the future finishes.
+@property(nonatomic, strong, nullable) ALNPg *pool;
+// Set while the query is in flight.
+@property(nonatomic, strong, nullable) ALNPgConnection *connection;
+
+- (instancetype)initWithPool:(ALNPg *)pool
+                         sql:(NSString *)sql
+                  parameters:(NSArray *)parameters
+                  completion:(ALNPgQueryCompletion)completion;
+- (BOOL)startWaiting:(BOOL)wait;
+
+@end
+
+@implementation ALNPgQueryFuture
+
+- (instancetype)initWithPool:(ALNPg *)pool
+                         sql:(NSString *)sql
+                  parameters:(NSArray *)parameters
+                  completion:(ALNPgQueryCompletion)completion {
+  self = [super init];
+  if (self) {
+    _pool = pool;
+    _sql = [sql copy] ?: @"";
+    _parameters = [parameters isKindOfClass:[NSArray class]] ? [parameters copy] : @[];
+    _completion = [completion copy];
+  }
+  return self;
+}
+
+- (void)dealloc {
+  if (_connection != nil) {
+    [_connection abandonAsyncQuery];
+    [_pool releaseConnection:_connection];
+  }
+}
+
+- (void)finishWithResult:(ALNDatabaseResult *)result
+            affectedRows:(NSInteger)affectedRows
+                   error:(NSError *)error {
+  self.result = (error == nil) ? result : nil;
+  self.affectedRows = (error == nil) ? affectedRows : 0;
+  self.error = error;
+  self.finished = YES;
+  self.pool = nil;
+  ALNPgQueryCompletion completion = self.completion;
+  self.completion = nil;
+  if (completion != nil) {
+    completion(self.result, self.error);
+  }
+}
+
+- (void)finishFromConnection {
+  ALNPgConnection *connection = self.connection;
+  ALNDatabaseResult *result = connection.asyncResult;
+  NSInteger affectedRows = connection.asyncAffectedRows;
+  NSError *error = connection.asyncError;
+  self.connection = nil;
+  [self.pool releaseConnection:connection];
+  [self finishWithResult:result affectedRows:affectedRows error:error];
+}
+
+// Takes a pooled connection and sends the query. Without `wait`, returns NO
+// when the pool has nothing free, leaving the future queued.
+- (BOOL)startWaiting:(BOOL)wait {
+  if (self.finished || self.connection != nil) {
+    return YES;
+  }
+  NSError *acquireError = nil;
+  ALNPgConnection *connection = [self.pool acquireConnectionWaiting:wait error:&acquireError];
+  if (connection == nil) {
+    if (!wait && acquireError == nil) {
+      return NO;
+    }
+    [self finishWithResult:nil affectedRows:0 error:acquireError];
+    return YES;
+  }
+  self.connection = connection;
+  (void)[connection sendAsyncQuery:self.sql parameters:self.parameters error:NULL];
+  if (connection.asyncFinished) {
+    [self finishFromConnection];
+  }
+  return YES;
 }
 
-- (BOOL)releaseSavepointNamed:(NSString *)name error:(NSError **)error {
-  ALNPgClearError(error);
-  NSString *validatedName = ALNPgValidatedSavepointName(name, error);
-  if (validatedName == nil) {
-    return NO;
-  }
-  if (!_inTransaction) {
-    if (error != NULL) {
-      *error = ALNPgMakeError(ALNPgErrorTransactionFailed,
-                              @"savepoints require an active transaction",
-                              nil,
-                              nil);
+// Sends queued futures as connections free up and reads the in-flight ones
+// until all of `futures` have finished.
++ (void)driveFutures:(NSArray<ALNPgQueryFuture *> *)futures {
+  while (YES) {
+    NSMutableArray<ALNPgQueryFuture *> *inFlight = [NSMutableArray array];
+    ALNPgQueryFuture *firstQueued = nil;
+    for (ALNPgQueryFuture *future in futures) {
+      if (!future.finished && ![future startWaiting:NO]) {
+        firstQueued = firstQueued ?: future;
+      }
+      if (future.connection != nil) {
+        [inFlight addObject:future];
+      }
+    }
+    NSUInteger count = [inFlight count];
+    if (count == 0) {
+      if (firstQueued == nil) {
+        return;
+      }
+      // None of these hold a connection, so queue for one like any other
+      // acquirer; waiting can no longer starve on our own queries.
+      (void)[firstQueued startWaiting:YES];
+      continue;
+    }
+
+    NSMutableData *socketData = [NSMutableData dataWithLength:count * sizeof(int)];
+    NSMutableData *readableData = [NSMutableData dataWithLength:count * sizeof(BOOL)];
+    int *sockets = [socketData mutableBytes];
+    BOOL *readable = [readableData mutableBytes];
+    for (NSUInteger idx = 0; idx < count; idx++) {
+      sockets[idx] = [inFlight[idx].connection asyncSocket];
+    }
+    ALNPgWaitForReadableSockets(sockets, readable, count);
+    for (NSUInteger idx = 0; idx < count; idx++) {
+      ALNPgQueryFuture *future = inFlight[idx];
+      if (readable[idx] && [future.connection readAsyncInput]) {
+        [future finishFromConnection];
+      }
     }
-    return NO;
   }
-  return [self runTransactionSQL:[NSString stringWithFormat:@"RELEASE SAVEPOINT %@", validatedName]
-                           error:error];
 }
 
-- (BOOL)withSavepointNamed:(NSString *)name
-                usingBlock:(BOOL (^)(NSError **error))block
-                     error:(NSError **)error {
+- (ALNDatabaseResult *)wait:(NSError **)error {
   ALNPgClearError(error);
-  if (block == nil) {
+  [ALNPgQueryFuture driveFutures:@[ self ]];
+  if (self.error != nil) {
     if (error != NULL) {
-      *error = ALNPgMakeError(ALNPgErrorInvalidArgument,
-                              @"savepoint block is required",
-                              nil,
-                              nil);
+      *error = self.error;
     }
-    return NO;
-  }
-  if (![self createSavepointNamed:name error:error]) {
-    return NO;
+    return nil;
   }
+  return self.result;
+}
 
-  NSError *blockError = nil;
-  BOOL success = block(&blockError);
-  if (success) {
-    NSError *releaseError = nil;
-    if (![self releaseSavepointNamed:name error:&releaseError]) {
++ (NSArray<ALNDatabaseResult *> *)whenAll:(NSArray<ALNPgQueryFuture *> *)futures
+                                    error:(NSError **)error {
+  ALNPgClearError(error);
+  for (id future in futures) {
+    if (![future isKindOfClass:[ALNPgQueryFuture class]]) {
       if (error != NULL) {
-        *error = releaseError;
+        *error = ALNPgMakeError(ALNPgErrorInvalidArgument,
+                                @"whenAll expects ALNPgQueryFuture instances",
+                                nil,
+                                nil);
       }
-      return NO;
+      return nil;
     }
-    return YES;
   }
+  [self driveFutures:futures ?: @[]];
 
-  NSError *rollbackError = nil;
-  (void)[self rollbackToSavepointNamed:name error:&rollbackError];
-  if (error != NULL) {
-    *error = blockError ?: rollbackError;
+  NSMutableArray<ALNDatabaseResult *> *results = [NSMutableArray arrayWithCapacity:[futures count]];
+  for (ALNPgQueryFuture *future in futures) {
+    if (future.error != nil) {
+      if (error != NULL) {
+        *error = future.error;
+      }
+      return nil;
+    }
+    [results addObject:future.result];
   }
-  return NO;
+  return results;
 }
 
 @end
 
-@interface ALNPg ()
-
-@property(nonatomic, copy, readwrite) NSString *connectionString;
-@property(nonatomic, assign, readwrite) NSUInteger maxConnections;
-@property(nonatomic, strong) NSMutableArray *idleConnections;
-@property(nonatomic, assign) NSUInteger inUseConnections;
-
-@end
-
 @implementation ALNPg
 
 - (NSDictionary<NSString *, id> *)capabilityMetadata {
   NSMutableDictionary<NSString *, id> *metadata =
       [NSMutableDictionary dictionaryWithDictionary:[[self class] capabilityMetadata]];
   metadata[@"connection_liveness_checks_enabled"] = @(self.connectionLivenessChecksEnabled);
+  metadata[@"pool_acquire_timeout_seconds"] = @(self.acquireTimeoutSeconds);
+  metadata[@"pool_min_idle_connections"] = @(self.minIdleConnections);
+  metadata[@"pipeline_mode_available"] = @(ALNLoadLibpq(NULL) && ALNPgPipelineModeAvailable());
+  metadata[@"async_queries_available"] = @(ALNLoadLibpq(NULL) && ALNPgAsyncQueriesAvailable());
+  metadata[@"binary_results_enabled"] = @(self.binaryResultsEnabled && ALNLoadLibpq(NULL) &&
+                                          ALNPgBinaryResultsAvailable());
   return [NSDictionary dictionaryWithDictionary:metadata];
 }
 
@@ -3186,95 +5314,413 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
   _preparedStatementCacheLimit = 128;
   _builderCompilationCacheLimit = 128;
   _connectionLivenessChecksEnabled = NO;
+  _acquireTimeoutSeconds = 5.0;
+  _minIdleConnections = 0;
+  _maxConnectionLifetimeSeconds = 1800.0;
+  _idleTimeoutSeconds = 600.0;
+  _maintenanceIntervalSeconds = 30.0;
   _includeSQLInDiagnosticsEvents = NO;
   _emitDiagnosticsEventsToStderr = NO;
   _queryDiagnosticsListener = nil;
+  _metrics = nil;
+  _statementStats = nil;
+  _binaryResultsEnabled = NO;
+  _poolCondition = [[NSCondition alloc] init];
+  _maintenanceCondition = [[NSCondition alloc] init];
+  _waiters = [NSMutableArray array];
+  _pendingConnections = 0;
+  _maintenanceStarted = NO;
   return self;
 }
 
 - (void)dealloc {
-  @synchronized(self) {
-    for (ALNPgConnection *connection in self.idleConnections) {
-      [connection close];
-    }
-    [self.idleConnections removeAllObjects];
+  // The maintenance thread only holds a weak reference and exits on its
+  // next pass.
+  for (ALNPgConnection *connection in _idleConnections) {
+    [connection close];
+  }
+  [_idleConnections removeAllObjects];
+}
+
+- (void)applySettingsToConnection:(ALNPgConnection *)connection {
+  connection.preparedStatementReusePolicy = self.preparedStatementReusePolicy;
+  connection.preparedStatementCacheLimit = self.preparedStatementCacheLimit;
+  connection.builderCompilationCacheLimit = self.builderCompilationCacheLimit;
+  connection.includeSQLInDiagnosticsEvents = self.includeSQLInDiagnosticsEvents;
+  connection.emitDiagnosticsEventsToStderr = self.emitDiagnosticsEventsToStderr;
+  connection.queryDiagnosticsListener = self.queryDiagnosticsListener;
+  connection.metrics = self.metrics;
+  connection.statementStats = self.statementStats;
+  connection.binaryResultsEnabled = self.binaryResultsEnabled;
+}
+
+- (NSUInteger)totalConnectionsLocked {
+  return self.inUseConnections + [self.idleConnections count] + _pendingConnections;
+}
+
+- (ALNPgConnection *)openPoolConnection:(NSError **)error {
+  ALNPgConnection *connection =
+      [[ALNPgConnection alloc] initWithConnectionString:self.connectionString error:error];
+  NSTimeInterval now = ALNPgPoolNow();
+  connection.poolCreatedAt = now;
+  connection.poolReleasedAt = now;
+  connection.poolCheckedAt = now;
+  return connection;
+}
+
+- (void)startPoolMaintenanceIfNeeded {
+  if (_maintenanceStarted || self.maintenanceIntervalSeconds <= 0) {
+    return;
+  }
+  [_poolCondition lock];
+  BOOL shouldStart = !_maintenanceStarted;
+  _maintenanceStarted = YES;
+  [_poolCondition unlock];
+  if (!shouldStart) {
+    return;
   }
+
+  __weak ALNPg *weakSelf = self;
+  NSCondition *sleeper = _maintenanceCondition;
+  NSThread *thread = [[NSThread alloc] initWithBlock:^{
+    while (YES) {
+      NSTimeInterval interval = 0;
+      @autoreleasepool {
+        ALNPg *pool = weakSelf;
+        interval = pool.maintenanceIntervalSeconds;
+      }
+      if (interval <= 0) {
+        break;
+      }
+      [sleeper lock];
+      [sleeper waitUntilDate:[NSDate dateWithTimeIntervalSinceNow:interval]];
+      [sleeper unlock];
+
+      BOOL stop = NO;
+      @autoreleasepool {
+        ALNPg *pool = weakSelf;
+        if (pool == nil || pool.maintenanceIntervalSeconds <= 0) {
+          stop = YES;
+        } else {
+          [pool performPoolMaintenance];
+        }
+      }
+      if (stop) {
+        break;
+      }
+    }
+    @autoreleasepool {
+      ALNPg *pool = weakSelf;
+      if (pool != nil) {
+        [pool->_poolCondition lock];
+        pool->_maintenanceStarted = NO;
+        [pool->_poolCondition unlock];
+      }
+    }
+  }];
+  [thread setName:@"arlen-pg-pool-maintenance"];
+  [thread start];
 }
 
 - (ALNPgConnection *)acquireConnection:(NSError **)error {
+  return [self acquireConnectionWaiting:YES error:error];
+}
+
+// Without `wait`, returns nil and no error as soon as no connection is free,
+// rather than queueing behind other acquirers; nothing counts as a timeout.
+- (ALNPgConnection *)acquireConnectionWaiting:(BOOL)wait error:(NSError **)error {
   ALNPgClearError(error);
-  @synchronized(self) {
-    while ([self.idleConnections count] > 0) {
-      ALNPgConnection *connection = [self.idleConnections lastObject];
-      [self.idleConnections removeLastObject];
-      connection.preparedStatementReusePolicy = self.preparedStatementReusePolicy;
-      connection.preparedStatementCacheLimit = self.preparedStatementCacheLimit;
-      connection.builderCompilationCacheLimit = self.builderCompilationCacheLimit;
-      connection.includeSQLInDiagnosticsEvents = self.includeSQLInDiagnosticsEvents;
-      connection.emitDiagnosticsEventsToStderr = self.emitDiagnosticsEventsToStderr;
-      connection.queryDiagnosticsListener = self.queryDiagnosticsListener;
-      if (self.connectionLivenessChecksEnabled) {
-        NSError *livenessError = nil;
-        if (![connection checkConnectionLiveness:&livenessError]) {
-          [connection close];
+  [self startPoolMaintenanceIfNeeded];
+
+  uint64_t startedNanoseconds = ALNPerfMonotonicNanoseconds();
+  NSTimeInterval timeout = self.acquireTimeoutSeconds;
+  NSTimeInterval lifetime = self.maxConnectionLifetimeSeconds;
+  BOOL checkOnCheckout =
+      self.connectionLivenessChecksEnabled && self.maintenanceIntervalSeconds <= 0;
+  NSDate *deadline = nil;
+  id ticket = nil;
+
+  while (YES) {
+    ALNPgConnection *connection = nil;
+    BOOL shouldOpen = NO;
+    BOOL timedOut = NO;
+    NSMutableArray *expired = nil;
+
+    [_poolCondition lock];
+    while (YES) {
+      BOOL isTurn = ([_waiters count] == 0 || _waiters[0] == ticket);
+      if (isTurn && [self.idleConnections count] > 0) {
+        ALNPgConnection *candidate = [self.idleConnections lastObject];
+        [self.idleConnections removeLastObject];
+        if (ALNPgPoolConnectionExpired(candidate, lifetime, ALNPgPoolNow())) {
+          expired = expired ?: [NSMutableArray array];
+          [expired addObject:candidate];
+          _closedExpiredCount += 1;
           continue;
         }
+        connection = candidate;
+        self.inUseConnections += 1;
+        break;
+      }
+      if (isTurn && [self totalConnectionsLocked] < self.maxConnections) {
+        _pendingConnections += 1;
+        shouldOpen = YES;
+        break;
+      }
+      if (!wait) {
+        break;
+      }
+      if (timedOut || timeout <= 0) {
+        _timeoutCount += 1;
+        break;
+      }
+      if (ticket == nil) {
+        ticket = [[NSObject alloc] init];
+        [_waiters addObject:ticket];
+        deadline = [NSDate dateWithTimeIntervalSinceNow:timeout];
+        _waitCount += 1;
       }
-      self.inUseConnections += 1;
-      return connection;
+      timedOut = ![_poolCondition waitUntilDate:deadline];
     }
+    if (ticket != nil) {
+      [_waiters removeObjectIdenticalTo:ticket];
+      ticket = nil;
+      [_poolCondition broadcast];
+    }
+    [_poolCondition unlock];
 
-    NSUInteger total = self.inUseConnections + [self.idleConnections count];
-    if (total >= self.maxConnections) {
-      if (error != NULL) {
-        *error = ALNPgMakeError(ALNPgErrorPoolExhausted,
-                                @"connection pool exhausted",
-                                nil,
-                                nil);
+    for (ALNPgConnection *stale in expired) {
+      [stale close];
+    }
+
+    if (shouldOpen) {
+      NSError *connectionError = nil;
+      connection = [self openPoolConnection:&connectionError];
+      [_poolCondition lock];
+      _pendingConnections -= 1;
+      if (connection != nil) {
+        self.inUseConnections += 1;
+        _createdCount += 1;
+      } else {
+        [_poolCondition broadcast];
       }
-      return nil;
+      [_poolCondition unlock];
+      if (connection == nil) {
+        [self recordAcquireSince:startedNanoseconds timedOut:NO];
+        if (error != NULL) {
+          *error = connectionError;
+        }
+        return nil;
+      }
+    } else if (connection != nil && checkOnCheckout) {
+      NSError *livenessError = nil;
+      if (![connection checkConnectionLiveness:&livenessError]) {
+        [connection close];
+        [_poolCondition lock];
+        self.inUseConnections -= 1;
+        _closedLivenessCount += 1;
+        [_poolCondition broadcast];
+        [_poolCondition unlock];
+        continue;
+      }
+      connection.poolCheckedAt = ALNPgPoolNow();
     }
 
-    NSError *connectionError = nil;
-    ALNPgConnection *connection =
-        [[ALNPgConnection alloc] initWithConnectionString:self.connectionString error:&connectionError];
+    if (connection == nil && !wait) {
+      return nil;
+    }
     if (connection == nil) {
+      double waitedMs = [self recordAcquireSince:startedNanoseconds timedOut:YES];
       if (error != NULL) {
-        *error = connectionError;
+        NSString *detail = [NSString stringWithFormat:
+                                         @"no connection became available within %.0f ms "
+                                          "(maxConnections=%lu)",
+                                         waitedMs,
+                                         (unsigned long)self.maxConnections];
+        *error = ALNPgMakeError(ALNPgErrorPoolExhausted,
+                                @"connection pool exhausted",
+                                detail,
+                                nil);
       }
       return nil;
     }
-    connection.preparedStatementReusePolicy = self.preparedStatementReusePolicy;
-    connection.preparedStatementCacheLimit = self.preparedStatementCacheLimit;
-    connection.builderCompilationCacheLimit = self.builderCompilationCacheLimit;
-    connection.includeSQLInDiagnosticsEvents = self.includeSQLInDiagnosticsEvents;
-    connection.emitDiagnosticsEventsToStderr = self.emitDiagnosticsEventsToStderr;
-    connection.queryDiagnosticsListener = self.queryDiagnosticsListener;
-    self.inUseConnections += 1;
+
+    [self applySettingsToConnection:connection];
+    [self recordAcquireSince:startedNanoseconds timedOut:NO];
     return connection;
   }
 }
 
+- (double)recordAcquireSince:(uint64_t)startedNanoseconds timedOut:(BOOL)timedOut {
+  double waitedMs =
+      (double)(ALNPerfMonotonicNanoseconds() - startedNanoseconds) / 1000000.0;
+  [_poolCondition lock];
+  _acquireCount += 1;
+  _waitMillisecondsTotal += waitedMs;
+  [_poolCondition unlock];
+
+  ALNMetricsRegistry *metrics = self.metrics;
+  [metrics recordTiming:@"db_pool_wait_ms" milliseconds:waitedMs];
+  if (timedOut) {
+    [metrics incrementCounter:@"db_pool_acquire_timeouts_total"];
+  }
+  return waitedMs;
+}
+
 - (void)releaseConnection:(ALNPgConnection *)connection {
   if (connection == nil) {
     return;
   }
-  @synchronized(self) {
-    if (self.inUseConnections > 0) {
-      self.inUseConnections -= 1;
+  if (connection.isOpen && [connection hasActiveTransaction]) {
+    NSError *rollbackError = nil;
+    if (![connection rollbackTransaction:&rollbackError]) {
+      [connection close];
     }
-    if (connection.isOpen && [connection hasActiveTransaction]) {
-      NSError *rollbackError = nil;
-      if (![connection rollbackTransaction:&rollbackError]) {
-        [connection close];
+  }
+  NSTimeInterval now = ALNPgPoolNow();
+  BOOL expired = ALNPgPoolConnectionExpired(connection, self.maxConnectionLifetimeSeconds, now);
+  if (expired && connection.isOpen) {
+    [connection close];
+  }
+
+  [_poolCondition lock];
+  if (self.inUseConnections > 0) {
+    self.inUseConnections -= 1;
+  }
+  if (connection.isOpen) {
+    connection.poolReleasedAt = now;
+    [self.idleConnections addObject:connection];
+  } else if (expired) {
+    _closedExpiredCount += 1;
+  }
+  [_poolCondition broadcast];
+  [_poolCondition unlock];
+
+  if (!connection.isOpen) {
+    [connection close];
+  }
+}
+
+- (BOOL)replenishIdleConnections:(NSError **)error {
+  [_poolCondition lock];
+  NSUInteger idle = [self.idleConnections count];
+  NSUInteger total = [self totalConnectionsLocked];
+  NSUInteger wanted = (self.minIdleConnections > idle) ? (self.minIdleConnections - idle) : 0;
+  NSUInteger room = (self.maxConnections > total) ? (self.maxConnections - total) : 0;
+  NSUInteger toOpen = MIN(wanted, room);
+  _pendingConnections += toOpen;
+  [_poolCondition unlock];
+
+  for (NSUInteger opened = 0; opened < toOpen; opened++) {
+    NSError *connectionError = nil;
+    ALNPgConnection *connection = [self openPoolConnection:&connectionError];
+    [_poolCondition lock];
+    if (connection != nil) {
+      _pendingConnections -= 1;
+      _createdCount += 1;
+      [self.idleConnections insertObject:connection atIndex:0];
+    } else {
+      _pendingConnections -= (toOpen - opened);
+    }
+    [_poolCondition broadcast];
+    [_poolCondition unlock];
+    if (connection == nil) {
+      if (error != NULL) {
+        *error = connectionError;
       }
+      return NO;
+    }
+  }
+  return YES;
+}
+
+- (BOOL)warmUpConnections:(NSError **)error {
+  ALNPgClearError(error);
+  [self startPoolMaintenanceIfNeeded];
+  return [self replenishIdleConnections:error];
+}
+
+- (void)performPoolMaintenance {
+  NSTimeInterval now = ALNPgPoolNow();
+  NSTimeInterval lifetime = self.maxConnectionLifetimeSeconds;
+  NSTimeInterval idleTimeout = self.idleTimeoutSeconds;
+  NSTimeInterval checkInterval = MAX(self.maintenanceIntervalSeconds, 0);
+  BOOL checkLiveness = self.connectionLivenessChecksEnabled;
+  NSMutableArray *toClose = [NSMutableArray array];
+  NSMutableArray *toCheck = [NSMutableArray array];
+
+  [_poolCondition lock];
+  // Idle connections are reused LIFO, so the front holds the longest idle.
+  NSUInteger idx = 0;
+  while (idx < [self.idleConnections count]) {
+    ALNPgConnection *connection = self.idleConnections[idx];
+    if (ALNPgPoolConnectionExpired(connection, lifetime, now)) {
+      [toClose addObject:connection];
+      [self.idleConnections removeObjectAtIndex:idx];
+      _closedExpiredCount += 1;
+      continue;
     }
-    if (connection.isOpen) {
-      [self.idleConnections addObject:connection];
+    if (idleTimeout > 0 && (now - connection.poolReleasedAt) >= idleTimeout &&
+        [self.idleConnections count] > self.minIdleConnections) {
+      [toClose addObject:connection];
+      [self.idleConnections removeObjectAtIndex:idx];
+      _closedIdleCount += 1;
+      continue;
+    }
+    if (checkLiveness &&
+        (now - MAX(connection.poolReleasedAt, connection.poolCheckedAt)) >= checkInterval) {
+      [toCheck addObject:connection];
+      [self.idleConnections removeObjectAtIndex:idx];
+      _pendingConnections += 1;
+      continue;
+    }
+    idx += 1;
+  }
+  [_poolCondition unlock];
+
+  for (ALNPgConnection *connection in toClose) {
+    [connection close];
+  }
+  for (ALNPgConnection *connection in toCheck) {
+    BOOL alive = [connection checkConnectionLiveness:NULL];
+    if (alive) {
+      connection.poolCheckedAt = ALNPgPoolNow();
     } else {
       [connection close];
     }
+    [_poolCondition lock];
+    _pendingConnections -= 1;
+    if (alive) {
+      [self.idleConnections insertObject:connection atIndex:0];
+    } else {
+      _closedLivenessCount += 1;
+    }
+    [_poolCondition broadcast];
+    [_poolCondition unlock];
   }
+
+  (void)[self replenishIdleConnections:NULL];
+}
+
+- (NSDictionary<NSString *, id> *)poolStatistics {
+  [_poolCondition lock];
+  NSDictionary *statistics = @{
+    @"max_connections" : @(self.maxConnections),
+    @"in_use" : @(self.inUseConnections),
+    @"idle" : @([self.idleConnections count]),
+    @"pending" : @(_pendingConnections),
+    @"waiting" : @([_waiters count]),
+    @"acquires" : @(_acquireCount),
+    @"waits" : @(_waitCount),
+    @"timeouts" : @(_timeoutCount),
+    @"wait_ms_total" : @(_waitMillisecondsTotal),
+    @"created" : @(_createdCount),
+    @"closed_expired" : @(_closedExpiredCount),
+    @"closed_idle" : @(_closedIdleCount),
+    @"closed_liveness" : @(_closedLivenessCount),
+  };
+  [_poolCondition unlock];
+  return statistics;
 }
 
 - (id<ALNDatabaseConnection>)acquireAdapterConnection:(NSError **)error {
@@ -3416,6 +5862,120 @@ static NSDictionary *ALNPgRowDictionary(PGresult *result,
   return affected;
 }
 
+- (NSArray *)executePipeline:(ALNPgPipeline *)pipeline error:(NSError **)error {
+  ALNPgClearError(error);
+  NSError *acquireError = nil;
+  ALNPgConnection *connection = [self acquireConnection:&acquireError];
+  if (connection == nil) {
+    if (error != NULL) {
+      *error = acquireError;
+    }
+    return nil;
+  }
+  NSArray *outcomes = nil;
+  @try {
+    outcomes = [connection executePipeline:pipeline error:error];
+  } @finally {
+    [self releaseConnection:connection];
+  }
+  return outcomes;
+}
+
+- (NSInteger)bulkCopyIntoTable:(NSString *)table
+                       columns:(NSArray<NSString *> *)columns
+                        format:(ALNPgCopyFormat)format
+                   rowProducer:(ALNPgCopyRowProducer)rowProducer
+                         error:(NSError **)error {
+  ALNPgClearError(error);
+  NSError *acquireError = nil;
+  ALNPgConnection *connection = [self acquireConnection:&acquireError];
+  if (connection == nil) {
+    if (error != NULL) {
+      *error = acquireError;
+    }
+    return -1;
+  }
+
+  NSInteger copied = -1;
+  @try {
+    copied = [connection bulkCopyIntoTable:table
+                                   columns:columns
+                                    format:format
+                               rowProducer:rowProducer
+                                     error:error];
+  } @finally {
+    [self releaseConnection:connection];
+  }
+  return copied;
+}
+
+- (BOOL)streamQuery:(NSString *)sql
+         parameters:(NSArray *)parameters
+          batchSize:(NSUInteger)batchSize
+         usingBlock:(ALNPgRowBatchBlock)block
+              error:(NSError **)error {
+  ALNPgClearError(error);
+  NSError *acquireError = nil;
+  ALNPgConnection *connection = [self acquireConnection:&acquireError];
+  if (connection == nil) {
+    if (error != NULL) {
+      *error = acquireError;
+    }
+    return NO;
+  }
+
+  BOOL success = NO;
+  @try {
+    success = [connection streamQuery:sql
+                           parameters:parameters ?: @[]
+                            batchSize:batchSize
+                           usingBlock:block
+                                error:error];
+  } @finally {
+    [self releaseConnection:connection];
+  }
+  return success;
+}
+
+- (BOOL)streamBuilderQuery:(ALNSQLBuilder *)builder
+                 batchSize:(NSUInteger)batchSize
+                usingBlock:(ALNPgRowBatchBlock)block
+                     error:(NSError **)error {
+  ALNPgClearError(error);
+  NSError *acquireError = nil;
+  ALNPgConnection *connection = [self acquireConnection:&acquireError];
+  if (connection == nil) {
+    if (error != NULL) {
+      *error = acquireError;
+    }
+    return NO;
+  }
+
+  BOOL success = NO;
+  @try {
+    success = [connection streamBuilderQuery:builder batchSize:batchSize usingBlock:block error:error];
+  } @finally {
+    [self releaseConnection:connection];
+  }
+  return success;
+}
+
+
+- (ALNPgQueryFuture *)sendQuery:(NSString *)sql parameters:(NSArray *)parameters {
+  return [self sendQuery:sql parameters:parameters completion:nil];
+}
+
+- (ALNPgQueryFuture *)sendQuery:(NSString *)sql
+                     parameters:(NSArray *)parameters
+                     completion:(ALNPgQueryCompletion)completion {
+  ALNPgQueryFuture *future = [[ALNPgQueryFuture alloc] initWithPool:self
+                                                                sql:sql
+                                                         parameters:parameters
+                                                         completion:completion];
+  (void)[future startWaiting:NO];
+  return future;
+}
+
 - (BOOL)withTransaction:(BOOL (^)(ALNPgConnection *connection, NSError **error))block
                   error:(NSError **)error {
   ALNPgClearError(error);
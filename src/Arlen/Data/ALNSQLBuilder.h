@@ -271,6 +271,11 @@ typedef NS_ENUM(NSInteger, ALNSQLBuilderKind) {
 - (instancetype)returningField:(NSString *)field;
 - (instancetype)returningFields:(NSArray<NSString *> *)fields;
 
+// Tables the statement reads or writes: its own table plus every joined,
+// subquery, CTE, and set-operation table, in first-seen order. CTE names and
+// tables mentioned only in raw SQL expressions are not included.
+- (NSArray<NSString *> *)referencedTableNames;
+
 - (nullable NSDictionary *)buildWithDialect:(nullable id<ALNSQLDialect>)dialect
                                       error:(NSError *_Nullable *_Nullable)error;
 - (nullable NSString *)buildSQLWithDialect:(nullable id<ALNSQLDialect>)dialect
@@ -2543,6 +2543,52 @@ static NSSet *ALNSQLBuilderAllowedJoinOperators(void) {
   }
 }
 
+- (void)collectTableNamesFromClauses:(NSArray *)clauses
+                                into:(NSMutableOrderedSet<NSString *> *)tables
+                            cteNames:(NSMutableSet<NSString *> *)cteNames {
+  for (NSDictionary *clause in clauses) {
+    if (![clause isKindOfClass:[NSDictionary class]]) {
+      continue;
+    }
+    if ([clause[@"query"] isKindOfClass:[ALNSQLBuilder class]]) {
+      [clause[@"query"] collectTableNamesInto:tables cteNames:cteNames];
+    }
+    if ([clause[@"clauses"] isKindOfClass:[NSArray class]]) {
+      [self collectTableNamesFromClauses:clause[@"clauses"] into:tables cteNames:cteNames];
+    }
+  }
+}
+
+- (void)collectTableNamesInto:(NSMutableOrderedSet<NSString *> *)tables
+                     cteNames:(NSMutableSet<NSString *> *)cteNames {
+  for (NSDictionary *cte in self.ctes) {
+    if ([cte[@"name"] isKindOfClass:[NSString class]] && [cte[@"name"] length] > 0) {
+      [cteNames addObject:cte[@"name"]];
+    }
+  }
+  if ([self.tableName length] > 0) {
+    [tables addObject:self.tableName];
+  }
+  for (NSDictionary *join in self.joins) {
+    if ([join[@"table"] isKindOfClass:[NSString class]] && [join[@"table"] length] > 0) {
+      [tables addObject:join[@"table"]];
+    }
+  }
+  [self collectTableNamesFromClauses:self.ctes into:tables cteNames:cteNames];
+  [self collectTableNamesFromClauses:self.joins into:tables cteNames:cteNames];
+  [self collectTableNamesFromClauses:self.whereClauses into:tables cteNames:cteNames];
+  [self collectTableNamesFromClauses:self.havingClauses into:tables cteNames:cteNames];
+  [self collectTableNamesFromClauses:self.setOperations into:tables cteNames:cteNames];
+}
+
+- (NSArray<NSString *> *)referencedTableNames {
+  NSMutableOrderedSet<NSString *> *tables = [NSMutableOrderedSet orderedSet];
+  NSMutableSet<NSString *> *cteNames = [NSMutableSet set];
+  [self collectTableNamesInto:tables cteNames:cteNames];
+  [tables minusSet:cteNames];
+  return [tables array];
+}
+
 - (NSDictionary *)build:(NSError **)error {
   return [self aln_buildDefaultDialect:error];
 }
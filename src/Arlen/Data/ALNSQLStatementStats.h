@@ -0,0 +1,63 @@
+#ifndef ALN_SQL_STATEMENT_STATS_H
+#define ALN_SQL_STATEMENT_STATS_H
+
+#import <Foundation/Foundation.h>
+
+NS_ASSUME_NONNULL_BEGIN
+
+@class ALNMetricsRegistry;
+
+// In-process pg_stat_statements: aggregates executed SQL per normalized
+// statement. Literals and `$n` placeholders normalize to `?`, lists of them
+// collapse to one, and comments and whitespace runs are dropped, so
+// `WHERE id IN (1, 2, 3)` and `WHERE id IN ($1)` share one entry.
+//
+// Attach an instance to ALNPg/ALNPgConnection through `statementStats`;
+// connections without one skip collection entirely. Thread-safe; one
+// instance is normally shared by every pool in the process.
+@interface ALNSQLStatementStats : NSObject
+
+@property(nonatomic, assign, readonly) NSUInteger maxStatements;
+
++ (NSString *)normalizedSQL:(NSString *)sql;
+// Stable 16-hex-digit identifier for a normalized statement.
++ (NSString *)statementIDForNormalizedSQL:(NSString *)normalizedSQL;
+
+// Statements beyond `maxStatements` distinct entries are counted in
+// `overflowCalls`/`overflowMs` only.
+- (instancetype)initWithMaxStatements:(NSUInteger)maxStatements;
+
+// One server round trip. `route` attributes the call to the route being
+// dispatched (ALNPg passes `[ALNPerfTrace currentTrace].routeName`).
+- (void)recordSQL:(NSString *)sql
+                   route:(nullable NSString *)route
+    durationMilliseconds:(double)durationMilliseconds
+                    rows:(NSUInteger)rows
+                prepared:(BOOL)prepared
+                  failed:(BOOL)failed;
+// One PQprepare of `sql`; prepared calls beyond these count as cache hits.
+- (void)recordPrepareForSQL:(NSString *)sql;
+
+// Entries sorted by total_ms, largest first. Each carries id, statement,
+// calls, total_ms, mean_ms, min_ms, max_ms, p95_ms, rows, prepared_calls,
+// adhoc_calls, prepares, cache_hits, errors, and routes (per-route calls and
+// total_ms, largest first).
+- (NSArray<NSDictionary *> *)statementsSortedByTotalTime;
+
+// { maxStatements, statementCount, totalCalls, totalMs, overflowCalls,
+//   overflowMs, pid, statements }, ready for JSON serialization.
+- (NSDictionary *)dictionaryRepresentation;
+
+// Publishes the top `limit` statements by total time as
+// `db_statement_<id>_{calls,total_ms,mean_ms,p95_ms,rows}` gauges, plus
+// `db_statements_tracked`. Gauges of statements that drop out of the top
+// `limit` since the previous export are removed from the registry.
+- (void)exportToMetricsRegistry:(ALNMetricsRegistry *)registry limit:(NSUInteger)limit;
+
+- (void)reset;
+
+@end
+
+NS_ASSUME_NONNULL_END
+
+#endif
@@ -0,0 +1,485 @@
+#import "ALNSQLStatementStats.h"
+
+#import "ALNMetrics.h"
+
+#import <ctype.h>
+#import <stdlib.h>
+#import <string.h>
+
+static const NSUInteger ALNSQLStatementNormalizationCacheLimit = 1024;
+static const NSUInteger ALNSQLStatementRouteLimit = 16;
+static NSString *const ALNSQLStatementOtherRoute = @"(other)";
+
+static BOOL ALNSQLIsIdentifierByte(unsigned char c) {
+  return isalnum(c) || c == '_' || c == '$' || c >= 0x80;
+}
+
+static void ALNSQLAppendPlaceholder(char *out, size_t *length) {
+  size_t o = *length;
+  // "?, ?" and "?,?" fold into the placeholder already emitted, so value
+  // lists of any length normalize the same way.
+  if (o >= 3 && out[o - 1] == ' ' && out[o - 2] == ',' && out[o - 3] == '?') {
+    *length = o - 2;
+    return;
+  }
+  if (o >= 2 && out[o - 1] == ',' && out[o - 2] == '?') {
+    *length = o - 1;
+    return;
+  }
+  out[o] = '?';
+  *length = o + 1;
+}
+
+static NSString *ALNSQLNormalize(NSString *sql) {
+  const char *in = [sql UTF8String];
+  if (in == NULL) {
+    return @"";
+  }
+  size_t length = strlen(in);
+  char *out = malloc(length + 1);
+  if (out == NULL) {
+    return sql;
+  }
+
+  size_t o = 0;
+  BOOL pendingSpace = NO;
+  size_t i = 0;
+  while (i < length) {
+    unsigned char c = (unsigned char)in[i];
+    unsigned char next = (i + 1 < length) ? (unsigned char)in[i + 1] : 0;
+
+    if (isspace(c)) {
+      pendingSpace = (o > 0);
+      i += 1;
+      continue;
+    }
+    if (c == '-' && next == '-') {
+      while (i < length && in[i] != '\n') {
+        i += 1;
+      }
+      pendingSpace = (o > 0);
+      continue;
+    }
+    if (c == '/' && next == '*') {
+      i += 2;
+      while (i + 1 < length && !(in[i] == '*' && in[i + 1] == '/')) {
+        i += 1;
+      }
+      i = (i + 1 < length) ? i + 2 : length;
+      pendingSpace = (o > 0);
+      continue;
+    }
+    if (pendingSpace) {
+      out[o++] = ' ';
+      pendingSpace = NO;
+    }
+
+    if (c == '\'') {
+      // E'...' strings honour backslash escapes; the E prefix goes with the
+      // literal.
+      BOOL escapes = (o > 0 && (out[o - 1] == 'E' || out[o - 1] == 'e') &&
+                      (o == 1 || !ALNSQLIsIdentifierByte((unsigned char)out[o - 2])));
+      if (escapes) {
+        o -= 1;
+      }
+      i += 1;
+      while (i < length) {
+        if (escapes && in[i] == '\\' && i + 1 < length) {
+          i += 2;
+          continue;
+        }
+        if (in[i] == '\'') {
+          if (i + 1 < length && in[i + 1] == '\'') {
+            i += 2;
+            continue;
+          }
+          i += 1;
+          break;
+        }
+        i += 1;
+      }
+      ALNSQLAppendPlaceholder(out, &o);
+      continue;
+    }
+    if (c == '"') {
+      out[o++] = (char)c;
+      i += 1;
+      while (i < length) {
+        out[o++] = in[i];
+        if (in[i] == '"') {
+          i += 1;
+          break;
+        }
+        i += 1;
+      }
+      continue;
+    }
+    BOOL afterIdentifier = (o > 0 && ALNSQLIsIdentifierByte((unsigned char)out[o - 1]));
+    if (c == '$' && !afterIdentifier) {
+      if (isdigit(next)) {
+        i += 1;
+        while (i < length && isdigit((unsigned char)in[i])) {
+          i += 1;
+        }
+        ALNSQLAppendPlaceholder(out, &o);
+        continue;
+      }
+      // Dollar-quoted string: $tag$ ... $tag$.
+      size_t tagEnd = i + 1;
+      while (tagEnd < length && in[tagEnd] != '$' &&
+             (isalnum((unsigned char)in[tagEnd]) || in[tagEnd] == '_')) {
+        tagEnd += 1;
+      }
+      if (tagEnd < length && in[tagEnd] == '$') {
+        size_t tagLength = tagEnd - i + 1;
+        const char *close = NULL;
+        for (size_t scan = tagEnd + 1; scan + tagLength <= length; scan++) {
+          if (strncmp(in + scan, in + i, tagLength) == 0) {
+            close = in + scan;
+            break;
+          }
+        }
+        if (close != NULL) {
+          i = (size_t)(close - in) + tagLength;
+          ALNSQLAppendPlaceholder(out, &o);
+          continue;
+        }
+      }
+    }
+    if (!afterIdentifier && (isdigit(c) || (c == '.' && isdigit(next)))) {
+      while (i < length) {
+        unsigned char d = (unsigned char)in[i];
+        if (isdigit(d) || d == '.') {
+          i += 1;
+        } else if ((d == 'e' || d == 'E') && i + 1 < length) {
+          i += 1;
+          if (in[i] == '+' || in[i] == '-') {
+            i += 1;
+          }
+        } else {
+          break;
+        }
+      }
+      ALNSQLAppendPlaceholder(out, &o);
+      continue;
+    }
+
+    out[o++] = (char)c;
+    i += 1;
+  }
+
+  NSString *normalized = [[NSString alloc] initWithBytes:out
+                                                  length:o
+                                                encoding:NSUTF8StringEncoding];
+  free(out);
+  return normalized ?: sql;
+}
+
+static uint64_t ALNSQLStatementFNV1a64(NSString *value) {
+  const unsigned char *bytes = (const unsigned char *)[value UTF8String];
+  uint64_t hash = 1469598103934665603ULL;
+  if (bytes == NULL) {
+    return hash;
+  }
+  for (; *bytes != 0; bytes++) {
+    hash ^= (uint64_t)(*bytes);
+    hash *= 1099511628211ULL;
+  }
+  return hash;
+}
+
+@interface ALNSQLStatementRouteTotals : NSObject {
+@public
+  unsigned long long _calls;
+  double _totalMs;
+}
+@end
+
+@implementation ALNSQLStatementRouteTotals
+@end
+
+@interface ALNSQLStatementEntry : NSObject {
+@public
+  NSString *_statementID;
+  NSString *_statement;
+  unsigned long long _calls;
+  double _totalMs;
+  double _minMs;
+  double _maxMs;
+  unsigned long long _rows;
+  unsigned long long _preparedCalls;
+  unsigned long long _prepares;
+  unsigned long long _errors;
+  ALNMetricsHistogram *_histogram;
+  NSMutableDictionary<NSString *, ALNSQLStatementRouteTotals *> *_routes;
+}
+@end
+
+@implementation ALNSQLStatementEntry
+@end
+
+@implementation ALNSQLStatementStats {
+  NSLock *_lock;
+  NSMutableDictionary<NSString *, ALNSQLStatementEntry *> *_entries;
+  NSMutableDictionary<NSString *, NSString *> *_normalizedByRawSQL;
+  unsigned long long _overflowCalls;
+  double _overflowMs;
+  NSSet<NSString *> *_exportedStatementIDs;
+}
+
++ (NSString *)normalizedSQL:(NSString *)sql {
+  if (![sql isKindOfClass:[NSString class]] || [sql length] == 0) {
+    return @"";
+  }
+  return ALNSQLNormalize(sql);
+}
+
++ (NSString *)statementIDForNormalizedSQL:(NSString *)normalizedSQL {
+  return [NSString stringWithFormat:@"%016llx",
+                                    (unsigned long long)ALNSQLStatementFNV1a64(normalizedSQL ?: @"")];
+}
+
+- (instancetype)init {
+  return [self initWithMaxStatements:500];
+}
+
+- (instancetype)initWithMaxStatements:(NSUInteger)maxStatements {
+  self = [super init];
+  if (self) {
+    _maxStatements = (maxStatements > 0) ? maxStatements : 1;
+    _lock = [[NSLock alloc] init];
+    _entries = [NSMutableDictionary dictionary];
+    _normalizedByRawSQL = [NSMutableDictionary dictionary];
+  }
+  return self;
+}
+
+- (NSString *)normalizedSQLForRawSQL:(NSString *)sql {
+  [_lock lock];
+  NSString *normalized = _normalizedByRawSQL[sql];
+  [_lock unlock];
+  if (normalized != nil) {
+    return normalized;
+  }
+  normalized = [[self class] normalizedSQL:sql];
+  [_lock lock];
+  if ([_normalizedByRawSQL count] >= ALNSQLStatementNormalizationCacheLimit) {
+    [_normalizedByRawSQL removeAllObjects];
+  }
+  _normalizedByRawSQL[[sql copy]] = normalized;
+  [_lock unlock];
+  return normalized;
+}
+
+// Caller holds _lock. Returns nil once maxStatements distinct entries exist.
+- (ALNSQLStatementEntry *)entryForNormalizedSQLLocked:(NSString *)normalized {
+  ALNSQLStatementEntry *entry = _entries[normalized];
+  if (entry != nil || [_entries count] >= _maxStatements) {
+    return entry;
+  }
+  entry = [[ALNSQLStatementEntry alloc] init];
+  entry->_statementID = [[self class] statementIDForNormalizedSQL:normalized];
+  entry->_statement = normalized;
+  entry->_histogram = [[ALNMetricsHistogram alloc] initWithBoundaries:nil];
+  entry->_routes = [NSMutableDictionary dictionary];
+  _entries[normalized] = entry;
+  return entry;
+}
+
+- (void)recordSQL:(NSString *)sql
+                   route:(NSString *)route
+    durationMilliseconds:(double)durationMilliseconds
+                    rows:(NSUInteger)rows
+                prepared:(BOOL)prepared
+                  failed:(BOOL)failed {
+  if (![sql isKindOfClass:[NSString class]] || [sql length] == 0) {
+    return;
+  }
+  NSString *normalized = [self normalizedSQLForRawSQL:sql];
+  double durationMs = (durationMilliseconds > 0.0) ? durationMilliseconds : 0.0;
+  NSString *routeName = ([route isKindOfClass:[NSString class]] && [route length] > 0) ? route : @"";
+
+  [_lock lock];
+  ALNSQLStatementEntry *entry = [self entryForNormalizedSQLLocked:normalized];
+  if (entry == nil) {
+    _overflowCalls += 1;
+    _overflowMs += durationMs;
+    [_lock unlock];
+    return;
+  }
+  if (entry->_calls == 0 || durationMs < entry->_minMs) {
+    entry->_minMs = durationMs;
+  }
+  if (durationMs > entry->_maxMs) {
+    entry->_maxMs = durationMs;
+  }
+  entry->_calls += 1;
+  entry->_totalMs += durationMs;
+  entry->_rows += rows;
+  if (prepared) {
+    entry->_preparedCalls += 1;
+  }
+  if (failed) {
+    entry->_errors += 1;
+  }
+  [entry->_histogram recordValue:durationMs];
+
+  ALNSQLStatementRouteTotals *routeTotals = entry->_routes[routeName];
+  if (routeTotals == nil) {
+    NSString *key = ([entry->_routes count] < ALNSQLStatementRouteLimit) ? routeName
+                                                                         : ALNSQLStatementOtherRoute;
+    routeTotals = entry->_routes[key];
+    if (routeTotals == nil) {
+      routeTotals = [[ALNSQLStatementRouteTotals alloc] init];
+      entry->_routes[key] = routeTotals;
+    }
+  }
+  routeTotals->_calls += 1;
+  routeTotals->_totalMs += durationMs;
+  [_lock unlock];
+}
+
+- (void)recordPrepareForSQL:(NSString *)sql {
+  if (![sql isKindOfClass:[NSString class]] || [sql length] == 0) {
+    return;
+  }
+  NSString *normalized = [self normalizedSQLForRawSQL:sql];
+  [_lock lock];
+  ALNSQLStatementEntry *entry = [self entryForNormalizedSQLLocked:normalized];
+  if (entry != nil) {
+    entry->_prepares += 1;
+  }
+  [_lock unlock];
+}
+
+// Caller holds _lock.
+- (NSDictionary *)dictionaryForEntryLocked:(ALNSQLStatementEntry *)entry {
+  NSMutableArray *routes = [NSMutableArray arrayWithCapacity:[entry->_routes count]];
+  for (NSString *route in entry->_routes) {
+    ALNSQLStatementRouteTotals *totals = entry->_routes[route];
+    [routes addObject:@{
+      @"route" : route,
+      @"calls" : @(totals->_calls),
+      @"total_ms" : @(totals->_totalMs),
+    }];
+  }
+  [routes sortUsingComparator:^NSComparisonResult(NSDictionary *left, NSDictionary *right) {
+    return [right[@"total_ms"] compare:left[@"total_ms"]];
+  }];
+
+  unsigned long long calls = entry->_calls;
+  unsigned long long cacheHits =
+      (entry->_preparedCalls > entry->_prepares) ? entry->_preparedCalls - entry->_prepares : 0;
+  return @{
+    @"id" : entry->_statementID,
+    @"statement" : entry->_statement,
+    @"calls" : @(calls),
+    @"total_ms" : @(entry->_totalMs),
+    @"mean_ms" : @((calls > 0) ? entry->_totalMs / (double)calls : 0.0),
+    @"min_ms" : @(entry->_minMs),
+    @"max_ms" : @(entry->_maxMs),
+    @"p95_ms" : @([entry->_histogram valueAtQuantile:0.95]),
+    @"rows" : @(entry->_rows),
+    @"prepared_calls" : @(entry->_preparedCalls),
+    @"adhoc_calls" : @(calls - entry->_preparedCalls),
+    @"prepares" : @(entry->_prepares),
+    @"cache_hits" : @(cacheHits),
+    @"errors" : @(entry->_errors),
+    @"routes" : routes,
+  };
+}
+
+- (NSArray<NSDictionary *> *)statementsSortedByTotalTime {
+  [_lock lock];
+  NSMutableArray *statements = [NSMutableArray arrayWithCapacity:[_entries count]];
+  for (ALNSQLStatementEntry *entry in [_entries allValues]) {
+    if (entry->_calls > 0) {
+      [statements addObject:[self dictionaryForEntryLocked:entry]];
+    }
+  }
+  [_lock unlock];
+  [statements sortUsingComparator:^NSComparisonResult(NSDictionary *left, NSDictionary *right) {
+    return [right[@"total_ms"] compare:left[@"total_ms"]];
+  }];
+  return statements;
+}
+
+- (NSDictionary *)dictionaryRepresentation {
+  NSArray *statements = [self statementsSortedByTotalTime];
+  unsigned long long totalCalls = 0;
+  double totalMs = 0.0;
+  for (NSDictionary *statement in statements) {
+    totalCalls += [statement[@"calls"] unsignedLongLongValue];
+    totalMs += [statement[@"total_ms"] doubleValue];
+  }
+  [_lock lock];
+  unsigned long long overflowCalls = _overflowCalls;
+  double overflowMs = _overflowMs;
+  [_lock unlock];
+  return @{
+    @"maxStatements" : @(_maxStatements),
+    @"statementCount" : @([statements count]),
+    @"totalCalls" : @(totalCalls + overflowCalls),
+    @"totalMs" : @(totalMs + overflowMs),
+    @"overflowCalls" : @(overflowCalls),
+    @"overflowMs" : @(overflowMs),
+    @"pid" : @([[NSProcessInfo processInfo] processIdentifier]),
+    @"statements" : statements,
+  };
+}
+
+static NSArray<NSString *> *ALNSQLStatementGaugeSuffixes(void) {
+  return @[ @"_calls", @"_total_ms", @"_mean_ms", @"_p95_ms", @"_rows" ];
+}
+
+- (void)exportToMetricsRegistry:(ALNMetricsRegistry *)registry limit:(NSUInteger)limit {
+  if (registry == nil) {
+    return;
+  }
+  NSArray *statements = [self statementsSortedByTotalTime];
+  [registry setGauge:@"db_statements_tracked" value:(double)[statements count]];
+  NSMutableSet<NSString *> *exportedIDs = [NSMutableSet setWithCapacity:limit];
+  for (NSDictionary *statement in statements) {
+    if ([exportedIDs count] >= limit) {
+      break;
+    }
+    NSString *prefix = [NSString stringWithFormat:@"db_statement_%@", statement[@"id"]];
+    [registry setGauge:[prefix stringByAppendingString:@"_calls"]
+                 value:[statement[@"calls"] doubleValue]];
+    [registry setGauge:[prefix stringByAppendingString:@"_total_ms"]
+                 value:[statement[@"total_ms"] doubleValue]];
+    [registry setGauge:[prefix stringByAppendingString:@"_mean_ms"]
+                 value:[statement[@"mean_ms"] doubleValue]];
+    [registry setGauge:[prefix stringByAppendingString:@"_p95_ms"]
+                 value:[statement[@"p95_ms"] doubleValue]];
+    [registry setGauge:[prefix stringByAppendingString:@"_rows"]
+                 value:[statement[@"rows"] doubleValue]];
+    [exportedIDs addObject:statement[@"id"]];
+  }
+
+  // Statements that fell out of the top `limit` (or were reset) take their
+  // gauges with them, so the exported set stays bounded by `limit`.
+  [_lock lock];
+  NSSet *previousIDs = _exportedStatementIDs;
+  _exportedStatementIDs = [exportedIDs copy];
+  [_lock unlock];
+  for (NSString *statementID in previousIDs) {
+    if ([exportedIDs containsObject:statementID]) {
+      continue;
+    }
+    for (NSString *suffix in ALNSQLStatementGaugeSuffixes()) {
+      [registry removeGaugeNamed:[NSString stringWithFormat:@"db_statement_%@%@", statementID, suffix]];
+    }
+  }
+}
+
+- (void)reset {
+  [_lock lock];
+  [_entries removeAllObjects];
+  [_normalizedByRawSQL removeAllObjects];
+  _overflowCalls = 0;
+  _overflowMs = 0.0;
+  [_lock unlock];
+}
+
+@end
@@ -42,6 +42,7 @@ typedef SSIZE_T ssize_t;
 #endif
 
 #import "ALNApplication.h"
+#import "ALNCIDRSet.h"
 #import "ALNEventStream.h"
 #import "ALNRequest.h"
 #import "ALNResponse.h"
@@ -2128,87 +2129,6 @@ static NSString *ALNFirstForwardedFor(NSString *value) {
   return ALNTrimmedString(parts[0]);
 }
 
-static BOOL ALNParseIPv4HostAddress(NSString *value, uint32_t *hostAddressOut) {
-  if (![value isKindOfClass:[NSString class]] || [value length] == 0) {
-    return NO;
-  }
-  struct in_addr address;
-  if (ALNInetPton(AF_INET, [value UTF8String], &address) != 1) {
-    return NO;
-  }
-  if (hostAddressOut != NULL) {
-    *hostAddressOut = ntohl(address.s_addr);
-  }
-  return YES;
-}
-
-static BOOL ALNParseTrustedProxyCIDR(NSString *value,
-                                     uint32_t *networkAddressOut,
-                                     NSUInteger *prefixLengthOut) {
-  if (![value isKindOfClass:[NSString class]] || [value length] == 0) {
-    return NO;
-  }
-  NSString *trimmed =
-      [value stringByTrimmingCharactersInSet:[NSCharacterSet whitespaceAndNewlineCharacterSet]];
-  if ([trimmed length] == 0) {
-    return NO;
-  }
-
-  NSString *addressPart = trimmed;
-  NSInteger prefixLength = 32;
-  NSRange slash = [trimmed rangeOfString:@"/"];
-  if (slash.location != NSNotFound) {
-    addressPart = [trimmed substringToIndex:slash.location];
-    NSString *prefixPart = [trimmed substringFromIndex:(slash.location + 1)];
-    NSScanner *scanner = [NSScanner scannerWithString:prefixPart];
-    NSInteger parsedPrefix = -1;
-    if (![scanner scanInteger:&parsedPrefix] || ![scanner isAtEnd] ||
-        parsedPrefix < 0 || parsedPrefix > 32) {
-      return NO;
-    }
-    prefixLength = parsedPrefix;
-  }
-
-  uint32_t hostAddress = 0;
-  if (!ALNParseIPv4HostAddress(addressPart, &hostAddress)) {
-    return NO;
-  }
-
-  uint32_t mask =
-      (prefixLength == 0) ? 0u : (0xFFFFFFFFu << (32 - (uint32_t)prefixLength));
-  if (networkAddressOut != NULL) {
-    *networkAddressOut = hostAddress & mask;
-  }
-  if (prefixLengthOut != NULL) {
-    *prefixLengthOut = (NSUInteger)prefixLength;
-  }
-  return YES;
-}
-
-static BOOL ALNRemoteAddressMatchesTrustedProxyCIDRs(NSString *remoteAddress, NSArray *trustedProxyCIDRs) {
-  if (![trustedProxyCIDRs isKindOfClass:[NSArray class]] || [trustedProxyCIDRs count] == 0) {
-    return NO;
-  }
-  uint32_t remoteHostAddress = 0;
-  if (!ALNParseIPv4HostAddress(remoteAddress, &remoteHostAddress)) {
-    return NO;
-  }
-
-  for (id value in trustedProxyCIDRs) {
-    uint32_t networkAddress = 0;
-    NSUInteger prefixLength = 32;
-    if (!ALNParseTrustedProxyCIDR(value, &networkAddress, &prefixLength)) {
-      continue;
-    }
-    uint32_t mask =
-        (prefixLength == 0) ? 0u : (0xFFFFFFFFu << (32 - (uint32_t)prefixLength));
-    if ((remoteHostAddress & mask) == networkAddress) {
-      return YES;
-    }
-  }
-  return NO;
-}
-
 static BOOL ALNProxyForwardingEnabled(NSDictionary *config, NSArray *trustedProxyCIDRs) {
   if ([trustedProxyCIDRs isKindOfClass:[NSArray class]] && [trustedProxyCIDRs count] > 0) {
     return YES;
@@ -2216,7 +2136,9 @@ static BOOL ALNProxyForwardingEnabled(NSDictionary *config, NSArray *trustedProx
   return ALNConfigBool(config, @"trustedProxy", NO);
 }
 
-static void ALNApplyProxyMetadata(ALNRequest *request, NSDictionary *config) {
+static void ALNApplyProxyMetadata(ALNRequest *request,
+                                  NSDictionary *config,
+                                  ALNCIDRSet *trustedProxyCIDRSet) {
   request.effectiveRemoteAddress = request.remoteAddress ?: @"";
   request.scheme = @"http";
 
@@ -2226,7 +2148,7 @@ static void ALNApplyProxyMetadata(ALNRequest *request, NSDictionary *config) {
   if (!ALNProxyForwardingEnabled(config, trustedProxyCIDRs)) {
     return;
   }
-  if (!ALNRemoteAddressMatchesTrustedProxyCIDRs(request.remoteAddress, trustedProxyCIDRs)) {
+  if (![trustedProxyCIDRSet containsAddress:request.parsedRemoteAddress]) {
     return;
   }
 
@@ -2723,6 +2645,93 @@ static double ALNSendResponse(ALNSocketHandle clientFd,
   return (ALNNowMilliseconds() - writeStart) + serializeMs;
 }
 
+static BOOL ALNSendHTTPChunk(ALNSocketHandle clientFd, NSData *chunk) {
+  NSUInteger length = [chunk length];
+  if (length == 0) {
+    return YES;
+  }
+  char prefix[32];
+  int prefixLength = snprintf(prefix, sizeof(prefix), "%lx\r\n", (unsigned long)length);
+  if (prefixLength <= 0) {
+    return NO;
+  }
+  struct iovec iov[3];
+  iov[0].iov_base = prefix;
+  iov[0].iov_len = (size_t)prefixLength;
+  iov[1].iov_base = (void *)[chunk bytes];
+  iov[1].iov_len = length;
+  iov[2].iov_base = (void *)"\r\n";
+  iov[2].iov_len = 2;
+  return ALNWritevAll(clientFd, iov, 3);
+}
+
+// Streamed bodies go out with chunked transfer encoding. HEAD and HTTP/1.0
+// requests collect the stream into a regular body instead, so Content-Length
+// stays accurate for clients that cannot decode chunks.
+static double ALNSendStreamedResponse(ALNSocketHandle clientFd,
+                                      ALNRequest *request,
+                                      ALNResponse *response,
+                                      BOOL performanceLogging,
+                                      BOOL *streamCompleted) {
+  ALNResponseBodyStreamer streamer = response.bodyStreamer;
+  response.bodyStreamer = nil;
+  if (streamCompleted != NULL) {
+    *streamCompleted = NO;
+  }
+  [response clearBody];
+
+  BOOL headRequest = [request.method isEqualToString:@"HEAD"];
+  NSString *version = [[request.httpVersion ?: @"HTTP/1.1" uppercaseString] copy];
+  if (headRequest || [version isEqualToString:@"HTTP/1.0"]) {
+    NSMutableData *collected = [NSMutableData data];
+    BOOL produced = YES;
+    if (streamer != nil) {
+      produced = streamer(^BOOL(NSData *chunk) {
+        [collected appendData:chunk ?: [NSData data]];
+        return YES;
+      });
+    }
+    if (!produced) {
+      double writeStart = ALNNowMilliseconds();
+      ALNSendFallbackInternalServerError(clientFd);
+      return ALNNowMilliseconds() - writeStart;
+    }
+    [response appendData:collected];
+    if (streamCompleted != NULL) {
+      *streamCompleted = YES;
+    }
+    return ALNSendResponse(clientFd, response, performanceLogging, !headRequest);
+  }
+
+  [response setHeader:@"Transfer-Encoding" value:@"chunked"];
+  NSData *headerData = [response serializedHeaderData];
+  double writeStart = ALNNowMilliseconds();
+  if ([headerData length] == 0 || !ALNSendAll(clientFd, [headerData bytes], [headerData length])) {
+    return ALNNowMilliseconds() - writeStart;
+  }
+
+  __block BOOL socketOK = YES;
+  BOOL produced = YES;
+  if (streamer != nil) {
+    produced = streamer(^BOOL(NSData *chunk) {
+      if (!socketOK) {
+        return NO;
+      }
+      socketOK = ALNSendHTTPChunk(clientFd, chunk);
+      return socketOK;
+    });
+  }
+  // A producer failure after the head is on the wire can only be signalled by
+  // withholding the terminating chunk and closing the connection.
+  if (produced && socketOK) {
+    socketOK = ALNSendAll(clientFd, "0\r\n\r\n", 5);
+  }
+  if (streamCompleted != NULL) {
+    *streamCompleted = produced && socketOK;
+  }
+  return ALNNowMilliseconds() - writeStart;
+}
+
 static ALNResponse *ALNErrorResponse(NSInteger statusCode, NSString *body) {
   ALNResponse *response = [[ALNResponse alloc] init];
   response.statusCode = statusCode;
@@ -2986,6 +2995,7 @@ static BOOL ALNSendSSEHeaders(ALNSocketHandle clientFd, ALNResponse *response) {
 @property(nonatomic, strong) NSLock *staticMountCacheLock;
 @property(nonatomic, copy) NSArray *cachedStaticMounts;
 @property(nonatomic, copy) NSArray *webSocketAllowedOrigins;
+@property(nonatomic, strong) ALNCIDRSet *trustedProxyCIDRSet;
 
 @end
 
@@ -3017,6 +3027,9 @@ static BOOL ALNSendSSEHeaders(ALNSocketHandle clientFd, ALNResponse *response) {
     _staticMountCacheLock = [[NSLock alloc] init];
     _cachedStaticMounts = nil;
     _webSocketAllowedOrigins = @[];
+    id trustedProxyCIDRs = application.config[@"trustedProxyCIDRs"];
+    _trustedProxyCIDRSet = [[ALNCIDRSet alloc]
+        initWithCIDRStrings:[trustedProxyCIDRs isKindOfClass:[NSArray class]] ? trustedProxyCIDRs : @[]];
   }
   return self;
 }
@@ -3550,7 +3563,7 @@ static BOOL ALNSendSSEHeaders(ALNSocketHandle clientFd, ALNResponse *response) {
         request.remoteAddress = connectionRemoteAddress;
         request.effectiveRemoteAddress = request.remoteAddress ?: @"";
         request.scheme = @"http";
-        ALNApplyProxyMetadata(request, self.application.config ?: @{});
+        ALNApplyProxyMetadata(request, self.application.config ?: @{}, self.trustedProxyCIDRSet);
 
         BOOL supportsStaticMethod = [request.method isEqualToString:@"GET"] ||
                                     [request.method isEqualToString:@"HEAD"];
@@ -3826,11 +3839,24 @@ static BOOL ALNSendSSEHeaders(ALNSocketHandle clientFd, ALNResponse *response) {
                                     performanceLogging,
                                     parseMs,
                                     ALNNowMilliseconds() - requestStartMs);
-        request.responseWriteDurationMilliseconds =
-            ALNSendResponse(clientFd,
-                            response,
-                            performanceLogging,
-                            ![request.method isEqualToString:@"HEAD"]);
+        if (response.bodyStreamer != nil) {
+          BOOL streamCompleted = NO;
+          request.responseWriteDurationMilliseconds =
+              ALNSendStreamedResponse(clientFd,
+                                      request,
+                                      response,
+                                      performanceLogging,
+                                      &streamCompleted);
+          if (!streamCompleted) {
+            keepAlive = NO;
+          }
+        } else {
+          request.responseWriteDurationMilliseconds =
+              ALNSendResponse(clientFd,
+                              response,
+                              performanceLogging,
+                              ![request.method isEqualToString:@"HEAD"]);
+        }
         requestsHandled += 1;
         if (!keepAlive) {
           return;
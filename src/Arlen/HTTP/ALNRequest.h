@@ -9,6 +9,8 @@
 
 NS_ASSUME_NONNULL_BEGIN
 
+@class ALNIPAddress;
+
 extern NSString *const ALNRequestErrorDomain;
 
 typedef NS_ENUM(NSUInteger, ALNHTTPParserBackend) {
@@ -30,6 +32,10 @@ typedef NS_ENUM(NSUInteger, ALNHTTPParserBackend) {
 @property(nonatomic, copy) NSDictionary *routeParams;
 @property(nonatomic, copy) NSString *remoteAddress;
 @property(nonatomic, copy) NSString *effectiveRemoteAddress;
+// Parsed forms of the addresses above, resolved on first use and cached until
+// the corresponding string property is reassigned.
+@property(nonatomic, strong, readonly, nullable) ALNIPAddress *parsedRemoteAddress;
+@property(nonatomic, strong, readonly, nullable) ALNIPAddress *parsedEffectiveRemoteAddress;
 @property(nonatomic, copy) NSString *scheme;
 @property(nonatomic, assign) double parseDurationMilliseconds;
 @property(nonatomic, assign) double responseWriteDurationMilliseconds;
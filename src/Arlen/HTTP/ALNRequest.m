@@ -1,5 +1,7 @@
 #import "ALNRequest.h"
 
+#import "ALNCIDRSet.h"
+
 #if ARLEN_ENABLE_LLHTTP
 #import "third_party/llhttp/llhttp.h"
 #include <pthread.h>
@@ -1497,6 +1499,10 @@ static ALNRequest *ALNRequestFromRawDataLLHTTP(NSData *data, NSError **error) {
 @property(nonatomic, copy) NSArray *deferredHeaderValues;
 @property(nonatomic, strong) NSData *deferredHeaderSourceData;
 @property(nonatomic, assign) BOOL headersMaterialized;
+@property(nonatomic, strong) ALNIPAddress *cachedParsedRemoteAddress;
+@property(nonatomic, strong) ALNIPAddress *cachedParsedEffectiveRemoteAddress;
+@property(nonatomic, assign) BOOL parsedRemoteAddressResolved;
+@property(nonatomic, assign) BOOL parsedEffectiveRemoteAddressResolved;
 
 - (void)aln_setDeferredHeaderStorage:(NSArray *)nameStorage
                       deferredValues:(NSArray *)valueStorage
@@ -1657,6 +1663,37 @@ static BOOL ALNASCIIBytesEqualLowercaseCString(const unsigned char *bytes,
   self.headersMaterialized = NO;
 }
 
+- (void)setRemoteAddress:(NSString *)remoteAddress {
+  _remoteAddress = [remoteAddress copy];
+  _cachedParsedRemoteAddress = nil;
+  _parsedRemoteAddressResolved = NO;
+}
+
+- (void)setEffectiveRemoteAddress:(NSString *)effectiveRemoteAddress {
+  _effectiveRemoteAddress = [effectiveRemoteAddress copy];
+  _cachedParsedEffectiveRemoteAddress = nil;
+  _parsedEffectiveRemoteAddressResolved = NO;
+}
+
+- (ALNIPAddress *)parsedRemoteAddress {
+  if (!_parsedRemoteAddressResolved) {
+    _cachedParsedRemoteAddress = [ALNIPAddress addressWithString:_remoteAddress];
+    _parsedRemoteAddressResolved = YES;
+  }
+  return _cachedParsedRemoteAddress;
+}
+
+- (ALNIPAddress *)parsedEffectiveRemoteAddress {
+  if (!_parsedEffectiveRemoteAddressResolved) {
+    _cachedParsedEffectiveRemoteAddress =
+        [_effectiveRemoteAddress isEqualToString:_remoteAddress ?: @""]
+            ? [self parsedRemoteAddress]
+            : [ALNIPAddress addressWithString:_effectiveRemoteAddress];
+    _parsedEffectiveRemoteAddressResolved = YES;
+  }
+  return _cachedParsedEffectiveRemoteAddress;
+}
+
 - (NSDictionary *)headers {
   if (self.headersMaterialized || [self.deferredHeaderNames count] == 0) {
     return _headers ?: @{};
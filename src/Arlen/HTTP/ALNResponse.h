@@ -7,6 +7,9 @@ NS_ASSUME_NONNULL_BEGIN
 
 extern NSString *const ALNResponseErrorDomain;
 
+typedef BOOL (^ALNResponseChunkWriter)(NSData *chunk);
+typedef BOOL (^ALNResponseBodyStreamer)(ALNResponseChunkWriter writeChunk);
+
 @interface ALNResponse : NSObject
 
 @property(nonatomic, assign) NSInteger statusCode;
@@ -19,6 +22,7 @@ extern NSString *const ALNResponseErrorDomain;
 @property(nonatomic, assign) unsigned long long fileBodyInode;
 @property(nonatomic, assign) long long fileBodyMTimeSeconds;
 @property(nonatomic, assign) long fileBodyMTimeNanoseconds;
+@property(nonatomic, copy, nullable) ALNResponseBodyStreamer bodyStreamer;
 
 - (void)setHeader:(NSString *)name value:(NSString *)value;
 - (void)setHeadersIfMissing:(NSDictionary<NSString *, NSString *> *)headers;
@@ -690,7 +690,8 @@ static NSData *ALNSharedSerializedHeaderDataForResponse(ALNResponse *response) {
     return nil;
   }
 
-  if ([self headerForName:@"Content-Length"] == nil) {
+  if ([self headerForName:@"Content-Length"] == nil &&
+      [self headerForName:@"Transfer-Encoding"] == nil) {
     unsigned long long bodyLength = [self bodyLength];
     if ([self.fileBodyPath length] > 0) {
       bodyLength = self.fileBodyLength;
@@ -12,18 +12,32 @@
 @class ALNPageState;
 @class ALNApplication;
 @class ALNDataverseClient;
+@class ALNContext;
 
 NS_ASSUME_NONNULL_BEGIN
 
+// Produces the request session on first access. Session middleware installs
+// one under ALNContextSessionLoaderStashKey so cookies are only decoded for
+// requests that read the session.
+typedef NSMutableDictionary *_Nullable (^ALNContextSessionLoader)(ALNContext *context);
+
+// Produces the CSRF token on first call to -csrfToken. CSRF middleware
+// installs one under ALNContextCSRFTokenLoaderStashKey so safe requests that
+// never ask for a token leave the session undecoded.
+typedef NSString *_Nullable (^ALNContextCSRFTokenLoader)(ALNContext *context);
+
 extern NSString *const ALNContextSessionStashKey;
 extern NSString *const ALNContextSessionDirtyStashKey;
 extern NSString *const ALNContextSessionHadCookieStashKey;
+extern NSString *const ALNContextSessionLoaderStashKey;
 extern NSString *const ALNContextCSRFTokenStashKey;
+extern NSString *const ALNContextCSRFTokenLoaderStashKey;
 extern NSString *const ALNContextValidationErrorsStashKey;
 extern NSString *const ALNContextEOCStrictLocalsStashKey;
 extern NSString *const ALNContextEOCStrictStringifyStashKey;
 extern NSString *const ALNContextEOCTemplateLayoutStashKey;
 extern NSString *const ALNContextEOCDisableLayoutStashKey;
+extern NSString *const ALNContextEOCRenderProfileStashKey;
 extern NSString *const ALNContextRequestFormatStashKey;
 extern NSString *const ALNContextValidatedParamsStashKey;
 extern NSString *const ALNContextAuthClaimsStashKey;
@@ -65,6 +79,7 @@ extern NSString *const ALNContextI18nFallbackLocaleStashKey;
                      actionName:(NSString *)actionName;
 
 - (NSMutableDictionary *)session;
+- (BOOL)isSessionLoaded;
 - (void)markSessionDirty;
 - (nullable NSString *)csrfToken;
 - (NSDictionary *)allParams;
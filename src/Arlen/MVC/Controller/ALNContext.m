@@ -12,12 +12,15 @@
 NSString *const ALNContextSessionStashKey = @"aln.session";
 NSString *const ALNContextSessionDirtyStashKey = @"aln.session.dirty";
 NSString *const ALNContextSessionHadCookieStashKey = @"aln.session.had_cookie";
+NSString *const ALNContextSessionLoaderStashKey = @"aln.session.loader";
 NSString *const ALNContextCSRFTokenStashKey = @"aln.csrf.token";
+NSString *const ALNContextCSRFTokenLoaderStashKey = @"aln.csrf.token.loader";
 NSString *const ALNContextValidationErrorsStashKey = @"aln.validation.errors";
 NSString *const ALNContextEOCStrictLocalsStashKey = @"aln.eoc.strict_locals";
 NSString *const ALNContextEOCStrictStringifyStashKey = @"aln.eoc.strict_stringify";
 NSString *const ALNContextEOCTemplateLayoutStashKey = @"aln.eoc.layout";
 NSString *const ALNContextEOCDisableLayoutStashKey = @"aln.eoc.disable_layout";
+NSString *const ALNContextEOCRenderProfileStashKey = @"aln.eoc.render_profile";
 NSString *const ALNContextRequestFormatStashKey = @"aln.request.format";
 NSString *const ALNContextValidatedParamsStashKey = @"aln.contract.validated_params";
 NSString *const ALNContextAuthClaimsStashKey = @"aln.auth.claims";
@@ -187,6 +190,16 @@ static BOOL ALNETagListMatches(NSString *ifNoneMatchHeader, NSString *etag) {
 
 - (NSMutableDictionary *)session {
   id current = self.stash[ALNContextSessionStashKey];
+  if (current == nil) {
+    ALNContextSessionLoader loader = self.stash[ALNContextSessionLoaderStashKey];
+    if (loader != nil) {
+      [self.stash removeObjectForKey:ALNContextSessionLoaderStashKey];
+      current = loader(self);
+      if ([current isKindOfClass:[NSMutableDictionary class]]) {
+        self.stash[ALNContextSessionStashKey] = current;
+      }
+    }
+  }
   if ([current isKindOfClass:[NSMutableDictionary class]]) {
     return current;
   }
@@ -200,6 +213,10 @@ static BOOL ALNETagListMatches(NSString *ifNoneMatchHeader, NSString *etag) {
   return empty;
 }
 
+- (BOOL)isSessionLoaded {
+  return (self.stash[ALNContextSessionStashKey] != nil);
+}
+
 - (void)markSessionDirty {
   self.stash[ALNContextSessionDirtyStashKey] = @(YES);
 }
@@ -210,6 +227,16 @@ static BOOL ALNETagListMatches(NSString *ifNoneMatchHeader, NSString *etag) {
     return stashToken;
   }
 
+  ALNContextCSRFTokenLoader loader = self.stash[ALNContextCSRFTokenLoaderStashKey];
+  if (loader != nil) {
+    [self.stash removeObjectForKey:ALNContextCSRFTokenLoaderStashKey];
+    NSString *loaded = loader(self);
+    if ([loaded isKindOfClass:[NSString class]] && [loaded length] > 0) {
+      self.stash[ALNContextCSRFTokenStashKey] = loaded;
+      return loaded;
+    }
+  }
+
   id sessionToken = [self session][@"_csrf_token"];
   if ([sessionToken isKindOfClass:[NSString class]] && [sessionToken length] > 0) {
     self.stash[ALNContextCSRFTokenStashKey] = sessionToken;
@@ -34,6 +34,15 @@ NS_ASSUME_NONNULL_BEGIN
                  error:(NSError *_Nullable *_Nullable)error;
 - (BOOL)renderTemplateWithoutLayout:(NSString *)templateName
                               error:(NSError *_Nullable *_Nullable)error;
+- (BOOL)streamTemplate:(NSString *)templateName
+               context:(nullable NSDictionary *)context
+                 error:(NSError *_Nullable *_Nullable)error;
+- (BOOL)streamTemplate:(NSString *)templateName
+               context:(nullable NSDictionary *)context
+                layout:(nullable NSString *)layoutName
+                 error:(NSError *_Nullable *_Nullable)error;
+- (BOOL)streamTemplate:(NSString *)templateName
+                 error:(NSError *_Nullable *_Nullable)error;
 - (NSDictionary *)templateContext;
 - (void)useTemplateLayout:(nullable NSString *)layoutName;
 - (void)disableTemplateLayout;
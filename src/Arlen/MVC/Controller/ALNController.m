@@ -3,8 +3,10 @@
 #import "ALNApplication.h"
 #import "ALNAuthSession.h"
 #import "ALNContext.h"
+#import "ALNEOCRuntime.h"
 #import "ALNJSONSerialization.h"
 #import "ALNLive.h"
+#import "ALNLogger.h"
 #import "ALNPageState.h"
 #import "ALNRequest.h"
 #import "ALNRealtime.h"
@@ -190,6 +192,11 @@ static NSDictionary *ALNEventStreamResyncPayload(ALNEventStreamReplayResult *res
   return [payload copy];
 }
 
+static ALNEOCRenderProfile *ALNContextRenderProfile(ALNContext *context) {
+  id profile = context.stash[ALNContextEOCRenderProfileStashKey];
+  return [profile isKindOfClass:[ALNEOCRenderProfile class]] ? profile : nil;
+}
+
 + (NSJSONWritingOptions)jsonWritingOptions {
   return 0;
 }
@@ -202,15 +209,22 @@ static NSDictionary *ALNEventStreamResyncPayload(ALNEventStreamReplayResult *res
       [self.context.stash[ALNContextEOCStrictLocalsStashKey] boolValue];
   BOOL strictStringify =
       [self.context.stash[ALNContextEOCStrictStringifyStashKey] boolValue];
-  [self.context.perfTrace startStage:@"render"];
-  NSString *rendered = [ALNView renderTemplate:templateName
-                                       context:context
-                                        layout:nil
-                          defaultLayoutEnabled:defaultLayoutEnabled
-                                  strictLocals:strictLocals
-                               strictStringify:strictStringify
-                                         error:error];
-  [self.context.perfTrace endStage:@"render"];
+  ALNEOCRenderProfile *profile = ALNContextRenderProfile(self.context);
+  NSDictionary *profileToken = (profile != nil) ? ALNEOCPushRenderProfile(profile) : nil;
+  [self.context.perfTrace startStageID:ALNPerfStageRender];
+  NSString *rendered = nil;
+  @try {
+    rendered = [ALNView renderTemplate:templateName
+                               context:context
+                                layout:nil
+                  defaultLayoutEnabled:defaultLayoutEnabled
+                          strictLocals:strictLocals
+                       strictStringify:strictStringify
+                                 error:error];
+  } @finally {
+    ALNEOCPopRenderProfile(profileToken);
+  }
+  [self.context.perfTrace endStageID:ALNPerfStageRender];
   return rendered;
 }
 
@@ -267,20 +281,110 @@ static NSDictionary *ALNEventStreamResyncPayload(ALNEventStreamReplayResult *res
       [self.context.stash[ALNContextEOCStrictLocalsStashKey] boolValue];
   BOOL strictStringify =
       [self.context.stash[ALNContextEOCStrictStringifyStashKey] boolValue];
-  [self.context.perfTrace startStage:@"render"];
-  NSString *rendered = [ALNView renderTemplate:templateName
-                                       context:context
-                                        layout:layoutName
-                          defaultLayoutEnabled:defaultLayoutEnabled
-                                  strictLocals:strictLocals
-                               strictStringify:strictStringify
-                                         error:error];
-  [self.context.perfTrace endStage:@"render"];
+  ALNEOCRenderProfile *profile = ALNContextRenderProfile(self.context);
+  NSDictionary *profileToken = (profile != nil) ? ALNEOCPushRenderProfile(profile) : nil;
+  [self.context.perfTrace startStageID:ALNPerfStageRender];
+  NSData *rendered = nil;
+  @try {
+    rendered = [ALNView renderTemplateData:templateName
+                                   context:context
+                                    layout:layoutName
+                      defaultLayoutEnabled:defaultLayoutEnabled
+                              strictLocals:strictLocals
+                           strictStringify:strictStringify
+                                     error:error];
+  } @finally {
+    ALNEOCPopRenderProfile(profileToken);
+  }
+  [self.context.perfTrace endStageID:ALNPerfStageRender];
   if (rendered == nil) {
     return NO;
   }
+  [self.context.response setDataBody:rendered contentType:@"text/html; charset=utf-8"];
+  self.context.response.committed = YES;
+  return YES;
+}
+
+- (BOOL)streamTemplate:(NSString *)templateName
+               context:(NSDictionary *)context
+                 error:(NSError **)error {
+  return [self streamTemplate:templateName context:context layout:nil error:error];
+}
+
+- (BOOL)streamTemplate:(NSString *)templateName error:(NSError **)error {
+  return [self streamTemplate:templateName
+                      context:[self templateContext]
+                       layout:nil
+                        error:error];
+}
+
+- (BOOL)streamTemplate:(NSString *)templateName
+               context:(NSDictionary *)context
+                layout:(NSString *)layoutName
+                 error:(NSError **)error {
+  NSString *effectiveLayout = ALNTrimmedLayoutName(layoutName);
+  BOOL defaultLayoutEnabled = YES;
+  if ([effectiveLayout length] == 0) {
+    NSString *preferredLayout =
+        ALNTrimmedLayoutName(self.context.stash[ALNContextEOCTemplateLayoutStashKey]);
+    if ([preferredLayout length] > 0) {
+      effectiveLayout = preferredLayout;
+    } else if ([self.context.stash[ALNContextEOCDisableLayoutStashKey] boolValue]) {
+      defaultLayoutEnabled = NO;
+    }
+  }
+
+  NSString *logical = [ALNView normalizeTemplateLogicalPath:templateName];
+  if (!ALNEOCTemplateIsRegistered(logical)) {
+    if (error != NULL) {
+      *error = [NSError errorWithDomain:ALNEOCErrorDomain
+                                   code:ALNEOCErrorTemplateNotFound
+                               userInfo:@{
+                                 NSLocalizedDescriptionKey :
+                                     [NSString stringWithFormat:@"Template not found: %@", logical],
+                                 ALNEOCErrorPathKey : logical
+                               }];
+    }
+    return NO;
+  }
+
+  BOOL strictLocals =
+      [self.context.stash[ALNContextEOCStrictLocalsStashKey] boolValue];
+  BOOL strictStringify =
+      [self.context.stash[ALNContextEOCStrictStringifyStashKey] boolValue];
+  NSDictionary *renderContext = [context copy] ?: @{};
+  NSString *streamLayout = [effectiveLayout copy];
+  ALNLogger *logger = self.context.logger;
+  NSString *requestID = [self.context.stash[@"request_id"] isKindOfClass:[NSString class]]
+                            ? self.context.stash[@"request_id"]
+                            : @"";
+
+  // The body is produced while the server writes the response, after the
+  // dispatch pipeline has returned; errors at that point can only be logged.
+  // The application times and profiles the stream separately, since the
+  // request trace has been finalized by then.
+  self.context.response.bodyStreamer = ^BOOL(ALNResponseChunkWriter writeChunk) {
+    NSError *streamError = nil;
+    BOOL streamed = [ALNView streamTemplate:logical
+                                    context:renderContext
+                                     layout:streamLayout
+                       defaultLayoutEnabled:defaultLayoutEnabled
+                               strictLocals:strictLocals
+                            strictStringify:strictStringify
+                                     writer:writeChunk
+                                      error:&streamError];
+    if (!streamed) {
+      [logger error:@"streamed template render failed"
+             fields:@{
+               @"template" : logical ?: @"",
+               @"request_id" : requestID ?: @"",
+               @"error" : [streamError localizedDescription] ?: @"unknown"
+             }];
+    }
+    return streamed;
+  };
+  [self.context.response clearBody];
   [self.context.response setHeader:@"Content-Type" value:@"text/html; charset=utf-8"];
-  [self.context.response setTextBody:rendered];
   self.context.response.committed = YES;
   return YES;
 }
@@ -366,7 +470,9 @@ static NSDictionary *ALNEventStreamResyncPayload(ALNEventStreamReplayResult *res
 
 - (BOOL)renderJSON:(id)object error:(NSError **)error {
   NSJSONWritingOptions options = [[self class] jsonWritingOptions];
+  [self.context.perfTrace startStageID:ALNPerfStageSerialize];
   BOOL ok = [self.context.response setJSONBody:object options:options error:error];
+  [self.context.perfTrace endStageID:ALNPerfStageSerialize];
   if (ok) {
     self.context.response.committed = YES;
   }
@@ -70,20 +70,25 @@ static NSString *ALNCSRFTokenFromFormBody(ALNRequest *request, NSString *queryPa
 
 - (BOOL)processContext:(ALNContext *)context error:(NSError **)error {
   (void)error;
-  NSMutableDictionary *session = [context session];
-
-  NSString *token = session[@"_csrf_token"];
-  if (![token isKindOfClass:[NSString class]] || [token length] == 0) {
-    token = ALNCSRFTokenFromRandomBytes();
-    session[@"_csrf_token"] = token;
-    [context markSessionDirty];
-  }
-  context.stash[ALNContextCSRFTokenStashKey] = token;
+  // The session is only read, and a token only issued, for unsafe methods or
+  // when the action asks for -csrfToken.
+  context.stash[ALNContextCSRFTokenLoaderStashKey] = ^NSString *(ALNContext *loadingContext) {
+    NSMutableDictionary *session = [loadingContext session];
+    NSString *token = session[@"_csrf_token"];
+    if (![token isKindOfClass:[NSString class]] || [token length] == 0) {
+      token = ALNCSRFTokenFromRandomBytes();
+      session[@"_csrf_token"] = token;
+      [loadingContext markSessionDirty];
+    }
+    return token;
+  };
 
   if (ALNIsSafeMethod(context.request.method ?: @"GET")) {
     return YES;
   }
 
+  NSString *token = [context csrfToken];
+
   NSString *provided = [context.request headerValueForName:self.headerName];
   if ([provided length] == 0) {
     provided = ALNCSRFTokenFromFormBody(context.request, self.queryParamName);
@@ -4,13 +4,21 @@
 #import <Foundation/Foundation.h>
 
 #import "ALNApplication.h"
+#import "ALNRateLimitStore.h"
 
 NS_ASSUME_NONNULL_BEGIN
 
+// Token-bucket limiter keyed by client address. Each key may burst up to
+// `maxRequests` and refills at `maxRequests / windowSeconds` per second.
 @interface ALNRateLimitMiddleware : NSObject <ALNMiddleware>
 
+@property(nonatomic, strong, readonly) id<ALNRateLimitStore> store;
+
 - (instancetype)initWithMaxRequests:(NSUInteger)maxRequests
                       windowSeconds:(NSUInteger)windowSeconds;
+- (instancetype)initWithMaxRequests:(NSUInteger)maxRequests
+                      windowSeconds:(NSUInteger)windowSeconds
+                              store:(nullable id<ALNRateLimitStore>)store;
 
 @end
 
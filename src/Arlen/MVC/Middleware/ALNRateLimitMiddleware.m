@@ -1,8 +1,7 @@
 #import "ALNRateLimitMiddleware.h"
 
-#import <math.h>
-
 #import "ALNContext.h"
+#import "ALNLogger.h"
 #import "ALNRequest.h"
 #import "ALNResponse.h"
 
@@ -10,8 +9,7 @@
 
 @property(nonatomic, assign) NSUInteger maxRequests;
 @property(nonatomic, assign) NSUInteger windowSeconds;
-@property(nonatomic, strong) NSMutableDictionary *entries;
-@property(nonatomic, assign) NSUInteger seenRequests;
+@property(nonatomic, strong, readwrite) id<ALNRateLimitStore> store;
 
 @end
 
@@ -19,33 +17,21 @@
 
 - (instancetype)initWithMaxRequests:(NSUInteger)maxRequests
                       windowSeconds:(NSUInteger)windowSeconds {
+  return [self initWithMaxRequests:maxRequests windowSeconds:windowSeconds store:nil];
+}
+
+- (instancetype)initWithMaxRequests:(NSUInteger)maxRequests
+                      windowSeconds:(NSUInteger)windowSeconds
+                              store:(id<ALNRateLimitStore>)store {
   self = [super init];
   if (self) {
     _maxRequests = (maxRequests > 0) ? maxRequests : 120;
     _windowSeconds = (windowSeconds > 0) ? windowSeconds : 60;
-    _entries = [[NSMutableDictionary alloc] init];
-    _seenRequests = 0;
+    _store = store ?: [[ALNSharedMemoryRateLimitStore alloc] initWithPath:nil slotCount:0 error:NULL];
   }
   return self;
 }
 
-- (void)pruneStaleEntriesAtTime:(NSTimeInterval)now {
-  if ([self.entries count] < 1024) {
-    return;
-  }
-  NSMutableArray *stale = [NSMutableArray array];
-  for (NSString *key in self.entries) {
-    NSDictionary *entry = self.entries[key];
-    NSTimeInterval start = [entry[@"start"] doubleValue];
-    if ((now - start) > (NSTimeInterval)(self.windowSeconds * 2)) {
-      [stale addObject:key];
-    }
-  }
-  if ([stale count] > 0) {
-    [self.entries removeObjectsForKeys:stale];
-  }
-}
-
 - (BOOL)processContext:(ALNContext *)context error:(NSError **)error {
   (void)error;
   NSString *key = context.request.effectiveRemoteAddress;
@@ -56,67 +42,36 @@
     key = @"unknown";
   }
 
-  NSTimeInterval now = [[NSDate date] timeIntervalSince1970];
-  NSUInteger count = 0;
-  NSTimeInterval start = now;
-  BOOL limited = NO;
-  NSUInteger remaining = 0;
-  NSUInteger retryAfterSeconds = self.windowSeconds;
-
-  @synchronized(self) {
-    NSMutableDictionary *entry = [self.entries[key] mutableCopy];
-    if (entry == nil) {
-      entry = [NSMutableDictionary dictionaryWithDictionary:@{
-        @"start" : @(now),
-        @"count" : @(0),
-      }];
-    }
-
-    start = [entry[@"start"] doubleValue];
-    count = [entry[@"count"] unsignedIntegerValue];
-
-    if ((now - start) >= (NSTimeInterval)self.windowSeconds) {
-      start = now;
-      count = 0;
-    }
-
-    count += 1;
-    limited = (count > self.maxRequests);
-    if (count >= self.maxRequests) {
-      remaining = 0;
-    } else {
-      remaining = self.maxRequests - count;
-    }
-
-    NSTimeInterval elapsed = now - start;
-    NSTimeInterval retryAfter = (NSTimeInterval)self.windowSeconds - elapsed;
-    if (retryAfter < 1.0) {
-      retryAfter = 1.0;
-    }
-    retryAfterSeconds = (NSUInteger)ceil(retryAfter);
-
-    entry[@"start"] = @(start);
-    entry[@"count"] = @(count);
-    self.entries[key] = entry;
-
-    self.seenRequests += 1;
-    if ((self.seenRequests % 128) == 0) {
-      [self pruneStaleEntriesAtTime:now];
-    }
+  double refillPerSecond = (double)self.maxRequests / (double)self.windowSeconds;
+  ALNRateLimitDecision decision = {YES, self.maxRequests, 0};
+  NSError *storeError = nil;
+  if (![self.store takeTokenForKey:key
+                          capacity:self.maxRequests
+                   refillPerSecond:refillPerSecond
+                          decision:&decision
+                             error:&storeError]) {
+    // An unreachable backend should not take the application down with it.
+    [context.logger warn:@"rate limit store unavailable; allowing request"
+                  fields:@{
+                    @"store" : [self.store storeName] ?: @"",
+                    @"error" : storeError.localizedDescription ?: @"",
+                  }];
+    decision = (ALNRateLimitDecision){YES, self.maxRequests, 0};
   }
 
   [context.response setHeader:@"X-RateLimit-Limit"
                         value:[NSString stringWithFormat:@"%lu", (unsigned long)self.maxRequests]];
   [context.response setHeader:@"X-RateLimit-Remaining"
-                        value:[NSString stringWithFormat:@"%lu", (unsigned long)remaining]];
+                        value:[NSString stringWithFormat:@"%lu", (unsigned long)decision.remaining]];
 
-  if (!limited) {
+  if (decision.allowed) {
     return YES;
   }
 
   context.response.statusCode = 429;
   [context.response setHeader:@"Retry-After"
-                        value:[NSString stringWithFormat:@"%lu", (unsigned long)retryAfterSeconds]];
+                        value:[NSString stringWithFormat:@"%lu",
+                                                         (unsigned long)decision.retryAfterSeconds]];
   [context.response setHeader:@"Content-Type" value:@"text/plain; charset=utf-8"];
   [context.response setTextBody:@"rate limit exceeded\n"];
   context.response.committed = YES;
@@ -11,6 +11,10 @@ FOUNDATION_EXPORT NSString *const ALNContextRoutePolicyDecisionStashKey;
 
 @interface ALNRoutePolicyMiddleware : NSObject <ALNMiddleware>
 
+// Compiles trusted proxy and source allowlist CIDRs from `config` up front.
+// Plain -init compiles them from the application config on first use.
+- (instancetype)initWithConfig:(nullable NSDictionary *)config;
+
 + (nullable NSError *)validateSecurityConfiguration:(NSDictionary *)config;
 
 @end
@@ -1,14 +1,12 @@
 #import "ALNRoutePolicyMiddleware.h"
 
+#import "ALNCIDRSet.h"
 #import "ALNContext.h"
 #import "ALNLogger.h"
 #import "ALNRequest.h"
 #import "ALNResponse.h"
 #import "ALNRoute.h"
 
-#include <arpa/inet.h>
-#include <string.h>
-
 NSString *const ALNContextRoutePolicyNamesStashKey = @"aln.route_policies.names";
 NSString *const ALNContextRoutePolicyDecisionStashKey = @"aln.route_policies.decision";
 
@@ -91,159 +89,6 @@ static BOOL ALNPathMatchesPolicyPrefix(NSString *path, NSString *prefix) {
   return [normalizedPath hasPrefix:prefixWithSlash];
 }
 
-static NSString *ALNNormalizeIPAddressCandidate(NSString *value) {
-  NSString *trimmed = ALNTrimmedPolicyString(value);
-  if ([trimmed length] == 0) {
-    return @"";
-  }
-  if ([trimmed hasPrefix:@"["]) {
-    NSRange closing = [trimmed rangeOfString:@"]"];
-    if (closing.location != NSNotFound && closing.location > 1) {
-      return [trimmed substringWithRange:NSMakeRange(1, closing.location - 1)];
-    }
-  }
-  NSRange percent = [trimmed rangeOfString:@"%"];
-  if (percent.location != NSNotFound) {
-    trimmed = [trimmed substringToIndex:percent.location];
-  }
-  NSUInteger colonCount = 0;
-  for (NSUInteger idx = 0; idx < [trimmed length]; idx++) {
-    if ([trimmed characterAtIndex:idx] == ':') {
-      colonCount += 1;
-    }
-  }
-  if (colonCount == 1 && [trimmed rangeOfString:@"."].location != NSNotFound) {
-    NSArray *parts = [trimmed componentsSeparatedByString:@":"];
-    if ([parts count] == 2 && [parts[0] length] > 0 && [parts[1] length] > 0) {
-      return parts[0];
-    }
-  }
-  return trimmed;
-}
-
-static BOOL ALNParseIPAddressBytes(NSString *value, int *familyOut, uint8_t bytesOut[16]) {
-  if (familyOut != NULL) {
-    *familyOut = 0;
-  }
-  if (bytesOut != NULL) {
-    memset(bytesOut, 0, 16);
-  }
-  NSString *candidate = ALNNormalizeIPAddressCandidate(value);
-  if ([candidate length] == 0 || bytesOut == NULL) {
-    return NO;
-  }
-  const char *raw = [candidate UTF8String];
-  if (raw == NULL) {
-    return NO;
-  }
-  struct in_addr ipv4;
-  memset(&ipv4, 0, sizeof(ipv4));
-  if (inet_pton(AF_INET, raw, &ipv4) == 1) {
-    memcpy(bytesOut, &ipv4, 4);
-    if (familyOut != NULL) {
-      *familyOut = AF_INET;
-    }
-    return YES;
-  }
-  struct in6_addr ipv6;
-  memset(&ipv6, 0, sizeof(ipv6));
-  if (inet_pton(AF_INET6, raw, &ipv6) == 1) {
-    memcpy(bytesOut, &ipv6, 16);
-    if (familyOut != NULL) {
-      *familyOut = AF_INET6;
-    }
-    return YES;
-  }
-  return NO;
-}
-
-static BOOL ALNStringIsUnsignedInteger(NSString *value, NSUInteger *parsedOut) {
-  NSString *trimmed = ALNTrimmedPolicyString(value);
-  if ([trimmed length] == 0) {
-    return NO;
-  }
-  NSScanner *scanner = [NSScanner scannerWithString:trimmed];
-  long long parsed = 0;
-  if (![scanner scanLongLong:&parsed] || ![scanner isAtEnd] || parsed < 0) {
-    return NO;
-  }
-  if (parsedOut != NULL) {
-    *parsedOut = (NSUInteger)parsed;
-  }
-  return YES;
-}
-
-static BOOL ALNCIDRIsValid(NSString *cidr) {
-  NSString *trimmed = ALNTrimmedPolicyString(cidr);
-  if ([trimmed length] == 0) {
-    return NO;
-  }
-  NSArray *parts = [trimmed componentsSeparatedByString:@"/"];
-  if ([parts count] > 2) {
-    return NO;
-  }
-  int family = 0;
-  uint8_t bytes[16];
-  if (!ALNParseIPAddressBytes(parts[0], &family, bytes)) {
-    return NO;
-  }
-  if ([parts count] == 1) {
-    return YES;
-  }
-  NSUInteger prefix = 0;
-  if (!ALNStringIsUnsignedInteger(parts[1], &prefix)) {
-    return NO;
-  }
-  return (family == AF_INET) ? (prefix <= 32) : (prefix <= 128);
-}
-
-static BOOL ALNIPAddressMatchesCIDR(NSString *ip, NSString *cidr) {
-  NSString *trimmed = ALNTrimmedPolicyString(cidr);
-  NSArray *parts = [trimmed componentsSeparatedByString:@"/"];
-  if ([parts count] > 2) {
-    return NO;
-  }
-  int ipFamily = 0;
-  int cidrFamily = 0;
-  uint8_t ipBytes[16];
-  uint8_t cidrBytes[16];
-  if (!ALNParseIPAddressBytes(ip, &ipFamily, ipBytes) ||
-      !ALNParseIPAddressBytes(parts[0], &cidrFamily, cidrBytes) ||
-      ipFamily != cidrFamily) {
-    return NO;
-  }
-  NSUInteger prefix = (ipFamily == AF_INET) ? 32 : 128;
-  if ([parts count] == 2 && !ALNStringIsUnsignedInteger(parts[1], &prefix)) {
-    return NO;
-  }
-  NSUInteger maxPrefix = (ipFamily == AF_INET) ? 32 : 128;
-  if (prefix > maxPrefix) {
-    return NO;
-  }
-  NSUInteger fullBytes = prefix / 8;
-  NSUInteger remainingBits = prefix % 8;
-  if (fullBytes > 0 && memcmp(ipBytes, cidrBytes, fullBytes) != 0) {
-    return NO;
-  }
-  if (remainingBits == 0) {
-    return YES;
-  }
-  uint8_t mask = (uint8_t)(0xFF << (8 - remainingBits));
-  return (ipBytes[fullBytes] & mask) == (cidrBytes[fullBytes] & mask);
-}
-
-static BOOL ALNIPMatchesAnyCIDR(NSString *ip, NSArray *cidrs) {
-  if ([ip length] == 0) {
-    return NO;
-  }
-  for (NSString *cidr in cidrs ?: @[]) {
-    if (ALNIPAddressMatchesCIDR(ip, cidr)) {
-      return YES;
-    }
-  }
-  return NO;
-}
-
 static NSString *ALNFirstForwardedForValue(NSString *header) {
   NSString *trimmed = ALNTrimmedPolicyString(header);
   if ([trimmed length] == 0) {
@@ -303,6 +148,37 @@ static NSArray *ALNTrustedProxyCIDRs(NSDictionary *config) {
   return ALNPolicyStringArray(ALNSecurityDictionary(config)[@"trustedProxies"]);
 }
 
+// Trusted proxies and per-policy source allowlists compiled into prefix tries
+// for one configuration dictionary. Never modified once compiled, so request
+// threads share one without locking.
+@interface ALNRoutePolicyCIDRTables : NSObject
+
+@property(nonatomic, strong) NSDictionary *config;
+@property(nonatomic, strong) ALNCIDRSet *trustedProxies;
+@property(nonatomic, copy) NSDictionary<NSString *, ALNCIDRSet *> *allowlists;
+
+@end
+
+@implementation ALNRoutePolicyCIDRTables
+@end
+
+static ALNRoutePolicyCIDRTables *ALNCompileRoutePolicyCIDRTables(NSDictionary *config) {
+  ALNRoutePolicyCIDRTables *tables = [[ALNRoutePolicyCIDRTables alloc] init];
+  tables.config = config;
+  tables.trustedProxies = [[ALNCIDRSet alloc] initWithCIDRStrings:ALNTrustedProxyCIDRs(config)];
+  NSMutableDictionary *allowlists = [NSMutableDictionary dictionary];
+  NSDictionary *policies = ALNRoutePoliciesDictionary(config);
+  for (NSString *name in policies) {
+    NSDictionary *policy = [policies[name] isKindOfClass:[NSDictionary class]] ? policies[name] : nil;
+    NSArray *allowlist = ALNPolicyStringArray(policy[@"sourceIPAllowlist"]);
+    if ([allowlist count] > 0) {
+      allowlists[name] = [[ALNCIDRSet alloc] initWithCIDRStrings:allowlist];
+    }
+  }
+  tables.allowlists = allowlists;
+  return tables;
+}
+
 static NSArray *ALNPolicyNamesForRequest(ALNContext *context) {
   NSDictionary *policies = ALNRoutePoliciesDictionary([context application].config ?: @{});
   NSMutableOrderedSet *names = [NSMutableOrderedSet orderedSet];
@@ -329,28 +205,39 @@ static NSArray *ALNPolicyNamesForRequest(ALNContext *context) {
   return [names array];
 }
 
-static NSDictionary *ALNResolvedClientIP(ALNContext *context, BOOL trustForwardedClientIP) {
-  NSString *directPeer = ALNNormalizeIPAddressCandidate(context.request.remoteAddress ?: @"");
-  int family = 0;
-  uint8_t bytes[16];
-  if (!ALNParseIPAddressBytes(directPeer, &family, bytes)) {
+static NSDictionary *ALNResolvedClientIP(ALNContext *context,
+                                         BOOL trustForwardedClientIP,
+                                         ALNCIDRSet *trustedProxies) {
+  ALNIPAddress *directPeerAddress = context.request.parsedRemoteAddress;
+  if (directPeerAddress == nil) {
     return @{ @"status" : @"unresolved", @"reason" : @"direct_peer_unresolved" };
   }
+  NSString *directPeer = directPeerAddress.stringValue;
 
-  NSArray *trustedProxyCIDRs = ALNTrustedProxyCIDRs([context application].config ?: @{});
-  if (!trustForwardedClientIP || [trustedProxyCIDRs count] == 0) {
-    return @{ @"status" : @"ok", @"client_ip" : directPeer, @"source" : @"direct" };
+  if (!trustForwardedClientIP || [trustedProxies count] == 0) {
+    return @{
+      @"status" : @"ok",
+      @"client_ip" : directPeer,
+      @"client_address" : directPeerAddress,
+      @"source" : @"direct",
+    };
   }
 
-  if (!ALNIPMatchesAnyCIDR(directPeer, trustedProxyCIDRs)) {
-    return @{ @"status" : @"ok", @"client_ip" : directPeer, @"source" : @"direct_untrusted_proxy_headers_ignored" };
+  if (![trustedProxies containsAddress:directPeerAddress]) {
+    return @{
+      @"status" : @"ok",
+      @"client_ip" : directPeer,
+      @"client_address" : directPeerAddress,
+      @"source" : @"direct_untrusted_proxy_headers_ignored",
+    };
   }
 
   NSString *forwarded = ALNFirstForwardedForValue([context.request headerValueForName:@"Forwarded"]);
   if ([forwarded length] == 0) {
     forwarded = ALNFirstXForwardedForValue([context.request headerValueForName:@"X-Forwarded-For"]);
   }
-  if (!ALNParseIPAddressBytes(forwarded, &family, bytes)) {
+  ALNIPAddress *forwardedAddress = [ALNIPAddress addressWithString:forwarded];
+  if (forwardedAddress == nil) {
     return @{
       @"status" : @"unresolved",
       @"reason" : @"forwarded_client_unresolved",
@@ -360,6 +247,7 @@ static NSDictionary *ALNResolvedClientIP(ALNContext *context, BOOL trustForwarde
   return @{
     @"status" : @"ok",
     @"client_ip" : forwarded,
+    @"client_address" : forwardedAddress,
     @"source" : @"trusted_forwarded",
     @"direct_peer" : directPeer,
   };
@@ -382,8 +270,40 @@ static NSDictionary *ALNRoutePolicyDenial(NSString *policyName,
   return decision;
 }
 
+@interface ALNRoutePolicyMiddleware ()
+
+@property(atomic, strong) ALNRoutePolicyCIDRTables *cidrTables;
+
+@end
+
 @implementation ALNRoutePolicyMiddleware
 
+- (instancetype)init {
+  return [self initWithConfig:nil];
+}
+
+- (instancetype)initWithConfig:(NSDictionary *)config {
+  self = [super init];
+  if (self) {
+    if ([config isKindOfClass:[NSDictionary class]]) {
+      _cidrTables = ALNCompileRoutePolicyCIDRTables(config);
+    }
+  }
+  return self;
+}
+
+// The published tables are an immutable snapshot read without a lock. When
+// the config changes, concurrent requests may each compile tables for it;
+// the last one stored wins and the others are simply dropped.
+- (ALNRoutePolicyCIDRTables *)cidrTablesForConfig:(NSDictionary *)config {
+  ALNRoutePolicyCIDRTables *tables = self.cidrTables;
+  if (tables == nil || tables.config != config) {
+    tables = ALNCompileRoutePolicyCIDRTables(config);
+    self.cidrTables = tables;
+  }
+  return tables;
+}
+
 + (NSError *)validationErrorWithCode:(NSInteger)code
                               reason:(NSString *)reason
                                  key:(NSString *)key
@@ -405,7 +325,7 @@ static NSDictionary *ALNRoutePolicyDenial(NSString *policyName,
   NSMutableArray *details = [NSMutableArray array];
   NSArray *trustedProxies = ALNPolicyStringArray(ALNSecurityDictionary(config)[@"trustedProxies"]);
   for (NSString *cidr in trustedProxies) {
-    if (!ALNCIDRIsValid(cidr)) {
+    if (![ALNCIDRSet isValidCIDRString:cidr]) {
       [details addObject:@{
         @"field" : @"security.trustedProxies",
         @"code" : @"invalid_cidr",
@@ -456,7 +376,7 @@ static NSDictionary *ALNRoutePolicyDenial(NSString *policyName,
       }
     }
     for (NSString *cidr in ALNPolicyStringArray(policy[@"sourceIPAllowlist"])) {
-      if (!ALNCIDRIsValid(cidr)) {
+      if (![ALNCIDRSet isValidCIDRString:cidr]) {
         [details addObject:@{
           @"field" : [NSString stringWithFormat:@"security.routePolicies.%@.sourceIPAllowlist", name],
           @"code" : @"invalid_cidr",
@@ -502,7 +422,9 @@ static NSDictionary *ALNRoutePolicyDenial(NSString *policyName,
     return YES;
   }
 
-  NSDictionary *policies = ALNRoutePoliciesDictionary([context application].config ?: @{});
+  NSDictionary *config = [context application].config ?: @{};
+  NSDictionary *policies = ALNRoutePoliciesDictionary(config);
+  ALNRoutePolicyCIDRTables *tables = nil;
   for (NSString *name in policyNames) {
     NSDictionary *policy = [policies[name] isKindOfClass:[NSDictionary class]] ? policies[name] : nil;
     if (policy == nil) {
@@ -510,12 +432,15 @@ static NSDictionary *ALNRoutePolicyDenial(NSString *policyName,
       return NO;
     }
 
-    NSArray *allowlist = ALNPolicyStringArray(policy[@"sourceIPAllowlist"]);
-    if ([allowlist count] > 0) {
+    if (tables == nil) {
+      tables = [self cidrTablesForConfig:config];
+    }
+    ALNCIDRSet *allowlist = tables.allowlists[name];
+    if (allowlist != nil) {
       BOOL trustForwarded = [policy[@"trustForwardedClientIP"] respondsToSelector:@selector(boolValue)]
                                 ? [policy[@"trustForwardedClientIP"] boolValue]
                                 : NO;
-      NSDictionary *resolved = ALNResolvedClientIP(context, trustForwarded);
+      NSDictionary *resolved = ALNResolvedClientIP(context, trustForwarded, tables.trustedProxies);
       NSString *clientIP = [resolved[@"client_ip"] isKindOfClass:[NSString class]] ? resolved[@"client_ip"] : @"";
       NSString *source = [resolved[@"source"] isKindOfClass:[NSString class]] ? resolved[@"source"] : @"";
       if (![[resolved[@"status"] description] isEqualToString:@"ok"] || [clientIP length] == 0) {
@@ -526,7 +451,7 @@ static NSDictionary *ALNRoutePolicyDenial(NSString *policyName,
         return NO;
       }
       context.request.effectiveRemoteAddress = clientIP;
-      if (!ALNIPMatchesAnyCIDR(clientIP, allowlist)) {
+      if (![allowlist containsAddress:resolved[@"client_address"]]) {
         [self applyDenial:ALNRoutePolicyDenial(name, @"source_ip_denied", clientIP, source)
                   context:context];
         return NO;
@@ -15,6 +15,18 @@ NS_ASSUME_NONNULL_BEGIN
                         secure:(BOOL)secure
                       sameSite:(nullable NSString *)sameSite;
 
+// `tokenCacheCapacity` bounds the LRU of verified cookie payloads that lets
+// repeat requests with the same cookie skip signature checks and decryption.
+// Zero disables the cache. The shorter initializer uses 1024.
+- (instancetype)initWithSecret:(NSString *)secret
+                    cookieName:(nullable NSString *)cookieName
+                 maxAgeSeconds:(NSUInteger)maxAgeSeconds
+                        secure:(BOOL)secure
+                      sameSite:(nullable NSString *)sameSite
+            tokenCacheCapacity:(NSUInteger)tokenCacheCapacity;
+
+- (NSUInteger)tokenCacheCapacity;
+
 @end
 
 NS_ASSUME_NONNULL_END
@@ -8,6 +8,7 @@
 #import <openssl/evp.h>
 #import <openssl/hmac.h>
 #import <openssl/rand.h>
+#import <openssl/sha.h>
 
 static NSString *const ALNSessionEncryptedVersion = @"v3";
 static NSString *const ALNSessionLegacyVersion = @"v2";
@@ -134,6 +135,142 @@ static NSData *ALNAES256CTRTransform(NSData *input, NSData *key, NSData *iv, BOO
   return result;
 }
 
+static NSData *ALNSessionTokenDigest(NSString *token) {
+  NSData *tokenData = [token dataUsingEncoding:NSUTF8StringEncoding];
+  if ([tokenData length] == 0) {
+    return nil;
+  }
+  unsigned char digest[SHA256_DIGEST_LENGTH];
+  SHA256([tokenData bytes], [tokenData length], digest);
+  return [NSData dataWithBytes:digest length:SHA256_DIGEST_LENGTH];
+}
+
+@interface ALNSessionTokenCacheEntry : NSObject
+
+@property(nonatomic, copy) NSData *digest;
+@property(nonatomic, copy) NSDictionary *payload;
+@property(nonatomic, assign) BOOL requiresRefresh;
+@property(nonatomic, strong) ALNSessionTokenCacheEntry *next;
+@property(nonatomic, unsafe_unretained) ALNSessionTokenCacheEntry *previous;
+
+@end
+
+@implementation ALNSessionTokenCacheEntry
+@end
+
+// Bounded LRU of token digest -> verified payload. Keys are SHA-256 digests of
+// the whole cookie value so a hit implies the exact token already passed
+// signature verification.
+@interface ALNSessionTokenCache : NSObject
+
+@property(nonatomic, assign, readonly) NSUInteger capacity;
+
+- (instancetype)initWithCapacity:(NSUInteger)capacity;
+- (nullable NSDictionary *)payloadForDigest:(NSData *)digest requiresRefresh:(BOOL *)requiresRefresh;
+- (void)storePayload:(NSDictionary *)payload
+           forDigest:(NSData *)digest
+     requiresRefresh:(BOOL)requiresRefresh;
+
+@end
+
+@implementation ALNSessionTokenCache {
+  NSMutableDictionary *_entries;
+  ALNSessionTokenCacheEntry *_head;
+  ALNSessionTokenCacheEntry *_tail;
+}
+
+- (instancetype)initWithCapacity:(NSUInteger)capacity {
+  self = [super init];
+  if (self) {
+    _capacity = capacity;
+    _entries = [NSMutableDictionary dictionaryWithCapacity:MIN(capacity, (NSUInteger)4096)];
+  }
+  return self;
+}
+
+- (void)unlinkEntry:(ALNSessionTokenCacheEntry *)entry {
+  if (entry.previous != nil) {
+    entry.previous.next = entry.next;
+  } else {
+    _head = entry.next;
+  }
+  if (entry.next != nil) {
+    entry.next.previous = entry.previous;
+  } else {
+    _tail = entry.previous;
+  }
+  entry.previous = nil;
+  entry.next = nil;
+}
+
+- (void)pushEntryToFront:(ALNSessionTokenCacheEntry *)entry {
+  entry.next = _head;
+  entry.previous = nil;
+  if (_head != nil) {
+    _head.previous = entry;
+  }
+  _head = entry;
+  if (_tail == nil) {
+    _tail = entry;
+  }
+}
+
+- (void)removeEntry:(ALNSessionTokenCacheEntry *)entry {
+  NSData *digest = entry.digest;
+  [self unlinkEntry:entry];
+  [_entries removeObjectForKey:digest];
+}
+
+- (NSDictionary *)payloadForDigest:(NSData *)digest requiresRefresh:(BOOL *)requiresRefresh {
+  if ([digest length] == 0) {
+    return nil;
+  }
+  @synchronized(self) {
+    ALNSessionTokenCacheEntry *entry = _entries[digest];
+    if (entry == nil) {
+      return nil;
+    }
+    NSInteger expiresAt = [entry.payload[@"exp"] integerValue];
+    if (expiresAt > 0 && expiresAt < (NSInteger)[[NSDate date] timeIntervalSince1970]) {
+      [self removeEntry:entry];
+      return nil;
+    }
+    if (entry != _head) {
+      [self unlinkEntry:entry];
+      [self pushEntryToFront:entry];
+    }
+    if (requiresRefresh != NULL) {
+      *requiresRefresh = entry.requiresRefresh;
+    }
+    return entry.payload;
+  }
+}
+
+- (void)storePayload:(NSDictionary *)payload
+           forDigest:(NSData *)digest
+     requiresRefresh:(BOOL)requiresRefresh {
+  if (self.capacity == 0 || [digest length] == 0 || ![payload isKindOfClass:[NSDictionary class]]) {
+    return;
+  }
+  @synchronized(self) {
+    ALNSessionTokenCacheEntry *existing = _entries[digest];
+    if (existing != nil) {
+      [self removeEntry:existing];
+    }
+    while ([_entries count] >= self.capacity && _tail != nil) {
+      [self removeEntry:_tail];
+    }
+    ALNSessionTokenCacheEntry *entry = [[ALNSessionTokenCacheEntry alloc] init];
+    entry.digest = digest;
+    entry.payload = payload;
+    entry.requiresRefresh = requiresRefresh;
+    _entries[digest] = entry;
+    [self pushEntryToFront:entry];
+  }
+}
+
+@end
+
 @interface ALNSessionMiddleware ()
 
 @property(nonatomic, copy) NSString *cookieName;
@@ -144,6 +281,7 @@ static NSData *ALNAES256CTRTransform(NSData *input, NSData *key, NSData *iv, BOO
 @property(nonatomic, strong) NSData *secretData;
 @property(nonatomic, strong) NSData *encryptionKeyData;
 @property(nonatomic, strong) NSData *signatureKeyData;
+@property(nonatomic, strong) ALNSessionTokenCache *tokenCache;
 
 @end
 
@@ -154,6 +292,20 @@ static NSData *ALNAES256CTRTransform(NSData *input, NSData *key, NSData *iv, BOO
                  maxAgeSeconds:(NSUInteger)maxAgeSeconds
                         secure:(BOOL)secure
                       sameSite:(NSString *)sameSite {
+  return [self initWithSecret:secret
+                   cookieName:cookieName
+                maxAgeSeconds:maxAgeSeconds
+                       secure:secure
+                     sameSite:sameSite
+           tokenCacheCapacity:1024];
+}
+
+- (instancetype)initWithSecret:(NSString *)secret
+                    cookieName:(NSString *)cookieName
+                 maxAgeSeconds:(NSUInteger)maxAgeSeconds
+                        secure:(BOOL)secure
+                      sameSite:(NSString *)sameSite
+            tokenCacheCapacity:(NSUInteger)tokenCacheCapacity {
   self = [super init];
   if (self) {
     NSString *normalizedSecret = secret ?: @"";
@@ -179,10 +331,17 @@ static NSData *ALNAES256CTRTransform(NSData *input, NSData *key, NSData *iv, BOO
     if ([_sameSite length] == 0) {
       _sameSite = @"Lax";
     }
+    _tokenCache = (tokenCacheCapacity > 0)
+                      ? [[ALNSessionTokenCache alloc] initWithCapacity:tokenCacheCapacity]
+                      : nil;
   }
   return self;
 }
 
+- (NSUInteger)tokenCacheCapacity {
+  return self.tokenCache.capacity;
+}
+
 - (NSString *)setCookieHeaderWithValue:(NSString *)value maxAge:(NSUInteger)maxAge {
   NSMutableArray *parts = [NSMutableArray arrayWithObjects:
                                               [NSString stringWithFormat:@"%@=%@", self.cookieName, value ?: @""],
@@ -275,7 +434,7 @@ static NSData *ALNAES256CTRTransform(NSData *input, NSData *key, NSData *iv, BOO
   return [payload isKindOfClass:[NSDictionary class]] ? payload : nil;
 }
 
-- (nullable NSMutableDictionary *)decodeLegacySessionToken:(NSString *)token {
+- (nullable NSDictionary *)verifiedLegacyPayloadFromToken:(NSString *)token {
   if ([self.secretData length] == 0) {
     return nil;
   }
@@ -299,10 +458,10 @@ static NSData *ALNAES256CTRTransform(NSData *input, NSData *key, NSData *iv, BOO
     return nil;
   }
 
-  return [self sessionDictionaryFromPayload:[self payloadFromPlaintext:plaintext]];
+  return [self payloadFromPlaintext:plaintext];
 }
 
-- (nullable NSMutableDictionary *)decodeEncryptedSessionToken:(NSString *)token {
+- (nullable NSDictionary *)verifiedEncryptedPayloadFromToken:(NSString *)token {
   if ([self.encryptionKeyData length] != 32 || [self.signatureKeyData length] == 0) {
     return nil;
   }
@@ -333,7 +492,7 @@ static NSData *ALNAES256CTRTransform(NSData *input, NSData *key, NSData *iv, BOO
     return nil;
   }
 
-  return [self sessionDictionaryFromPayload:[self payloadFromPlaintext:plaintext]];
+  return [self payloadFromPlaintext:plaintext];
 }
 
 - (nullable NSMutableDictionary *)decodeSessionToken:(NSString *)token requiresRefresh:(BOOL *)requiresRefresh {
@@ -344,13 +503,22 @@ static NSData *ALNAES256CTRTransform(NSData *input, NSData *key, NSData *iv, BOO
     return nil;
   }
 
-  NSMutableDictionary *session = [self decodeEncryptedSessionToken:token];
-  if (session != nil) {
-    return session;
+  NSData *digest = (self.tokenCache != nil) ? ALNSessionTokenDigest(token) : nil;
+  BOOL legacy = NO;
+  NSDictionary *payload = [self.tokenCache payloadForDigest:digest requiresRefresh:&legacy];
+  if (payload == nil) {
+    payload = [self verifiedEncryptedPayloadFromToken:token];
+    if (payload == nil) {
+      payload = [self verifiedLegacyPayloadFromToken:token];
+      legacy = (payload != nil);
+    }
+    if (payload != nil) {
+      [self.tokenCache storePayload:payload forDigest:digest requiresRefresh:legacy];
+    }
   }
 
-  session = [self decodeLegacySessionToken:token];
-  if (session != nil && requiresRefresh != NULL) {
+  NSMutableDictionary *session = [self sessionDictionaryFromPayload:payload];
+  if (session != nil && legacy && requiresRefresh != NULL) {
     *requiresRefresh = YES;
   }
   return session;
@@ -361,28 +529,35 @@ static NSData *ALNAES256CTRTransform(NSData *input, NSData *key, NSData *iv, BOO
   NSString *raw = context.request.cookies[self.cookieName];
   BOOL hadCookie = ([raw length] > 0);
 
-  NSMutableDictionary *session = nil;
-  BOOL requiresRefresh = NO;
-  if (hadCookie) {
-    session = [self decodeSessionToken:raw requiresRefresh:&requiresRefresh];
-  }
-  if (session == nil) {
-    session = [NSMutableDictionary dictionary];
-  }
-
-  context.stash[ALNContextSessionStashKey] = session;
   context.stash[ALNContextSessionHadCookieStashKey] = @(hadCookie);
   context.stash[ALNContextSessionDirtyStashKey] = @(NO);
-  context.stash[ALNSessionNeedsRefreshStashKey] = @(requiresRefresh);
-
-  NSString *csrf = session[@"_csrf_token"];
-  if ([csrf isKindOfClass:[NSString class]] && [csrf length] > 0) {
-    context.stash[ALNContextCSRFTokenStashKey] = csrf;
+  context.stash[ALNSessionNeedsRefreshStashKey] = @(NO);
+  if (!hadCookie) {
+    return YES;
+  }
+
+  // Decoding waits until something reads the session. Legacy cookies are
+  // decoded now so they are re-issued in the current format.
+  ALNSessionMiddleware *middleware = self;
+  NSString *token = [raw copy];
+  context.stash[ALNContextSessionLoaderStashKey] = [^NSMutableDictionary *(ALNContext *loading) {
+    BOOL requiresRefresh = NO;
+    NSMutableDictionary *session = [middleware decodeSessionToken:token
+                                                  requiresRefresh:&requiresRefresh];
+    loading.stash[ALNSessionNeedsRefreshStashKey] = @(requiresRefresh);
+    return session ?: [NSMutableDictionary dictionary];
+  } copy];
+  if ([token hasPrefix:[ALNSessionLegacyVersion stringByAppendingString:@"."]]) {
+    (void)[context session];
   }
   return YES;
 }
 
 - (void)didProcessContext:(ALNContext *)context {
+  if (![context isSessionLoaded]) {
+    // Nothing read or wrote the session, so the cookie stands as sent.
+    return;
+  }
   NSMutableDictionary *session = context.stash[ALNContextSessionStashKey];
   if (![session isKindOfClass:[NSMutableDictionary class]]) {
     return;
@@ -5,6 +5,8 @@
 
 NS_ASSUME_NONNULL_BEGIN
 
+@class ALNCompiledSchema;
+
 typedef NS_ENUM(NSInteger, ALNRouteKind) {
   ALNRouteKindStatic = 3,
   ALNRouteKindParameterized = 2,
@@ -64,6 +66,8 @@ typedef NS_ENUM(NSUInteger, ALNRouteInvocationReturnKind) {
 @property(nonatomic, assign, nullable) IMP compiledFastActionIMP;
 @property(nonatomic, assign) ALNRouteInvocationReturnKind compiledActionReturnKind;
 @property(nonatomic, assign) ALNRouteInvocationReturnKind compiledGuardReturnKind;
+@property(nonatomic, strong, nullable) ALNCompiledSchema *compiledRequestSchema;
+@property(nonatomic, strong, nullable) ALNCompiledSchema *compiledResponseSchema;
 @property(nonatomic, assign) BOOL compiledInvocationMetadata;
 
 - (instancetype)initWithMethod:(NSString *)method
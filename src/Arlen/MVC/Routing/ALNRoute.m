@@ -145,6 +145,8 @@ static NSString *ALNNormalizedPathForFastMatch(NSString *path) {
     _compiledFastActionIMP = NULL;
     _compiledActionReturnKind = ALNRouteInvocationReturnKindUnknown;
     _compiledGuardReturnKind = ALNRouteInvocationReturnKindUnknown;
+    _compiledRequestSchema = nil;
+    _compiledResponseSchema = nil;
     _compiledInvocationMetadata = NO;
 
     BOOL hasWildcard = NO;
@@ -10,6 +10,9 @@ NS_ASSUME_NONNULL_BEGIN
 @interface ALNRouter : NSObject
 
 @property(nonatomic, assign, readonly) BOOL hasFormatConstrainedRoutes;
+// Incremented every time a route is added, so derived data (for example the
+// cached OpenAPI document) can tell when the route table changed.
+@property(nonatomic, assign, readonly) NSUInteger generation;
 
 - (ALNRoute *)addRouteMethod:(NSString *)method
                        path:(NSString *)path
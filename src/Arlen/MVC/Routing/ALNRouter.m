@@ -8,6 +8,7 @@
 @property(nonatomic, strong) NSMutableArray *routeGroups;
 @property(nonatomic, assign) NSUInteger routeCounter;
 @property(nonatomic, assign, readwrite) BOOL hasFormatConstrainedRoutes;
+@property(nonatomic, assign, readwrite) NSUInteger generation;
 
 @end
 
@@ -206,6 +207,7 @@ static NSArray *ALNStaticCandidatesForPath(NSDictionary *index,
     _routeGroups = [NSMutableArray array];
     _routeCounter = 0;
     _hasFormatConstrainedRoutes = NO;
+    _generation = 0;
   }
   return self;
 }
@@ -293,6 +295,7 @@ static NSArray *ALNStaticCandidatesForPath(NSDictionary *index,
   [bucket addObject:route];
   self.routesByMethod[bucketKey] = bucket;
   ALNIndexStaticRoute(self.staticRoutesByMethodAndPath, route);
+  self.generation += 1;
   return route;
 }
 
@@ -21,8 +21,48 @@ typedef NS_ENUM(NSInteger, ALNEOCErrorCode) {
   ALNEOCErrorInvalidArgument = 5,
 };
 
+// Growable UTF-8 byte buffer that transpiled templates render into. Static
+// template text is appended as pre-encoded bytes and escaping writes straight
+// into the buffer, so a finished render can become a response body without
+// another transcoding pass.
+@interface ALNEOCRenderBuffer : NSObject
+
+- (instancetype)init;
+- (instancetype)initWithCapacity:(NSUInteger)capacity;
+- (NSUInteger)length;
+- (const uint8_t *)bytes;
+- (void)appendBytes:(const void *)bytes length:(NSUInteger)length;
+- (void)appendString:(NSString *)string;
+- (void)appendEscapedString:(NSString *)string;
+- (void)appendRenderBuffer:(ALNEOCRenderBuffer *)buffer;
+- (void)reset;
+- (NSString *)stringValue;
+- (NSData *)dataValue;
+- (NSData *)detachData;
+
+@end
+
+// Opt-in render profile. While a profile is pushed on the current thread,
+// every template render records its count, inclusive and self time on a
+// monotonic clock, and the UTF-8 bytes it produced, keyed by logical path.
+// Self time excludes nested includes, collections, and deferred slots.
+@interface ALNEOCRenderProfile : NSObject
+
+- (instancetype)init;
+- (NSUInteger)renderCount;
+- (double)totalSelfMilliseconds;
+- (NSArray<NSDictionary *> *)entries;
+- (NSDictionary *)dictionaryRepresentation;
+- (void)reset;
+
+@end
+
 typedef NSString *_Nullable (*ALNEOCRenderFunction)(id _Nullable ctx,
                                                      NSError **_Nullable error);
+typedef ALNEOCRenderBuffer *_Nullable (*ALNEOCBufferRenderFunction)(id _Nullable ctx,
+                                                                     ALNEOCRenderBuffer *out,
+                                                                     NSError **_Nullable error);
+typedef BOOL (^ALNEOCStreamWriter)(NSData *chunk);
 
 NSString *ALNEOCCanonicalTemplatePath(NSString *path);
 NSString *ALNEOCEscapeHTMLString(NSString *input);
@@ -36,6 +76,17 @@ NSDictionary *ALNEOCPushRenderOptions(BOOL strictLocals, BOOL strictStringify);
 void ALNEOCPopRenderOptions(NSDictionary *_Nullable token);
 NSDictionary *ALNEOCPushCompositionState(void);
 void ALNEOCPopCompositionState(NSDictionary *_Nullable token);
+NSDictionary *ALNEOCPushStreamSink(ALNEOCRenderBuffer *rootBuffer, ALNEOCStreamWriter writer);
+void ALNEOCPopStreamSink(NSDictionary *_Nullable token);
+BOOL ALNEOCStreamSinkIsActive(void);
+NSDictionary *ALNEOCPushRenderProfile(ALNEOCRenderProfile *profile);
+void ALNEOCPopRenderProfile(NSDictionary *_Nullable token);
+ALNEOCRenderProfile *_Nullable ALNEOCCurrentRenderProfile(void);
+BOOL ALNEOCFlush(id out,
+                 NSString *templatePath,
+                 NSUInteger line,
+                 NSUInteger column,
+                 NSError **_Nullable error);
 
 id _Nullable ALNEOCLocal(id _Nullable ctx,
                          NSString *name,
@@ -50,15 +101,16 @@ id _Nullable ALNEOCLocalPath(id _Nullable ctx,
                              NSUInteger column,
                              NSError **_Nullable error);
 
-void ALNEOCAppendEscaped(NSMutableString *out, id _Nullable value);
-void ALNEOCAppendRaw(NSMutableString *out, id _Nullable value);
-BOOL ALNEOCAppendEscapedChecked(NSMutableString *out,
+void ALNEOCAppendLiteral(ALNEOCRenderBuffer *out, const char *bytes, NSUInteger length);
+void ALNEOCAppendEscaped(id out, id _Nullable value);
+void ALNEOCAppendRaw(id out, id _Nullable value);
+BOOL ALNEOCAppendEscapedChecked(id out,
                                 id _Nullable value,
                                 NSString *templatePath,
                                 NSUInteger line,
                                 NSUInteger column,
                                 NSError **_Nullable error);
-BOOL ALNEOCAppendRawChecked(NSMutableString *out,
+BOOL ALNEOCAppendRawChecked(id out,
                             id _Nullable value,
                             NSString *templatePath,
                             NSUInteger line,
@@ -72,13 +124,17 @@ BOOL ALNEOCEnsureRequiredLocals(id _Nullable ctx,
                                 NSError **_Nullable error);
 BOOL ALNEOCSetSlot(id _Nullable ctx,
                    NSString *slotName,
-                   NSString *content,
+                   id content,
                    NSString *templatePath,
                    NSUInteger line,
                    NSUInteger column,
                    NSError **_Nullable error);
 void ALNEOCSetSlotContent(NSString *slotName, NSString *content);
-BOOL ALNEOCAppendYield(NSMutableString *out,
+void ALNEOCSetDeferredSlotTemplate(NSString *slotName,
+                                   NSString *logicalPath,
+                                   id _Nullable ctx);
+id _Nullable ALNEOCDeferredSlotTemplate(NSString *logicalPath, id _Nullable ctx);
+BOOL ALNEOCAppendYield(id out,
                        id _Nullable ctx,
                        NSString *slotName,
                        NSString *templatePath,
@@ -88,18 +144,28 @@ BOOL ALNEOCAppendYield(NSMutableString *out,
 
 void ALNEOCClearTemplateRegistry(void);
 void ALNEOCRegisterTemplate(NSString *logicalPath, ALNEOCRenderFunction function);
+void ALNEOCRegisterBufferTemplate(NSString *logicalPath, ALNEOCBufferRenderFunction function);
 void ALNEOCRegisterTemplateLayout(NSString *logicalPath, NSString *layoutLogicalPath);
 NSString *_Nullable ALNEOCResolveTemplateLayout(NSString *logicalPath);
 ALNEOCRenderFunction _Nullable ALNEOCResolveTemplate(NSString *logicalPath);
+ALNEOCBufferRenderFunction _Nullable ALNEOCResolveBufferTemplate(NSString *logicalPath);
+BOOL ALNEOCTemplateIsRegistered(NSString *logicalPath);
 
 NSString *_Nullable ALNEOCRenderTemplate(NSString *logicalPath,
                                           id _Nullable ctx,
                                           NSError **_Nullable error);
-BOOL ALNEOCInclude(NSMutableString *out,
+NSData *_Nullable ALNEOCRenderTemplateData(NSString *logicalPath,
+                                           id _Nullable ctx,
+                                           NSError **_Nullable error);
+BOOL ALNEOCRenderTemplateIntoBuffer(ALNEOCRenderBuffer *out,
+                                    NSString *logicalPath,
+                                    id _Nullable ctx,
+                                    NSError **_Nullable error);
+BOOL ALNEOCInclude(id out,
                     id _Nullable ctx,
                     NSString *logicalPath,
                     NSError **_Nullable error);
-BOOL ALNEOCIncludeWithLocals(NSMutableString *out,
+BOOL ALNEOCIncludeWithLocals(id out,
                              id _Nullable ctx,
                              NSString *logicalPath,
                              id _Nullable locals,
@@ -107,7 +173,7 @@ BOOL ALNEOCIncludeWithLocals(NSMutableString *out,
                              NSUInteger line,
                              NSUInteger column,
                              NSError **_Nullable error);
-BOOL ALNEOCRenderCollection(NSMutableString *out,
+BOOL ALNEOCRenderCollection(id out,
                             id _Nullable ctx,
                             NSString *logicalPath,
                             id _Nullable collection,
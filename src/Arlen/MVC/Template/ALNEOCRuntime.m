@@ -1,5 +1,8 @@
 #import "ALNEOCRuntime.h"
 
+#include <stdlib.h>
+#include <time.h>
+
 NSString *const ALNEOCErrorDomain = @"Arlen.EOC.Error";
 NSString *const ALNEOCErrorLineKey = @"line";
 NSString *const ALNEOCErrorColumnKey = @"column";
@@ -14,6 +17,8 @@ static NSString *const ALNEOCThreadStrictStringifyKey = @"strict_stringify";
 static NSString *const ALNEOCThreadOptionsStackKey = @"aln.eoc.render_options_stack";
 static NSString *const ALNEOCThreadCompositionStackKey = @"aln.eoc.composition_stack";
 static NSString *const ALNEOCCompositionSlotsKey = @"slots";
+static NSString *const ALNEOCThreadStreamSinkStackKey = @"aln.eoc.stream_sink_stack";
+static NSString *const ALNEOCThreadRenderProfileStackKey = @"aln.eoc.render_profile_stack";
 
 static id ALNEOCLookupValueOnObject(id object, NSString *name, BOOL *found);
 
@@ -76,6 +81,429 @@ static id ALNEOCLookupValueOnObject(id object, NSString *name, BOOL *found);
 
 @end
 
+static const NSUInteger ALNEOCRenderBufferDefaultCapacity = 4096;
+
+@implementation ALNEOCRenderBuffer {
+  uint8_t *_bytes;
+  NSUInteger _length;
+  NSUInteger _capacity;
+}
+
+static BOOL ALNEOCRenderBufferReserve(ALNEOCRenderBuffer *buffer, NSUInteger additional) {
+  if (additional <= buffer->_capacity - buffer->_length) {
+    return YES;
+  }
+  NSUInteger required = buffer->_length + additional;
+  if (required < buffer->_length) {
+    return NO;
+  }
+  NSUInteger capacity = (buffer->_capacity > 0) ? buffer->_capacity : ALNEOCRenderBufferDefaultCapacity;
+  while (capacity < required) {
+    NSUInteger next = capacity * 2;
+    if (next <= capacity) {
+      capacity = required;
+      break;
+    }
+    capacity = next;
+  }
+  uint8_t *grown = realloc(buffer->_bytes, capacity);
+  if (grown == NULL) {
+    return NO;
+  }
+  buffer->_bytes = grown;
+  buffer->_capacity = capacity;
+  return YES;
+}
+
+static void ALNEOCRenderBufferAppendBytes(ALNEOCRenderBuffer *buffer,
+                                          const void *bytes,
+                                          NSUInteger length) {
+  if (buffer == nil || bytes == NULL || length == 0) {
+    return;
+  }
+  if (!ALNEOCRenderBufferReserve(buffer, length)) {
+    return;
+  }
+  memcpy(buffer->_bytes + buffer->_length, bytes, length);
+  buffer->_length += length;
+}
+
+// Encodes |string| as UTF-8 straight into the unused tail of the buffer and
+// returns the number of bytes written without committing them.
+static NSUInteger ALNEOCRenderBufferEncodeTail(ALNEOCRenderBuffer *buffer, NSString *string) {
+  NSUInteger characters = [string length];
+  if (characters == 0) {
+    return 0;
+  }
+  NSUInteger maximum = [string maximumLengthOfBytesUsingEncoding:NSUTF8StringEncoding];
+  if (!ALNEOCRenderBufferReserve(buffer, maximum)) {
+    return 0;
+  }
+  NSUInteger used = 0;
+  NSRange remaining = NSMakeRange(0, 0);
+  BOOL encoded = [string getBytes:buffer->_bytes + buffer->_length
+                        maxLength:maximum
+                       usedLength:&used
+                         encoding:NSUTF8StringEncoding
+                          options:NSStringEncodingConversionAllowLossy
+                            range:NSMakeRange(0, characters)
+                   remainingRange:&remaining];
+  if (!encoded || remaining.length > 0) {
+    NSData *fallback = [string dataUsingEncoding:NSUTF8StringEncoding allowLossyConversion:YES];
+    used = MIN([fallback length], maximum);
+    if (used > 0) {
+      memcpy(buffer->_bytes + buffer->_length, [fallback bytes], used);
+    }
+  }
+  return used;
+}
+
+static NSUInteger ALNEOCEscapedByteExpansion(uint8_t byte) {
+  switch (byte) {
+  case '&':
+    return 4;
+  case '<':
+  case '>':
+    return 3;
+  case '"':
+    return 5;
+  case '\'':
+    return 4;
+  default:
+    return 0;
+  }
+}
+
+static const char *ALNEOCEscapedByteEntity(uint8_t byte) {
+  switch (byte) {
+  case '&':
+    return "&amp;";
+  case '<':
+    return "&lt;";
+  case '>':
+    return "&gt;";
+  case '"':
+    return "&quot;";
+  case '\'':
+    return "&#39;";
+  default:
+    return NULL;
+  }
+}
+
+- (instancetype)init {
+  return [self initWithCapacity:ALNEOCRenderBufferDefaultCapacity];
+}
+
+- (instancetype)initWithCapacity:(NSUInteger)capacity {
+  self = [super init];
+  if (self != nil) {
+    _capacity = (capacity > 0) ? capacity : ALNEOCRenderBufferDefaultCapacity;
+    _bytes = malloc(_capacity);
+    _length = 0;
+    if (_bytes == NULL) {
+      return nil;
+    }
+  }
+  return self;
+}
+
+- (void)dealloc {
+  free(_bytes);
+}
+
+- (NSUInteger)length {
+  return _length;
+}
+
+- (const uint8_t *)bytes {
+  return _bytes;
+}
+
+- (void)appendBytes:(const void *)bytes length:(NSUInteger)length {
+  ALNEOCRenderBufferAppendBytes(self, bytes, length);
+}
+
+- (void)appendString:(NSString *)string {
+  _length += ALNEOCRenderBufferEncodeTail(self, string ?: @"");
+}
+
+- (void)appendEscapedString:(NSString *)string {
+  NSUInteger start = _length;
+  NSUInteger used = ALNEOCRenderBufferEncodeTail(self, string ?: @"");
+  if (used == 0) {
+    return;
+  }
+
+  // HTML-significant characters are all ASCII, so escaping can run over the
+  // encoded UTF-8 bytes in place, expanding from the end backwards.
+  NSUInteger extra = 0;
+  for (NSUInteger idx = 0; idx < used; idx++) {
+    extra += ALNEOCEscapedByteExpansion(_bytes[start + idx]);
+  }
+  if (extra == 0) {
+    _length = start + used;
+    return;
+  }
+  _length = start + used;
+  if (!ALNEOCRenderBufferReserve(self, extra)) {
+    _length = start;
+    return;
+  }
+  NSUInteger source = start + used;
+  NSUInteger destination = start + used + extra;
+  while (source > start) {
+    source -= 1;
+    uint8_t byte = _bytes[source];
+    const char *entity = ALNEOCEscapedByteEntity(byte);
+    if (entity == NULL) {
+      destination -= 1;
+      _bytes[destination] = byte;
+      continue;
+    }
+    NSUInteger entityLength = strlen(entity);
+    destination -= entityLength;
+    memcpy(_bytes + destination, entity, entityLength);
+  }
+  _length = start + used + extra;
+}
+
+- (void)appendRenderBuffer:(ALNEOCRenderBuffer *)buffer {
+  if (buffer == nil || buffer == self) {
+    return;
+  }
+  ALNEOCRenderBufferAppendBytes(self, buffer->_bytes, buffer->_length);
+}
+
+- (void)reset {
+  _length = 0;
+}
+
+- (NSString *)stringValue {
+  if (_length == 0) {
+    return @"";
+  }
+  return [[NSString alloc] initWithBytes:_bytes length:_length encoding:NSUTF8StringEncoding] ?: @"";
+}
+
+- (NSData *)dataValue {
+  return [NSData dataWithBytes:_bytes length:_length];
+}
+
+- (NSData *)detachData {
+  if (_length == 0) {
+    return [NSData data];
+  }
+  uint8_t *replacement = malloc(ALNEOCRenderBufferDefaultCapacity);
+  if (replacement == NULL) {
+    NSData *copy = [self dataValue];
+    _length = 0;
+    return copy;
+  }
+  NSData *data = [NSData dataWithBytesNoCopy:_bytes length:_length freeWhenDone:YES];
+  _bytes = replacement;
+  _capacity = ALNEOCRenderBufferDefaultCapacity;
+  _length = 0;
+  return data;
+}
+
+- (NSString *)description {
+  return [self stringValue];
+}
+
+void ALNEOCAppendLiteral(ALNEOCRenderBuffer *out, const char *bytes, NSUInteger length) {
+  ALNEOCRenderBufferAppendBytes(out, bytes, length);
+}
+
+@end
+
+// Streaming renders hand flushed output to a writer block. The sink tracks the
+// render buffer at the head of the response; only that buffer may be flushed,
+// because everything before it has already been written.
+@interface ALNEOCStreamSink : NSObject
+
+@property(nonatomic, copy) ALNEOCStreamWriter writer;
+@property(nonatomic, strong) ALNEOCRenderBuffer *rootBuffer;
+@property(nonatomic, assign) BOOL failed;
+
+@end
+
+@implementation ALNEOCStreamSink
+@end
+
+@interface ALNEOCDeferredSlot : NSObject
+
+@property(nonatomic, copy) NSString *logicalPath;
+@property(nonatomic, strong) id context;
+
+@end
+
+@implementation ALNEOCDeferredSlot
+
+- (NSString *)description {
+  return @"";
+}
+
+@end
+
+typedef struct {
+  uint64_t startNanoseconds;
+  uint64_t childNanoseconds;
+  NSUInteger startBytes;
+} ALNEOCRenderProfileFrame;
+
+static uint64_t ALNEOCMonotonicNanoseconds(void) {
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return ((uint64_t)ts.tv_sec * 1000000000ull) + (uint64_t)ts.tv_nsec;
+}
+
+@interface ALNEOCRenderProfileEntry : NSObject {
+ @public
+  NSUInteger _count;
+  uint64_t _inclusiveNanoseconds;
+  uint64_t _selfNanoseconds;
+  NSUInteger _bytes;
+}
+@end
+
+@implementation ALNEOCRenderProfileEntry
+@end
+
+@implementation ALNEOCRenderProfile {
+  NSMutableDictionary<NSString *, ALNEOCRenderProfileEntry *> *_entriesByPath;
+  ALNEOCRenderProfileFrame *_frames;
+  NSUInteger _frameCount;
+  NSUInteger _frameCapacity;
+  NSUInteger _flushedBytes;
+  NSUInteger _renderCount;
+  uint64_t _selfNanoseconds;
+}
+
+- (instancetype)init {
+  self = [super init];
+  if (self) {
+    _entriesByPath = [NSMutableDictionary dictionary];
+  }
+  return self;
+}
+
+- (void)dealloc {
+  free(_frames);
+}
+
+// Frames are pushed and popped by the rendering thread only; the aggregated
+// entries are guarded so a finished request can read them from anywhere.
+static BOOL ALNEOCRenderProfileBegin(ALNEOCRenderProfile *profile, ALNEOCRenderBuffer *out) {
+  if (profile->_frameCount == profile->_frameCapacity) {
+    NSUInteger capacity = (profile->_frameCapacity == 0) ? 8 : profile->_frameCapacity * 2;
+    ALNEOCRenderProfileFrame *frames =
+        realloc(profile->_frames, capacity * sizeof(ALNEOCRenderProfileFrame));
+    if (frames == NULL) {
+      return NO;
+    }
+    profile->_frames = frames;
+    profile->_frameCapacity = capacity;
+  }
+  ALNEOCRenderProfileFrame *frame = &profile->_frames[profile->_frameCount++];
+  frame->childNanoseconds = 0;
+  frame->startBytes = [out length] + profile->_flushedBytes;
+  frame->startNanoseconds = ALNEOCMonotonicNanoseconds();
+  return YES;
+}
+
+static void ALNEOCRenderProfileEnd(ALNEOCRenderProfile *profile,
+                                   NSString *logicalPath,
+                                   ALNEOCRenderBuffer *out) {
+  uint64_t now = ALNEOCMonotonicNanoseconds();
+  if (profile->_frameCount == 0) {
+    return;
+  }
+  ALNEOCRenderProfileFrame frame = profile->_frames[--profile->_frameCount];
+  uint64_t inclusive = (now > frame.startNanoseconds) ? now - frame.startNanoseconds : 0;
+  uint64_t exclusive = (inclusive > frame.childNanoseconds) ? inclusive - frame.childNanoseconds : 0;
+  NSUInteger endBytes = [out length] + profile->_flushedBytes;
+  NSUInteger bytes = (endBytes > frame.startBytes) ? endBytes - frame.startBytes : 0;
+  if (profile->_frameCount > 0) {
+    profile->_frames[profile->_frameCount - 1].childNanoseconds += inclusive;
+  }
+
+  NSString *path = ALNEOCCanonicalTemplatePath(logicalPath);
+  @synchronized(profile) {
+    ALNEOCRenderProfileEntry *entry = profile->_entriesByPath[path];
+    if (entry == nil) {
+      entry = [[ALNEOCRenderProfileEntry alloc] init];
+      profile->_entriesByPath[path] = entry;
+    }
+    entry->_count += 1;
+    entry->_inclusiveNanoseconds += inclusive;
+    entry->_selfNanoseconds += exclusive;
+    entry->_bytes += bytes;
+    profile->_renderCount += 1;
+    profile->_selfNanoseconds += exclusive;
+  }
+}
+
+static void ALNEOCRenderProfileNoteFlushedBytes(ALNEOCRenderProfile *profile, NSUInteger length) {
+  profile->_flushedBytes += length;
+}
+
+- (NSUInteger)renderCount {
+  @synchronized(self) {
+    return _renderCount;
+  }
+}
+
+- (double)totalSelfMilliseconds {
+  @synchronized(self) {
+    return (double)_selfNanoseconds / 1000000.0;
+  }
+}
+
+- (NSArray<NSDictionary *> *)entries {
+  NSMutableArray *entries = [NSMutableArray array];
+  @synchronized(self) {
+    for (NSString *path in _entriesByPath) {
+      ALNEOCRenderProfileEntry *entry = _entriesByPath[path];
+      [entries addObject:@{
+        @"path" : path,
+        @"count" : @(entry->_count),
+        @"inclusive_ms" : @((double)entry->_inclusiveNanoseconds / 1000000.0),
+        @"self_ms" : @((double)entry->_selfNanoseconds / 1000000.0),
+        @"bytes" : @(entry->_bytes),
+      }];
+    }
+  }
+  [entries sortUsingComparator:^NSComparisonResult(NSDictionary *left, NSDictionary *right) {
+    NSComparisonResult order = [right[@"self_ms"] compare:left[@"self_ms"]];
+    if (order != NSOrderedSame) {
+      return order;
+    }
+    return [left[@"path"] compare:right[@"path"]];
+  }];
+  return entries;
+}
+
+- (NSDictionary *)dictionaryRepresentation {
+  return @{
+    @"renders" : @([self renderCount]),
+    @"self_ms" : @([self totalSelfMilliseconds]),
+    @"templates" : [self entries],
+  };
+}
+
+- (void)reset {
+  @synchronized(self) {
+    [_entriesByPath removeAllObjects];
+    _frameCount = 0;
+    _flushedBytes = 0;
+    _renderCount = 0;
+    _selfNanoseconds = 0;
+  }
+}
+
+@end
+
 static NSMutableDictionary *ALNEOCTemplateRegistry(void) {
   static NSMutableDictionary *registry = nil;
   @synchronized([NSThread class]) {
@@ -86,6 +514,16 @@ static NSMutableDictionary *ALNEOCTemplateRegistry(void) {
   }
 }
 
+static NSMutableDictionary *ALNEOCBufferTemplateRegistry(void) {
+  static NSMutableDictionary *registry = nil;
+  @synchronized([NSThread class]) {
+    if (registry == nil) {
+      registry = [[NSMutableDictionary alloc] init];
+    }
+    return registry;
+  }
+}
+
 static NSMutableDictionary *ALNEOCTemplateLayoutRegistry(void) {
   static NSMutableDictionary *registry = nil;
   @synchronized([NSThread class]) {
@@ -131,6 +569,33 @@ static NSMutableArray *ALNEOCThreadCompositionStack(void) {
   return stack;
 }
 
+static NSMutableArray *ALNEOCThreadStreamSinkStack(void) {
+  NSMutableDictionary *threadDictionary = [[NSThread currentThread] threadDictionary];
+  id current = threadDictionary[ALNEOCThreadStreamSinkStackKey];
+  if ([current isKindOfClass:[NSMutableArray class]]) {
+    return current;
+  }
+  NSMutableArray *stack = [NSMutableArray array];
+  threadDictionary[ALNEOCThreadStreamSinkStackKey] = stack;
+  return stack;
+}
+
+static NSMutableArray *ALNEOCThreadRenderProfileStack(void) {
+  NSMutableDictionary *threadDictionary = [[NSThread currentThread] threadDictionary];
+  id current = threadDictionary[ALNEOCThreadRenderProfileStackKey];
+  if ([current isKindOfClass:[NSMutableArray class]]) {
+    return current;
+  }
+  NSMutableArray *stack = [NSMutableArray array];
+  threadDictionary[ALNEOCThreadRenderProfileStackKey] = stack;
+  return stack;
+}
+
+static ALNEOCStreamSink *ALNEOCCurrentStreamSink(void) {
+  id current = [[[NSThread currentThread] threadDictionary][ALNEOCThreadStreamSinkStackKey] lastObject];
+  return [current isKindOfClass:[ALNEOCStreamSink class]] ? current : nil;
+}
+
 static BOOL ALNEOCCompositionStateIsActive(void) {
   return [ALNEOCThreadCompositionStack() count] > 0;
 }
@@ -218,6 +683,58 @@ void ALNEOCPopCompositionState(NSDictionary *token) {
   }
 }
 
+NSDictionary *ALNEOCPushStreamSink(ALNEOCRenderBuffer *rootBuffer, ALNEOCStreamWriter writer) {
+  ALNEOCStreamSink *sink = [[ALNEOCStreamSink alloc] init];
+  sink.writer = writer;
+  sink.rootBuffer = rootBuffer;
+  [ALNEOCThreadStreamSinkStack() addObject:sink];
+  return @{ @"depth" : @([ALNEOCThreadStreamSinkStack() count]) };
+}
+
+void ALNEOCPopStreamSink(NSDictionary *token) {
+  (void)token;
+  NSMutableArray *stack = ALNEOCThreadStreamSinkStack();
+  if ([stack count] == 0) {
+    return;
+  }
+  [stack removeLastObject];
+  if ([stack count] == 0) {
+    [[[NSThread currentThread] threadDictionary] removeObjectForKey:ALNEOCThreadStreamSinkStackKey];
+  }
+}
+
+BOOL ALNEOCStreamSinkIsActive(void) {
+  return ALNEOCCurrentStreamSink() != nil;
+}
+
+NSDictionary *ALNEOCPushRenderProfile(ALNEOCRenderProfile *profile) {
+  if (profile == nil) {
+    return @{};
+  }
+  [ALNEOCThreadRenderProfileStack() addObject:profile];
+  return @{ @"depth" : @([ALNEOCThreadRenderProfileStack() count]) };
+}
+
+void ALNEOCPopRenderProfile(NSDictionary *token) {
+  if (token[@"depth"] == nil) {
+    return;
+  }
+  NSMutableArray *stack = ALNEOCThreadRenderProfileStack();
+  if ([stack count] == 0) {
+    return;
+  }
+  [stack removeLastObject];
+  if ([stack count] == 0) {
+    [[[NSThread currentThread] threadDictionary] removeObjectForKey:ALNEOCThreadRenderProfileStackKey];
+  }
+}
+
+ALNEOCRenderProfile *ALNEOCCurrentRenderProfile(void) {
+  id current =
+      [[[NSThread currentThread] threadDictionary][ALNEOCThreadRenderProfileStackKey] lastObject];
+  return [current isKindOfClass:[ALNEOCRenderProfile class]] ? current : nil;
+}
+
 static NSError *ALNEOCTemplateExecutionError(NSString *message,
                                              NSString *templatePath,
                                              NSUInteger line,
@@ -313,6 +830,43 @@ static NSString *ALNEOCStringValueWithOptions(id value,
   return [value description] ?: @"";
 }
 
+static BOOL ALNEOCStreamSinkWrite(ALNEOCStreamSink *sink, NSData *chunk) {
+  if (sink.failed) {
+    return NO;
+  }
+  if ([chunk length] == 0) {
+    return YES;
+  }
+  BOOL written = (sink.writer != nil) ? sink.writer(chunk) : NO;
+  if (!written) {
+    sink.failed = YES;
+  }
+  return written;
+}
+
+BOOL ALNEOCFlush(id out,
+                 NSString *templatePath,
+                 NSUInteger line,
+                 NSUInteger column,
+                 NSError **error) {
+  ALNEOCStreamSink *sink = ALNEOCCurrentStreamSink();
+  if (sink == nil || out == nil || out != sink.rootBuffer) {
+    return YES;
+  }
+  ALNEOCRenderProfile *profile = ALNEOCCurrentRenderProfile();
+  if (profile != nil) {
+    ALNEOCRenderProfileNoteFlushedBytes(profile, [sink.rootBuffer length]);
+  }
+  if (!ALNEOCStreamSinkWrite(sink, [sink.rootBuffer detachData])) {
+    if (error != NULL) {
+      *error = ALNEOCTemplateExecutionError(
+          @"EOC stream write failed", templatePath, line, column, nil, nil, nil);
+    }
+    return NO;
+  }
+  return YES;
+}
+
 static id ALNEOCLookupValueOnObject(id object, NSString *name, BOOL *found) {
   if (found != NULL) {
     *found = NO;
@@ -530,27 +1084,65 @@ NSString *ALNEOCEscapeHTMLString(NSString *input) {
   return escaped;
 }
 
-void ALNEOCAppendEscaped(NSMutableString *out, id value) {
+// Render targets are normally ALNEOCRenderBuffer instances; NSMutableString
+// targets remain supported for hand-written render functions.
+static void ALNEOCOutputAppendString(id out, NSString *string, BOOL escape) {
+  if (out == nil || [string length] == 0) {
+    return;
+  }
+  if ([out isKindOfClass:[ALNEOCRenderBuffer class]]) {
+    if (escape) {
+      [(ALNEOCRenderBuffer *)out appendEscapedString:string];
+    } else {
+      [(ALNEOCRenderBuffer *)out appendString:string];
+    }
+    return;
+  }
+  if ([out isKindOfClass:[NSMutableString class]]) {
+    [(NSMutableString *)out appendString:(escape ? ALNEOCEscapeHTMLString(string) : string)];
+  }
+}
+
+static void ALNEOCOutputAppendBuffer(id out, ALNEOCRenderBuffer *buffer, BOOL escape) {
+  if (out == nil || buffer == nil || [buffer length] == 0) {
+    return;
+  }
+  if (!escape && [out isKindOfClass:[ALNEOCRenderBuffer class]]) {
+    [(ALNEOCRenderBuffer *)out appendRenderBuffer:buffer];
+    return;
+  }
+  ALNEOCOutputAppendString(out, [buffer stringValue], escape);
+}
+
+void ALNEOCAppendEscaped(id out, id value) {
   if (out == nil) {
     return;
   }
   BOOL conversionOK = YES;
   NSString *rendered = ALNEOCStringValueWithOptions(value, NO, &conversionOK);
   (void)conversionOK;
-  [out appendString:ALNEOCEscapeHTMLString(rendered ?: @"")];
+  ALNEOCOutputAppendString(out, rendered ?: @"", YES);
 }
 
-void ALNEOCAppendRaw(NSMutableString *out, id value) {
+void ALNEOCAppendRaw(id out, id value) {
   if (out == nil) {
     return;
   }
   BOOL conversionOK = YES;
   NSString *rendered = ALNEOCStringValueWithOptions(value, NO, &conversionOK);
   (void)conversionOK;
-  [out appendString:rendered ?: @""];
+  ALNEOCOutputAppendString(out, rendered ?: @"", NO);
 }
 
-static BOOL ALNEOCAppendChecked(NSMutableString *out,
+static BOOL ALNEOCAppendDeferredSlot(id out,
+                                     ALNEOCDeferredSlot *deferred,
+                                     BOOL escape,
+                                     NSString *templatePath,
+                                     NSUInteger line,
+                                     NSUInteger column,
+                                     NSError **error);
+
+static BOOL ALNEOCAppendChecked(id out,
                                 id value,
                                 BOOL escape,
                                 NSString *templatePath,
@@ -560,6 +1152,13 @@ static BOOL ALNEOCAppendChecked(NSMutableString *out,
   if (out == nil) {
     return YES;
   }
+  if ([value isKindOfClass:[ALNEOCDeferredSlot class]]) {
+    return ALNEOCAppendDeferredSlot(out, value, escape, templatePath, line, column, error);
+  }
+  if ([value isKindOfClass:[ALNEOCRenderBuffer class]]) {
+    ALNEOCOutputAppendBuffer(out, value, escape);
+    return YES;
+  }
 
   BOOL conversionOK = YES;
   NSString *rendered =
@@ -573,15 +1172,11 @@ static BOOL ALNEOCAppendChecked(NSMutableString *out,
     return NO;
   }
 
-  if (escape) {
-    [out appendString:ALNEOCEscapeHTMLString(rendered)];
-  } else {
-    [out appendString:rendered];
-  }
+  ALNEOCOutputAppendString(out, rendered, escape);
   return YES;
 }
 
-BOOL ALNEOCAppendEscapedChecked(NSMutableString *out,
+BOOL ALNEOCAppendEscapedChecked(id out,
                                 id value,
                                 NSString *templatePath,
                                 NSUInteger line,
@@ -590,7 +1185,7 @@ BOOL ALNEOCAppendEscapedChecked(NSMutableString *out,
   return ALNEOCAppendChecked(out, value, YES, templatePath, line, column, error);
 }
 
-BOOL ALNEOCAppendRawChecked(NSMutableString *out,
+BOOL ALNEOCAppendRawChecked(id out,
                             id value,
                             NSString *templatePath,
                             NSUInteger line,
@@ -627,7 +1222,7 @@ BOOL ALNEOCEnsureRequiredLocals(id ctx,
 
 BOOL ALNEOCSetSlot(id ctx,
                    NSString *slotName,
-                   NSString *content,
+                   id content,
                    NSString *templatePath,
                    NSUInteger line,
                    NSUInteger column,
@@ -663,7 +1258,58 @@ void ALNEOCSetSlotContent(NSString *slotName, NSString *content) {
   slots[slotName] = content ?: @"";
 }
 
-BOOL ALNEOCAppendYield(NSMutableString *out,
+void ALNEOCSetDeferredSlotTemplate(NSString *slotName, NSString *logicalPath, id ctx) {
+  if ([slotName length] == 0) {
+    return;
+  }
+  NSMutableDictionary *slots = ALNEOCCurrentSlotMap();
+  id deferred = ALNEOCDeferredSlotTemplate(logicalPath, ctx);
+  if (slots == nil || deferred == nil) {
+    return;
+  }
+  slots[slotName] = deferred;
+}
+
+id ALNEOCDeferredSlotTemplate(NSString *logicalPath, id ctx) {
+  NSString *normalizedPath = ALNEOCNormalizeTemplateReference(logicalPath);
+  if ([normalizedPath length] == 0) {
+    return nil;
+  }
+  ALNEOCDeferredSlot *deferred = [[ALNEOCDeferredSlot alloc] init];
+  deferred.logicalPath = normalizedPath;
+  deferred.context = ctx;
+  return deferred;
+}
+
+// Deferred slots render at the point they are yielded. When the yielding buffer
+// is the stream head, everything rendered so far is flushed first and the
+// deferred template renders straight into the stream head, so its own flushes
+// go to the writer.
+static BOOL ALNEOCAppendDeferredSlot(id out,
+                                     ALNEOCDeferredSlot *deferred,
+                                     BOOL escape,
+                                     NSString *templatePath,
+                                     NSUInteger line,
+                                     NSUInteger column,
+                                     NSError **error) {
+  if (!escape && [out isKindOfClass:[ALNEOCRenderBuffer class]]) {
+    ALNEOCStreamSink *sink = ALNEOCCurrentStreamSink();
+    if (sink != nil && out == sink.rootBuffer &&
+        !ALNEOCFlush(out, templatePath, line, column, error)) {
+      return NO;
+    }
+    return ALNEOCRenderTemplateIntoBuffer(out, deferred.logicalPath, deferred.context, error);
+  }
+
+  NSString *rendered = ALNEOCRenderTemplate(deferred.logicalPath, deferred.context, error);
+  if (rendered == nil) {
+    return NO;
+  }
+  ALNEOCOutputAppendString(out, rendered, escape);
+  return YES;
+}
+
+BOOL ALNEOCAppendYield(id out,
                        id ctx,
                        NSString *slotName,
                        NSString *templatePath,
@@ -687,6 +1333,9 @@ void ALNEOCClearTemplateRegistry(void) {
   @synchronized(ALNEOCTemplateRegistry()) {
     [ALNEOCTemplateRegistry() removeAllObjects];
   }
+  @synchronized(ALNEOCBufferTemplateRegistry()) {
+    [ALNEOCBufferTemplateRegistry() removeAllObjects];
+  }
   @synchronized(ALNEOCTemplateLayoutRegistry()) {
     [ALNEOCTemplateLayoutRegistry() removeAllObjects];
   }
@@ -703,6 +1352,17 @@ void ALNEOCRegisterTemplate(NSString *logicalPath, ALNEOCRenderFunction function
   }
 }
 
+void ALNEOCRegisterBufferTemplate(NSString *logicalPath, ALNEOCBufferRenderFunction function) {
+  NSString *canonical = ALNEOCCanonicalTemplatePath(logicalPath);
+  if ([canonical length] == 0 || function == NULL) {
+    return;
+  }
+
+  @synchronized(ALNEOCBufferTemplateRegistry()) {
+    ALNEOCBufferTemplateRegistry()[canonical] = [NSValue valueWithPointer:function];
+  }
+}
+
 void ALNEOCRegisterTemplateLayout(NSString *logicalPath, NSString *layoutLogicalPath) {
   NSString *canonical = ALNEOCCanonicalTemplatePath(logicalPath);
   NSString *normalizedLayout = ALNEOCNormalizeTemplateReference(layoutLogicalPath);
@@ -748,11 +1408,37 @@ ALNEOCRenderFunction ALNEOCResolveTemplate(NSString *logicalPath) {
   return [ptr pointerValue];
 }
 
-NSString *ALNEOCRenderTemplate(NSString *logicalPath, id ctx, NSError **error) {
+ALNEOCBufferRenderFunction ALNEOCResolveBufferTemplate(NSString *logicalPath) {
+  NSString *canonical = ALNEOCCanonicalTemplatePath(logicalPath);
+  if ([canonical length] == 0) {
+    return NULL;
+  }
+
+  NSValue *ptr = nil;
+  @synchronized(ALNEOCBufferTemplateRegistry()) {
+    ptr = ALNEOCBufferTemplateRegistry()[canonical];
+  }
+
+  if (ptr == nil) {
+    return NULL;
+  }
+  return [ptr pointerValue];
+}
+
+BOOL ALNEOCTemplateIsRegistered(NSString *logicalPath) {
+  return ALNEOCResolveBufferTemplate(logicalPath) != NULL ||
+         ALNEOCResolveTemplate(logicalPath) != NULL;
+}
+
+BOOL ALNEOCRenderTemplateIntoBuffer(ALNEOCRenderBuffer *out,
+                                    NSString *logicalPath,
+                                    id ctx,
+                                    NSError **error) {
   NSString *normalizedPath = ALNEOCNormalizeTemplateReference(logicalPath);
   NSString *resolvedPath = ([normalizedPath length] > 0) ? normalizedPath : logicalPath;
-  ALNEOCRenderFunction function = ALNEOCResolveTemplate(resolvedPath);
-  if (function == NULL) {
+  ALNEOCBufferRenderFunction bufferFunction = ALNEOCResolveBufferTemplate(resolvedPath);
+  ALNEOCRenderFunction function = (bufferFunction == NULL) ? ALNEOCResolveTemplate(resolvedPath) : NULL;
+  if (bufferFunction == NULL && function == NULL) {
     if (error != NULL) {
       NSString *canonical = ALNEOCCanonicalTemplatePath(resolvedPath);
       *error = [NSError errorWithDomain:ALNEOCErrorDomain
@@ -764,21 +1450,34 @@ NSString *ALNEOCRenderTemplate(NSString *logicalPath, id ctx, NSError **error) {
                                  ALNEOCErrorPathKey : canonical
                                }];
     }
-    return nil;
+    return NO;
   }
 
   BOOL ownsCompositionState = !ALNEOCCompositionStateIsActive();
   NSDictionary *compositionToken = ownsCompositionState ? ALNEOCPushCompositionState() : nil;
+  ALNEOCRenderProfile *profile = ALNEOCCurrentRenderProfile();
+  BOOL profiling = (profile != nil) && ALNEOCRenderProfileBegin(profile, out);
   NSError *innerError = nil;
-  NSString *rendered = nil;
+  BOOL rendered = NO;
   @try {
-    rendered = function(ctx, &innerError);
+    if (bufferFunction != NULL) {
+      rendered = (bufferFunction(ctx, out, &innerError) != nil);
+    } else {
+      NSString *legacy = function(ctx, &innerError);
+      if (legacy != nil) {
+        [out appendString:legacy];
+        rendered = YES;
+      }
+    }
   } @finally {
+    if (profiling) {
+      ALNEOCRenderProfileEnd(profile, resolvedPath, out);
+    }
     if (ownsCompositionState) {
       ALNEOCPopCompositionState(compositionToken);
     }
   }
-  if (rendered == nil) {
+  if (!rendered) {
     if (error != NULL) {
       if (innerError != nil) {
         *error = innerError;
@@ -795,21 +1494,40 @@ NSString *ALNEOCRenderTemplate(NSString *logicalPath, id ctx, NSError **error) {
                    }];
       }
     }
+    return NO;
+  }
+  return YES;
+}
+
+NSString *ALNEOCRenderTemplate(NSString *logicalPath, id ctx, NSError **error) {
+  ALNEOCRenderBuffer *buffer = [[ALNEOCRenderBuffer alloc] init];
+  if (!ALNEOCRenderTemplateIntoBuffer(buffer, logicalPath, ctx, error)) {
     return nil;
   }
-  return rendered;
+  return [buffer stringValue];
 }
 
-BOOL ALNEOCInclude(NSMutableString *out, id ctx, NSString *logicalPath, NSError **error) {
+NSData *ALNEOCRenderTemplateData(NSString *logicalPath, id ctx, NSError **error) {
+  ALNEOCRenderBuffer *buffer = [[ALNEOCRenderBuffer alloc] init];
+  if (!ALNEOCRenderTemplateIntoBuffer(buffer, logicalPath, ctx, error)) {
+    return nil;
+  }
+  return [buffer detachData];
+}
+
+BOOL ALNEOCInclude(id out, id ctx, NSString *logicalPath, NSError **error) {
+  if ([out isKindOfClass:[ALNEOCRenderBuffer class]]) {
+    return ALNEOCRenderTemplateIntoBuffer(out, logicalPath, ctx, error);
+  }
   NSString *rendered = ALNEOCRenderTemplate(logicalPath, ctx, error);
   if (rendered == nil) {
     return NO;
   }
-  [out appendString:rendered];
+  ALNEOCOutputAppendString(out, rendered, NO);
   return YES;
 }
 
-BOOL ALNEOCIncludeWithLocals(NSMutableString *out,
+BOOL ALNEOCIncludeWithLocals(id out,
                              id ctx,
                              NSString *logicalPath,
                              id locals,
@@ -826,7 +1544,7 @@ BOOL ALNEOCIncludeWithLocals(NSMutableString *out,
   return ALNEOCInclude(out, effectiveContext, normalizedPath, error);
 }
 
-BOOL ALNEOCRenderCollection(NSMutableString *out,
+BOOL ALNEOCRenderCollection(id out,
                             id ctx,
                             NSString *logicalPath,
                             id collection,
@@ -16,6 +16,7 @@ extern NSString *const ALNEOCTemplateMetadataRequiredLocalsKey;
 extern NSString *const ALNEOCTemplateMetadataYieldSlotsKey;
 extern NSString *const ALNEOCTemplateMetadataFilledSlotsKey;
 extern NSString *const ALNEOCTemplateMetadataStaticDependenciesKey;
+extern NSString *const ALNEOCTranspilerCodegenVersion;
 
 @interface ALNEOCTranspiler : NSObject
 
@@ -19,6 +19,7 @@ typedef NS_ENUM(NSUInteger, ALNEOCDirectiveKind) {
   ALNEOCDirectiveKindEndSlot = 5,
   ALNEOCDirectiveKindInclude = 6,
   ALNEOCDirectiveKindRender = 7,
+  ALNEOCDirectiveKindFlush = 8,
 };
 
 static NSString *const ALNEOCTokenTypeKey = @"type";
@@ -48,6 +49,9 @@ NSString *const ALNEOCTemplateMetadataRequiredLocalsKey = @"required_locals";
 NSString *const ALNEOCTemplateMetadataYieldSlotsKey = @"yield_slots";
 NSString *const ALNEOCTemplateMetadataFilledSlotsKey = @"filled_slots";
 NSString *const ALNEOCTemplateMetadataStaticDependenciesKey = @"static_dependencies";
+// Bump whenever generated source changes shape so cached eocc outputs from an
+// older transpiler are regenerated even though the template text is unchanged.
+NSString *const ALNEOCTranspilerCodegenVersion = @"eoc-codegen-v2";
 
 @interface ALNEOCTranspiler ()
 
@@ -105,6 +109,53 @@ NSString *const ALNEOCTemplateMetadataStaticDependenciesKey = @"static_dependenc
 
 @end
 
+// Template text is emitted as a plain C string of its UTF-8 bytes so the
+// runtime can copy it into the render buffer without re-encoding. Non-ASCII
+// and control bytes use three-digit octal escapes, which cannot absorb a
+// following digit, and `?` is escaped to keep trigraphs out of the output.
+static NSString *ALNEOCCStringLiteralForText(NSString *text) {
+  NSData *data = [text dataUsingEncoding:NSUTF8StringEncoding allowLossyConversion:YES];
+  const unsigned char *bytes = [data bytes];
+  NSUInteger length = [data length];
+  NSMutableString *literal = [NSMutableString stringWithCapacity:length + 8];
+  [literal appendString:@"  \""];
+  for (NSUInteger idx = 0; idx < length; idx++) {
+    unsigned char byte = bytes[idx];
+    switch (byte) {
+    case '\\':
+      [literal appendString:@"\\\\"];
+      break;
+    case '"':
+      [literal appendString:@"\\\""];
+      break;
+    case '?':
+      [literal appendString:@"\\?"];
+      break;
+    case '\n':
+      [literal appendString:@"\\n"];
+      if (idx + 1 < length) {
+        [literal appendString:@"\"\n  \""];
+      }
+      break;
+    case '\r':
+      [literal appendString:@"\\r"];
+      break;
+    case '\t':
+      [literal appendString:@"\\t"];
+      break;
+    default:
+      if (byte >= 0x20 && byte < 0x7f) {
+        [literal appendFormat:@"%c", (char)byte];
+      } else {
+        [literal appendFormat:@"\\%03o", (unsigned int)byte];
+      }
+      break;
+    }
+  }
+  [literal appendString:@"\""];
+  return literal;
+}
+
 @implementation ALNEOCTranspiler
 
 - (NSString *)symbolNameForLogicalPath:(NSString *)logicalPath {
@@ -219,18 +270,18 @@ NSString *const ALNEOCTemplateMetadataStaticDependenciesKey = @"static_dependenc
       [NSString stringWithFormat:@"ALNEOCAutoRegister_%@", symbol];
 
   NSMutableString *source = [NSMutableString string];
+  NSMutableString *literals = [NSMutableString string];
   NSMutableArray<NSDictionary *> *slotStack = [NSMutableArray array];
   NSUInteger slotCounter = 0;
+  NSUInteger literalCounter = 0;
 
-  [source appendString:@"#import <Foundation/Foundation.h>\n"];
-  [source appendString:@"#import \"ALNEOCRuntime.h\"\n\n"];
-  [source appendFormat:@"NSString *%@(id ctx, NSError **error) {\n", symbol];
-  [source appendString:@"  NSMutableString *out = [NSMutableString string];\n"];
+  [source appendFormat:@"ALNEOCRenderBuffer *%@(id ctx, ALNEOCRenderBuffer *out, NSError **error) {\n",
+                       symbol];
   [source appendString:@"  if (out == nil) {\n"];
   [source appendString:@"    if (error != NULL) {\n"];
   [source appendFormat:
               @"      *error = [NSError errorWithDomain:@\"%@\" code:%ld "
-               "userInfo:@{NSLocalizedDescriptionKey: @\"Unable to allocate render "
+               "userInfo:@{NSLocalizedDescriptionKey: @\"Missing render "
                "buffer\"}];\n",
               ALNEOCErrorDomain, (long)ALNEOCErrorTemplateExecutionFailed];
   [source appendString:@"    }\n"];
@@ -252,32 +303,15 @@ NSString *const ALNEOCTemplateMetadataStaticDependenciesKey = @"static_dependenc
         [source appendString:@"\n"];
         break;
       }
-      NSMutableString *literal = [NSMutableString string];
-      NSUInteger length = [content length];
-      for (NSUInteger idx = 0; idx < length; idx++) {
-        unichar ch = [content characterAtIndex:idx];
-        switch (ch) {
-        case '\\':
-          [literal appendString:@"\\\\"];
-          break;
-        case '"':
-          [literal appendString:@"\\\""];
-          break;
-        case '\n':
-          [literal appendString:@"\\n"];
-          break;
-        case '\r':
-          [literal appendString:@"\\r"];
-          break;
-        case '\t':
-          [literal appendString:@"\\t"];
-          break;
-        default:
-          [literal appendFormat:@"%C", ch];
-          break;
-        }
-      }
-      [source appendFormat:@"ALNEOCAppendRaw(out, @\"%@\");\n\n", literal];
+      literalCounter += 1;
+      NSString *literalName =
+          [NSString stringWithFormat:@"ALNEOCText_%lu", (unsigned long)literalCounter];
+      [literals appendFormat:@"static const char %@[] =\n%@;\n",
+                             literalName,
+                             ALNEOCCStringLiteralForText(content)];
+      [source appendFormat:@"ALNEOCAppendLiteral(out, %@, sizeof(%@) - 1);\n\n",
+                           literalName,
+                           literalName];
       break;
     }
     case ALNEOCTokenTypeCode:
@@ -367,6 +401,12 @@ NSString *const ALNEOCTemplateMetadataStaticDependenciesKey = @"static_dependenc
                     (unsigned long)column];
         break;
       }
+      case ALNEOCDirectiveKindFlush:
+        [source appendFormat:@"if (!ALNEOCFlush(out, @\"%@\", %lu, %lu, error)) { return nil; }\n\n",
+                             escapedPath,
+                             (unsigned long)line,
+                             (unsigned long)column];
+        break;
       case ALNEOCDirectiveKindSlot: {
         slotCounter += 1;
         NSString *slotName = directive[ALNEOCDirectiveSlotNameKey] ?: @"";
@@ -381,10 +421,11 @@ NSString *const ALNEOCTemplateMetadataStaticDependenciesKey = @"static_dependenc
           ALNEOCTokenLineKey : @(line),
           ALNEOCTokenColumnKey : @(column)
         }];
-        [source appendFormat:@"NSMutableString *%@ = [NSMutableString string];\n", bufferName];
+        [source appendFormat:@"ALNEOCRenderBuffer *%@ = [[ALNEOCRenderBuffer alloc] init];\n",
+                             bufferName];
         [source appendString:[NSString stringWithFormat:@"if (%@ == nil) { return nil; }\n",
                                                         bufferName]];
-        [source appendFormat:@"NSMutableString *%@ = out;\n", previousOutName];
+        [source appendFormat:@"ALNEOCRenderBuffer *%@ = out;\n", previousOutName];
         [source appendFormat:@"out = %@;\n\n", bufferName];
         break;
       }
@@ -520,17 +561,26 @@ NSString *const ALNEOCTemplateMetadataStaticDependenciesKey = @"static_dependenc
     return nil;
   }
 
-  [source appendString:@"  return [NSString stringWithString:out];\n"];
+  [source appendString:@"  return out;\n"];
   [source appendString:@"}\n\n"];
   [source appendString:@"__attribute__((constructor))\n"];
   [source appendFormat:@"static void %@ (void) {\n", registrationSymbol];
-  [source appendFormat:@"  ALNEOCRegisterTemplate(@\"%@\", &%@);\n", escapedPath, symbol];
+  [source appendFormat:@"  ALNEOCRegisterBufferTemplate(@\"%@\", &%@);\n", escapedPath, symbol];
   if ([escapedLayoutPath length] > 0) {
     [source appendFormat:@"  ALNEOCRegisterTemplateLayout(@\"%@\", @\"%@\");\n",
                          escapedPath,
                          escapedLayoutPath];
   }
   [source appendString:@"}\n"];
+
+  NSMutableString *header = [NSMutableString string];
+  [header appendString:@"#import <Foundation/Foundation.h>\n"];
+  [header appendString:@"#import \"ALNEOCRuntime.h\"\n\n"];
+  if ([literals length] > 0) {
+    [header appendString:literals];
+    [header appendString:@"\n"];
+  }
+  [source insertString:header atIndex:0];
   return source;
 }
 
@@ -1104,6 +1154,21 @@ NSString *const ALNEOCTemplateMetadataStaticDependenciesKey = @"static_dependenc
     };
   }
 
+  if ([name isEqualToString:@"flush"]) {
+    index = [self skipWhitespaceInString:content fromIndex:index];
+    if (index != contentLength) {
+      [self directiveErrorWithMessage:@"Unexpected content after flush directive"
+                          logicalPath:logicalPath
+                                 line:line
+                               column:column
+                                error:error];
+      return nil;
+    }
+    return @{
+      ALNEOCDirectiveKindKey : @(ALNEOCDirectiveKindFlush),
+    };
+  }
+
   if ([name isEqualToString:@"include"]) {
     index = [self skipWhitespaceInString:content fromIndex:index];
     NSString *path = [self parseQuotedDirectiveStringFromContent:content
@@ -3,6 +3,8 @@
 
 #import <Foundation/Foundation.h>
 
+#import "ALNEOCRuntime.h"
+
 NS_ASSUME_NONNULL_BEGIN
 
 @interface ALNView : NSObject
@@ -25,6 +27,29 @@ NS_ASSUME_NONNULL_BEGIN
                          strictLocals:(BOOL)strictLocals
                       strictStringify:(BOOL)strictStringify
                                 error:(NSError *_Nullable *_Nullable)error;
++ (nullable NSData *)renderTemplateData:(NSString *)templateName
+                                context:(nullable NSDictionary *)context
+                                 layout:(nullable NSString *)layoutName
+                   defaultLayoutEnabled:(BOOL)defaultLayoutEnabled
+                           strictLocals:(BOOL)strictLocals
+                        strictStringify:(BOOL)strictStringify
+                                  error:(NSError *_Nullable *_Nullable)error;
++ (BOOL)renderTemplate:(NSString *)templateName
+               context:(nullable NSDictionary *)context
+                layout:(nullable NSString *)layoutName
+  defaultLayoutEnabled:(BOOL)defaultLayoutEnabled
+          strictLocals:(BOOL)strictLocals
+       strictStringify:(BOOL)strictStringify
+            intoBuffer:(ALNEOCRenderBuffer *)out
+                 error:(NSError *_Nullable *_Nullable)error;
++ (BOOL)streamTemplate:(NSString *)templateName
+               context:(nullable NSDictionary *)context
+                layout:(nullable NSString *)layoutName
+  defaultLayoutEnabled:(BOOL)defaultLayoutEnabled
+          strictLocals:(BOOL)strictLocals
+       strictStringify:(BOOL)strictStringify
+                writer:(ALNEOCStreamWriter)writer
+                 error:(NSError *_Nullable *_Nullable)error;
 
 @end
 
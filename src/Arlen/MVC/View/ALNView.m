@@ -38,6 +38,52 @@
                 strictLocals:(BOOL)strictLocals
              strictStringify:(BOOL)strictStringify
                        error:(NSError **)error {
+  ALNEOCRenderBuffer *buffer = [[ALNEOCRenderBuffer alloc] init];
+  if (![self renderTemplate:templateName
+                     context:context
+                      layout:layoutName
+        defaultLayoutEnabled:defaultLayoutEnabled
+                strictLocals:strictLocals
+             strictStringify:strictStringify
+                  intoBuffer:buffer
+                       error:error]) {
+    return nil;
+  }
+  return [buffer stringValue];
+}
+
++ (NSData *)renderTemplateData:(NSString *)templateName
+                       context:(NSDictionary *)context
+                        layout:(NSString *)layoutName
+          defaultLayoutEnabled:(BOOL)defaultLayoutEnabled
+                  strictLocals:(BOOL)strictLocals
+               strictStringify:(BOOL)strictStringify
+                         error:(NSError **)error {
+  ALNEOCRenderBuffer *buffer = [[ALNEOCRenderBuffer alloc] init];
+  if (![self renderTemplate:templateName
+                     context:context
+                      layout:layoutName
+        defaultLayoutEnabled:defaultLayoutEnabled
+                strictLocals:strictLocals
+             strictStringify:strictStringify
+                  intoBuffer:buffer
+                       error:error]) {
+    return nil;
+  }
+  return [buffer detachData];
+}
+
+// The body renders into its own buffer, which becomes the layout's content
+// slot as-is; the layout copies its bytes when it yields, without decoding.
+// `$content` stays an NSString, as layouts have always received it.
++ (BOOL)renderTemplate:(NSString *)templateName
+               context:(NSDictionary *)context
+                layout:(NSString *)layoutName
+  defaultLayoutEnabled:(BOOL)defaultLayoutEnabled
+          strictLocals:(BOOL)strictLocals
+       strictStringify:(BOOL)strictStringify
+            intoBuffer:(ALNEOCRenderBuffer *)out
+                 error:(NSError **)error {
   NSString *logical = [self normalizeTemplateLogicalPath:templateName];
   NSString *resolvedLayout = nil;
   if ([layoutName length] > 0) {
@@ -47,27 +93,22 @@
   }
   NSDictionary *bodyToken = ALNEOCPushRenderOptions(strictLocals, strictStringify);
   NSDictionary *compositionToken = ALNEOCPushCompositionState();
-  NSString *body = nil;
   @try {
-    body = ALNEOCRenderTemplate(logical, context ?: @{}, error);
-  } @finally {
-    if (body != nil) {
-      ALNEOCSetSlotContent(@"content", body);
-    }
-  }
-  @try {
-    if (body == nil) {
-      return nil;
-    }
-
     if ([resolvedLayout length] == 0) {
-      return body;
+      return ALNEOCRenderTemplateIntoBuffer(out, logical, context ?: @{}, error);
     }
 
+    ALNEOCRenderBuffer *body = [[ALNEOCRenderBuffer alloc] init];
+    if (!ALNEOCRenderTemplateIntoBuffer(body, logical, context ?: @{}, error)) {
+      return NO;
+    }
+    if (!ALNEOCSetSlot(context, @"content", body, logical, 0, 0, error)) {
+      return NO;
+    }
     NSMutableDictionary *layoutContext =
         [NSMutableDictionary dictionaryWithDictionary:context ?: @{}];
-    layoutContext[@"content"] = body;
-    return ALNEOCRenderTemplate(resolvedLayout, layoutContext, error);
+    layoutContext[@"content"] = [body stringValue];
+    return ALNEOCRenderTemplateIntoBuffer(out, resolvedLayout, layoutContext, error);
   } @finally {
     ALNEOCPopCompositionState(compositionToken);
     ALNEOCPopRenderOptions(bodyToken);
@@ -89,4 +130,65 @@
                         error:error];
 }
 
+// Streaming renders the layout first and defers the body template to the
+// layout's content yield, so the layout head reaches the writer before the
+// body runs. Slots yielded ahead of the content yield must therefore come from
+// the render context rather than from the body template.
++ (BOOL)streamTemplate:(NSString *)templateName
+               context:(NSDictionary *)context
+                layout:(NSString *)layoutName
+  defaultLayoutEnabled:(BOOL)defaultLayoutEnabled
+          strictLocals:(BOOL)strictLocals
+       strictStringify:(BOOL)strictStringify
+                writer:(ALNEOCStreamWriter)writer
+                 error:(NSError **)error {
+  NSString *logical = [self normalizeTemplateLogicalPath:templateName];
+  NSString *resolvedLayout = nil;
+  if ([layoutName length] > 0) {
+    resolvedLayout = [self normalizeTemplateLogicalPath:layoutName];
+  } else if (defaultLayoutEnabled) {
+    resolvedLayout = ALNEOCResolveTemplateLayout(logical);
+  }
+
+  NSString *entryPath = logical;
+  NSDictionary *entryContext = context ?: @{};
+  NSDictionary *optionsToken = ALNEOCPushRenderOptions(strictLocals, strictStringify);
+  NSDictionary *compositionToken = ALNEOCPushCompositionState();
+  ALNEOCRenderBuffer *root = [[ALNEOCRenderBuffer alloc] init];
+  NSDictionary *sinkToken = ALNEOCPushStreamSink(root, writer);
+  @try {
+    if ([resolvedLayout length] > 0) {
+      id deferredBody = ALNEOCDeferredSlotTemplate(logical, context ?: @{});
+      ALNEOCSetDeferredSlotTemplate(@"content", logical, context ?: @{});
+      NSMutableDictionary *layoutContext =
+          [NSMutableDictionary dictionaryWithDictionary:context ?: @{}];
+      if (deferredBody != nil) {
+        layoutContext[@"content"] = deferredBody;
+      }
+      entryPath = resolvedLayout;
+      entryContext = layoutContext;
+    }
+
+    if (!ALNEOCRenderTemplateIntoBuffer(root, entryPath, entryContext, error)) {
+      return NO;
+    }
+    if ([root length] > 0 && !writer([root detachData])) {
+      if (error != NULL) {
+        *error = [NSError errorWithDomain:ALNEOCErrorDomain
+                                     code:ALNEOCErrorTemplateExecutionFailed
+                                 userInfo:@{
+                                   NSLocalizedDescriptionKey : @"EOC stream write failed",
+                                   ALNEOCErrorPathKey : ALNEOCCanonicalTemplatePath(entryPath)
+                                 }];
+      }
+      return NO;
+    }
+    return YES;
+  } @finally {
+    ALNEOCPopStreamSink(sinkToken);
+    ALNEOCPopCompositionState(compositionToken);
+    ALNEOCPopRenderOptions(optionsToken);
+  }
+}
+
 @end
@@ -305,20 +305,36 @@ NSString *ALNORMModelStateName(ALNORMModelState state) {
     return NO;
   }
 
+  // Columnar result rows resolve each field to a column position once and
+  // read the value positionally.
+  ALNDatabaseResultRow *columnarRow =
+      [row isKindOfClass:[ALNDatabaseResultRow class]] ? (ALNDatabaseResultRow *)row : nil;
   NSMutableDictionary *values = [NSMutableDictionary dictionary];
   for (ALNORMFieldDescriptor *field in self.descriptor.fields ?: @[]) {
     id rawValue = nil;
     BOOL found = NO;
 
-    rawValue = row[field.columnName];
-    found = (rawValue != nil || [row objectForKey:field.columnName] != nil);
-    if (!found) {
-      rawValue = row[field.propertyName];
-      found = (rawValue != nil || [row objectForKey:field.propertyName] != nil);
-    }
-    if (!found) {
-      rawValue = row[field.name];
-      found = (rawValue != nil || [row objectForKey:field.name] != nil);
+    if (columnarRow != nil) {
+      NSUInteger index = [columnarRow indexOfColumn:field.columnName];
+      if (index == NSNotFound) {
+        index = [columnarRow indexOfColumn:field.propertyName];
+      }
+      if (index == NSNotFound) {
+        index = [columnarRow indexOfColumn:field.name];
+      }
+      found = (index != NSNotFound);
+      rawValue = found ? [columnarRow valueAtColumnIndex:index] : nil;
+    } else {
+      rawValue = row[field.columnName];
+      found = (rawValue != nil || [row objectForKey:field.columnName] != nil);
+      if (!found) {
+        rawValue = row[field.propertyName];
+        found = (rawValue != nil || [row objectForKey:field.propertyName] != nil);
+      }
+      if (!found) {
+        rawValue = row[field.name];
+        found = (rawValue != nil || [row objectForKey:field.name] != nil);
+      }
     }
     if (!found) {
       continue;
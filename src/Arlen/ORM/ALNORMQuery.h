@@ -8,7 +8,11 @@
 
 NS_ASSUME_NONNULL_BEGIN
 
+@class ALNORMContext;
+
 typedef void (^ALNORMQueryScope)(id query);
+// Receives streamed models a batch at a time; set `*stop` to end early.
+typedef void (^ALNORMModelBatchBlock)(NSArray *models, BOOL *stop);
 
 typedef NS_ENUM(NSInteger, ALNORMRelationLoadStrategy) {
   ALNORMRelationLoadStrategyDefault = 0,
@@ -70,6 +74,12 @@ FOUNDATION_EXPORT NSString *ALNORMRelationLoadStrategyName(ALNORMRelationLoadStr
 - (ALNORMQuery *)strictLoading:(BOOL)enabled;
 - (ALNORMRelationLoadStrategy)loadStrategyForRelationNamed:(NSString *)relationName;
 - (nullable ALNSQLBuilder *)selectBuilder:(NSError *_Nullable *_Nullable)error;
+// Streams the query's models through the context's repository for
+// `modelClass`; see -[ALNORMRepository enumerateModelsMatchingQuery:...].
+- (BOOL)enumerateModelsInContext:(ALNORMContext *)context
+                       batchSize:(NSUInteger)batchSize
+                      usingBlock:(ALNORMModelBatchBlock)block
+                           error:(NSError *_Nullable *_Nullable)error;
 
 @end
 
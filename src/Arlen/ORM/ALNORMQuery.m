@@ -1,8 +1,10 @@
 #import "ALNORMQuery.h"
 
+#import "ALNORMContext.h"
 #import "ALNORMErrors.h"
 #import "ALNORMFieldDescriptor.h"
 #import "ALNORMModel.h"
+#import "ALNORMRepository.h"
 
 static NSString *ALNORMQueryTrimmedString(NSString *value) {
   if (![value isKindOfClass:[NSString class]]) {
@@ -469,4 +471,22 @@ NSString *ALNORMRelationLoadStrategyName(ALNORMRelationLoadStrategy strategy) {
   return builder;
 }
 
+- (BOOL)enumerateModelsInContext:(ALNORMContext *)context
+                       batchSize:(NSUInteger)batchSize
+                      usingBlock:(ALNORMModelBatchBlock)block
+                           error:(NSError **)error {
+  ALNORMRepository *repository = [context repositoryForModelClass:self.modelClass];
+  if (repository == nil) {
+    if (error != NULL) {
+      *error = ALNORMMakeError(ALNORMErrorUnsupportedModelClass,
+                               @"query model class has no repository in this context",
+                               @{
+                                 @"entity_name" : self.descriptor.entityName ?: @"",
+                               });
+    }
+    return NO;
+  }
+  return [repository enumerateModelsMatchingQuery:self batchSize:batchSize usingBlock:block error:error];
+}
+
 @end
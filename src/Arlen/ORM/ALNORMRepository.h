@@ -27,6 +27,20 @@ NS_ASSUME_NONNULL_BEGIN
 - (nullable NSArray *)all:(NSError *_Nullable *_Nullable)error;
 - (nullable NSArray *)allMatchingQuery:(nullable ALNORMQuery *)query
                                  error:(NSError *_Nullable *_Nullable)error;
+// Streams matching models to `block` a batch at a time (batchSize 0 means
+// 500) instead of loading them all. On PostgreSQL each batch is fetched in
+// full from a server-side cursor before it is materialized, so select-in
+// preloads and queries or writes made by `block` run on the same connection
+// between fetches. The cursor lives in the context's transaction, or in one
+// opened for the enumeration (committed once it ends, and rolled back if it
+// fails). Other adapters load the rows and slice them. Select-in relations
+// are preloaded per batch. Models handed to the block
+// are dropped from the identity map afterwards unless dirty, so memory stays
+// flat. Setting `*stop` ends the enumeration early.
+- (BOOL)enumerateModelsMatchingQuery:(nullable ALNORMQuery *)query
+                           batchSize:(NSUInteger)batchSize
+                          usingBlock:(ALNORMModelBatchBlock)block
+                               error:(NSError *_Nullable *_Nullable)error;
 - (nullable id)first:(NSError *_Nullable *_Nullable)error;
 - (nullable id)firstMatchingQuery:(nullable ALNORMQuery *)query
                             error:(NSError *_Nullable *_Nullable)error;
@@ -55,6 +69,15 @@ NS_ASSUME_NONNULL_BEGIN
 - (BOOL)upsertModel:(ALNORMModel *)model
              options:(nullable ALNORMWriteOptions *)options
                error:(NSError *_Nullable *_Nullable)error;
+// Inserts new models in one COPY when the adapter is ALNPg and every model
+// sets its primary key, falling back to one INSERT per model inside a
+// transaction otherwise, which reads generated keys back. Every model must
+// set the same fields; related-model saves are not supported.
+- (BOOL)bulkInsertModels:(NSArray<ALNORMModel *> *)models
+                   error:(NSError *_Nullable *_Nullable)error;
+- (BOOL)bulkInsertModels:(NSArray<ALNORMModel *> *)models
+                 options:(nullable ALNORMWriteOptions *)options
+                   error:(NSError *_Nullable *_Nullable)error;
 - (nullable NSDictionary<NSString *, id> *)compiledPlanForQuery:(nullable ALNORMQuery *)query
                                                           error:(NSError *_Nullable *_Nullable)error;
 
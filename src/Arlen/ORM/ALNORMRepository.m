@@ -1,5 +1,6 @@
 #import "ALNORMRepository.h"
 
+#import "../Data/ALNPg.h"
 #import "../Data/ALNPostgresSQLBuilder.h"
 #import "ALNORMContext.h"
 #import "ALNORMErrors.h"
@@ -75,6 +76,18 @@ static NSArray *ALNORMRepositoryUniqueValues(NSArray *values) {
                                                                parameters:(NSArray *)parameters
                                                                 modelName:(NSString *)modelName
                                                                     error:(NSError **)error;
+- (BOOL)activeConnectionSupportsBulkCopy;
+- (NSInteger)bulkCopyIntoTable:(NSString *)table
+                       columns:(NSArray<NSString *> *)columns
+                   rowProducer:(ALNPgCopyRowProducer)rowProducer
+                     modelName:(NSString *)modelName
+                         error:(NSError **)error;
+- (BOOL)streamQuerySQL:(NSString *)sql
+            parameters:(NSArray *)parameters
+             batchSize:(NSUInteger)batchSize
+             modelName:(NSString *)modelName
+            usingBlock:(ALNPgRowBatchBlock)block
+                 error:(NSError **)error;
 - (nullable ALNORMModel *)trackedModelForClass:(Class)modelClass
                               primaryKeyValues:(NSDictionary<NSString *, id> *)primaryKeyValues;
 - (void)trackModel:(ALNORMModel *)model;
@@ -656,6 +669,73 @@ static NSArray *ALNORMRepositoryUniqueValues(NSArray *values) {
                                     error:error];
 }
 
+- (BOOL)enumerateModelsMatchingQuery:(ALNORMQuery *)query
+                           batchSize:(NSUInteger)batchSize
+                          usingBlock:(ALNORMModelBatchBlock)block
+                               error:(NSError **)error {
+  if (error != NULL) {
+    *error = nil;
+  }
+  if (block == nil) {
+    if (error != NULL) {
+      *error = ALNORMMakeError(ALNORMErrorInvalidArgument,
+                               @"model enumeration requires a block",
+                               @{
+                                 @"entity_name" : self.descriptor.entityName ?: @"",
+                               });
+    }
+    return NO;
+  }
+  ALNORMQuery *resolvedQuery = query ?: [self query];
+  NSArray<NSDictionary<NSString *, id> *> *joinedRelations = nil;
+  ALNSQLBuilder *builder = [self selectBuilderForQuery:resolvedQuery
+                                        joinedRelations:&joinedRelations
+                                                  error:error];
+  if (builder == nil) {
+    return NO;
+  }
+  NSDictionary<NSString *, id> *plan = ALNORMRepositoryCompileBuilder(self.context.adapter, builder, error);
+  if (plan == nil) {
+    return NO;
+  }
+
+  NSString *sql = [plan[@"sql"] isKindOfClass:[NSString class]] ? plan[@"sql"] : @"";
+  NSArray *parameters = [plan[@"parameters"] isKindOfClass:[NSArray class]] ? plan[@"parameters"] : @[];
+  __block NSError *batchError = nil;
+  BOOL streamed = [self.context streamQuerySQL:sql
+                                    parameters:parameters
+                                     batchSize:batchSize
+                                     modelName:self.descriptor.entityName
+                                    usingBlock:^(NSArray<NSDictionary *> *rows, BOOL *stop) {
+                                      NSError *materializeError = nil;
+                                      NSArray *models = [self materializedModelsFromRows:rows
+                                                                                   query:resolvedQuery
+                                                                          joinedRelations:joinedRelations
+                                                                                   error:&materializeError];
+                                      if (models == nil) {
+                                        batchError = materializeError;
+                                        *stop = YES;
+                                        return;
+                                      }
+                                      block(models, stop);
+                                      // Keep the identity map from growing with the stream;
+                                      // dirty models stay tracked so they can still be saved.
+                                      for (ALNORMModel *model in models) {
+                                        if (model.state != ALNORMModelStateDirty) {
+                                          [self.context untrackModel:model];
+                                        }
+                                      }
+                                    }
+                                         error:error];
+  if (batchError != nil) {
+    if (error != NULL) {
+      *error = batchError;
+    }
+    return NO;
+  }
+  return streamed;
+}
+
 - (id)first:(NSError **)error {
   ALNORMQuery *query = [self query];
   [query limit:1];
@@ -1368,6 +1448,172 @@ static NSArray *ALNORMRepositoryUniqueValues(NSArray *values) {
                                       error:error];
 }
 
+- (BOOL)modelsHaveExplicitPrimaryKeys:(NSArray<ALNORMModel *> *)models {
+  for (ALNORMModel *model in models) {
+    for (NSString *fieldName in self.descriptor.primaryKeyFieldNames ?: @[]) {
+      id value = [model objectForFieldName:fieldName];
+      if (value == nil || value == [NSNull null]) {
+        return NO;
+      }
+    }
+  }
+  return YES;
+}
+
+- (BOOL)bulkInsertModels:(NSArray<ALNORMModel *> *)models error:(NSError **)error {
+  return [self bulkInsertModels:models options:nil error:error];
+}
+
+- (BOOL)bulkInsertModels:(NSArray<ALNORMModel *> *)models
+                 options:(ALNORMWriteOptions *)options
+                   error:(NSError **)error {
+  if (error != NULL) {
+    *error = nil;
+  }
+  if (![models isKindOfClass:[NSArray class]]) {
+    if (error != NULL) {
+      *error = ALNORMMakeError(ALNORMErrorInvalidArgument,
+                               @"bulk insert requires an array of models",
+                               nil);
+    }
+    return NO;
+  }
+  if ([models count] == 0) {
+    return YES;
+  }
+  for (ALNORMModel *model in models) {
+    if (![model isKindOfClass:[ALNORMModel class]] || model.state != ALNORMModelStateNew ||
+        ![model.descriptor.entityName isEqualToString:self.descriptor.entityName]) {
+      if (error != NULL) {
+        *error = ALNORMMakeError(ALNORMErrorInvalidArgument,
+                                 @"bulk insert requires new models of the repository entity",
+                                 @{
+                                   @"entity_name" : self.descriptor.entityName ?: @"",
+                                 });
+      }
+      return NO;
+    }
+  }
+
+  ALNORMWriteOptions *resolvedOptions = [self resolvedWriteOptions:options];
+  if ([resolvedOptions.saveRelatedRelationNames count] > 0) {
+    if (error != NULL) {
+      *error = ALNORMMakeError(ALNORMErrorSaveFailed,
+                               @"bulk insert does not save related models",
+                               @{
+                                 @"entity_name" : self.descriptor.entityName ?: @"",
+                               });
+    }
+    return NO;
+  }
+
+  __weak typeof(self) weakSelf = self;
+  return [self.context withTransactionUsingBlock:^BOOL(NSError **blockError) {
+           __strong typeof(self) strongSelf = weakSelf;
+           // COPY returns nothing, so models whose keys the database generates
+           // go through insertModel, which reads the keys back; a tracked
+           // model with a NULL key would later save or delete the wrong row.
+           if (![strongSelf.context activeConnectionSupportsBulkCopy] ||
+               ![strongSelf modelsHaveExplicitPrimaryKeys:models]) {
+             for (ALNORMModel *model in models) {
+               if (![strongSelf insertModel:model options:resolvedOptions error:blockError]) {
+                 return NO;
+               }
+             }
+             return YES;
+           }
+
+           NSArray<NSString *> *fieldNames = nil;
+           for (ALNORMModel *model in models) {
+             if (![strongSelf applyTimestampAutomationToModel:model
+                                                     options:resolvedOptions
+                                                    isInsert:YES
+                                                       error:blockError] ||
+                 ![strongSelf applyOptimisticLockToModel:model
+                                                 options:resolvedOptions
+                                                isInsert:YES
+                                          currentVersion:NULL
+                                                   error:blockError]) {
+               return NO;
+             }
+             NSArray<NSString *> *modelFieldNames = [strongSelf writableFieldNamesForModel:model
+                                                                                  isInsert:YES
+                                                                          overwriteAllFields:YES];
+             if (fieldNames == nil) {
+               fieldNames = modelFieldNames;
+             } else if (![fieldNames isEqualToArray:modelFieldNames]) {
+               if (blockError != NULL) {
+                 *blockError = ALNORMMakeError(ALNORMErrorSaveFailed,
+                                               @"bulk insert requires every model to set the same fields",
+                                               @{
+                                                 @"entity_name" : strongSelf.descriptor.entityName ?: @"",
+                                               });
+               }
+               return NO;
+             }
+           }
+           if ([fieldNames count] == 0) {
+             if (blockError != NULL) {
+               *blockError = ALNORMMakeError(ALNORMErrorSaveFailed,
+                                             @"insert requires at least one writable value",
+                                             @{
+                                               @"entity_name" : strongSelf.descriptor.entityName ?: @"",
+                                             });
+             }
+             return NO;
+           }
+
+           NSMutableArray<NSString *> *columns = [NSMutableArray arrayWithCapacity:[fieldNames count]];
+           for (NSString *fieldName in fieldNames) {
+             [columns addObject:[strongSelf.descriptor fieldNamed:fieldName].columnName ?: @""];
+           }
+           // Rows are encoded as COPY consumes them, so only one row's encoded
+           // values are alive at a time.
+           __block NSUInteger nextIndex = 0;
+           NSInteger copied =
+               [strongSelf.context bulkCopyIntoTable:strongSelf.descriptor.qualifiedTableName
+                                             columns:columns
+                                         rowProducer:^NSArray *(NSError **rowError) {
+                                           if (nextIndex >= [models count]) {
+                                             return nil;
+                                           }
+                                           NSDictionary<NSString *, id> *values =
+                                               [strongSelf encodedValuesForModel:models[nextIndex]
+                                                                      fieldNames:fieldNames
+                                                                           error:rowError];
+                                           if (values == nil) {
+                                             return nil;
+                                           }
+                                           nextIndex += 1;
+                                           NSMutableArray *row = [NSMutableArray arrayWithCapacity:[columns count]];
+                                           for (NSString *column in columns) {
+                                             [row addObject:values[column] ?: [NSNull null]];
+                                           }
+                                           return row;
+                                         }
+                                           modelName:strongSelf.descriptor.entityName
+                                               error:blockError];
+           if (copied < 0) {
+             if (blockError != NULL && *blockError == nil) {
+               *blockError = ALNORMMakeError(ALNORMErrorSaveFailed,
+                                             @"bulk insert failed",
+                                             @{
+                                               @"entity_name" : strongSelf.descriptor.entityName ?: @"",
+                                             });
+             }
+             return NO;
+           }
+
+           for (ALNORMModel *model in models) {
+             [model markClean];
+             [model attachToContext:strongSelf.context];
+             [strongSelf.context trackModel:model];
+           }
+           return YES;
+         }
+                                      error:error];
+}
+
 - (BOOL)upsertModel:(ALNORMModel *)model
              options:(ALNORMWriteOptions *)options
                error:(NSError **)error {
@@ -0,0 +1,48 @@
+#ifndef ALN_CIDR_SET_H
+#define ALN_CIDR_SET_H
+
+#import <Foundation/Foundation.h>
+
+NS_ASSUME_NONNULL_BEGIN
+
+typedef NS_ENUM(NSUInteger, ALNIPAddressFamily) {
+  ALNIPAddressFamilyIPv4 = 4,
+  ALNIPAddressFamilyIPv6 = 6,
+};
+
+// Strips brackets, IPv6 zone identifiers, and IPv4 ports from an address
+// taken from a socket peer or a forwarding header.
+NSString *ALNNormalizeIPAddressCandidate(NSString *_Nullable value);
+
+// A parsed IPv4 or IPv6 address in network byte order.
+@interface ALNIPAddress : NSObject <NSCopying>
+
+@property(nonatomic, assign, readonly) ALNIPAddressFamily family;
+@property(nonatomic, copy, readonly) NSString *stringValue;
+
++ (nullable instancetype)addressWithString:(nullable NSString *)string;
+
+- (const uint8_t *)bytes;
+- (NSUInteger)bitLength;
+
+@end
+
+// CIDR ranges compiled into binary prefix tries, one per address family.
+// Lookups walk at most 32 (IPv4) or 128 (IPv6) bits regardless of how many
+// ranges the set holds. Sets are immutable and safe to share across threads.
+@interface ALNCIDRSet : NSObject
+
+@property(nonatomic, assign, readonly) NSUInteger count;
+@property(nonatomic, copy, readonly) NSArray<NSString *> *invalidCIDRStrings;
+
++ (BOOL)isValidCIDRString:(nullable NSString *)cidr;
+
+- (instancetype)initWithCIDRStrings:(nullable NSArray *)cidrs;
+- (BOOL)containsAddress:(nullable ALNIPAddress *)address;
+- (BOOL)containsAddressString:(nullable NSString *)address;
+
+@end
+
+NS_ASSUME_NONNULL_END
+
+#endif
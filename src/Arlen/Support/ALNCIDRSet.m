@@ -0,0 +1,288 @@
+#import "ALNCIDRSet.h"
+
+#if defined(_WIN32)
+#include <winsock2.h>
+#include <ws2tcpip.h>
+#else
+#include <arpa/inet.h>
+#endif
+#include <stdlib.h>
+#include <string.h>
+
+static NSString *ALNTrimmedAddressString(id value) {
+  if (![value isKindOfClass:[NSString class]]) {
+    return @"";
+  }
+  return [(NSString *)value
+      stringByTrimmingCharactersInSet:[NSCharacterSet whitespaceAndNewlineCharacterSet]];
+}
+
+NSString *ALNNormalizeIPAddressCandidate(NSString *value) {
+  NSString *trimmed = ALNTrimmedAddressString(value);
+  if ([trimmed length] == 0) {
+    return @"";
+  }
+  if ([trimmed hasPrefix:@"["]) {
+    NSRange closing = [trimmed rangeOfString:@"]"];
+    if (closing.location != NSNotFound && closing.location > 1) {
+      return [trimmed substringWithRange:NSMakeRange(1, closing.location - 1)];
+    }
+  }
+  NSRange percent = [trimmed rangeOfString:@"%"];
+  if (percent.location != NSNotFound) {
+    trimmed = [trimmed substringToIndex:percent.location];
+  }
+  NSUInteger colonCount = 0;
+  for (NSUInteger idx = 0; idx < [trimmed length]; idx++) {
+    if ([trimmed characterAtIndex:idx] == ':') {
+      colonCount += 1;
+    }
+  }
+  if (colonCount == 1 && [trimmed rangeOfString:@"."].location != NSNotFound) {
+    NSArray *parts = [trimmed componentsSeparatedByString:@":"];
+    if ([parts count] == 2 && [parts[0] length] > 0 && [parts[1] length] > 0) {
+      return parts[0];
+    }
+  }
+  return trimmed;
+}
+
+static BOOL ALNParseIPAddressBytes(NSString *candidate, ALNIPAddressFamily *familyOut, uint8_t bytesOut[16]) {
+  memset(bytesOut, 0, 16);
+  const char *raw = [candidate UTF8String];
+  if (raw == NULL || raw[0] == '\0') {
+    return NO;
+  }
+  struct in_addr ipv4;
+  memset(&ipv4, 0, sizeof(ipv4));
+  if (inet_pton(AF_INET, raw, &ipv4) == 1) {
+    memcpy(bytesOut, &ipv4, 4);
+    *familyOut = ALNIPAddressFamilyIPv4;
+    return YES;
+  }
+  struct in6_addr ipv6;
+  memset(&ipv6, 0, sizeof(ipv6));
+  if (inet_pton(AF_INET6, raw, &ipv6) == 1) {
+    memcpy(bytesOut, &ipv6, 16);
+    *familyOut = ALNIPAddressFamilyIPv6;
+    return YES;
+  }
+  return NO;
+}
+
+static BOOL ALNParseCIDRPrefixLength(NSString *value, NSUInteger maxPrefix, NSUInteger *prefixOut) {
+  NSString *trimmed = ALNTrimmedAddressString(value);
+  if ([trimmed length] == 0) {
+    return NO;
+  }
+  NSScanner *scanner = [NSScanner scannerWithString:trimmed];
+  long long parsed = 0;
+  if (![scanner scanLongLong:&parsed] || ![scanner isAtEnd] || parsed < 0 ||
+      (unsigned long long)parsed > maxPrefix) {
+    return NO;
+  }
+  *prefixOut = (NSUInteger)parsed;
+  return YES;
+}
+
+static BOOL ALNParseCIDRString(NSString *cidr,
+                               ALNIPAddressFamily *familyOut,
+                               uint8_t bytesOut[16],
+                               NSUInteger *prefixOut) {
+  NSString *trimmed = ALNTrimmedAddressString(cidr);
+  if ([trimmed length] == 0) {
+    return NO;
+  }
+  NSArray *parts = [trimmed componentsSeparatedByString:@"/"];
+  if ([parts count] > 2) {
+    return NO;
+  }
+  if (!ALNParseIPAddressBytes(ALNNormalizeIPAddressCandidate(parts[0]), familyOut, bytesOut)) {
+    return NO;
+  }
+  NSUInteger maxPrefix = (*familyOut == ALNIPAddressFamilyIPv4) ? 32 : 128;
+  *prefixOut = maxPrefix;
+  if ([parts count] == 2) {
+    return ALNParseCIDRPrefixLength(parts[1], maxPrefix, prefixOut);
+  }
+  return YES;
+}
+
+static inline NSUInteger ALNAddressBit(const uint8_t *bytes, NSUInteger index) {
+  return (bytes[index / 8] >> (7 - (index % 8))) & 1u;
+}
+
+@implementation ALNIPAddress {
+  uint8_t _bytes[16];
+}
+
++ (instancetype)addressWithString:(NSString *)string {
+  NSString *candidate = ALNNormalizeIPAddressCandidate(string);
+  if ([candidate length] == 0) {
+    return nil;
+  }
+  ALNIPAddress *address = [[self alloc] init];
+  ALNIPAddressFamily family = ALNIPAddressFamilyIPv4;
+  if (!ALNParseIPAddressBytes(candidate, &family, address->_bytes)) {
+    return nil;
+  }
+  address->_family = family;
+  address->_stringValue = [candidate copy];
+  return address;
+}
+
+- (id)copyWithZone:(NSZone *)zone {
+  (void)zone;
+  return self;
+}
+
+- (const uint8_t *)bytes {
+  return _bytes;
+}
+
+- (NSUInteger)bitLength {
+  return (_family == ALNIPAddressFamilyIPv4) ? 32 : 128;
+}
+
+- (BOOL)isEqual:(id)object {
+  if (![object isKindOfClass:[ALNIPAddress class]]) {
+    return NO;
+  }
+  ALNIPAddress *other = object;
+  return other.family == _family && memcmp([other bytes], _bytes, 16) == 0;
+}
+
+- (NSUInteger)hash {
+  NSUInteger hash = _family;
+  for (NSUInteger idx = 0; idx < 16; idx++) {
+    hash = (hash * 31u) + _bytes[idx];
+  }
+  return hash;
+}
+
+- (NSString *)description {
+  return _stringValue ?: @"";
+}
+
+@end
+
+// Node 0 is the null child; nodes 1 and 2 are the IPv4 and IPv6 roots.
+typedef struct {
+  uint32_t child[2];
+  BOOL terminal;
+} ALNCIDRTrieNode;
+
+static const uint32_t ALNCIDRTrieIPv4Root = 1;
+static const uint32_t ALNCIDRTrieIPv6Root = 2;
+
+@implementation ALNCIDRSet {
+  ALNCIDRTrieNode *_nodes;
+  NSUInteger _nodeCount;
+  NSUInteger _nodeCapacity;
+}
+
++ (BOOL)isValidCIDRString:(NSString *)cidr {
+  ALNIPAddressFamily family = ALNIPAddressFamilyIPv4;
+  uint8_t bytes[16];
+  NSUInteger prefix = 0;
+  return ALNParseCIDRString(cidr, &family, bytes, &prefix);
+}
+
+static uint32_t ALNCIDRSetAllocateNode(ALNCIDRSet *set) {
+  if (set->_nodeCount == set->_nodeCapacity) {
+    NSUInteger capacity = (set->_nodeCapacity == 0) ? 64 : set->_nodeCapacity * 2;
+    ALNCIDRTrieNode *nodes = realloc(set->_nodes, capacity * sizeof(ALNCIDRTrieNode));
+    if (nodes == NULL) {
+      return 0;
+    }
+    set->_nodes = nodes;
+    set->_nodeCapacity = capacity;
+  }
+  uint32_t index = (uint32_t)set->_nodeCount++;
+  memset(&set->_nodes[index], 0, sizeof(ALNCIDRTrieNode));
+  return index;
+}
+
+static BOOL ALNCIDRSetInsert(ALNCIDRSet *set,
+                             ALNIPAddressFamily family,
+                             const uint8_t *bytes,
+                             NSUInteger prefix) {
+  uint32_t node = (family == ALNIPAddressFamilyIPv4) ? ALNCIDRTrieIPv4Root : ALNCIDRTrieIPv6Root;
+  for (NSUInteger idx = 0; idx < prefix; idx++) {
+    if (set->_nodes[node].terminal) {
+      // A shorter range already covers this one.
+      return YES;
+    }
+    NSUInteger bit = ALNAddressBit(bytes, idx);
+    uint32_t next = set->_nodes[node].child[bit];
+    if (next == 0) {
+      next = ALNCIDRSetAllocateNode(set);
+      if (next == 0) {
+        return NO;
+      }
+      set->_nodes[node].child[bit] = next;
+    }
+    node = next;
+  }
+  set->_nodes[node].terminal = YES;
+  return YES;
+}
+
+- (instancetype)init {
+  return [self initWithCIDRStrings:@[]];
+}
+
+- (instancetype)initWithCIDRStrings:(NSArray *)cidrs {
+  self = [super init];
+  if (self) {
+    (void)ALNCIDRSetAllocateNode(self);
+    (void)ALNCIDRSetAllocateNode(self);
+    (void)ALNCIDRSetAllocateNode(self);
+    NSMutableArray *invalid = [NSMutableArray array];
+    NSUInteger count = 0;
+    for (id value in [cidrs isKindOfClass:[NSArray class]] ? cidrs : @[]) {
+      ALNIPAddressFamily family = ALNIPAddressFamilyIPv4;
+      uint8_t bytes[16];
+      NSUInteger prefix = 0;
+      if (!ALNParseCIDRString(value, &family, bytes, &prefix) || _nodeCount < 3 ||
+          !ALNCIDRSetInsert(self, family, bytes, prefix)) {
+        [invalid addObject:[value isKindOfClass:[NSString class]] ? value : [value description]];
+        continue;
+      }
+      count += 1;
+    }
+    _count = count;
+    _invalidCIDRStrings = [invalid copy];
+  }
+  return self;
+}
+
+- (void)dealloc {
+  free(_nodes);
+}
+
+- (BOOL)containsAddress:(ALNIPAddress *)address {
+  if (address == nil || _count == 0) {
+    return NO;
+  }
+  const uint8_t *bytes = [address bytes];
+  NSUInteger bitLength = [address bitLength];
+  uint32_t node =
+      (address.family == ALNIPAddressFamilyIPv4) ? ALNCIDRTrieIPv4Root : ALNCIDRTrieIPv6Root;
+  for (NSUInteger idx = 0; idx < bitLength; idx++) {
+    if (_nodes[node].terminal) {
+      return YES;
+    }
+    node = _nodes[node].child[ALNAddressBit(bytes, idx)];
+    if (node == 0) {
+      return NO;
+    }
+  }
+  return _nodes[node].terminal;
+}
+
+- (BOOL)containsAddressString:(NSString *)address {
+  return [self containsAddress:[ALNIPAddress addressWithString:address]];
+}
+
+@end
@@ -5,14 +5,101 @@
 
 NS_ASSUME_NONNULL_BEGIN
 
+// Fixed-memory latency histogram. Boundaries are ascending inclusive upper
+// bounds in milliseconds; one overflow bucket counts samples above the last
+// boundary. Instances are not thread-safe on their own; the registry guards
+// them.
+@interface ALNMetricsHistogram : NSObject
+
+@property(nonatomic, copy, readonly) NSArray<NSNumber *> *boundaries;
+@property(nonatomic, assign, readonly) unsigned long long count;
+@property(nonatomic, assign, readonly) double sum;
+@property(nonatomic, assign, readonly) double min;
+@property(nonatomic, assign, readonly) double max;
+
+// Log-linear (HDR-style) boundaries: each power of ten between minimum and
+// maximum is split into `subBucketsPerDecade` equal-width buckets, so
+// relative error stays bounded across the whole range.
++ (NSArray<NSNumber *> *)logLinearBoundariesFromMinimum:(double)minimum
+                                                maximum:(double)maximum
+                                    subBucketsPerDecade:(NSUInteger)subBucketsPerDecade;
++ (NSArray<NSNumber *> *)defaultBoundaries;
+
+- (instancetype)initWithBoundaries:(nullable NSArray<NSNumber *> *)boundaries;
+- (void)recordValue:(double)value;
+- (double)valueAtQuantile:(double)quantile;
+- (NSArray<NSNumber *> *)bucketCounts;
+- (NSDictionary *)dictionaryRepresentation;
+- (void)mergeDictionaryRepresentation:(NSDictionary *)representation;
+
+@end
+
+// Pre-registered metric handles. Look one up once (for example at startup)
+// and keep it; updates go to a per-thread shard without taking a lock, and
+// shards are summed when the registry is read.
+@interface ALNMetricsCounter : NSObject
+
+@property(nonatomic, copy, readonly) NSString *name;
+@property(nonatomic, copy, readonly) NSString *exportedName;
+
+- (void)increment;
+- (void)incrementBy:(double)amount;
+- (double)value;
+
+@end
+
+@interface ALNMetricsGauge : NSObject
+
+@property(nonatomic, copy, readonly) NSString *name;
+@property(nonatomic, copy, readonly) NSString *exportedName;
+
+- (void)setValue:(double)value;
+- (void)addDelta:(double)delta;
+- (double)value;
+
+@end
+
+@interface ALNMetricsTiming : NSObject
+
+@property(nonatomic, copy, readonly) NSString *name;
+@property(nonatomic, copy, readonly) NSString *exportedName;
+@property(nonatomic, copy, readonly) NSArray<NSNumber *> *boundaries;
+
+- (void)recordMilliseconds:(double)durationMilliseconds;
+- (ALNMetricsHistogram *)histogram;
+
+@end
+
 @interface ALNMetricsRegistry : NSObject
 
+// Boundaries used for timings without an explicit per-name override.
+// Changing them only affects timings first recorded afterwards.
+@property(nonatomic, copy) NSArray<NSNumber *> *defaultHistogramBoundaries;
+
+// Combines histogram snapshots from several registries (for example one per
+// worker process) into one snapshot in the same shape.
++ (NSDictionary *)mergedHistogramSnapshots:(NSArray<NSDictionary *> *)snapshots;
+
+// Returns the handle for `name`, creating it on first use. The same name
+// always yields the same handle. Returns nil for an empty name.
+- (nullable ALNMetricsCounter *)counterNamed:(NSString *)name;
+- (nullable ALNMetricsGauge *)gaugeNamed:(NSString *)name;
+- (nullable ALNMetricsTiming *)timingNamed:(NSString *)name;
+
 - (void)incrementCounter:(NSString *)name;
 - (void)incrementCounter:(NSString *)name by:(double)amount;
 - (void)setGauge:(NSString *)name value:(double)value;
 - (void)addGauge:(NSString *)name delta:(double)delta;
 - (void)recordTiming:(NSString *)name milliseconds:(double)durationMilliseconds;
+// Drops the gauge from the registry and its exports. A handle still held
+// elsewhere keeps working but is no longer exported; `gaugeNamed:` creates a
+// fresh one.
+- (void)removeGaugeNamed:(NSString *)name;
+- (void)setHistogramBoundaries:(nullable NSArray<NSNumber *> *)boundaries
+                     forTiming:(NSString *)name;
 - (NSDictionary *)snapshot;
+- (NSDictionary *)histogramSnapshot;
+- (void)mergeHistogramSnapshot:(NSDictionary *)histogramSnapshot;
 - (NSString *)prometheusText;
 
 @end
@@ -1,5 +1,13 @@
 #import "ALNMetrics.h"
 
+#import <dispatch/dispatch.h>
+#include <math.h>
+#include <pthread.h>
+#include <stdatomic.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+
 static NSString *ALNSanitizeMetricName(NSString *name) {
   if (![name isKindOfClass:[NSString class]] || [name length] == 0) {
     return @"aln_metric";
@@ -30,165 +38,816 @@ static NSString *ALNSanitizeMetricName(NSString *name) {
   return out;
 }
 
-static NSDictionary *ALNTimingEntry(double count, double sum, double min, double max) {
-  double average = (count > 0.0) ? (sum / count) : 0.0;
+static NSString *ALNMetricBoundaryLabel(double boundary) {
+  return [NSString stringWithFormat:@"%.6g", boundary];
+}
+
+static NSArray<NSNumber *> *ALNNormalizedHistogramBoundaries(NSArray *boundaries) {
+  if (![boundaries isKindOfClass:[NSArray class]]) {
+    return nil;
+  }
+  NSMutableArray *values = [NSMutableArray array];
+  for (id value in boundaries) {
+    if (![value respondsToSelector:@selector(doubleValue)]) {
+      continue;
+    }
+    double boundary = [value doubleValue];
+    if (!isfinite(boundary) || boundary <= 0.0) {
+      continue;
+    }
+    [values addObject:@(boundary)];
+  }
+  [values sortUsingSelector:@selector(compare:)];
+  NSMutableArray *unique = [NSMutableArray arrayWithCapacity:[values count]];
+  for (NSNumber *value in values) {
+    if ([unique count] == 0 || [[unique lastObject] doubleValue] < [value doubleValue]) {
+      [unique addObject:value];
+    }
+  }
+  return ([unique count] > 0) ? [NSArray arrayWithArray:unique] : nil;
+}
+
+// Index of the first bucket whose inclusive upper bound is >= value; the
+// overflow bucket is `count`.
+static NSUInteger ALNHistogramBucketIndex(const double *bounds, NSUInteger count, double value) {
+  NSUInteger low = 0;
+  NSUInteger high = count;
+  while (low < high) {
+    NSUInteger mid = low + ((high - low) / 2);
+    if (bounds[mid] < value) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+  return low;
+}
+
+@interface ALNMetricsHistogram ()
+
+- (void)addHistogram:(ALNMetricsHistogram *)other;
+
+@end
+
+@implementation ALNMetricsHistogram {
+  double *_bounds;
+  unsigned long long *_counts;
+  NSUInteger _boundCount;
+}
+
++ (NSArray<NSNumber *> *)logLinearBoundariesFromMinimum:(double)minimum
+                                                maximum:(double)maximum
+                                    subBucketsPerDecade:(NSUInteger)subBucketsPerDecade {
+  double lower = (isfinite(minimum) && minimum > 0.0) ? minimum : 0.1;
+  double upper = (isfinite(maximum) && maximum > lower) ? maximum : lower * 10.0;
+  NSUInteger steps = MAX((NSUInteger)1, MIN(subBucketsPerDecade, (NSUInteger)100));
+
+  NSMutableArray *boundaries = [NSMutableArray array];
+  int exponent = (int)floor(log10(lower));
+  double tolerance = 1e-9;
+  while ([boundaries count] < 4096) {
+    double decade = pow(10.0, exponent);
+    if (decade > upper * (1.0 + tolerance)) {
+      break;
+    }
+    for (NSUInteger idx = 0; idx < steps; idx++) {
+      double boundary = decade * (double)(steps + (idx * 9)) / (double)steps;
+      // Round away binary noise such as 0.30000000000000004.
+      boundary = [[NSString stringWithFormat:@"%.12g", boundary] doubleValue];
+      if (boundary < lower * (1.0 - tolerance)) {
+        continue;
+      }
+      if (boundary > upper * (1.0 + tolerance)) {
+        break;
+      }
+      [boundaries addObject:@(boundary)];
+    }
+    exponent += 1;
+  }
+  if ([boundaries count] == 0 || [[boundaries lastObject] doubleValue] < upper * (1.0 - tolerance)) {
+    [boundaries addObject:@(upper)];
+  }
+  return [NSArray arrayWithArray:boundaries];
+}
+
++ (NSArray<NSNumber *> *)defaultBoundaries {
+  static NSArray *boundaries = nil;
+  static dispatch_once_t onceToken;
+  dispatch_once(&onceToken, ^{
+    boundaries = [self logLinearBoundariesFromMinimum:0.1 maximum:60000.0 subBucketsPerDecade:9];
+  });
+  return boundaries;
+}
+
+- (instancetype)init {
+  return [self initWithBoundaries:nil];
+}
+
+- (instancetype)initWithBoundaries:(NSArray<NSNumber *> *)boundaries {
+  self = [super init];
+  if (self) {
+    _boundaries = ALNNormalizedHistogramBoundaries(boundaries) ?: [[self class] defaultBoundaries];
+    _boundCount = [_boundaries count];
+    _bounds = calloc(_boundCount, sizeof(double));
+    _counts = calloc(_boundCount + 1, sizeof(unsigned long long));
+    if (_bounds == NULL || _counts == NULL) {
+      free(_bounds);
+      free(_counts);
+      return nil;
+    }
+    for (NSUInteger idx = 0; idx < _boundCount; idx++) {
+      _bounds[idx] = [_boundaries[idx] doubleValue];
+    }
+  }
+  return self;
+}
+
+- (void)dealloc {
+  free(_bounds);
+  free(_counts);
+}
+
+- (void)addCount:(unsigned long long)count
+        toBucket:(NSUInteger)bucket
+             sum:(double)sum
+             min:(double)min
+             max:(double)max {
+  if (count == 0) {
+    return;
+  }
+  _counts[MIN(bucket, _boundCount)] += count;
+  if (_count == 0) {
+    _min = min;
+    _max = max;
+  } else {
+    _min = MIN(_min, min);
+    _max = MAX(_max, max);
+  }
+  _count += count;
+  _sum += sum;
+}
+
+- (void)recordValue:(double)value {
+  double sample = (isfinite(value) && value > 0.0) ? value : 0.0;
+  NSUInteger bucket = ALNHistogramBucketIndex(_bounds, _boundCount, sample);
+  [self addCount:1 toBucket:bucket sum:sample min:sample max:sample];
+}
+
+- (double)valueAtQuantile:(double)quantile {
+  if (_count == 0) {
+    return 0.0;
+  }
+  double q = isfinite(quantile) ? MAX(0.0, MIN(1.0, quantile)) : 0.0;
+  double rank = q * (double)_count;
+  if (rank <= 0.0) {
+    return _min;
+  }
+  unsigned long long cumulative = 0;
+  for (NSUInteger idx = 0; idx <= _boundCount; idx++) {
+    unsigned long long bucketCount = _counts[idx];
+    if (bucketCount == 0) {
+      continue;
+    }
+    if ((double)(cumulative + bucketCount) >= rank) {
+      double lower = (idx == 0) ? _min : MAX(_min, _bounds[idx - 1]);
+      double upper = (idx < _boundCount) ? MIN(_max, _bounds[idx]) : _max;
+      if (upper < lower) {
+        upper = lower;
+      }
+      double fraction = (rank - (double)cumulative) / (double)bucketCount;
+      return lower + ((upper - lower) * fraction);
+    }
+    cumulative += bucketCount;
+  }
+  return _max;
+}
+
+- (NSArray<NSNumber *> *)bucketCounts {
+  NSMutableArray *counts = [NSMutableArray arrayWithCapacity:_boundCount + 1];
+  for (NSUInteger idx = 0; idx <= _boundCount; idx++) {
+    [counts addObject:@(_counts[idx])];
+  }
+  return [NSArray arrayWithArray:counts];
+}
+
+- (NSDictionary *)dictionaryRepresentation {
   return @{
-    @"count" : @(count),
-    @"sum" : @(sum),
-    @"min" : @(count > 0.0 ? min : 0.0),
-    @"max" : @(count > 0.0 ? max : 0.0),
-    @"avg" : @(average),
+    @"boundaries" : _boundaries,
+    @"counts" : [self bucketCounts],
+    @"count" : @(_count),
+    @"sum" : @(_sum),
+    @"min" : @(_count > 0 ? _min : 0.0),
+    @"max" : @(_count > 0 ? _max : 0.0),
   };
 }
 
-@interface ALNMetricsRegistry ()
+- (void)mergeDictionaryRepresentation:(NSDictionary *)representation {
+  if (![representation isKindOfClass:[NSDictionary class]]) {
+    return;
+  }
+  NSArray *sourceBoundaries = ALNNormalizedHistogramBoundaries(representation[@"boundaries"]) ?: @[];
+  NSArray *sourceCounts = [representation[@"counts"] isKindOfClass:[NSArray class]]
+                              ? representation[@"counts"]
+                              : @[];
+  if ([sourceCounts count] != [sourceBoundaries count] + 1) {
+    return;
+  }
+  unsigned long long total = 0;
+  for (id value in sourceCounts) {
+    total += [value respondsToSelector:@selector(unsignedLongLongValue)] ? [value unsignedLongLongValue] : 0;
+  }
+  if (total == 0) {
+    return;
+  }
+  double sum = [representation[@"sum"] respondsToSelector:@selector(doubleValue)]
+                   ? [representation[@"sum"] doubleValue]
+                   : 0.0;
+  double min = [representation[@"min"] respondsToSelector:@selector(doubleValue)]
+                   ? [representation[@"min"] doubleValue]
+                   : 0.0;
+  double max = [representation[@"max"] respondsToSelector:@selector(doubleValue)]
+                   ? [representation[@"max"] doubleValue]
+                   : 0.0;
+
+  // Source buckets are re-binned into the narrowest local bucket whose upper
+  // bound covers the source bound, so mismatched layouts only lose
+  // resolution, never samples.
+  BOOL sameLayout = [sourceBoundaries isEqualToArray:_boundaries];
+  BOOL first = YES;
+  for (NSUInteger idx = 0; idx < [sourceCounts count]; idx++) {
+    id value = sourceCounts[idx];
+    unsigned long long bucketCount =
+        [value respondsToSelector:@selector(unsignedLongLongValue)] ? [value unsignedLongLongValue] : 0;
+    if (bucketCount == 0) {
+      continue;
+    }
+    NSUInteger target = idx;
+    if (!sameLayout) {
+      target = (idx < [sourceBoundaries count])
+                   ? ALNHistogramBucketIndex(_bounds, _boundCount, [sourceBoundaries[idx] doubleValue])
+                   : _boundCount;
+    }
+    [self addCount:bucketCount toBucket:target sum:(first ? sum : 0.0) min:min max:max];
+    first = NO;
+  }
+}
+
+// Same-layout merge without going through dictionaries; used to sum shards.
+- (void)addHistogram:(ALNMetricsHistogram *)other {
+  if (other == nil || other->_count == 0) {
+    return;
+  }
+  if (other->_boundCount != _boundCount) {
+    [self mergeDictionaryRepresentation:[other dictionaryRepresentation]];
+    return;
+  }
+  for (NSUInteger idx = 0; idx <= _boundCount; idx++) {
+    _counts[idx] += other->_counts[idx];
+  }
+  if (_count == 0) {
+    _min = other->_min;
+    _max = other->_max;
+  } else {
+    _min = MIN(_min, other->_min);
+    _max = MAX(_max, other->_max);
+  }
+  _count += other->_count;
+  _sum += other->_sum;
+}
+
+@end
+
+// Threads are assigned shards round-robin on first use, so with up to
+// ALN_METRICS_SHARD_COUNT threads no two writers share a cell.
+#define ALN_METRICS_SHARD_COUNT 32
+
+typedef struct {
+  _Atomic(uint64_t) bits;
+  uint8_t padding[64 - sizeof(uint64_t)];
+} ALNMetricsCell;
+
+static NSUInteger ALNMetricsThreadShard(void) {
+  static _Atomic(unsigned int) nextShard = 0;
+  static _Thread_local int threadShard = -1;
+  if (threadShard < 0) {
+    threadShard =
+        (int)(atomic_fetch_add_explicit(&nextShard, 1u, memory_order_relaxed) % ALN_METRICS_SHARD_COUNT);
+  }
+  return (NSUInteger)threadShard;
+}
+
+static inline double ALNMetricsCellLoad(ALNMetricsCell *cell) {
+  uint64_t bits = atomic_load_explicit(&cell->bits, memory_order_relaxed);
+  double value = 0.0;
+  memcpy(&value, &bits, sizeof(value));
+  return value;
+}
+
+static inline void ALNMetricsCellStore(ALNMetricsCell *cell, double value) {
+  uint64_t bits = 0;
+  memcpy(&bits, &value, sizeof(bits));
+  atomic_store_explicit(&cell->bits, bits, memory_order_relaxed);
+}
+
+static inline void ALNMetricsCellAdd(ALNMetricsCell *cell, double amount) {
+  uint64_t expected = atomic_load_explicit(&cell->bits, memory_order_relaxed);
+  for (;;) {
+    double current = 0.0;
+    memcpy(&current, &expected, sizeof(current));
+    double next = current + amount;
+    uint64_t desired = 0;
+    memcpy(&desired, &next, sizeof(desired));
+    if (atomic_compare_exchange_weak_explicit(
+            &cell->bits, &expected, desired, memory_order_relaxed, memory_order_relaxed)) {
+      return;
+    }
+  }
+}
+
+// Handles are only exported once they have been updated, so registering
+// one up front does not add an empty series to /metrics.
+static inline void ALNMetricsMarkObserved(_Atomic(bool) *observed) {
+  if (!atomic_load_explicit(observed, memory_order_relaxed)) {
+    atomic_store_explicit(observed, true, memory_order_relaxed);
+  }
+}
+
+@interface ALNMetricsCounter ()
+
+- (instancetype)initWithName:(NSString *)name;
+- (BOOL)isObserved;
+
+@end
+
+@implementation ALNMetricsCounter {
+  ALNMetricsCell _cells[ALN_METRICS_SHARD_COUNT];
+  _Atomic(bool) _observed;
+}
+
+- (instancetype)initWithName:(NSString *)name {
+  self = [super init];
+  if (self) {
+    _name = [name copy];
+    _exportedName = ALNSanitizeMetricName([NSString stringWithFormat:@"aln_%@", name]);
+  }
+  return self;
+}
+
+- (void)increment {
+  ALNMetricsCellAdd(&_cells[ALNMetricsThreadShard()], 1.0);
+  ALNMetricsMarkObserved(&_observed);
+}
+
+- (void)incrementBy:(double)amount {
+  ALNMetricsCellAdd(&_cells[ALNMetricsThreadShard()], amount);
+  ALNMetricsMarkObserved(&_observed);
+}
+
+- (BOOL)isObserved {
+  return atomic_load_explicit(&_observed, memory_order_relaxed) ? YES : NO;
+}
+
+- (double)value {
+  double total = 0.0;
+  for (NSUInteger idx = 0; idx < ALN_METRICS_SHARD_COUNT; idx++) {
+    total += ALNMetricsCellLoad(&_cells[idx]);
+  }
+  return total;
+}
+
+@end
+
+@interface ALNMetricsGauge ()
+
+- (instancetype)initWithName:(NSString *)name;
+- (BOOL)isObserved;
+
+@end
+
+@implementation ALNMetricsGauge {
+  ALNMetricsCell _base;
+  ALNMetricsCell _cells[ALN_METRICS_SHARD_COUNT];
+  pthread_mutex_t _setLock;
+  _Atomic(bool) _observed;
+}
+
+- (instancetype)initWithName:(NSString *)name {
+  self = [super init];
+  if (self) {
+    _name = [name copy];
+    _exportedName = ALNSanitizeMetricName([NSString stringWithFormat:@"aln_%@", name]);
+    pthread_mutex_init(&_setLock, NULL);
+  }
+  return self;
+}
+
+- (void)dealloc {
+  pthread_mutex_destroy(&_setLock);
+}
+
+- (void)setValue:(double)value {
+  // Deltas stay in their shards; the base absorbs whatever they sum to, so
+  // an add racing with a set is ordered either before or after it.
+  pthread_mutex_lock(&_setLock);
+  double deltas = 0.0;
+  for (NSUInteger idx = 0; idx < ALN_METRICS_SHARD_COUNT; idx++) {
+    deltas += ALNMetricsCellLoad(&_cells[idx]);
+  }
+  ALNMetricsCellStore(&_base, value - deltas);
+  pthread_mutex_unlock(&_setLock);
+  ALNMetricsMarkObserved(&_observed);
+}
 
-@property(nonatomic, strong) NSMutableDictionary *counters;
-@property(nonatomic, strong) NSMutableDictionary *gauges;
-@property(nonatomic, strong) NSMutableDictionary *timings;
+- (void)addDelta:(double)delta {
+  ALNMetricsCellAdd(&_cells[ALNMetricsThreadShard()], delta);
+  ALNMetricsMarkObserved(&_observed);
+}
+
+- (BOOL)isObserved {
+  return atomic_load_explicit(&_observed, memory_order_relaxed) ? YES : NO;
+}
+
+- (double)value {
+  double total = ALNMetricsCellLoad(&_base);
+  for (NSUInteger idx = 0; idx < ALN_METRICS_SHARD_COUNT; idx++) {
+    total += ALNMetricsCellLoad(&_cells[idx]);
+  }
+  return total;
+}
 
 @end
 
-@implementation ALNMetricsRegistry
+@interface ALNMetricsTiming ()
+
+- (instancetype)initWithName:(NSString *)name boundaries:(NSArray<NSNumber *> *)boundaries;
+- (BOOL)isObserved;
+
+@end
+
+@implementation ALNMetricsTiming {
+  pthread_mutex_t _locks[ALN_METRICS_SHARD_COUNT];
+  ALNMetricsHistogram *_shards[ALN_METRICS_SHARD_COUNT];
+  _Atomic(bool) _observed;
+}
+
+- (instancetype)initWithName:(NSString *)name boundaries:(NSArray<NSNumber *> *)boundaries {
+  self = [super init];
+  if (self) {
+    _name = [name copy];
+    _exportedName = ALNSanitizeMetricName([NSString stringWithFormat:@"aln_%@", name]);
+    _boundaries = ALNNormalizedHistogramBoundaries(boundaries) ?: [ALNMetricsHistogram defaultBoundaries];
+    for (NSUInteger idx = 0; idx < ALN_METRICS_SHARD_COUNT; idx++) {
+      pthread_mutex_init(&_locks[idx], NULL);
+    }
+  }
+  return self;
+}
+
+- (void)dealloc {
+  for (NSUInteger idx = 0; idx < ALN_METRICS_SHARD_COUNT; idx++) {
+    pthread_mutex_destroy(&_locks[idx]);
+  }
+}
+
+// Caller must hold the shard lock.
+- (ALNMetricsHistogram *)histogramForShardLocked:(NSUInteger)shard {
+  ALNMetricsHistogram *histogram = _shards[shard];
+  if (histogram == nil) {
+    histogram = [[ALNMetricsHistogram alloc] initWithBoundaries:_boundaries];
+    _shards[shard] = histogram;
+  }
+  return histogram;
+}
+
+- (void)recordMilliseconds:(double)durationMilliseconds {
+  double duration = (durationMilliseconds > 0.0) ? durationMilliseconds : 0.0;
+  NSUInteger shard = ALNMetricsThreadShard();
+  pthread_mutex_lock(&_locks[shard]);
+  [[self histogramForShardLocked:shard] recordValue:duration];
+  pthread_mutex_unlock(&_locks[shard]);
+  ALNMetricsMarkObserved(&_observed);
+}
+
+- (void)mergeDictionaryRepresentation:(NSDictionary *)representation {
+  NSUInteger shard = ALNMetricsThreadShard();
+  pthread_mutex_lock(&_locks[shard]);
+  [[self histogramForShardLocked:shard] mergeDictionaryRepresentation:representation];
+  pthread_mutex_unlock(&_locks[shard]);
+  ALNMetricsMarkObserved(&_observed);
+}
+
+- (BOOL)isObserved {
+  return atomic_load_explicit(&_observed, memory_order_relaxed) ? YES : NO;
+}
+
+- (ALNMetricsHistogram *)histogram {
+  ALNMetricsHistogram *merged = [[ALNMetricsHistogram alloc] initWithBoundaries:_boundaries];
+  for (NSUInteger idx = 0; idx < ALN_METRICS_SHARD_COUNT; idx++) {
+    pthread_mutex_lock(&_locks[idx]);
+    [merged addHistogram:_shards[idx]];
+    pthread_mutex_unlock(&_locks[idx]);
+  }
+  return merged;
+}
+
+@end
+
+@implementation ALNMetricsRegistry {
+  pthread_rwlock_t _handlesLock;
+  NSMutableDictionary<NSString *, ALNMetricsCounter *> *_counters;
+  NSMutableDictionary<NSString *, ALNMetricsGauge *> *_gauges;
+  NSMutableDictionary<NSString *, ALNMetricsTiming *> *_timings;
+  NSMutableDictionary<NSString *, NSArray *> *_timingBoundaries;
+  NSArray<NSNumber *> *_defaultHistogramBoundaries;
+}
+
++ (NSDictionary *)mergedHistogramSnapshots:(NSArray<NSDictionary *> *)snapshots {
+  NSMutableDictionary *histograms = [NSMutableDictionary dictionary];
+  for (NSDictionary *snapshot in [snapshots isKindOfClass:[NSArray class]] ? snapshots : @[]) {
+    if (![snapshot isKindOfClass:[NSDictionary class]]) {
+      continue;
+    }
+    for (NSString *name in snapshot) {
+      NSDictionary *entry = snapshot[name];
+      if (![entry isKindOfClass:[NSDictionary class]]) {
+        continue;
+      }
+      ALNMetricsHistogram *histogram = histograms[name];
+      if (histogram == nil) {
+        histogram = [[ALNMetricsHistogram alloc] initWithBoundaries:entry[@"boundaries"]];
+        if (histogram == nil) {
+          continue;
+        }
+        histograms[name] = histogram;
+      }
+      [histogram mergeDictionaryRepresentation:entry];
+    }
+  }
+  NSMutableDictionary *merged = [NSMutableDictionary dictionary];
+  for (NSString *name in histograms) {
+    merged[name] = [histograms[name] dictionaryRepresentation];
+  }
+  return merged;
+}
 
 - (instancetype)init {
   self = [super init];
   if (self) {
+    pthread_rwlock_init(&_handlesLock, NULL);
     _counters = [NSMutableDictionary dictionary];
     _gauges = [NSMutableDictionary dictionary];
     _timings = [NSMutableDictionary dictionary];
+    _timingBoundaries = [NSMutableDictionary dictionary];
+    _defaultHistogramBoundaries = [ALNMetricsHistogram defaultBoundaries];
   }
   return self;
 }
 
-- (void)incrementCounter:(NSString *)name {
-  [self incrementCounter:name by:1.0];
+- (void)dealloc {
+  pthread_rwlock_destroy(&_handlesLock);
 }
 
-- (void)incrementCounter:(NSString *)name by:(double)amount {
+- (NSArray<NSNumber *> *)defaultHistogramBoundaries {
+  pthread_rwlock_rdlock(&_handlesLock);
+  NSArray *boundaries = _defaultHistogramBoundaries;
+  pthread_rwlock_unlock(&_handlesLock);
+  return boundaries;
+}
+
+- (void)setDefaultHistogramBoundaries:(NSArray<NSNumber *> *)boundaries {
+  NSArray *normalized = ALNNormalizedHistogramBoundaries(boundaries) ?: [ALNMetricsHistogram defaultBoundaries];
+  pthread_rwlock_wrlock(&_handlesLock);
+  _defaultHistogramBoundaries = normalized;
+  pthread_rwlock_unlock(&_handlesLock);
+}
+
+- (void)setHistogramBoundaries:(NSArray<NSNumber *> *)boundaries forTiming:(NSString *)name {
   if ([name length] == 0) {
     return;
   }
-  @synchronized(self) {
-    double current = [self.counters[name] respondsToSelector:@selector(doubleValue)]
-                         ? [self.counters[name] doubleValue]
-                         : 0.0;
-    self.counters[name] = @(current + amount);
+  NSArray *normalized = ALNNormalizedHistogramBoundaries(boundaries);
+  pthread_rwlock_wrlock(&_handlesLock);
+  if (normalized == nil) {
+    [_timingBoundaries removeObjectForKey:name];
+  } else {
+    _timingBoundaries[[name copy]] = normalized;
   }
+  pthread_rwlock_unlock(&_handlesLock);
 }
 
-- (void)setGauge:(NSString *)name value:(double)value {
+- (ALNMetricsCounter *)counterNamed:(NSString *)name {
   if ([name length] == 0) {
-    return;
+    return nil;
+  }
+  pthread_rwlock_rdlock(&_handlesLock);
+  ALNMetricsCounter *counter = _counters[name];
+  pthread_rwlock_unlock(&_handlesLock);
+  if (counter != nil) {
+    return counter;
   }
-  @synchronized(self) {
-    self.gauges[name] = @(value);
+  pthread_rwlock_wrlock(&_handlesLock);
+  counter = _counters[name];
+  if (counter == nil) {
+    counter = [[ALNMetricsCounter alloc] initWithName:name];
+    _counters[counter.name] = counter;
   }
+  pthread_rwlock_unlock(&_handlesLock);
+  return counter;
 }
 
-- (void)addGauge:(NSString *)name delta:(double)delta {
+- (ALNMetricsGauge *)gaugeNamed:(NSString *)name {
   if ([name length] == 0) {
-    return;
+    return nil;
   }
-  @synchronized(self) {
-    double current = [self.gauges[name] respondsToSelector:@selector(doubleValue)]
-                         ? [self.gauges[name] doubleValue]
-                         : 0.0;
-    self.gauges[name] = @(current + delta);
+  pthread_rwlock_rdlock(&_handlesLock);
+  ALNMetricsGauge *gauge = _gauges[name];
+  pthread_rwlock_unlock(&_handlesLock);
+  if (gauge != nil) {
+    return gauge;
   }
+  pthread_rwlock_wrlock(&_handlesLock);
+  gauge = _gauges[name];
+  if (gauge == nil) {
+    gauge = [[ALNMetricsGauge alloc] initWithName:name];
+    _gauges[gauge.name] = gauge;
+  }
+  pthread_rwlock_unlock(&_handlesLock);
+  return gauge;
 }
 
-- (void)recordTiming:(NSString *)name milliseconds:(double)durationMilliseconds {
+- (ALNMetricsTiming *)timingNamed:(NSString *)name {
   if ([name length] == 0) {
-    return;
+    return nil;
   }
-
-  double duration = durationMilliseconds;
-  if (duration < 0.0) {
-    duration = 0.0;
+  pthread_rwlock_rdlock(&_handlesLock);
+  ALNMetricsTiming *timing = _timings[name];
+  pthread_rwlock_unlock(&_handlesLock);
+  if (timing != nil) {
+    return timing;
+  }
+  pthread_rwlock_wrlock(&_handlesLock);
+  timing = _timings[name];
+  if (timing == nil) {
+    NSArray *boundaries = _timingBoundaries[name] ?: _defaultHistogramBoundaries;
+    timing = [[ALNMetricsTiming alloc] initWithName:name boundaries:boundaries];
+    _timings[timing.name] = timing;
   }
+  pthread_rwlock_unlock(&_handlesLock);
+  return timing;
+}
+
+- (void)incrementCounter:(NSString *)name {
+  [[self counterNamed:name] increment];
+}
+
+- (void)incrementCounter:(NSString *)name by:(double)amount {
+  [[self counterNamed:name] incrementBy:amount];
+}
 
-  @synchronized(self) {
-    NSMutableDictionary *entry =
-        [self.timings[name] isKindOfClass:[NSMutableDictionary class]]
-            ? self.timings[name]
-            : [NSMutableDictionary dictionary];
-    double count = [entry[@"count"] respondsToSelector:@selector(doubleValue)] ? [entry[@"count"] doubleValue] : 0.0;
-    double sum = [entry[@"sum"] respondsToSelector:@selector(doubleValue)] ? [entry[@"sum"] doubleValue] : 0.0;
-    double min = [entry[@"min"] respondsToSelector:@selector(doubleValue)] ? [entry[@"min"] doubleValue] : duration;
-    double max = [entry[@"max"] respondsToSelector:@selector(doubleValue)] ? [entry[@"max"] doubleValue] : duration;
+- (void)setGauge:(NSString *)name value:(double)value {
+  [[self gaugeNamed:name] setValue:value];
+}
+
+- (void)addGauge:(NSString *)name delta:(double)delta {
+  [[self gaugeNamed:name] addDelta:delta];
+}
 
-    count += 1.0;
-    sum += duration;
-    min = MIN(min, duration);
-    max = MAX(max, duration);
+- (void)recordTiming:(NSString *)name milliseconds:(double)durationMilliseconds {
+  [[self timingNamed:name] recordMilliseconds:durationMilliseconds];
+}
 
-    entry[@"count"] = @(count);
-    entry[@"sum"] = @(sum);
-    entry[@"min"] = @(min);
-    entry[@"max"] = @(max);
-    self.timings[name] = entry;
+- (void)removeGaugeNamed:(NSString *)name {
+  if ([name length] == 0) {
+    return;
   }
+  pthread_rwlock_wrlock(&_handlesLock);
+  [_gauges removeObjectForKey:name];
+  pthread_rwlock_unlock(&_handlesLock);
+}
+
+- (void)copyHandlesCounters:(NSArray **)counters gauges:(NSArray **)gauges timings:(NSArray **)timings {
+  pthread_rwlock_rdlock(&_handlesLock);
+  NSArray *allCounters = [_counters allValues];
+  NSArray *allGauges = [_gauges allValues];
+  NSArray *allTimings = [_timings allValues];
+  pthread_rwlock_unlock(&_handlesLock);
+  NSPredicate *observed = [NSPredicate predicateWithBlock:^BOOL(id handle, NSDictionary *bindings) {
+    (void)bindings;
+    return [handle isObserved];
+  }];
+  *counters = [allCounters filteredArrayUsingPredicate:observed];
+  *gauges = [allGauges filteredArrayUsingPredicate:observed];
+  *timings = [allTimings filteredArrayUsingPredicate:observed];
 }
 
 - (NSDictionary *)snapshot {
-  @synchronized(self) {
-    NSMutableDictionary *timingsSnapshot = [NSMutableDictionary dictionary];
-    for (NSString *name in self.timings) {
-      NSDictionary *entry = self.timings[name];
-      double count = [entry[@"count"] doubleValue];
-      double sum = [entry[@"sum"] doubleValue];
-      double min = [entry[@"min"] doubleValue];
-      double max = [entry[@"max"] doubleValue];
-      timingsSnapshot[name] = ALNTimingEntry(count, sum, min, max);
-    }
-
-    return @{
-      @"counters" : [NSDictionary dictionaryWithDictionary:self.counters],
-      @"gauges" : [NSDictionary dictionaryWithDictionary:self.gauges],
-      @"timings" : timingsSnapshot,
+  NSArray *counters = nil;
+  NSArray *gauges = nil;
+  NSArray *timings = nil;
+  [self copyHandlesCounters:&counters gauges:&gauges timings:&timings];
+
+  NSMutableDictionary *countersSnapshot = [NSMutableDictionary dictionary];
+  for (ALNMetricsCounter *counter in counters) {
+    countersSnapshot[counter.name] = @([counter value]);
+  }
+  NSMutableDictionary *gaugesSnapshot = [NSMutableDictionary dictionary];
+  for (ALNMetricsGauge *gauge in gauges) {
+    gaugesSnapshot[gauge.name] = @([gauge value]);
+  }
+  NSMutableDictionary *timingsSnapshot = [NSMutableDictionary dictionary];
+  for (ALNMetricsTiming *timing in timings) {
+    ALNMetricsHistogram *histogram = [timing histogram];
+    double count = (double)histogram.count;
+    timingsSnapshot[timing.name] = @{
+      @"count" : @(count),
+      @"sum" : @(histogram.sum),
+      @"min" : @(count > 0.0 ? histogram.min : 0.0),
+      @"max" : @(count > 0.0 ? histogram.max : 0.0),
+      @"avg" : @(count > 0.0 ? histogram.sum / count : 0.0),
+      @"p50" : @([histogram valueAtQuantile:0.50]),
+      @"p95" : @([histogram valueAtQuantile:0.95]),
+      @"p99" : @([histogram valueAtQuantile:0.99]),
     };
   }
+
+  return @{
+    @"counters" : countersSnapshot,
+    @"gauges" : gaugesSnapshot,
+    @"timings" : timingsSnapshot,
+  };
+}
+
+- (NSDictionary *)histogramSnapshot {
+  NSArray *counters = nil;
+  NSArray *gauges = nil;
+  NSArray *timings = nil;
+  [self copyHandlesCounters:&counters gauges:&gauges timings:&timings];
+  NSMutableDictionary *histograms = [NSMutableDictionary dictionary];
+  for (ALNMetricsTiming *timing in timings) {
+    histograms[timing.name] = [[timing histogram] dictionaryRepresentation];
+  }
+  return histograms;
+}
+
+- (void)mergeHistogramSnapshot:(NSDictionary *)histogramSnapshot {
+  if (![histogramSnapshot isKindOfClass:[NSDictionary class]]) {
+    return;
+  }
+  for (NSString *name in histogramSnapshot) {
+    if (![name isKindOfClass:[NSString class]]) {
+      continue;
+    }
+    [[self timingNamed:name] mergeDictionaryRepresentation:histogramSnapshot[name]];
+  }
 }
 
 - (NSString *)prometheusText {
-  NSDictionary *snapshot = [self snapshot];
-  NSDictionary *counters = [snapshot[@"counters"] isKindOfClass:[NSDictionary class]]
-                               ? snapshot[@"counters"]
-                               : @{};
-  NSDictionary *gauges = [snapshot[@"gauges"] isKindOfClass:[NSDictionary class]]
-                             ? snapshot[@"gauges"]
-                             : @{};
-  NSDictionary *timings = [snapshot[@"timings"] isKindOfClass:[NSDictionary class]]
-                              ? snapshot[@"timings"]
-                              : @{};
+  NSArray *counters = nil;
+  NSArray *gauges = nil;
+  NSArray *timings = nil;
+  [self copyHandlesCounters:&counters gauges:&gauges timings:&timings];
+  NSArray *byName = @[ [NSSortDescriptor sortDescriptorWithKey:@"name" ascending:YES] ];
 
   NSMutableString *out = [NSMutableString string];
 
-  NSArray *counterNames = [[counters allKeys] sortedArrayUsingSelector:@selector(compare:)];
-  for (NSString *name in counterNames) {
-    NSString *metricName = ALNSanitizeMetricName([NSString stringWithFormat:@"aln_%@", name]);
+  for (ALNMetricsCounter *counter in [counters sortedArrayUsingDescriptors:byName]) {
+    NSString *metricName = counter.exportedName;
     [out appendFormat:@"# TYPE %@ counter\n", metricName];
-    [out appendFormat:@"%@ %.3f\n", metricName, [counters[name] doubleValue]];
+    [out appendFormat:@"%@ %.3f\n", metricName, [counter value]];
   }
 
-  NSArray *gaugeNames = [[gauges allKeys] sortedArrayUsingSelector:@selector(compare:)];
-  for (NSString *name in gaugeNames) {
-    NSString *metricName = ALNSanitizeMetricName([NSString stringWithFormat:@"aln_%@", name]);
+  for (ALNMetricsGauge *gauge in [gauges sortedArrayUsingDescriptors:byName]) {
+    NSString *metricName = gauge.exportedName;
     [out appendFormat:@"# TYPE %@ gauge\n", metricName];
-    [out appendFormat:@"%@ %.3f\n", metricName, [gauges[name] doubleValue]];
-  }
-
-  NSArray *timingNames = [[timings allKeys] sortedArrayUsingSelector:@selector(compare:)];
-  for (NSString *name in timingNames) {
-    NSDictionary *entry = timings[name];
-    NSString *baseName = ALNSanitizeMetricName([NSString stringWithFormat:@"aln_%@", name]);
-    [out appendFormat:@"# TYPE %@ summary\n", baseName];
-    [out appendFormat:@"%@_count %.0f\n", baseName, [entry[@"count"] doubleValue]];
-    [out appendFormat:@"%@_sum %.3f\n", baseName, [entry[@"sum"] doubleValue]];
-    [out appendFormat:@"%@_min %.3f\n", baseName, [entry[@"min"] doubleValue]];
-    [out appendFormat:@"%@_max %.3f\n", baseName, [entry[@"max"] doubleValue]];
-    [out appendFormat:@"%@_avg %.3f\n", baseName, [entry[@"avg"] doubleValue]];
+    [out appendFormat:@"%@ %.3f\n", metricName, [gauge value]];
+  }
+
+  for (ALNMetricsTiming *timing in [timings sortedArrayUsingDescriptors:byName]) {
+    ALNMetricsHistogram *histogram = [timing histogram];
+    NSArray *boundaries = histogram.boundaries;
+    NSArray *counts = [histogram bucketCounts];
+    unsigned long long count = histogram.count;
+    NSString *baseName = timing.exportedName;
+    [out appendFormat:@"# TYPE %@ histogram\n", baseName];
+    unsigned long long cumulative = 0;
+    for (NSUInteger idx = 0; idx < [boundaries count]; idx++) {
+      cumulative += [counts[idx] unsignedLongLongValue];
+      [out appendFormat:@"%@_bucket{le=\"%@\"} %llu\n",
+                        baseName,
+                        ALNMetricBoundaryLabel([boundaries[idx] doubleValue]),
+                        cumulative];
+    }
+    [out appendFormat:@"%@_bucket{le=\"+Inf\"} %llu\n", baseName, count];
+    [out appendFormat:@"%@_sum %.3f\n", baseName, histogram.sum];
+    [out appendFormat:@"%@_count %llu\n", baseName, count];
+    // min/max/avg predate the histogram layout; they stay as separate gauge
+    // families so existing dashboards keep working.
+    [out appendFormat:@"# TYPE %@_min gauge\n", baseName];
+    [out appendFormat:@"%@_min %.3f\n", baseName, count > 0 ? histogram.min : 0.0];
+    [out appendFormat:@"# TYPE %@_max gauge\n", baseName];
+    [out appendFormat:@"%@_max %.3f\n", baseName, count > 0 ? histogram.max : 0.0];
+    [out appendFormat:@"# TYPE %@_avg gauge\n", baseName];
+    [out appendFormat:@"%@_avg %.3f\n", baseName, count > 0 ? histogram.sum / (double)count : 0.0];
   }
 
   return out;
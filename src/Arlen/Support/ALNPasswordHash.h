@@ -18,6 +18,7 @@ typedef NS_ENUM(NSInteger, ALNPasswordHashErrorCode) {
   ALNPasswordHashErrorMalformedEncodedHash = 5,
   ALNPasswordHashErrorUnsupportedEncodedHash = 6,
   ALNPasswordHashErrorVerificationFailed = 7,
+  ALNPasswordHashErrorExecutorSaturated = 8,
 };
 
 typedef struct {
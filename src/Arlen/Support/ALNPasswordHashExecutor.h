@@ -0,0 +1,55 @@
+#ifndef ALN_PASSWORD_HASH_EXECUTOR_H
+#define ALN_PASSWORD_HASH_EXECUTOR_H
+
+#import <Foundation/Foundation.h>
+
+#import "ALNPasswordHash.h"
+
+@class ALNMetricsRegistry;
+
+NS_ASSUME_NONNULL_BEGIN
+
+// NSNumber seconds a rejected caller should wait before retrying.
+extern NSString *const ALNPasswordHashRetryAfterSecondsKey;
+
+// Admission control for Argon2id work. At most `maxConcurrent` hashes run at
+// once, their combined Argon2 memory stays under `memoryBudgetKiB`, and at
+// most `maxQueueDepth` callers wait for a slot. Callers beyond that, or
+// callers that wait longer than `queueTimeoutSeconds`, fail immediately with
+// ALNPasswordHashErrorExecutorSaturated instead of tying up a request thread.
+// A `queueTimeoutSeconds` of 0 rejects every caller that cannot start at once.
+@interface ALNPasswordHashExecutor : NSObject
+
+@property(nonatomic, assign, readonly) NSUInteger maxConcurrent;
+@property(nonatomic, assign, readonly) NSUInteger maxQueueDepth;
+@property(nonatomic, assign, readonly) NSTimeInterval queueTimeoutSeconds;
+@property(nonatomic, assign, readonly) NSUInteger memoryBudgetKiB;
+@property(nonatomic, strong, nullable) ALNMetricsRegistry *metrics;
+
++ (ALNPasswordHashExecutor *)sharedExecutor;
++ (void)setSharedExecutor:(nullable ALNPasswordHashExecutor *)executor;
+
+- (instancetype)initWithMaxConcurrent:(NSUInteger)maxConcurrent
+                        maxQueueDepth:(NSUInteger)maxQueueDepth
+                  queueTimeoutSeconds:(NSTimeInterval)queueTimeoutSeconds
+                      memoryBudgetKiB:(NSUInteger)memoryBudgetKiB;
+
+- (nullable NSString *)hashPasswordString:(NSString *)password
+                                  options:(ALNArgon2idOptions)options
+                                    error:(NSError *_Nullable *_Nullable)error;
+- (BOOL)verifyPasswordString:(NSString *)password
+           againstEncodedHash:(NSString *)encodedHash
+                        error:(NSError *_Nullable *_Nullable)error;
+
+// Runs `block` once a slot with `memoryKiB` of budget is available.
+- (BOOL)performWithMemoryKiB:(NSUInteger)memoryKiB
+                       error:(NSError *_Nullable *_Nullable)error
+                       block:(void (^)(void))block;
+
+- (NSDictionary *)statusSnapshot;
+
+@end
+
+NS_ASSUME_NONNULL_END
+
+#endif
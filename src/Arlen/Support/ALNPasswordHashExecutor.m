@@ -0,0 +1,250 @@
+#import "ALNPasswordHashExecutor.h"
+
+#import "ALNMetrics.h"
+
+#include <math.h>
+#include <time.h>
+
+NSString *const ALNPasswordHashRetryAfterSecondsKey = @"ALNPasswordHashRetryAfterSeconds";
+
+static ALNPasswordHashExecutor *gSharedPasswordHashExecutor = nil;
+
+static double ALNPasswordHashMonotonicMilliseconds(void) {
+  struct timespec now;
+  clock_gettime(CLOCK_MONOTONIC, &now);
+  return ((double)now.tv_sec * 1000.0) + ((double)now.tv_nsec / 1000000.0);
+}
+
+// Reads the m= cost from a PHC string so verification is admitted against
+// the memory it will actually use, not the current default policy.
+static NSUInteger ALNPasswordHashMemoryKiBFromEncodedHash(NSString *encodedHash) {
+  NSUInteger fallback = [ALNPasswordHash defaultArgon2idOptions].memoryKiB;
+  if (![encodedHash isKindOfClass:[NSString class]]) {
+    return fallback;
+  }
+  NSRange marker = [encodedHash rangeOfString:@"$m="];
+  if (marker.location == NSNotFound) {
+    return fallback;
+  }
+  NSScanner *scanner =
+      [NSScanner scannerWithString:[encodedHash substringFromIndex:NSMaxRange(marker)]];
+  long long parsed = 0;
+  if (![scanner scanLongLong:&parsed] || parsed <= 0) {
+    return fallback;
+  }
+  return (NSUInteger)parsed;
+}
+
+@implementation ALNPasswordHashExecutor {
+  NSCondition *_condition;
+  NSUInteger _inFlight;
+  NSUInteger _inFlightMemoryKiB;
+  NSUInteger _waiting;
+  double _averageDurationMilliseconds;
+  unsigned long long _completedCount;
+  unsigned long long _rejectedCount;
+}
+
++ (ALNPasswordHashExecutor *)sharedExecutor {
+  @synchronized(self) {
+    if (gSharedPasswordHashExecutor == nil) {
+      gSharedPasswordHashExecutor = [[ALNPasswordHashExecutor alloc] initWithMaxConcurrent:2
+                                                                             maxQueueDepth:2
+                                                                       queueTimeoutSeconds:0.25
+                                                                           memoryBudgetKiB:131072];
+    }
+    return gSharedPasswordHashExecutor;
+  }
+}
+
++ (void)setSharedExecutor:(ALNPasswordHashExecutor *)executor {
+  @synchronized(self) {
+    gSharedPasswordHashExecutor = executor;
+  }
+}
+
+- (instancetype)init {
+  return [self initWithMaxConcurrent:2 maxQueueDepth:2 queueTimeoutSeconds:0.25 memoryBudgetKiB:131072];
+}
+
+- (instancetype)initWithMaxConcurrent:(NSUInteger)maxConcurrent
+                        maxQueueDepth:(NSUInteger)maxQueueDepth
+                  queueTimeoutSeconds:(NSTimeInterval)queueTimeoutSeconds
+                      memoryBudgetKiB:(NSUInteger)memoryBudgetKiB {
+  self = [super init];
+  if (self) {
+    _maxConcurrent = (maxConcurrent > 0) ? maxConcurrent : 1;
+    _maxQueueDepth = maxQueueDepth;
+    _queueTimeoutSeconds = (queueTimeoutSeconds >= 0.0) ? queueTimeoutSeconds : 0.25;
+    _memoryBudgetKiB = (memoryBudgetKiB > 0) ? memoryBudgetKiB : 131072;
+    _condition = [[NSCondition alloc] init];
+    _averageDurationMilliseconds = 50.0;
+  }
+  return self;
+}
+
+- (BOOL)canStartWithCostLocked:(NSUInteger)cost {
+  if (_inFlight >= self.maxConcurrent) {
+    return NO;
+  }
+  // A single job larger than the whole budget still runs, but alone.
+  return (_inFlight == 0 || (_inFlightMemoryKiB + cost) <= self.memoryBudgetKiB);
+}
+
+- (NSUInteger)retryAfterSecondsLocked {
+  double backlog = (double)(_waiting + _inFlight + 1) / (double)self.maxConcurrent;
+  double seconds = ceil((_averageDurationMilliseconds * backlog) / 1000.0);
+  return (NSUInteger)MAX(1.0, seconds);
+}
+
+- (void)publishGaugesWithInFlight:(NSUInteger)inFlight waiting:(NSUInteger)waiting {
+  ALNMetricsRegistry *metrics = self.metrics;
+  if (metrics == nil) {
+    return;
+  }
+  [metrics setGauge:@"password_hash_in_flight" value:(double)inFlight];
+  [metrics setGauge:@"password_hash_queue_depth" value:(double)waiting];
+}
+
+- (NSError *)saturationErrorWithReason:(NSString *)reason retryAfter:(NSUInteger)retryAfter {
+  return [NSError errorWithDomain:ALNPasswordHashErrorDomain
+                             code:ALNPasswordHashErrorExecutorSaturated
+                         userInfo:@{
+                           NSLocalizedDescriptionKey : @"password hashing is temporarily overloaded",
+                           @"reason" : reason ?: @"",
+                           ALNPasswordHashRetryAfterSecondsKey : @(retryAfter),
+                         }];
+}
+
+- (BOOL)performWithMemoryKiB:(NSUInteger)memoryKiB
+                       error:(NSError **)error
+                       block:(void (^)(void))block {
+  if (block == nil) {
+    return YES;
+  }
+  NSUInteger cost = MIN(memoryKiB, self.memoryBudgetKiB);
+  double waitStarted = ALNPasswordHashMonotonicMilliseconds();
+  NSString *rejection = nil;
+  NSUInteger retryAfter = 0;
+  NSUInteger inFlight = 0;
+  NSUInteger waiting = 0;
+
+  [_condition lock];
+  BOOL admitted = [self canStartWithCostLocked:cost];
+  if (!admitted) {
+    if (_waiting >= self.maxQueueDepth || self.queueTimeoutSeconds <= 0.0) {
+      rejection = @"queue_full";
+    } else {
+      _waiting += 1;
+      [self publishGaugesWithInFlight:_inFlight waiting:_waiting];
+      NSDate *deadline = [NSDate dateWithTimeIntervalSinceNow:self.queueTimeoutSeconds];
+      while (!(admitted = [self canStartWithCostLocked:cost])) {
+        if (![_condition waitUntilDate:deadline]) {
+          admitted = [self canStartWithCostLocked:cost];
+          break;
+        }
+      }
+      _waiting -= 1;
+      if (!admitted) {
+        rejection = @"queue_timeout";
+      }
+    }
+  }
+  if (admitted) {
+    _inFlight += 1;
+    _inFlightMemoryKiB += cost;
+  } else {
+    _rejectedCount += 1;
+    retryAfter = [self retryAfterSecondsLocked];
+  }
+  inFlight = _inFlight;
+  waiting = _waiting;
+  [_condition unlock];
+
+  [self publishGaugesWithInFlight:inFlight waiting:waiting];
+  if (!admitted) {
+    [self.metrics incrementCounter:@"password_hash_rejected_total"];
+    if (error != NULL) {
+      *error = [self saturationErrorWithReason:rejection retryAfter:retryAfter];
+    }
+    return NO;
+  }
+
+  double started = ALNPasswordHashMonotonicMilliseconds();
+  [self.metrics recordTiming:@"password_hash_wait_ms" milliseconds:(started - waitStarted)];
+  @try {
+    block();
+  } @finally {
+    double duration = ALNPasswordHashMonotonicMilliseconds() - started;
+    [_condition lock];
+    _inFlight -= 1;
+    _inFlightMemoryKiB -= cost;
+    _completedCount += 1;
+    _averageDurationMilliseconds = (_averageDurationMilliseconds * 0.8) + (duration * 0.2);
+    inFlight = _inFlight;
+    waiting = _waiting;
+    [_condition broadcast];
+    [_condition unlock];
+
+    [self publishGaugesWithInFlight:inFlight waiting:waiting];
+    [self.metrics incrementCounter:@"password_hash_operations_total"];
+    [self.metrics recordTiming:@"password_hash_duration_ms" milliseconds:duration];
+  }
+  return YES;
+}
+
+- (NSString *)hashPasswordString:(NSString *)password
+                         options:(ALNArgon2idOptions)options
+                           error:(NSError **)error {
+  __block NSString *encodedHash = nil;
+  __block NSError *hashError = nil;
+  BOOL ran = [self performWithMemoryKiB:options.memoryKiB
+                                  error:error
+                                  block:^{
+                                    encodedHash = [ALNPasswordHash hashPasswordString:password
+                                                                              options:options
+                                                                                error:&hashError];
+                                  }];
+  if (ran && encodedHash == nil && error != NULL) {
+    *error = hashError;
+  }
+  return encodedHash;
+}
+
+- (BOOL)verifyPasswordString:(NSString *)password
+           againstEncodedHash:(NSString *)encodedHash
+                        error:(NSError **)error {
+  __block BOOL verified = NO;
+  __block NSError *verifyError = nil;
+  BOOL ran = [self performWithMemoryKiB:ALNPasswordHashMemoryKiBFromEncodedHash(encodedHash)
+                                  error:error
+                                  block:^{
+                                    verified = [ALNPasswordHash verifyPasswordString:password
+                                                                  againstEncodedHash:encodedHash
+                                                                               error:&verifyError];
+                                  }];
+  if (ran && !verified && error != NULL) {
+    *error = verifyError;
+  }
+  return verified;
+}
+
+- (NSDictionary *)statusSnapshot {
+  [_condition lock];
+  NSDictionary *snapshot = @{
+    @"maxConcurrent" : @(self.maxConcurrent),
+    @"maxQueueDepth" : @(self.maxQueueDepth),
+    @"queueTimeoutSeconds" : @(self.queueTimeoutSeconds),
+    @"memoryBudgetKiB" : @(self.memoryBudgetKiB),
+    @"inFlight" : @(_inFlight),
+    @"inFlightMemoryKiB" : @(_inFlightMemoryKiB),
+    @"queueDepth" : @(_waiting),
+    @"completed" : @(_completedCount),
+    @"rejected" : @(_rejectedCount),
+    @"averageDurationMs" : @(_averageDurationMilliseconds),
+  };
+  [_condition unlock];
+  return snapshot;
+}
+
+@end
@@ -5,8 +5,32 @@
 
 NS_ASSUME_NONNULL_BEGIN
 
+// Built-in request stages. Each has a fixed slot in ALNPerfTrace; any other
+// stage name still works through the string API at dictionary cost.
+typedef NS_ENUM(NSUInteger, ALNPerfStage) {
+  ALNPerfStageTotal = 0,
+  ALNPerfStageParse = 1,
+  ALNPerfStageRoute = 2,
+  ALNPerfStageMiddleware = 3,
+  ALNPerfStageController = 4,
+  ALNPerfStageRender = 5,
+  ALNPerfStageSerialize = 6,
+  ALNPerfStageResponseWrite = 7,
+  ALNPerfStageCount = 8,
+};
+
+uint64_t ALNPerfMonotonicNanoseconds(void);
+NSString *ALNPerfStageName(ALNPerfStage stage);
+
+// Per-request stage timer on the monotonic clock. Repeated start/end pairs
+// for one stage accumulate, so a stage entered twice reports its total.
+// Not thread-safe; a trace belongs to one request.
 @interface ALNPerfTrace : NSObject
 
+// Name of the matched route, once routing has run; lower layers use it to
+// attribute their work (for example ALNSQLStatementStats).
+@property(nonatomic, copy, nullable) NSString *routeName;
+
 - (instancetype)initWithEnabled:(BOOL)enabled;
 - (BOOL)isEnabled;
 - (void)startStage:(NSString *)stage;
@@ -15,6 +39,27 @@ NS_ASSUME_NONNULL_BEGIN
 - (nullable NSNumber *)durationMillisecondsForStage:(NSString *)stage;
 - (NSDictionary *)dictionaryRepresentation;
 
+- (void)startStageID:(ALNPerfStage)stage;
+- (void)endStageID:(ALNPerfStage)stage;
+- (void)setStageID:(ALNPerfStage)stage durationMilliseconds:(double)durationMs;
+- (BOOL)hasDurationForStageID:(ALNPerfStage)stage;
+- (double)durationMillisecondsForStageID:(ALNPerfStage)stage;
+
+// `Server-Timing` header value (`total;dur=1.234, route;dur=0.010, ...`)
+// listing every recorded stage, or an empty string.
+- (NSString *)serverTimingHeaderValue;
+
+// The trace of the request being dispatched on the calling thread, if any.
+// Lower layers such as ALNPg attribute their work to it. The caller keeps
+// the trace alive while it is current.
++ (nullable ALNPerfTrace *)currentTrace;
++ (void)setCurrentTrace:(nullable ALNPerfTrace *)trace;
+
+// Database round trips attributed to this request.
+- (void)recordDatabaseQueryMilliseconds:(double)durationMs;
+- (NSUInteger)databaseQueryCount;
+- (double)databaseQueryMilliseconds;
+
 @end
 
 NS_ASSUME_NONNULL_END
@@ -1,14 +1,68 @@
 #import "ALNPerf.h"
 
+#include <time.h>
+
+static NSString *const ALNPerfStageNames[ALNPerfStageCount] = {
+  @"total",
+  @"parse",
+  @"route",
+  @"middleware",
+  @"controller",
+  @"render",
+  @"serialize",
+  @"response_write",
+};
+
+uint64_t ALNPerfMonotonicNanoseconds(void) {
+  struct timespec now;
+  clock_gettime(CLOCK_MONOTONIC, &now);
+  return ((uint64_t)now.tv_sec * 1000000000ull) + (uint64_t)now.tv_nsec;
+}
+
+NSString *ALNPerfStageName(ALNPerfStage stage) {
+  return (stage < ALNPerfStageCount) ? ALNPerfStageNames[stage] : @"";
+}
+
+static NSInteger ALNPerfStageIDForName(NSString *stage) {
+  for (NSUInteger idx = 0; idx < ALNPerfStageCount; idx++) {
+    if (stage == ALNPerfStageNames[idx]) {
+      return (NSInteger)idx;
+    }
+  }
+  for (NSUInteger idx = 0; idx < ALNPerfStageCount; idx++) {
+    if ([stage isEqualToString:ALNPerfStageNames[idx]]) {
+      return (NSInteger)idx;
+    }
+  }
+  return -1;
+}
+
+static __thread __unsafe_unretained ALNPerfTrace *gALNPerfCurrentTrace = nil;
+
 @interface ALNPerfTrace ()
 
-@property(nonatomic, strong) NSMutableDictionary *startedAt;
-@property(nonatomic, strong) NSMutableDictionary *durationsMs;
+@property(nonatomic, strong) NSMutableDictionary *customStartedAt;
+@property(nonatomic, strong) NSMutableDictionary *customDurationsMs;
 @property(nonatomic, assign) BOOL enabled;
 
 @end
 
-@implementation ALNPerfTrace
+@implementation ALNPerfTrace {
+  uint64_t _startedNanoseconds[ALNPerfStageCount];
+  double _durationsMs[ALNPerfStageCount];
+  uint32_t _runningMask;
+  uint32_t _recordedMask;
+  NSUInteger _databaseQueryCount;
+  double _databaseQueryMs;
+}
+
++ (ALNPerfTrace *)currentTrace {
+  return gALNPerfCurrentTrace;
+}
+
++ (void)setCurrentTrace:(ALNPerfTrace *)trace {
+  gALNPerfCurrentTrace = trace;
+}
 
 - (instancetype)init {
   return [self initWithEnabled:YES];
@@ -18,16 +72,71 @@
   self = [super init];
   if (self) {
     _enabled = enabled;
-    _startedAt = [NSMutableDictionary dictionary];
-    _durationsMs = [NSMutableDictionary dictionary];
   }
   return self;
 }
 
+- (void)dealloc {
+  if (gALNPerfCurrentTrace == self) {
+    gALNPerfCurrentTrace = nil;
+  }
+}
+
 - (BOOL)isEnabled {
   return self.enabled;
 }
 
+- (void)startStageID:(ALNPerfStage)stage {
+  if (!_enabled || stage >= ALNPerfStageCount) {
+    return;
+  }
+  _startedNanoseconds[stage] = ALNPerfMonotonicNanoseconds();
+  _runningMask |= (1u << stage);
+}
+
+- (void)endStageID:(ALNPerfStage)stage {
+  if (!_enabled || stage >= ALNPerfStageCount || (_runningMask & (1u << stage)) == 0) {
+    return;
+  }
+  uint64_t now = ALNPerfMonotonicNanoseconds();
+  double elapsedMs = (double)(now - _startedNanoseconds[stage]) / 1000000.0;
+  _durationsMs[stage] = ((_recordedMask & (1u << stage)) != 0) ? _durationsMs[stage] + elapsedMs : elapsedMs;
+  _runningMask &= ~(1u << stage);
+  _recordedMask |= (1u << stage);
+}
+
+- (void)setStageID:(ALNPerfStage)stage durationMilliseconds:(double)durationMs {
+  if (!_enabled || stage >= ALNPerfStageCount) {
+    return;
+  }
+  _durationsMs[stage] = durationMs;
+  _recordedMask |= (1u << stage);
+}
+
+- (BOOL)hasDurationForStageID:(ALNPerfStage)stage {
+  return _enabled && stage < ALNPerfStageCount && (_recordedMask & (1u << stage)) != 0;
+}
+
+- (double)durationMillisecondsForStageID:(ALNPerfStage)stage {
+  return [self hasDurationForStageID:stage] ? _durationsMs[stage] : 0.0;
+}
+
+- (void)recordDatabaseQueryMilliseconds:(double)durationMs {
+  if (!_enabled) {
+    return;
+  }
+  _databaseQueryCount += 1;
+  _databaseQueryMs += (durationMs > 0.0) ? durationMs : 0.0;
+}
+
+- (NSUInteger)databaseQueryCount {
+  return _databaseQueryCount;
+}
+
+- (double)databaseQueryMilliseconds {
+  return _databaseQueryMs;
+}
+
 - (void)startStage:(NSString *)stage {
   if (!self.enabled) {
     return;
@@ -35,21 +144,41 @@
   if ([stage length] == 0) {
     return;
   }
-  self.startedAt[stage] = @([[NSDate date] timeIntervalSinceReferenceDate]);
+  NSInteger stageID = ALNPerfStageIDForName(stage);
+  if (stageID >= 0) {
+    [self startStageID:(ALNPerfStage)stageID];
+    return;
+  }
+  if (self.customStartedAt == nil) {
+    self.customStartedAt = [NSMutableDictionary dictionary];
+  }
+  self.customStartedAt[stage] = @(ALNPerfMonotonicNanoseconds());
 }
 
 - (void)endStage:(NSString *)stage {
   if (!self.enabled) {
     return;
   }
-  NSNumber *start = self.startedAt[stage];
+  if ([stage length] == 0) {
+    return;
+  }
+  NSInteger stageID = ALNPerfStageIDForName(stage);
+  if (stageID >= 0) {
+    [self endStageID:(ALNPerfStage)stageID];
+    return;
+  }
+  NSNumber *start = self.customStartedAt[stage];
   if (start == nil) {
     return;
   }
-  double now = [[NSDate date] timeIntervalSinceReferenceDate];
-  double elapsedMs = (now - [start doubleValue]) * 1000.0;
-  self.durationsMs[stage] = @(elapsedMs);
-  [self.startedAt removeObjectForKey:stage];
+  uint64_t now = ALNPerfMonotonicNanoseconds();
+  double elapsedMs = (double)(now - [start unsignedLongLongValue]) / 1000000.0;
+  if (self.customDurationsMs == nil) {
+    self.customDurationsMs = [NSMutableDictionary dictionary];
+  }
+  double previous = [self.customDurationsMs[stage] doubleValue];
+  self.customDurationsMs[stage] = @(previous + elapsedMs);
+  [self.customStartedAt removeObjectForKey:stage];
 }
 
 - (void)setStage:(NSString *)stage durationMilliseconds:(double)durationMs {
@@ -59,21 +188,73 @@
   if ([stage length] == 0) {
     return;
   }
-  self.durationsMs[stage] = @(durationMs);
+  NSInteger stageID = ALNPerfStageIDForName(stage);
+  if (stageID >= 0) {
+    [self setStageID:(ALNPerfStage)stageID durationMilliseconds:durationMs];
+    return;
+  }
+  if (self.customDurationsMs == nil) {
+    self.customDurationsMs = [NSMutableDictionary dictionary];
+  }
+  self.customDurationsMs[stage] = @(durationMs);
 }
 
 - (NSNumber *)durationMillisecondsForStage:(NSString *)stage {
-  if (!self.enabled) {
+  if (!self.enabled || [stage length] == 0) {
     return nil;
   }
-  return self.durationsMs[stage];
+  NSInteger stageID = ALNPerfStageIDForName(stage);
+  if (stageID >= 0) {
+    return [self hasDurationForStageID:(ALNPerfStage)stageID] ? @(_durationsMs[stageID]) : nil;
+  }
+  return self.customDurationsMs[stage];
 }
 
 - (NSDictionary *)dictionaryRepresentation {
   if (!self.enabled) {
     return @{};
   }
-  return [NSDictionary dictionaryWithDictionary:self.durationsMs];
+  NSMutableDictionary *durations =
+      [NSMutableDictionary dictionaryWithDictionary:self.customDurationsMs ?: @{}];
+  for (NSUInteger idx = 0; idx < ALNPerfStageCount; idx++) {
+    if ((_recordedMask & (1u << idx)) != 0) {
+      durations[ALNPerfStageNames[idx]] = @(_durationsMs[idx]);
+    }
+  }
+  return durations;
+}
+
+- (NSString *)serverTimingHeaderValue {
+  if (!self.enabled) {
+    return @"";
+  }
+  NSMutableString *value = [NSMutableString string];
+  for (NSUInteger idx = 0; idx < ALNPerfStageCount; idx++) {
+    if ((_recordedMask & (1u << idx)) == 0) {
+      continue;
+    }
+    [value appendFormat:@"%@%@;dur=%.3f",
+                        ([value length] > 0) ? @", " : @"",
+                        ALNPerfStageNames[idx],
+                        _durationsMs[idx]];
+  }
+  NSArray *customStages =
+      [[self.customDurationsMs allKeys] sortedArrayUsingSelector:@selector(compare:)];
+  NSCharacterSet *invalid =
+      [[NSCharacterSet characterSetWithCharactersInString:
+                           @"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-.!#$%&'*+^`|~"]
+          invertedSet];
+  for (NSString *stage in customStages) {
+    // Server-Timing metric names must be HTTP tokens.
+    if ([stage rangeOfCharacterFromSet:invalid].location != NSNotFound) {
+      continue;
+    }
+    [value appendFormat:@"%@%@;dur=%.3f",
+                        ([value length] > 0) ? @", " : @"",
+                        stage,
+                        [self.customDurationsMs[stage] doubleValue]];
+  }
+  return value;
 }
 
 @end
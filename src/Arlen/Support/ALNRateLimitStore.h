@@ -0,0 +1,64 @@
+#ifndef ALN_RATE_LIMIT_STORE_H
+#define ALN_RATE_LIMIT_STORE_H
+
+#import <Foundation/Foundation.h>
+
+@class ALNRedisCacheAdapter;
+
+NS_ASSUME_NONNULL_BEGIN
+
+extern NSString *const ALNRateLimitStoreErrorDomain;
+
+typedef struct {
+  BOOL allowed;
+  NSUInteger remaining;
+  NSUInteger retryAfterSeconds;
+} ALNRateLimitDecision;
+
+// Token-bucket storage for ALNRateLimitMiddleware. A bucket holds up to
+// `capacity` tokens and refills continuously at `refillPerSecond`; each
+// request takes one token.
+@protocol ALNRateLimitStore <NSObject>
+
+- (NSString *)storeName;
+- (BOOL)takeTokenForKey:(NSString *)key
+               capacity:(NSUInteger)capacity
+        refillPerSecond:(double)refillPerSecond
+               decision:(ALNRateLimitDecision *)decision
+                  error:(NSError *_Nullable *_Nullable)error;
+
+@end
+
+// Fixed-size hash table of token buckets guarded by sharded spinlocks. With a
+// path the table lives in a shared file mapping, so every worker process on
+// the host that maps the same path enforces one limit. Without a path the
+// table is private to the process. When a key's probe window is full the
+// least recently updated bucket in that window is evicted. Opening an
+// existing table with a different slot count fails instead of reformatting it.
+// A shard lock left behind by a worker that died is taken back once its
+// holder is gone or it has been held for over a second.
+@interface ALNSharedMemoryRateLimitStore : NSObject <ALNRateLimitStore>
+
+@property(nonatomic, copy, readonly, nullable) NSString *path;
+@property(nonatomic, assign, readonly) NSUInteger slotCount;
+
+- (nullable instancetype)initWithPath:(nullable NSString *)path
+                            slotCount:(NSUInteger)slotCount
+                                error:(NSError *_Nullable *_Nullable)error;
+
+@end
+
+// Token buckets kept in Redis and updated by one server-side script per
+// request, for limits shared across hosts. The script is loaded once and
+// invoked by digest over the adapter's reused connections. Buckets expire once idle long
+// enough to refill completely.
+@interface ALNRedisRateLimitStore : NSObject <ALNRateLimitStore>
+
+- (instancetype)initWithRedisAdapter:(ALNRedisCacheAdapter *)adapter
+                           namespace:(nullable NSString *)namespacePrefix;
+
+@end
+
+NS_ASSUME_NONNULL_END
+
+#endif
@@ -0,0 +1,506 @@
+#import "ALNRateLimitStore.h"
+
+#import "ALNServices.h"
+
+#include <errno.h>
+#include <fcntl.h>
+#include <math.h>
+#include <stdatomic.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/stat.h>
+#include <sys/types.h>
+
+#if !defined(_WIN32)
+#include <sched.h>
+#include <signal.h>
+#include <sys/file.h>
+#include <sys/mman.h>
+#include <time.h>
+#include <unistd.h>
+#endif
+
+NSString *const ALNRateLimitStoreErrorDomain = @"Arlen.RateLimit.Store.Error";
+
+static const uint64_t ALNRateLimitTableMagic = 0x414C4E524C543031ULL;  // "ALNRLT01"
+static const uint32_t ALNRateLimitTableVersion = 2;
+static const NSUInteger ALNRateLimitShardCount = 64;
+static const NSUInteger ALNRateLimitProbeWindow = 8;
+static const NSUInteger ALNRateLimitDefaultSlotCount = 65536;
+// A shard is held for one bucket update, so a lock held this long belongs
+// to a worker that died or was stopped, even if its pid is alive again.
+static const uint32_t ALNRateLimitStaleLockMilliseconds = 1000;
+
+typedef struct {
+  uint64_t magic;
+  uint32_t version;
+  uint32_t slotCount;
+  // Per shard, the holder's pid in the high 32 bits and the monotonic time
+  // it took the lock, in wrapping milliseconds, in the low 32; 0 when free.
+  _Atomic uint64_t shardLocks[64];
+} ALNRateLimitTableHeader;
+
+typedef struct {
+  uint64_t keyHash;
+  double tokens;
+  double updatedAt;
+} ALNRateLimitBucket;
+
+static NSError *ALNRateLimitStoreError(NSInteger code, NSString *message, NSString *path) {
+  NSMutableDictionary *userInfo = [NSMutableDictionary dictionary];
+  userInfo[NSLocalizedDescriptionKey] = message ?: @"rate limit store failure";
+  if ([path length] > 0) {
+    userInfo[NSFilePathErrorKey] = path;
+  }
+  if (errno != 0) {
+    userInfo[@"errno"] = @(errno);
+  }
+  return [NSError errorWithDomain:ALNRateLimitStoreErrorDomain code:code userInfo:userInfo];
+}
+
+static uint64_t ALNRateLimitKeyHash(NSString *key) {
+  const char *raw = [key UTF8String] ?: "";
+  uint64_t hash = 1469598103934665603ULL;
+  for (const unsigned char *cursor = (const unsigned char *)raw; *cursor != '\0'; cursor++) {
+    hash ^= (uint64_t)(*cursor);
+    hash *= 1099511628211ULL;
+  }
+  return (hash == 0) ? 1 : hash;
+}
+
+// Refills `tokens` for the time since `updatedAt`, then tries to take one.
+// A clock that moved backwards counts as no elapsed time.
+static void ALNRateLimitApplyBucket(double *tokens,
+                                    double *updatedAt,
+                                    NSUInteger capacity,
+                                    double refillPerSecond,
+                                    double now,
+                                    ALNRateLimitDecision *decision) {
+  double elapsed = now - *updatedAt;
+  if (elapsed < 0.0) {
+    elapsed = 0.0;
+  }
+  double available = *tokens + (elapsed * refillPerSecond);
+  if (available > (double)capacity) {
+    available = (double)capacity;
+  }
+  BOOL allowed = (available >= 1.0);
+  if (allowed) {
+    available -= 1.0;
+  }
+  *tokens = available;
+  *updatedAt = now;
+
+  decision->allowed = allowed;
+  decision->remaining = (NSUInteger)floor(available);
+  double retryAfter = (refillPerSecond > 0.0) ? (1.0 - available) / refillPerSecond : 1.0;
+  decision->retryAfterSeconds = allowed ? 0 : (NSUInteger)MAX(1.0, ceil(retryAfter));
+}
+
+static NSUInteger ALNRateLimitNormalizedSlotCount(NSUInteger requested) {
+  NSUInteger minimum = ALNRateLimitShardCount * ALNRateLimitProbeWindow;
+  NSUInteger target = (requested > 0) ? requested : ALNRateLimitDefaultSlotCount;
+  NSUInteger slotCount = minimum;
+  while (slotCount < target && slotCount < ((NSUInteger)UINT32_MAX / 2)) {
+    slotCount <<= 1;
+  }
+  return slotCount;
+}
+
+@interface ALNSharedMemoryRateLimitStore ()
+
+@property(nonatomic, copy, readwrite) NSString *path;
+@property(nonatomic, assign, readwrite) NSUInteger slotCount;
+
+@end
+
+@implementation ALNSharedMemoryRateLimitStore {
+  ALNRateLimitTableHeader *_header;
+  ALNRateLimitBucket *_buckets;
+  size_t _mappingLength;
+  BOOL _fileBacked;
+  int32_t _lockOwner;
+}
+
+- (instancetype)init {
+  return [self initWithPath:nil slotCount:0 error:NULL];
+}
+
+static void ALNRateLimitInitializeTable(ALNRateLimitTableHeader *header, NSUInteger slotCount) {
+  memset(header, 0, sizeof(ALNRateLimitTableHeader) + (slotCount * sizeof(ALNRateLimitBucket)));
+  header->version = ALNRateLimitTableVersion;
+  header->slotCount = (uint32_t)slotCount;
+  for (NSUInteger idx = 0; idx < ALNRateLimitShardCount; idx++) {
+    atomic_init(&header->shardLocks[idx], 0);
+  }
+  header->magic = ALNRateLimitTableMagic;
+}
+
+- (instancetype)initWithPath:(NSString *)path slotCount:(NSUInteger)slotCount error:(NSError **)error {
+  self = [super init];
+  if (!self) {
+    return nil;
+  }
+  _slotCount = ALNRateLimitNormalizedSlotCount(slotCount);
+  _mappingLength = sizeof(ALNRateLimitTableHeader) + (_slotCount * sizeof(ALNRateLimitBucket));
+  _path = ([path length] > 0) ? [path copy] : nil;
+
+  if (_path == nil) {
+    _header = calloc(1, _mappingLength);
+    if (_header == NULL) {
+      if (error != NULL) {
+        *error = ALNRateLimitStoreError(1, @"unable to allocate rate limit table", nil);
+      }
+      return nil;
+    }
+    ALNRateLimitInitializeTable(_header, _slotCount);
+    _buckets = (ALNRateLimitBucket *)(_header + 1);
+    _lockOwner = 1;
+    return self;
+  }
+
+#if defined(_WIN32)
+  if (error != NULL) {
+    *error = ALNRateLimitStoreError(2, @"shared rate limit tables are not supported on Windows", _path);
+  }
+  return nil;
+#else
+  NSString *directory = [_path stringByDeletingLastPathComponent];
+  if ([directory length] > 0) {
+    [[NSFileManager defaultManager] createDirectoryAtPath:directory
+                              withIntermediateDirectories:YES
+                                               attributes:nil
+                                                    error:NULL];
+  }
+  errno = 0;
+  int fd = open([_path fileSystemRepresentation], O_RDWR | O_CREAT, 0600);
+  if (fd < 0) {
+    if (error != NULL) {
+      *error = ALNRateLimitStoreError(3, @"unable to open shared rate limit table", _path);
+    }
+    return nil;
+  }
+  // The first process to take the file lock sizes and formats the table;
+  // later workers map what it wrote. A table that already exists with a
+  // different layout may be in use by other workers, so it is refused
+  // rather than resized or reformatted underneath them.
+  if (flock(fd, LOCK_EX) != 0) {
+    if (error != NULL) {
+      *error = ALNRateLimitStoreError(4, @"unable to lock shared rate limit table", _path);
+    }
+    close(fd);
+    return nil;
+  }
+  struct stat info;
+  if (fstat(fd, &info) != 0) {
+    if (error != NULL) {
+      *error = ALNRateLimitStoreError(5, @"unable to size shared rate limit table", _path);
+    }
+    flock(fd, LOCK_UN);
+    close(fd);
+    return nil;
+  }
+  if (info.st_size != 0 && (size_t)info.st_size != _mappingLength) {
+    if (error != NULL) {
+      *error = ALNRateLimitStoreError(7, @"shared rate limit table exists with a different layout", _path);
+    }
+    flock(fd, LOCK_UN);
+    close(fd);
+    return nil;
+  }
+  BOOL created = (info.st_size == 0);
+  if (created && ftruncate(fd, (off_t)_mappingLength) != 0) {
+    if (error != NULL) {
+      *error = ALNRateLimitStoreError(5, @"unable to size shared rate limit table", _path);
+    }
+    flock(fd, LOCK_UN);
+    close(fd);
+    return nil;
+  }
+  void *mapping = mmap(NULL, _mappingLength, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+  if (mapping == MAP_FAILED) {
+    if (error != NULL) {
+      *error = ALNRateLimitStoreError(6, @"unable to map shared rate limit table", _path);
+    }
+    flock(fd, LOCK_UN);
+    close(fd);
+    return nil;
+  }
+  _header = mapping;
+  if (created || _header->magic == 0) {
+    ALNRateLimitInitializeTable(_header, _slotCount);
+  } else if (_header->magic != ALNRateLimitTableMagic || _header->version != ALNRateLimitTableVersion ||
+             _header->slotCount != (uint32_t)_slotCount) {
+    munmap(mapping, _mappingLength);
+    _header = NULL;
+    if (error != NULL) {
+      *error = ALNRateLimitStoreError(7, @"shared rate limit table exists with a different layout", _path);
+    }
+    flock(fd, LOCK_UN);
+    close(fd);
+    return nil;
+  }
+  flock(fd, LOCK_UN);
+  close(fd);
+  _buckets = (ALNRateLimitBucket *)(_header + 1);
+  _fileBacked = YES;
+  _lockOwner = (int32_t)getpid();
+  return self;
+#endif
+}
+
+- (void)dealloc {
+  if (_header == NULL) {
+    return;
+  }
+#if !defined(_WIN32)
+  if (_fileBacked) {
+    munmap(_header, _mappingLength);
+    return;
+  }
+#endif
+  free(_header);
+}
+
+- (NSString *)storeName {
+  return _fileBacked ? @"shared_memory" : @"memory";
+}
+
+static uint32_t ALNRateLimitLockClockMilliseconds(void) {
+#if defined(_WIN32)
+  return 0;
+#else
+  struct timespec now;
+  clock_gettime(CLOCK_MONOTONIC, &now);
+  return (uint32_t)(((uint64_t)now.tv_sec * 1000ULL) + ((uint64_t)now.tv_nsec / 1000000ULL));
+#endif
+}
+
+static void ALNRateLimitLockShard(_Atomic uint64_t *lock, int32_t owner) {
+  NSUInteger spins = 0;
+  for (;;) {
+    uint64_t expected = 0;
+    uint64_t held = ((uint64_t)(uint32_t)owner << 32) | ALNRateLimitLockClockMilliseconds();
+    if (held == 0) {
+      held = 1;
+    }
+    if (atomic_compare_exchange_weak_explicit(lock,
+                                              &expected,
+                                              held,
+                                              memory_order_acquire,
+                                              memory_order_relaxed)) {
+      return;
+    }
+    spins += 1;
+    if ((spins & 0x3FF) != 0) {
+      continue;
+    }
+#if !defined(_WIN32)
+    // A worker that died while holding the lock would otherwise wedge the
+    // shard for every other worker. Its pid may already belong to another
+    // process, so a lock held past the stale limit is taken back too. The
+    // exchange compares the whole value, so a lock released and retaken in
+    // the meantime is left alone.
+    int32_t holder = (int32_t)(expected >> 32);
+    uint32_t heldMilliseconds = ALNRateLimitLockClockMilliseconds() - (uint32_t)(expected & 0xFFFFFFFFULL);
+    BOOL holderGone = (holder > 1 && holder != owner && kill((pid_t)holder, 0) != 0 && errno == ESRCH);
+    if (holder > 1 && (holderGone || heldMilliseconds > ALNRateLimitStaleLockMilliseconds)) {
+      (void)atomic_compare_exchange_strong_explicit(lock,
+                                                    &expected,
+                                                    0,
+                                                    memory_order_acq_rel,
+                                                    memory_order_relaxed);
+      continue;
+    }
+    sched_yield();
+#endif
+  }
+}
+
+static void ALNRateLimitUnlockShard(_Atomic uint64_t *lock) {
+  atomic_store_explicit(lock, 0, memory_order_release);
+}
+
+- (BOOL)takeTokenForKey:(NSString *)key
+               capacity:(NSUInteger)capacity
+        refillPerSecond:(double)refillPerSecond
+               decision:(ALNRateLimitDecision *)decision
+                  error:(NSError **)error {
+  (void)error;
+  if (decision == NULL) {
+    return NO;
+  }
+  uint64_t hash = ALNRateLimitKeyHash(key ?: @"");
+  NSUInteger slotsPerShard = _slotCount / ALNRateLimitShardCount;
+  NSUInteger shard = (NSUInteger)(hash % ALNRateLimitShardCount);
+  NSUInteger windowStart = (NSUInteger)((hash / ALNRateLimitShardCount) % slotsPerShard);
+  ALNRateLimitBucket *shardBuckets = _buckets + (shard * slotsPerShard);
+  double now = [[NSDate date] timeIntervalSince1970];
+
+  ALNRateLimitLockShard(&_header->shardLocks[shard], _lockOwner);
+  ALNRateLimitBucket *match = NULL;
+  ALNRateLimitBucket *victim = NULL;
+  for (NSUInteger probe = 0; probe < ALNRateLimitProbeWindow; probe++) {
+    ALNRateLimitBucket *bucket = &shardBuckets[(windowStart + probe) % slotsPerShard];
+    if (bucket->keyHash == hash) {
+      match = bucket;
+      break;
+    }
+    if (bucket->keyHash == 0) {
+      if (victim == NULL || victim->keyHash != 0) {
+        victim = bucket;
+      }
+      continue;
+    }
+    if (victim == NULL || (victim->keyHash != 0 && bucket->updatedAt < victim->updatedAt)) {
+      victim = bucket;
+    }
+  }
+  if (match == NULL) {
+    match = victim;
+    match->keyHash = hash;
+    match->tokens = (double)capacity;
+    match->updatedAt = now;
+  }
+  ALNRateLimitApplyBucket(&match->tokens, &match->updatedAt, capacity, refillPerSecond, now, decision);
+  ALNRateLimitUnlockShard(&_header->shardLocks[shard]);
+  return YES;
+}
+
+@end
+
+// KEYS[1] bucket hash; ARGV capacity, refill per second, idle TTL seconds.
+// Uses the Redis clock so hosts with skewed clocks agree.
+static NSString *const ALNRedisTokenBucketScript =
+    @"if redis.replicate_commands then redis.replicate_commands() end\n"
+     "local capacity = tonumber(ARGV[1])\n"
+     "local rate = tonumber(ARGV[2])\n"
+     "local t = redis.call('TIME')\n"
+     "local now = tonumber(t[1]) + (tonumber(t[2]) / 1000000)\n"
+     "local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')\n"
+     "local tokens = tonumber(state[1])\n"
+     "local ts = tonumber(state[2])\n"
+     "if tokens == nil or ts == nil then tokens = capacity; ts = now end\n"
+     "local elapsed = now - ts\n"
+     "if elapsed < 0 then elapsed = 0 end\n"
+     "tokens = math.min(capacity, tokens + (elapsed * rate))\n"
+     "local allowed = 0\n"
+     "if tokens >= 1 then tokens = tokens - 1; allowed = 1 end\n"
+     "redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))\n"
+     "redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))\n"
+     "return {allowed, tostring(tokens)}\n";
+
+@interface ALNRedisRateLimitStore ()
+
+@property(nonatomic, strong) ALNRedisCacheAdapter *adapter;
+@property(nonatomic, copy) NSString *namespacePrefix;
+@property(nonatomic, copy) NSString *scriptSHA;
+
+@end
+
+@implementation ALNRedisRateLimitStore
+
+- (instancetype)initWithRedisAdapter:(ALNRedisCacheAdapter *)adapter
+                           namespace:(NSString *)namespacePrefix {
+  self = [super init];
+  if (self) {
+    _adapter = adapter;
+    _namespacePrefix = ([namespacePrefix length] > 0) ? [namespacePrefix copy] : @"arlen:ratelimit";
+  }
+  return self;
+}
+
+- (NSString *)storeName {
+  return @"redis";
+}
+
+static NSString *ALNRedisReplyString(id value) {
+  if ([value isKindOfClass:[NSData class]]) {
+    return [[NSString alloc] initWithData:value encoding:NSUTF8StringEncoding];
+  }
+  if ([value isKindOfClass:[NSString class]]) {
+    return value;
+  }
+  return [value respondsToSelector:@selector(stringValue)] ? [value stringValue] : nil;
+}
+
+// Loads the script once and remembers its digest so each request sends
+// EVALSHA with the digest instead of the script body.
+- (NSString *)loadedScriptSHAReloading:(BOOL)reload error:(NSError **)error {
+  @synchronized(self) {
+    if (!reload && [self.scriptSHA length] > 0) {
+      return self.scriptSHA;
+    }
+  }
+  id reply = [self.adapter executeCommand:@[ @"SCRIPT", @"LOAD", ALNRedisTokenBucketScript ] error:error];
+  NSString *sha = ALNRedisReplyString(reply);
+  if ([sha length] == 0) {
+    if (error != NULL && *error == nil) {
+      *error = [NSError errorWithDomain:ALNRateLimitStoreErrorDomain
+                                   code:11
+                               userInfo:@{ NSLocalizedDescriptionKey : @"redis did not load the rate limit script" }];
+    }
+    return nil;
+  }
+  @synchronized(self) {
+    self.scriptSHA = sha;
+  }
+  return sha;
+}
+
+- (BOOL)takeTokenForKey:(NSString *)key
+               capacity:(NSUInteger)capacity
+        refillPerSecond:(double)refillPerSecond
+               decision:(ALNRateLimitDecision *)decision
+                  error:(NSError **)error {
+  if (decision == NULL) {
+    return NO;
+  }
+  double rate = (refillPerSecond > 0.0) ? refillPerSecond : 1.0;
+  NSUInteger idleTTL = (NSUInteger)ceil((double)capacity / rate) + 1;
+  NSArray *arguments = @[
+    @"1",
+    [NSString stringWithFormat:@"%@:%@", self.namespacePrefix, key ?: @""],
+    [NSString stringWithFormat:@"%lu", (unsigned long)capacity],
+    [NSString stringWithFormat:@"%.17g", rate],
+    [NSString stringWithFormat:@"%lu", (unsigned long)idleTTL],
+  ];
+  NSError *commandError = nil;
+  id reply = nil;
+  NSString *sha = [self loadedScriptSHAReloading:NO error:&commandError];
+  if (sha != nil) {
+    reply = [self.adapter executeCommand:[@[ @"EVALSHA", sha ] arrayByAddingObjectsFromArray:arguments]
+                                   error:&commandError];
+    // The server drops loaded scripts on restart or SCRIPT FLUSH.
+    if (reply == nil && [[commandError localizedDescription] rangeOfString:@"NOSCRIPT"].location != NSNotFound) {
+      commandError = nil;
+      sha = [self loadedScriptSHAReloading:YES error:&commandError];
+      if (sha != nil) {
+        reply = [self.adapter executeCommand:[@[ @"EVALSHA", sha ] arrayByAddingObjectsFromArray:arguments]
+                                       error:&commandError];
+      }
+    }
+  }
+  NSArray *values = [reply isKindOfClass:[NSArray class]] ? reply : nil;
+  NSString *tokensText = ([values count] == 2) ? ALNRedisReplyString(values[1]) : nil;
+  if (tokensText == nil || ![values[0] respondsToSelector:@selector(integerValue)]) {
+    if (error != NULL) {
+      *error = commandError ?: [NSError errorWithDomain:ALNRateLimitStoreErrorDomain
+                                                   code:10
+                                               userInfo:@{
+                                                 NSLocalizedDescriptionKey :
+                                                     @"unexpected redis rate limit reply"
+                                               }];
+    }
+    return NO;
+  }
+
+  double tokens = [tokensText doubleValue];
+  BOOL allowed = ([values[0] integerValue] == 1);
+  decision->allowed = allowed;
+  decision->remaining = (NSUInteger)floor(MAX(0.0, tokens));
+  decision->retryAfterSeconds = allowed ? 0 : (NSUInteger)MAX(1.0, ceil((1.0 - tokens) / rate));
+  return YES;
+}
+
+@end
@@ -0,0 +1,48 @@
+#ifndef ALN_SAMPLING_PROFILER_H
+#define ALN_SAMPLING_PROFILER_H
+
+#import <Foundation/Foundation.h>
+
+NS_ASSUME_NONNULL_BEGIN
+
+extern NSString *const ALNSamplingProfilerErrorDomain;
+
+typedef NS_ENUM(NSInteger, ALNSamplingProfilerErrorCode) {
+  ALNSamplingProfilerErrorUnsupported = 1,
+  ALNSamplingProfilerErrorBusy = 2,
+  ALNSamplingProfilerErrorTimerFailed = 3,
+};
+
+// In-process CPU stack sampler. While a session runs, a process CPU-time
+// timer delivers SIGPROF at the requested frequency and the handler copies
+// the interrupted thread's return addresses into a preallocated buffer.
+// Outside a session no timer is armed and SIGPROF is back to its previous
+// disposition (ignored, if it had none), so an idle profiler costs nothing.
+@interface ALNSamplingProfiler : NSObject
+
++ (instancetype)sharedProfiler;
++ (BOOL)isSupported;
+
+- (BOOL)isActive;
+
+// Samples the whole process for `duration` seconds, blocking the caller,
+// and returns:
+//   collapsed: flamegraph-ready text, one "root;...;leaf count" line per
+//              distinct stack
+//   samples, dropped, frequency, durationSeconds
+// Only one session can run per process; a concurrent call fails with
+// ALNSamplingProfilerErrorBusy.
+- (nullable NSDictionary *)profileForDuration:(NSTimeInterval)duration
+                                    frequency:(NSUInteger)frequency
+                                        error:(NSError *_Nullable *_Nullable)error;
+
+// Resolves a code address to "-[Class selector]" / "+[Class selector]" for
+// Objective-C method implementations, otherwise to the nearest exported
+// symbol, otherwise to "image+0xoffset" or a raw address.
+- (NSString *)symbolNameForAddress:(uintptr_t)address;
+
+@end
+
+NS_ASSUME_NONNULL_END
+
+#endif
@@ -0,0 +1,456 @@
+#import "ALNSamplingProfiler.h"
+
+#include <objc/runtime.h>
+#include <stdatomic.h>
+#include <stdlib.h>
+#include <string.h>
+
+#if !defined(_WIN32)
+#define ALN_SAMPLING_PROFILER_SUPPORTED 1
+#include <dlfcn.h>
+#include <errno.h>
+#include <execinfo.h>
+#include <signal.h>
+#include <sys/time.h>
+#include <time.h>
+#include <unistd.h>
+#if defined(__linux__) || defined(__FreeBSD__)
+#define ALN_SAMPLING_PROFILER_POSIX_TIMER 1
+#endif
+#endif
+
+NSString *const ALNSamplingProfilerErrorDomain = @"Arlen.SamplingProfiler.Error";
+
+enum {
+  ALNSamplerMaxDepth = 64,
+  // The signal handler and the kernel's signal trampoline.
+  ALNSamplerSkipFrames = 2,
+  ALNSamplerMaxSamples = 65536,
+};
+
+typedef struct {
+  void **frames;
+  uint16_t *depths;
+  size_t capacity;
+  _Atomic size_t next;
+  _Atomic size_t dropped;
+} ALNSamplerBuffer;
+
+static ALNSamplerBuffer *_Atomic gALNSamplerBuffer = NULL;
+static _Atomic int gALNSamplerHandlersInFlight = 0;
+
+static NSError *ALNSamplingProfilerError(ALNSamplingProfilerErrorCode code, NSString *message) {
+  return [NSError errorWithDomain:ALNSamplingProfilerErrorDomain
+                             code:code
+                         userInfo:@{ NSLocalizedDescriptionKey : message ?: @"" }];
+}
+
+#if defined(ALN_SAMPLING_PROFILER_SUPPORTED)
+// Runs on whichever thread was on-CPU when the timer fired. Only touches the
+// preallocated buffer; backtrace() is primed before the timer is armed so it
+// does not load the unwinder from here.
+static void ALNSamplerHandleSignal(int signo) {
+  (void)signo;
+  int savedErrno = errno;
+  atomic_fetch_add(&gALNSamplerHandlersInFlight, 1);
+  ALNSamplerBuffer *buffer = atomic_load(&gALNSamplerBuffer);
+  if (buffer != NULL) {
+    size_t slot = atomic_fetch_add_explicit(&buffer->next, 1, memory_order_relaxed);
+    if (slot < buffer->capacity) {
+      int depth = backtrace(&buffer->frames[slot * ALNSamplerMaxDepth], ALNSamplerMaxDepth);
+      buffer->depths[slot] = (uint16_t)((depth > 0) ? depth : 0);
+    } else {
+      atomic_fetch_add_explicit(&buffer->dropped, 1, memory_order_relaxed);
+    }
+  }
+  atomic_fetch_sub(&gALNSamplerHandlersInFlight, 1);
+  errno = savedErrno;
+}
+#endif
+
+@implementation ALNSamplingProfiler {
+  NSLock *_lock;
+  _Atomic(bool) _active;
+  uintptr_t *_methodStarts;
+  NSArray<NSString *> *_methodNames;
+  NSUInteger _methodCount;
+}
+
++ (instancetype)sharedProfiler {
+  static ALNSamplingProfiler *shared = nil;
+  static dispatch_once_t onceToken;
+  dispatch_once(&onceToken, ^{
+    shared = [[ALNSamplingProfiler alloc] init];
+  });
+  return shared;
+}
+
++ (BOOL)isSupported {
+#if defined(ALN_SAMPLING_PROFILER_SUPPORTED)
+  return YES;
+#else
+  return NO;
+#endif
+}
+
+- (instancetype)init {
+  self = [super init];
+  if (self) {
+    _lock = [[NSLock alloc] init];
+    atomic_init(&_active, false);
+  }
+  return self;
+}
+
+- (void)dealloc {
+  free(_methodStarts);
+}
+
+- (BOOL)isActive {
+  return atomic_load(&_active) ? YES : NO;
+}
+
+- (NSDictionary *)profileForDuration:(NSTimeInterval)duration
+                           frequency:(NSUInteger)frequency
+                               error:(NSError **)error {
+#if !defined(ALN_SAMPLING_PROFILER_SUPPORTED)
+  (void)duration;
+  (void)frequency;
+  if (error != NULL) {
+    *error = ALNSamplingProfilerError(ALNSamplingProfilerErrorUnsupported,
+                                      @"stack sampling is not supported on this platform");
+  }
+  return nil;
+#else
+  if (duration <= 0.0 || frequency == 0) {
+    if (error != NULL) {
+      *error = ALNSamplingProfilerError(ALNSamplingProfilerErrorTimerFailed,
+                                        @"duration and frequency must be positive");
+    }
+    return nil;
+  }
+  bool expected = false;
+  if (!atomic_compare_exchange_strong(&_active, &expected, true)) {
+    if (error != NULL) {
+      *error = ALNSamplingProfilerError(ALNSamplingProfilerErrorBusy,
+                                        @"a profiling session is already running");
+    }
+    return nil;
+  }
+
+  // CPU-time samples across all threads; leave headroom for bursts.
+  double expectedSamples = duration * (double)frequency * 2.0 + 64.0;
+  size_t capacity = (expectedSamples > (double)ALNSamplerMaxSamples)
+                        ? (size_t)ALNSamplerMaxSamples
+                        : (size_t)expectedSamples;
+  ALNSamplerBuffer *buffer = calloc(1, sizeof(ALNSamplerBuffer));
+  if (buffer != NULL) {
+    buffer->frames = calloc(capacity * ALNSamplerMaxDepth, sizeof(void *));
+    buffer->depths = calloc(capacity, sizeof(uint16_t));
+    buffer->capacity = capacity;
+    atomic_init(&buffer->next, 0);
+    atomic_init(&buffer->dropped, 0);
+  }
+  if (buffer == NULL || buffer->frames == NULL || buffer->depths == NULL) {
+    if (buffer != NULL) {
+      free(buffer->frames);
+      free(buffer->depths);
+      free(buffer);
+    }
+    atomic_store(&_active, false);
+    if (error != NULL) {
+      *error = ALNSamplingProfilerError(ALNSamplingProfilerErrorTimerFailed,
+                                        @"could not allocate the sample buffer");
+    }
+    return nil;
+  }
+
+  void *primer[4];
+  (void)backtrace(primer, 4);
+
+  struct sigaction action;
+  struct sigaction previous;
+  memset(&action, 0, sizeof(action));
+  memset(&previous, 0, sizeof(previous));
+  action.sa_handler = ALNSamplerHandleSignal;
+  action.sa_flags = SA_RESTART;
+  sigemptyset(&action.sa_mask);
+
+  atomic_store(&gALNSamplerBuffer, buffer);
+  BOOL installed = NO;
+  BOOL armed = NO;
+  NSString *failure = nil;
+  long intervalNanoseconds = (long)(1000000000.0 / (double)frequency);
+  if (intervalNanoseconds < 1000) {
+    intervalNanoseconds = 1000;
+  }
+  if (sigaction(SIGPROF, &action, &previous) != 0) {
+    failure = [NSString stringWithFormat:@"sigaction failed: %s", strerror(errno)];
+  } else {
+    installed = YES;
+  }
+
+#if defined(ALN_SAMPLING_PROFILER_POSIX_TIMER)
+  timer_t timer;
+  memset(&timer, 0, sizeof(timer));
+  if (failure == nil) {
+    struct sigevent event;
+    memset(&event, 0, sizeof(event));
+    event.sigev_notify = SIGEV_SIGNAL;
+    event.sigev_signo = SIGPROF;
+    if (timer_create(CLOCK_PROCESS_CPUTIME_ID, &event, &timer) != 0) {
+      failure = [NSString stringWithFormat:@"timer_create failed: %s", strerror(errno)];
+    } else {
+      struct itimerspec spec;
+      memset(&spec, 0, sizeof(spec));
+      spec.it_interval.tv_sec = intervalNanoseconds / 1000000000L;
+      spec.it_interval.tv_nsec = intervalNanoseconds % 1000000000L;
+      spec.it_value = spec.it_interval;
+      if (timer_settime(timer, 0, &spec, NULL) != 0) {
+        failure = [NSString stringWithFormat:@"timer_settime failed: %s", strerror(errno)];
+        timer_delete(timer);
+      } else {
+        armed = YES;
+      }
+    }
+  }
+#else
+  struct itimerval previousTimer;
+  memset(&previousTimer, 0, sizeof(previousTimer));
+  if (failure == nil) {
+    struct itimerval spec;
+    memset(&spec, 0, sizeof(spec));
+    spec.it_interval.tv_sec = intervalNanoseconds / 1000000000L;
+    spec.it_interval.tv_usec = (intervalNanoseconds % 1000000000L) / 1000;
+    spec.it_value = spec.it_interval;
+    if (setitimer(ITIMER_PROF, &spec, &previousTimer) != 0) {
+      failure = [NSString stringWithFormat:@"setitimer failed: %s", strerror(errno)];
+    } else {
+      armed = YES;
+    }
+  }
+#endif
+
+  NSDate *startedAt = [NSDate date];
+  if (armed) {
+    [NSThread sleepForTimeInterval:duration];
+#if defined(ALN_SAMPLING_PROFILER_POSIX_TIMER)
+    timer_delete(timer);
+#else
+    setitimer(ITIMER_PROF, &previousTimer, NULL);
+#endif
+  }
+  NSTimeInterval elapsed = [[NSDate date] timeIntervalSinceDate:startedAt];
+
+  // Stop accepting samples, wait out handlers already running, and give a
+  // signal raised just before the timer was deleted a moment to land on our
+  // handler rather than the default (terminating) disposition.
+  atomic_store(&gALNSamplerBuffer, NULL);
+  while (atomic_load(&gALNSamplerHandlersInFlight) > 0) {
+    usleep(100);
+  }
+  if (armed) {
+    usleep(2000);
+  }
+  if (installed) {
+    if (previous.sa_handler == SIG_DFL && (previous.sa_flags & SA_SIGINFO) == 0) {
+      struct sigaction ignore;
+      memset(&ignore, 0, sizeof(ignore));
+      ignore.sa_handler = SIG_IGN;
+      sigemptyset(&ignore.sa_mask);
+      sigaction(SIGPROF, &ignore, NULL);
+    } else {
+      sigaction(SIGPROF, &previous, NULL);
+    }
+  }
+
+  NSDictionary *result = nil;
+  if (armed) {
+    size_t recorded = atomic_load(&buffer->next);
+    if (recorded > buffer->capacity) {
+      recorded = buffer->capacity;
+    }
+    NSUInteger samples = 0;
+    NSString *collapsed = [self collapsedStacksFromBuffer:buffer count:recorded samples:&samples];
+    result = @{
+      @"collapsed" : collapsed,
+      @"samples" : @(samples),
+      @"dropped" : @(atomic_load(&buffer->dropped)),
+      @"frequency" : @(frequency),
+      @"durationSeconds" : @(elapsed),
+    };
+  } else if (error != NULL) {
+    *error = ALNSamplingProfilerError(ALNSamplingProfilerErrorTimerFailed,
+                                      failure ?: @"could not arm the profiling timer");
+  }
+
+  free(buffer->frames);
+  free(buffer->depths);
+  free(buffer);
+  atomic_store(&_active, false);
+  return result;
+#endif
+}
+
+#if defined(ALN_SAMPLING_PROFILER_SUPPORTED)
+- (NSString *)collapsedStacksFromBuffer:(ALNSamplerBuffer *)buffer
+                                  count:(size_t)count
+                                samples:(NSUInteger *)samplesOut {
+  [self reloadMethodTable];
+  NSMutableDictionary<NSNumber *, NSString *> *symbols = [NSMutableDictionary dictionary];
+  NSMutableDictionary<NSString *, NSNumber *> *stacks = [NSMutableDictionary dictionary];
+  NSUInteger samples = 0;
+  for (size_t slot = 0; slot < count; slot++) {
+    NSUInteger depth = buffer->depths[slot];
+    if (depth <= ALNSamplerSkipFrames) {
+      continue;
+    }
+    void **frames = &buffer->frames[slot * ALNSamplerMaxDepth];
+    NSMutableArray<NSString *> *names = [NSMutableArray arrayWithCapacity:depth];
+    // backtrace() is leaf-first; collapsed stacks are root-first.
+    for (NSUInteger idx = depth; idx > ALNSamplerSkipFrames; idx--) {
+      NSNumber *key = @((uintptr_t)frames[idx - 1]);
+      NSString *name = symbols[key];
+      if (name == nil) {
+        name = [self symbolNameForAddress:(uintptr_t)frames[idx - 1]];
+        symbols[key] = name;
+      }
+      [names addObject:name];
+    }
+    NSString *stack = [names componentsJoinedByString:@";"];
+    stacks[stack] = @([stacks[stack] unsignedIntegerValue] + 1);
+    samples += 1;
+  }
+  if (samplesOut != NULL) {
+    *samplesOut = samples;
+  }
+  NSMutableString *text = [NSMutableString string];
+  for (NSString *stack in [[stacks allKeys] sortedArrayUsingSelector:@selector(compare:)]) {
+    [text appendFormat:@"%@ %lu\n", stack, (unsigned long)[stacks[stack] unsignedIntegerValue]];
+  }
+  return text;
+}
+#endif
+
+static void ALNSamplingProfilerCollectMethods(Class cls,
+                                              NSString *prefix,
+                                              NSMutableArray<NSArray *> *entries) {
+  unsigned int methodCount = 0;
+  Method *methods = class_copyMethodList(cls, &methodCount);
+  for (unsigned int idx = 0; idx < methodCount; idx++) {
+    IMP imp = method_getImplementation(methods[idx]);
+    SEL selector = method_getName(methods[idx]);
+    if (imp == NULL || selector == NULL) {
+      continue;
+    }
+    NSString *name = [NSString stringWithFormat:@"%@[%s %s]",
+                                                prefix,
+                                                class_getName(cls),
+                                                sel_getName(selector)];
+    [entries addObject:@[ @((uintptr_t)imp), name ]];
+  }
+  free(methods);
+}
+
+// Objective-C method bodies are usually local symbols that dladdr() cannot
+// see, so the runtime's method lists provide the names instead.
+- (void)reloadMethodTable {
+  NSMutableArray<NSArray *> *entries = [NSMutableArray array];
+  unsigned int classCount = 0;
+  Class *classes = objc_copyClassList(&classCount);
+  for (unsigned int idx = 0; idx < classCount; idx++) {
+    Class cls = classes[idx];
+    ALNSamplingProfilerCollectMethods(cls, @"-", entries);
+    Class metaclass = object_getClass((id)cls);
+    if (metaclass != Nil) {
+      ALNSamplingProfilerCollectMethods(metaclass, @"+", entries);
+    }
+  }
+  free(classes);
+  [entries sortUsingComparator:^NSComparisonResult(NSArray *left, NSArray *right) {
+    return [left[0] compare:right[0]];
+  }];
+
+  uintptr_t *starts = calloc([entries count] + 1, sizeof(uintptr_t));
+  NSMutableArray<NSString *> *names = [NSMutableArray arrayWithCapacity:[entries count]];
+  NSUInteger count = 0;
+  for (NSArray *entry in entries) {
+    uintptr_t start = (uintptr_t)[entry[0] unsignedLongLongValue];
+    // Several selectors can share one IMP; keep the first name.
+    if (starts == NULL || (count > 0 && starts[count - 1] == start)) {
+      continue;
+    }
+    starts[count++] = start;
+    [names addObject:entry[1]];
+  }
+
+  [_lock lock];
+  free(_methodStarts);
+  _methodStarts = starts;
+  _methodNames = [names copy];
+  _methodCount = (starts != NULL) ? count : 0;
+  [_lock unlock];
+}
+
+- (NSString *)symbolNameForAddress:(uintptr_t)address {
+  if (address == 0) {
+    return @"0x0";
+  }
+  [_lock lock];
+  BOOL loaded = (_methodStarts != NULL);
+  [_lock unlock];
+  if (!loaded) {
+    [self reloadMethodTable];
+  }
+
+  // Return addresses point just past the call; look up the call itself.
+  uintptr_t lookup = address - 1;
+  uintptr_t methodStart = 0;
+  NSString *methodName = nil;
+  [_lock lock];
+  NSUInteger low = 0;
+  NSUInteger high = _methodCount;
+  while (low < high) {
+    NSUInteger mid = low + (high - low) / 2;
+    if (_methodStarts[mid] <= lookup) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+  if (low > 0) {
+    methodStart = _methodStarts[low - 1];
+    methodName = _methodNames[low - 1];
+  }
+  [_lock unlock];
+
+#if defined(ALN_SAMPLING_PROFILER_SUPPORTED)
+  Dl_info info;
+  memset(&info, 0, sizeof(info));
+  BOOL resolved = (dladdr((void *)lookup, &info) != 0);
+  uintptr_t symbolStart = resolved ? (uintptr_t)info.dli_saddr : 0;
+  uintptr_t imageBase = resolved ? (uintptr_t)info.dli_fbase : 0;
+  // Prefer whichever known start lies closest below the address, provided
+  // the method is in the same image as the address.
+  if (methodName != nil && methodStart >= symbolStart &&
+      (imageBase == 0 || methodStart >= imageBase)) {
+    return methodName;
+  }
+  if (resolved && info.dli_sname != NULL && info.dli_sname[0] != '\0') {
+    return [NSString stringWithUTF8String:info.dli_sname] ?: @"?";
+  }
+  if (resolved && info.dli_fname != NULL) {
+    NSString *image = [[NSString stringWithUTF8String:info.dli_fname] lastPathComponent];
+    return [NSString stringWithFormat:@"%@+0x%llx",
+                                      image ?: @"?",
+                                      (unsigned long long)(address - imageBase)];
+  }
+#else
+  if (methodName != nil) {
+    return methodName;
+  }
+#endif
+  return [NSString stringWithFormat:@"0x%llx", (unsigned long long)address];
+}
+
+@end
@@ -141,6 +141,13 @@ typedef NS_ENUM(NSUInteger, ALNJobWorkerDisposition) {
                                adapterName:(nullable NSString *)adapterName
                                      error:(NSError *_Nullable *_Nullable)error;
 
+// Sends one raw command and returns the decoded reply: NSData for bulk
+// strings, NSNumber for integers, NSArray for multi-bulk, NSNull for nil.
+// Connections are kept open and reused across commands. A command whose
+// write fails on a reused connection is retried once on a new one; once
+// written it is never resent, so a failed read returns the error.
+- (nullable id)executeCommand:(NSArray *)arguments error:(NSError *_Nullable *_Nullable)error;
+
 @end
 
 @protocol ALNLocalizationAdapter <NSObject>
@@ -12,6 +12,7 @@
 #include <ws2tcpip.h>
 #else
 #include <netdb.h>
+#include <poll.h>
 #include <sys/socket.h>
 #endif
 #include <unistd.h>
@@ -1806,9 +1807,15 @@ static ALNJobEnvelope *ALNJobEnvelopeFromDictionary(id value) {
 @property(nonatomic, copy) NSString *password;
 @property(nonatomic, copy) NSString *namespacePrefix;
 @property(nonatomic, assign) NSTimeInterval ioTimeoutSeconds;
+// Authenticated sockets waiting for the next command.
+@property(nonatomic, strong) NSMutableArray<NSNumber *> *idleConnections;
+@property(nonatomic, strong) NSLock *idleConnectionsLock;
 
 @end
 
+// Idle sockets kept per adapter; callers beyond this open and close their own.
+static const NSUInteger ALNRedisMaxIdleConnections = 8;
+
 static BOOL ALNParseSignedInteger(NSString *text, long long *outValue) {
   if (![text isKindOfClass:[NSString class]] || [text length] == 0) {
     return NO;
@@ -2190,9 +2197,17 @@ static int ALNRedisOpenSocketConnection(NSString *host,
       [ALNNonEmptyString(adapterName,
                          [NSString stringWithFormat:@"redis_cache@%@:%lu", host, (unsigned long)port]) copy];
   _ioTimeoutSeconds = 2.5;
+  _idleConnections = [NSMutableArray array];
+  _idleConnectionsLock = [[NSLock alloc] init];
   return self;
 }
 
+- (void)dealloc {
+  for (NSNumber *fd in _idleConnections) {
+    close([fd intValue]);
+  }
+}
+
 - (NSString *)adapterName {
   return self.adapterNameValue ?: @"redis_cache";
 }
@@ -2253,27 +2268,94 @@ static int ALNRedisOpenSocketConnection(NSString *host,
   return fd;
 }
 
-- (id)runCommand:(NSArray *)parts error:(NSError **)error {
-  int fd = [self openConnectionWithError:error];
-  if (fd < 0) {
-    return nil;
+- (id)executeCommand:(NSArray *)arguments error:(NSError **)error {
+  return [self runCommand:arguments ?: @[] error:error];
+}
+
+// An idle connection has nothing to read; a readable one was closed or
+// reset by the server, or holds stray bytes, and cannot be reused.
+static BOOL ALNRedisIdleConnectionIsUsable(int fd) {
+  struct pollfd descriptor = { .fd = fd, .events = POLLIN, .revents = 0 };
+#if defined(_WIN32)
+  int ready = WSAPoll(&descriptor, 1, 0);
+#else
+  int ready = poll(&descriptor, 1, 0);
+#endif
+  return ready == 0;
+}
+
+- (int)takeIdleConnection {
+  while (YES) {
+    [self.idleConnectionsLock lock];
+    NSNumber *fd = [self.idleConnections lastObject];
+    if (fd != nil) {
+      [self.idleConnections removeLastObject];
+    }
+    [self.idleConnectionsLock unlock];
+    if (fd == nil) {
+      return -1;
+    }
+    if (ALNRedisIdleConnectionIsUsable([fd intValue])) {
+      return [fd intValue];
+    }
+    close([fd intValue]);
   }
+}
 
-  NSError *commandError = nil;
-  BOOL wrote = ALNRedisWriteCommand(fd, parts, &commandError);
-  id reply = nil;
-  if (wrote) {
-    reply = ALNRedisReadReply(fd, &commandError);
+- (void)returnIdleConnection:(int)fd {
+  [self.idleConnectionsLock lock];
+  BOOL kept = ([self.idleConnections count] < ALNRedisMaxIdleConnections);
+  if (kept) {
+    [self.idleConnections addObject:@(fd)];
+  }
+  [self.idleConnectionsLock unlock];
+  if (!kept) {
+    close(fd);
   }
-  close(fd);
+}
 
-  if (!wrote || commandError != nil) {
-    if (error != NULL) {
-      *error = commandError ?: ALNRedisClientError(2223, @"redis command failed", nil);
+- (id)runCommand:(NSArray *)parts error:(NSError **)error {
+  // Only a failed write on a reused connection is retried: nothing reached
+  // the server, so the command cannot run twice. Once the write succeeds,
+  // any failure is returned as is, since INCR or a rate-limit script may
+  // already have run.
+  int fd = [self takeIdleConnection];
+  BOOL reused = (fd >= 0);
+  while (YES) {
+    if (fd < 0) {
+      fd = [self openConnectionWithError:error];
+      if (fd < 0) {
+        return nil;
+      }
     }
-    return nil;
+
+    NSError *commandError = nil;
+    if (!ALNRedisWriteCommand(fd, parts, &commandError)) {
+      close(fd);
+      fd = -1;
+      if (reused) {
+        reused = NO;
+        continue;
+      }
+      if (error != NULL) {
+        *error = commandError ?: ALNRedisClientError(2223, @"redis command failed", nil);
+      }
+      return nil;
+    }
+
+    id reply = ALNRedisReadReply(fd, &commandError);
+    // After an error reply or a partial read the connection's position in
+    // the reply stream is not trusted, so only clean replies keep it.
+    if (reply == nil || commandError != nil) {
+      close(fd);
+      if (error != NULL) {
+        *error = commandError ?: ALNRedisClientError(2223, @"redis command failed", nil);
+      }
+      return nil;
+    }
+    [self returnIdleConnection:fd];
+    return reply;
   }
-  return reply;
 }
 
 - (NSData *)serializedRecordForObject:(id)object
@@ -0,0 +1,43 @@
+#ifndef ALN_SLOW_REQUEST_RECORDER_H
+#define ALN_SLOW_REQUEST_RECORDER_H
+
+#import <Foundation/Foundation.h>
+
+NS_ASSUME_NONNULL_BEGIN
+
+// Flight recorder for requests slower than a threshold. Keeps two bounded
+// sets per process: the slowest `capacity` requests seen so far and the
+// `capacity` most recent over-threshold requests. Requests under the
+// threshold cost one comparison. Thread-safe.
+//
+// Entries are dictionaries carrying at least `total_ms`; ALNApplication
+// records request_id, method, path, route, controller, action, status,
+// stages (milliseconds per ALNPerfTrace stage), db_query_count, db_query_ms,
+// response_bytes, and timestamp.
+@interface ALNSlowRequestRecorder : NSObject
+
+@property(nonatomic, assign, readonly) double thresholdMilliseconds;
+@property(nonatomic, assign, readonly) NSUInteger capacity;
+
+- (instancetype)initWithThresholdMilliseconds:(double)thresholdMilliseconds
+                                     capacity:(NSUInteger)capacity;
+
+- (BOOL)shouldRecordDurationMilliseconds:(double)durationMilliseconds;
+- (void)recordEntry:(NSDictionary *)entry;
+
+// Slowest first.
+- (NSArray<NSDictionary *> *)slowestEntries;
+// Newest first.
+- (NSArray<NSDictionary *> *)recentEntries;
+- (unsigned long long)recordedCount;
+
+// { thresholdMs, capacity, recordedCount, pid, slowest, recent }, ready for
+// JSON serialization.
+- (NSDictionary *)dictionaryRepresentation;
+- (void)reset;
+
+@end
+
+NS_ASSUME_NONNULL_END
+
+#endif
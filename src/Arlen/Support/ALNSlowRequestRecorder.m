@@ -0,0 +1,125 @@
+#import "ALNSlowRequestRecorder.h"
+
+static double ALNSlowRequestEntryDuration(NSDictionary *entry) {
+  id value = entry[@"total_ms"];
+  return [value respondsToSelector:@selector(doubleValue)] ? [value doubleValue] : 0.0;
+}
+
+@implementation ALNSlowRequestRecorder {
+  NSLock *_lock;
+  // Ascending by total_ms, so index 0 is the first to be displaced.
+  NSMutableArray<NSDictionary *> *_slowest;
+  NSMutableArray<NSDictionary *> *_recent;
+  NSUInteger _recentNext;
+  unsigned long long _recordedCount;
+}
+
+- (instancetype)init {
+  return [self initWithThresholdMilliseconds:500.0 capacity:32];
+}
+
+- (instancetype)initWithThresholdMilliseconds:(double)thresholdMilliseconds
+                                     capacity:(NSUInteger)capacity {
+  self = [super init];
+  if (self) {
+    _thresholdMilliseconds = (thresholdMilliseconds > 0.0) ? thresholdMilliseconds : 0.0;
+    _capacity = (capacity > 0) ? capacity : 1;
+    _lock = [[NSLock alloc] init];
+    _slowest = [NSMutableArray arrayWithCapacity:_capacity];
+    _recent = [NSMutableArray arrayWithCapacity:_capacity];
+  }
+  return self;
+}
+
+- (BOOL)shouldRecordDurationMilliseconds:(double)durationMilliseconds {
+  return durationMilliseconds >= _thresholdMilliseconds;
+}
+
+- (void)recordEntry:(NSDictionary *)entry {
+  if (![entry isKindOfClass:[NSDictionary class]]) {
+    return;
+  }
+  double duration = ALNSlowRequestEntryDuration(entry);
+  if (![self shouldRecordDurationMilliseconds:duration]) {
+    return;
+  }
+  NSDictionary *stored = [entry copy];
+
+  [_lock lock];
+  _recordedCount += 1;
+  if ([_recent count] < _capacity) {
+    [_recent addObject:stored];
+  } else {
+    _recent[_recentNext] = stored;
+  }
+  _recentNext = (_recentNext + 1) % _capacity;
+
+  BOOL full = ([_slowest count] >= _capacity);
+  if (!full || duration > ALNSlowRequestEntryDuration(_slowest[0])) {
+    if (full) {
+      [_slowest removeObjectAtIndex:0];
+    }
+    NSUInteger low = 0;
+    NSUInteger high = [_slowest count];
+    while (low < high) {
+      NSUInteger mid = low + (high - low) / 2;
+      if (ALNSlowRequestEntryDuration(_slowest[mid]) <= duration) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    [_slowest insertObject:stored atIndex:low];
+  }
+  [_lock unlock];
+}
+
+- (NSArray<NSDictionary *> *)slowestEntries {
+  [_lock lock];
+  NSArray *entries = [[[_slowest reverseObjectEnumerator] allObjects] copy];
+  [_lock unlock];
+  return entries;
+}
+
+- (NSArray<NSDictionary *> *)recentEntries {
+  [_lock lock];
+  NSUInteger count = [_recent count];
+  NSMutableArray *entries = [NSMutableArray arrayWithCapacity:count];
+  for (NSUInteger offset = 1; offset <= count; offset++) {
+    NSUInteger idx = (_recentNext + _capacity - offset) % _capacity;
+    if (idx < count) {
+      [entries addObject:_recent[idx]];
+    }
+  }
+  [_lock unlock];
+  return entries;
+}
+
+- (unsigned long long)recordedCount {
+  [_lock lock];
+  unsigned long long count = _recordedCount;
+  [_lock unlock];
+  return count;
+}
+
+- (NSDictionary *)dictionaryRepresentation {
+  return @{
+    @"thresholdMs" : @(_thresholdMilliseconds),
+    @"capacity" : @(_capacity),
+    @"recordedCount" : @([self recordedCount]),
+    @"pid" : @([[NSProcessInfo processInfo] processIdentifier]),
+    @"slowest" : [self slowestEntries],
+    @"recent" : [self recentEntries],
+  };
+}
+
+- (void)reset {
+  [_lock lock];
+  [_slowest removeAllObjects];
+  [_recent removeAllObjects];
+  _recentNext = 0;
+  _recordedCount = 0;
+  [_lock unlock];
+}
+
+@end
@@ -4,6 +4,7 @@
 #import "Arlen/Data/ALNAdapterConformance.h"
 #import "Arlen/Data/ALNDatabaseAdapter.h"
 #import "Arlen/Data/ALNDatabaseInspector.h"
+#import "Arlen/Data/ALNDatabaseQueryCache.h"
 #import "Arlen/Data/ALNDatabaseRouter.h"
 #import "Arlen/Data/ALNDataverseClient.h"
 #import "Arlen/Data/ALNDataverseCodegen.h"
@@ -3228,6 +3228,85 @@
   }
 }
 
+- (void)testEOCCParallelIncrementalRunReportsTimingsAndDependencyChanges {
+  NSString *repoRoot = [[NSFileManager defaultManager] currentDirectoryPath];
+  NSString *workRoot = [self createTempDirectoryWithPrefix:@"arlen-eocc-parallel-incremental"];
+  XCTAssertNotNil(workRoot);
+  if (workRoot == nil) {
+    return;
+  }
+
+  @try {
+    NSString *templateRoot = [workRoot stringByAppendingPathComponent:@"templates"];
+    NSString *outputRoot = [workRoot stringByAppendingPathComponent:@"generated"];
+    NSString *manifestPath = [outputRoot stringByAppendingPathComponent:@"manifest.json"];
+    NSString *timingPath = [workRoot stringByAppendingPathComponent:@"timing.json"];
+    NSString *layoutPath = [templateRoot stringByAppendingPathComponent:@"layouts/main.html.eoc"];
+    NSString *pagePath = [templateRoot stringByAppendingPathComponent:@"pages/show.html.eoc"];
+    NSString *otherPath = [templateRoot stringByAppendingPathComponent:@"pages/other.html.eoc"];
+
+    XCTAssertTrue([self writeFile:layoutPath
+                          content:@"<main><%@ yield %></main><aside><%@ yield \"sidebar\" %></aside>\n"]);
+    XCTAssertTrue([self writeFile:pagePath
+                          content:@"<%@ layout \"layouts/main\" %>\n<%@ slot \"sidebar\" %>nav<%@ endslot %>\nbody\n"]);
+    XCTAssertTrue([self writeFile:otherPath content:@"<p>other</p>\n"]);
+
+    NSString *arguments = [NSString stringWithFormat:
+                                        @"--template-root %@ --output-dir %@ --manifest %@ --jobs 4 "
+                                         "--timing-report %@ %@ %@ %@",
+                                        templateRoot,
+                                        outputRoot,
+                                        manifestPath,
+                                        timingPath,
+                                        layoutPath,
+                                        pagePath,
+                                        otherPath];
+    int code = 0;
+    NSString *firstOutput = [self runEOCCCaptureAtRepoRoot:repoRoot
+                                                  workRoot:workRoot
+                                                 arguments:arguments
+                                                  exitCode:&code];
+    XCTAssertEqual(0, code, @"%@", firstOutput);
+    XCTAssertTrue([firstOutput containsString:@"transpiled 3 templates (reused 0, removed 0)"],
+                  @"%@", firstOutput);
+
+    NSData *timingData = [NSData dataWithContentsOfFile:timingPath];
+    NSDictionary *timing = (timingData != nil)
+                               ? [NSJSONSerialization JSONObjectWithData:timingData options:0 error:NULL]
+                               : nil;
+    XCTAssertEqualObjects(@"eocc-timing-report-v1", timing[@"version"]);
+    XCTAssertEqualObjects(@3, timing[@"jobs"]);
+    XCTAssertEqual((NSUInteger)3, [timing[@"templates"] count]);
+    for (NSDictionary *row in timing[@"templates"] ?: @[]) {
+      XCTAssertEqualObjects(@"transpiled", row[@"status"]);
+      XCTAssertNotNil(row[@"total_ms"]);
+    }
+
+    NSString *secondOutput = [self runEOCCCaptureAtRepoRoot:repoRoot
+                                                   workRoot:workRoot
+                                                  arguments:arguments
+                                                   exitCode:&code];
+    XCTAssertEqual(0, code, @"%@", secondOutput);
+    XCTAssertTrue([secondOutput containsString:@"transpiled 0 templates (reused 3, removed 0)"],
+                  @"%@", secondOutput);
+
+    // Dropping the sidebar yield only changes the layout, but the page's
+    // dependency closure changed, so its cross-template warning is reported.
+    XCTAssertTrue([self writeFile:layoutPath content:@"<main><%@ yield %></main>\n"]);
+    NSString *thirdOutput = [self runEOCCCaptureAtRepoRoot:repoRoot
+                                                  workRoot:workRoot
+                                                 arguments:arguments
+                                                  exitCode:&code];
+    XCTAssertEqual(0, code, @"%@", thirdOutput);
+    XCTAssertTrue([thirdOutput containsString:@"transpiled 1 templates (reused 2, removed 0)"],
+                  @"%@", thirdOutput);
+    XCTAssertTrue([thirdOutput containsString:@"code=unused_slot_fill"], @"%@", thirdOutput);
+    XCTAssertTrue([thirdOutput containsString:@"path=pages/show.html.eoc"], @"%@", thirdOutput);
+  } @finally {
+    [[NSFileManager defaultManager] removeItemAtPath:workRoot error:nil];
+  }
+}
+
 - (void)testEOCCRejectsUnknownStaticCompositionDependency {
   NSString *repoRoot = [[NSFileManager defaultManager] currentDirectoryPath];
   NSString *workRoot = [self createTempDirectoryWithPrefix:@"arlen-eocc-missing-dependency"];